@@ -0,0 +1,148 @@
+# app/core/activity.py
+
+"""
+Write-behind tracking of user activity timestamps.
+
+Logins and authenticated requests only record a timestamp in a Redis hash,
+where repeated hits by the same user coalesce into a single field. A periodic
+flusher drains the hashes and applies them to the `users` table with one
+set-based UPDATE per batch, instead of a commit and refresh per request.
+"""
+
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import r
+from app.database.database import SessionLocal
+
+
+LAST_LOGIN_KEY = "activity:last_login"
+LAST_SEEN_KEY = "activity:last_seen"
+
+# Last time this worker recorded a user as seen, so that a burst of requests
+# from one user costs a single Redis write per resolution window.
+_seen_recorded_at: dict[str, float] = {}
+
+
+def record_login(user_id: str):
+    """
+    Record a successful login for a user.
+    """
+    now = time.time()
+    _seen_recorded_at[user_id] = now
+    pipe = r.pipeline(transaction=False)
+    pipe.hset(LAST_LOGIN_KEY, user_id, now)
+    pipe.hset(LAST_SEEN_KEY, user_id, now)
+    pipe.execute()
+
+
+def record_seen(user_id: str):
+    """
+    Record that a user made an authenticated request.
+    """
+    now = time.time()
+    if now - _seen_recorded_at.get(user_id, 0) < settings.ACTIVITY_SEEN_RESOLUTION_SECONDS:
+        return
+    if len(_seen_recorded_at) > settings.ACTIVITY_LOCAL_CACHE_SIZE:
+        _seen_recorded_at.clear()
+    _seen_recorded_at[user_id] = now
+    r.hset(LAST_SEEN_KEY, user_id, now)
+
+
+def _drain(key: str) -> dict[str, float]:
+    """
+    Atomically read and clear a pending-activity hash.
+    """
+    pipe = r.pipeline(transaction=True)
+    pipe.hgetall(key)
+    pipe.delete(key)
+    entries, _ = pipe.execute()
+    return {user_id: float(ts) for user_id, ts in entries.items()}
+
+
+def _restore(key: str, entries: dict[str, float]):
+    """
+    Put drained entries back after a failed flush, without overwriting
+    newer timestamps recorded in the meantime.
+    """
+    pipe = r.pipeline(transaction=False)
+    for user_id, ts in entries.items():
+        pipe.hsetnx(key, user_id, ts)
+    pipe.execute()
+
+
+def _to_datetime(ts: float | None) -> datetime | None:
+    return datetime.fromtimestamp(ts, tz=timezone.utc) if ts is not None else None
+
+
+def _apply_batch(db, batch: list[tuple[str, float | None, float | None]]):
+    """
+    Apply a batch of (user_id, last_login, last_seen) with one UPDATE ... FROM (VALUES ...).
+    """
+    rows = []
+    params = {}
+    for i, (user_id, login_ts, seen_ts) in enumerate(batch):
+        rows.append(
+            f"(CAST(:id_{i} AS uuid), CAST(:login_{i} AS timestamptz), CAST(:seen_{i} AS timestamptz))"
+        )
+        params[f"id_{i}"] = user_id
+        params[f"login_{i}"] = _to_datetime(login_ts)
+        params[f"seen_{i}"] = _to_datetime(seen_ts)
+    # GREATEST ignores NULLs, so users that only have one of the two
+    # timestamps pending keep their other column unchanged
+    db.execute(
+        text(
+            "UPDATE users SET "
+            "last_login_at = GREATEST(users.last_login_at, v.last_login_at), "
+            "last_seen_at = GREATEST(users.last_seen_at, v.last_seen_at) "
+            f"FROM (VALUES {', '.join(rows)}) AS v(id, last_login_at, last_seen_at) "
+            "WHERE users.id = v.id"
+        ),
+        params,
+    )
+
+
+def flush_activity() -> int:
+    """
+    Drain pending activity from Redis and persist it to Postgres.
+    Returns the number of users updated.
+    """
+    logins = _drain(LAST_LOGIN_KEY)
+    seen = _drain(LAST_SEEN_KEY)
+    if not logins and not seen:
+        metrics.set_gauge("activity.flush.lag_seconds", 0)
+        return 0
+
+    pending = [
+        (user_id, logins.get(user_id), seen.get(user_id))
+        for user_id in logins.keys() | seen.keys()
+    ]
+    oldest = min(min(logins.values(), default=time.time()), min(seen.values(), default=time.time()))
+    metrics.set_gauge("activity.flush.lag_seconds", time.time() - oldest)
+
+    batch_size = settings.ACTIVITY_FLUSH_BATCH_SIZE
+    db = SessionLocal()
+    try:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                _apply_batch(db, batch)
+                db.commit()
+            except Exception:
+                db.rollback()
+                metrics.increment("activity.flush.errors")
+                # Keep everything not yet persisted for the next flush
+                remaining = pending[start:]
+                _restore(LAST_LOGIN_KEY, {u: ts for u, ts, _ in remaining if ts is not None})
+                _restore(LAST_SEEN_KEY, {u: ts for u, _, ts in remaining if ts is not None})
+                raise
+            metrics.observe("activity.flush.batch_size", len(batch))
+    finally:
+        db.close()
+
+    metrics.increment("activity.flush.users", len(pending))
+    return len(pending)
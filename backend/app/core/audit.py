@@ -0,0 +1,211 @@
+# app/core/audit.py
+
+"""
+Buffered authentication audit log.
+
+Routes record events into an in-process ring buffer, which never blocks the
+request. A background task drains the buffer and writes the events with one
+multi-row INSERT per batch into the month-partitioned `auth_audit_events`
+table. When the buffer fills up, routine events are sampled and, once it is
+full, new events are dropped; both are counted in the metrics.
+"""
+
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import insert, text
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.database.database import SessionLocal, engine
+from app.models.audit import AuthAuditEvent
+
+
+LOGIN = "login"
+LOGIN_FAILED = "login_failed"
+REFRESH = "refresh"
+REFRESH_FAILED = "refresh_failed"
+LOGOUT = "logout"
+LOGOUT_ALL = "logout_all"
+
+# High-volume events that are sampled under overload. Failures and logouts
+# matter most for investigations and are only dropped when the buffer is full.
+SAMPLED_EVENT_TYPES = frozenset({LOGIN, REFRESH})
+
+
+class AuditBuffer:
+    """
+    Bounded buffer of pending audit events with load shedding.
+    """
+    def __init__(self, capacity: int, high_watermark: int, sample_every: int):
+        self.capacity = capacity
+        self.high_watermark = high_watermark
+        self.sample_every = max(1, sample_every)
+        self._events: deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._sample_counter = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def record(self, event: dict) -> bool:
+        """
+        Add an event to the buffer. Returns False if it was shed.
+        """
+        with self._lock:
+            size = len(self._events)
+            if size >= self.capacity:
+                metrics.increment("audit.events.dropped")
+                return False
+            if size >= self.high_watermark and event["event_type"] in SAMPLED_EVENT_TYPES:
+                self._sample_counter += 1
+                if self._sample_counter % self.sample_every:
+                    metrics.increment("audit.events.sampled_out")
+                    return False
+            self._events.append(event)
+        metrics.increment("audit.events.recorded")
+        return True
+
+    def drain(self, max_events: int) -> list[dict]:
+        """
+        Remove and return up to `max_events` of the oldest events.
+        """
+        with self._lock:
+            count = min(max_events, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+
+    def requeue(self, events: list[dict]):
+        """
+        Put events back at the front after a failed write, dropping
+        whatever no longer fits.
+        """
+        with self._lock:
+            room = max(0, self.capacity - len(self._events))
+            kept = events[:room]
+            self._events.extendleft(reversed(kept))
+        if len(events) > len(kept):
+            metrics.increment("audit.events.dropped", len(events) - len(kept))
+
+
+audit_buffer = AuditBuffer(
+    capacity=settings.AUDIT_BUFFER_CAPACITY,
+    high_watermark=int(settings.AUDIT_BUFFER_CAPACITY * settings.AUDIT_SAMPLING_THRESHOLD),
+    sample_every=settings.AUDIT_SAMPLE_EVERY,
+)
+metrics.register_collector("audit.buffer.size", lambda: len(audit_buffer))
+
+
+def record_auth_event(
+    event_type: str,
+    request: Optional[Request] = None,
+    success: bool = True,
+    username: Optional[str] = None,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+):
+    """
+    Record an authentication event without touching the database.
+    """
+    user_agent = request.headers.get("user-agent") if request else None
+    audit_buffer.record({
+        "occurred_at": datetime.now(timezone.utc),
+        "event_type": event_type,
+        "success": success,
+        "username": username,
+        "user_id": user_id,
+        "session_id": session_id,
+        "ip_address": request.client.host if request and request.client else None,
+        "user_agent": user_agent[:255] if user_agent else None,
+    })
+
+
+def flush_audit_events() -> int:
+    """
+    Write buffered events to the database in multi-row batches.
+    Returns the number of events written.
+    """
+    written = 0
+    db = SessionLocal()
+    try:
+        while True:
+            batch = audit_buffer.drain(settings.AUDIT_FLUSH_BATCH_SIZE)
+            if not batch:
+                break
+            try:
+                db.execute(insert(AuthAuditEvent).values(batch))
+                db.commit()
+            except Exception:
+                db.rollback()
+                metrics.increment("audit.flush.errors")
+                audit_buffer.requeue(batch)
+                raise
+            metrics.observe("audit.flush.batch_size", len(batch))
+            written += len(batch)
+    finally:
+        db.close()
+    return written
+
+
+# region Partition maintenance
+
+def _month_start(year: int, month: int) -> datetime:
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def _partition_name(start: datetime) -> str:
+    return f"{AuthAuditEvent.__tablename__}_y{start.year}m{start.month:02d}"
+
+
+def ensure_audit_partitions(months_ahead: Optional[int] = None):
+    """
+    Create the partitions for the current month and the next few months.
+    """
+    months_ahead = settings.AUDIT_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        for offset in range(months_ahead + 1):
+            start = _month_start(now.year, now.month + offset)
+            end = _month_start(now.year, now.month + offset + 1)
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {_partition_name(start)} "
+                f"PARTITION OF {AuthAuditEvent.__tablename__} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+
+
+def drop_expired_audit_partitions(retention_months: Optional[int] = None) -> list[str]:
+    """
+    Drop whole partitions older than the retention period.
+    """
+    retention_months = settings.AUDIT_RETENTION_MONTHS if retention_months is None else retention_months
+    now = datetime.now(timezone.utc)
+    cutoff = _partition_name(_month_start(now.year, now.month - retention_months))
+    dropped = []
+    with engine.begin() as conn:
+        partitions = conn.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :parent"
+        ), {"parent": AuthAuditEvent.__tablename__}).scalars().all()
+        # Names sort chronologically thanks to the zero-padded month
+        for name in sorted(partitions):
+            if name < cutoff:
+                conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+    return dropped
+
+
+def maintain_audit_partitions():
+    """
+    Periodic partition maintenance: create upcoming months, drop expired ones.
+    """
+    ensure_audit_partitions()
+    drop_expired_audit_partitions()
+
+# endregion Partition maintenance
@@ -0,0 +1,78 @@
+# app/core/caching.py
+
+"""
+HTTP conditional request helpers.
+
+Cacheable collections keep a version counter in Redis that is bumped on
+every write. ETags are derived from that version and the request, so a
+matching If-None-Match can be answered with 304 before any database query.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from app.core.redis import r
+
+
+# Cache scope of the games catalog; any write invalidates its ETags
+GAMES_SCOPE = "games"
+
+
+def _version_key(scope: str) -> str:
+    return f"cache:version:{scope}"
+
+
+def get_version(scope: str) -> int:
+    """
+    Current version of a cacheable collection.
+    """
+    return int(r.get(_version_key(scope)) or 0)
+
+
+def bump_version(scope: str) -> int:
+    """
+    Invalidate every ETag derived from a collection. Call after committing a write.
+    """
+    return r.incr(_version_key(scope))
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from the given parts.
+    """
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def collection_etag(request: Request, scope: str) -> str:
+    """
+    ETag for a request against a versioned collection: changes whenever the
+    collection is written to or the request path or query changes.
+    """
+    query = "&".join(sorted(request.url.query.split("&")))
+    return make_etag(scope, get_version(scope), request.url.path, query)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header matches the ETag.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified_response(etag: str, headers: Optional[dict] = None) -> Response:
+    """
+    Empty 304 response carrying the validator.
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, **(headers or {})},
+    )
@@ -1,6 +1,7 @@
 # app/core/config.py
 
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -13,6 +14,127 @@ class Settings(BaseSettings):
     DATABASE_URL : str
     SECRET_KEY : str
     ACCESS_TOKEN_EXPIRE_MINUTES : int
+    REFRESH_TOKEN_EXPIRE_DAYS : int = 7
+    MAX_SESSIONS_PER_USER : int = 20
+
+    ACTIVITY_FLUSH_INTERVAL_SECONDS : float = 30.0
+    ACTIVITY_FLUSH_BATCH_SIZE : int = 500
+    ACTIVITY_SEEN_RESOLUTION_SECONDS : float = 60.0
+    ACTIVITY_LOCAL_CACHE_SIZE : int = 100_000
+
+    AUDIT_BUFFER_CAPACITY : int = 50_000
+    AUDIT_SAMPLING_THRESHOLD : float = 0.8
+    AUDIT_SAMPLE_EVERY : int = 10
+    AUDIT_FLUSH_INTERVAL_SECONDS : float = 2.0
+    AUDIT_FLUSH_BATCH_SIZE : int = 1_000
+    AUDIT_PARTITIONS_AHEAD : int = 2
+    AUDIT_RETENTION_MONTHS : int = 12
+
+    USER_BATCH_MAX_SIZE : int = 100
+
+    SEARCH_CACHE_TTL_SECONDS : int = 30
+    SEARCH_MAX_CANDIDATES : int = 5000
+
+    TYPEAHEAD_MAX_RESULTS : int = 10
+
+    EVENTS_CALENDAR_TIMEZONE : str = "UTC"
+    EVENTS_MAX_DURATION_DAYS : int = 31
+    EVENTS_MAX_RANGE_DAYS : int = 93
+    EVENTS_DAY_PREVIEW_SIZE : int = 3
+
+    COMMENTS_MAX_DEPTH : int = 16
+    COMMENTS_REPLY_PREVIEW : int = 3
+
+    RATINGS_PRIOR_MEAN : float = 3.0
+    RATINGS_PRIOR_WEIGHT : int = 10
+    RATINGS_RECONCILE_INTERVAL_SECONDS : float = 60 * 60
+    RATINGS_RECONCILE_BATCH_SIZE : int = 500
+    RATINGS_RECONCILE_BATCHES_PER_RUN : int = 20
+
+    STORAGE_ROOT : str = "storage"
+    UPLOAD_MAX_BYTES : int = 256 * 1024 * 1024
+    UPLOAD_QUOTA_BYTES : int = 1024 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE : int = 1024 * 1024
+
+    IMAGE_WORKER_PROCESSES : int = 2
+    WORK_QUEUE_HEARTBEAT_SECONDS : float = 30
+
+    DICE_CACHE_SIZE : int = 1024
+    DICE_MAX_EXPRESSION_LENGTH : int = 200
+    DICE_MAX_DICE : int = 1000
+    DICE_MAX_SIDES : int = 1000
+    DICE_MAX_KEEP_POOL : int = 20
+    DICE_MAX_KEEP_EXPLODING_SIDES : int = 100
+    DICE_MAX_KEEP_WORK : int = 200_000_000
+    DICE_MAX_OUTCOMES : int = 1_000_000
+    DICE_MAX_ROLLS_PER_REQUEST : int = 100_000
+    DICE_MAX_DICE_PER_REQUEST : int = 2000
+    DICE_MAX_OUTCOMES_PER_REQUEST : int = 2_000_000
+
+    RANDOM_TABLES_CACHE_SIZE : int = 512
+    RANDOM_TABLES_MAX_ENTRIES : int = 1000
+    RANDOM_TABLES_MAX_CLOSURE : int = 200
+    RANDOM_TABLES_MAX_DEPTH : int = 10
+    RANDOM_TABLES_MAX_ROLLS : int = 10_000
+    RANDOM_TABLES_MAX_RESULT_CHARS : int = 5_000_000
+
+    CHARACTER_SHEETS_MAX_BYTES : int = 256 * 1024
+    CHARACTER_SHEETS_MAX_PATCH_OPERATIONS : int = 100
+
+    HOMEBREW_SNAPSHOT_INTERVAL : int = 20
+    HOMEBREW_MAX_DOCUMENT_BYTES : int = 1024 * 1024
+
+    SIMILARITY_SHINGLE_SIZE : int = 3
+    SIMILARITY_NUM_PERM : int = 128
+    SIMILARITY_BANDS : int = 32
+    SIMILARITY_THRESHOLD : float = 0.7
+    SIMILARITY_MAX_CANDIDATES : int = 200
+    SIMILARITY_MAX_BUCKET_SIZE : int = 100
+    SIMILARITY_BACKFILL_CHUNK_SIZE : int = 1000
+
+    MODERATION_MAX_TERMS_PER_REQUEST : int = 1000
+    MODERATION_RESCAN_BATCH_SIZE : int = 500
+
+    LIVE_QUEUE_SIZE : int = 64
+    LIVE_HEARTBEAT_SECONDS : float = 15
+    LIVE_MAX_TOPICS : int = 20
+
+    FRONTEND_URL : str = "http://localhost:3000"
+    SMTP_HOST : str = "localhost"
+    SMTP_PORT : int = 25
+    SMTP_USERNAME : Optional[str] = None
+    SMTP_PASSWORD : Optional[str] = None
+    SMTP_STARTTLS : bool = False
+    SMTP_TIMEOUT_SECONDS : float = 30
+    SMTP_IDLE_SECONDS : float = 60
+    MAIL_FROM : str = "noreply@localhost"
+    MAIL_SENDER_THREADS : int = 2
+    MAIL_BATCH_SIZE : int = 50
+    MAIL_MAX_ATTEMPTS : int = 6
+    MAIL_RETRY_BASE_SECONDS : float = 30
+    MAIL_RETRY_MAX_SECONDS : float = 6 * 60 * 60
+    MAIL_DEAD_LETTER_MAX : int = 10_000
+    MAIL_REMINDER_LEAD_HOURS : float = 24
+    MAIL_REMINDER_INTERVAL_SECONDS : float = 5 * 60
+
+    NOTIFICATIONS_UNREAD_TTL_SECONDS : int = 24 * 60 * 60
+    NOTIFICATIONS_RECONCILE_INTERVAL_SECONDS : float = 10 * 60
+    NOTIFICATIONS_RECONCILE_BATCH_SIZE : int = 500
+    NOTIFICATIONS_RECONCILE_BATCHES_PER_RUN : int = 20
+
+    FEED_FANOUT_THRESHOLD : int = 1000
+    FEED_FANOUT_CHUNK_SIZE : int = 1000
+    FEED_MAX_ITEMS : int = 500
+    FEED_SOURCE_MAX_ITEMS : int = 200
+
+    SIMILAR_GAMES_K : int = 20
+    SIMILAR_GAMES_MIN_SCORE : float = 0.0
+    SIMILAR_GAMES_RATING_WEIGHT : float = 1.0
+    SIMILAR_GAMES_RSVP_WEIGHT : float = 0.5
+    SIMILAR_GAMES_CHUNK_BYTES : int = 256 * 1024 * 1024
+    SIMILAR_GAMES_SAVE_BATCH_SIZE : int = 1000
+    SIMILAR_GAMES_REFRESH_INTERVAL_SECONDS : float = 15 * 60
+    SIMILAR_GAMES_REFRESH_LOCK_SECONDS : int = 60 * 60
     DEBUG : bool
 
     AUTH_PREFIX : str
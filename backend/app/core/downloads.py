@@ -0,0 +1,122 @@
+# app/core/downloads.py
+
+"""
+File downloads with byte-range support.
+
+`file_download` answers a GET for a stored file: 304 when If-None-Match
+matches, 206 with the requested slice for a satisfiable single `Range` (and
+a matching If-Range, if given), 416 for an unsatisfiable one, and the whole
+file otherwise. The body is handed to the server as a file descriptor slice
+when it supports the ASGI zero-copy send extension, and read in chunks in a
+worker thread when it does not, so the file is never loaded in memory.
+"""
+
+import os
+from typing import Optional
+
+import anyio
+from fastapi import Request, Response, status
+from starlette.types import Receive, Scope, Send
+
+from app.core.caching import is_not_modified, not_modified_response
+
+
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end) offsets.
+    Returns None to serve the whole file (no header, several ranges, or a
+    unit other than bytes) and raises ValueError if it is unsatisfiable.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start < 0 or start > end or start >= size:
+        raise ValueError("unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+class FileSliceResponse(Response):
+    """
+    Send `count` bytes of a file from `offset`.
+    """
+    chunk_size = 256 * 1024
+
+    def __init__(self, path: str, offset: int, count: int, status_code: int, headers: dict, media_type: str):
+        self.path = path
+        self.offset = offset
+        self.count = count
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers({**headers, "Content-Length": str(count)})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        with open(self.path, "rb") as file:
+            if ZERO_COPY_EXTENSION in scope.get("extensions", {}):
+                await send({
+                    "type": ZERO_COPY_EXTENSION,
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False,
+                })
+                return
+            fd, offset, remaining = file.fileno(), self.offset, self.count
+            while True:
+                chunk = await anyio.to_thread.run_sync(os.pread, fd, min(self.chunk_size, remaining), offset)
+                offset += len(chunk)
+                remaining -= len(chunk)
+                more_body = remaining > 0 and len(chunk) > 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                if not more_body:
+                    break
+
+
+def file_download(
+    request: Request,
+    path: str,
+    size: int,
+    etag: str,
+    media_type: str,
+    headers: Optional[dict] = None,
+) -> Response:
+    """
+    Response for a GET of the file at `path`, honouring conditional and
+    range headers. `etag` must change whenever the content does.
+    """
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", **(headers or {})}
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, headers)
+
+    if_range = request.headers.get("if-range")
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        if if_range is None or if_range == etag:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+        byte_range = None
+    # A stale If-Range means the client's partial copy is outdated
+    if byte_range is None or (if_range is not None and if_range != etag):
+        return FileSliceResponse(path, 0, size, status.HTTP_200_OK, headers, media_type)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return FileSliceResponse(path, start, end - start + 1, status.HTTP_206_PARTIAL_CONTENT, headers, media_type)
@@ -6,6 +6,9 @@ INVALID_CREDENTIALS = "Incorrect username or password."
 INVALID_TOKEN = "Invalid or expired token."
 TOKEN_REVOKED = "Token has been revoked."
 REFRESH_TOKEN_REVOKED = "Refresh token has been revoked."
+SESSION_NOT_FOUND = "Session not found or already revoked."
+
+ADMIN_PRIVILEGES_REQUIRED = "Administrator privileges are required."
 
 # endregion Authentication Errors
 
@@ -25,6 +28,154 @@ INVALID_VERIFICATION_TOKEN = "Invalid or expired verification token."
 #endregion Verification Errors
 
 
+# region User Lookup Errors
+
+TOO_MANY_USERS_REQUESTED = "Too many users requested in a single batch."
+
+# endregion User Lookup Errors
+
+
+# region Games Errors
+
+GAME_NOT_FOUND = "Game not found."
+INVALID_PLAYER_RANGE = "Maximum players must be greater than or equal to minimum players."
+RATING_NOT_FOUND = "Rating not found."
+INVALID_GAME_IMAGE = "The game image must be an uploaded image."
+
+# endregion Games Errors
+
+
+# region Events Errors
+
+EVENT_NOT_FOUND = "Event not found."
+NOT_EVENT_ORGANIZER = "Only the organizer can change this event."
+INVALID_EVENT_TIME_RANGE = "An event must end after it starts and last at most the allowed duration."
+INVALID_EVENT_RANGE = "The requested time range must end after it starts and span at most the allowed number of days."
+CAPACITY_BELOW_RSVPS = "Capacity cannot be lower than the number of confirmed RSVPs."
+ALREADY_RSVPED = "You have already RSVPed to this event."
+RSVP_NOT_FOUND = "RSVP not found."
+
+# endregion Events Errors
+
+
+# region Comments Errors
+
+COMMENT_NOT_FOUND = "Comment not found."
+COMMENT_SUBJECT_NOT_FOUND = "The game or event being discussed does not exist."
+COMMENT_TOO_DEEP = "Replies cannot be nested any deeper."
+NOT_COMMENT_AUTHOR = "Only the author can change this comment."
+
+# endregion Comments Errors
+
+
+# region Uploads Errors
+
+UPLOAD_NOT_FOUND = "Upload not found."
+UPLOAD_TOO_LARGE = "The file is larger than the maximum upload size."
+UPLOAD_QUOTA_EXCEEDED = "The file does not fit in your remaining storage quota."
+NOT_UPLOAD_OWNER = "Only the owner can delete this upload."
+INVALID_UPLOAD_FILENAME = "Invalid file name."
+VARIANT_NOT_FOUND = "Image variant not found or not rendered yet."
+
+# endregion Uploads Errors
+
+
+# region Dice Errors
+
+INVALID_DICE_EXPRESSION = "Invalid dice expression"
+TOO_MANY_DICE_ROLLS = "Too many rolls requested in a single batch."
+DICE_BATCH_TOO_LARGE = "Too many dice or possible outcomes in a single batch."
+
+# endregion Dice Errors
+
+
+# region Random Tables Errors
+
+RANDOM_TABLE_NOT_FOUND = "Random table not found."
+NOT_RANDOM_TABLE_OWNER = "Only the table's owner can change it."
+UNKNOWN_NESTED_TABLE = "An entry rolls on a table that does not exist."
+RANDOM_TABLE_CYCLE = "Tables cannot roll on themselves, directly or through other tables."
+RANDOM_TABLE_IN_USE = "Other tables roll on this table."
+RANDOM_TABLE_TOO_DEEP = "Tables cannot nest this deeply or roll on this many other tables."
+TOO_MANY_TABLE_RESULTS = "The results would be too large; roll fewer times."
+
+# endregion Random Tables Errors
+
+
+# region Character Sheets Errors
+
+CHARACTER_SHEET_NOT_FOUND = "Character sheet not found."
+NOT_CHARACTER_SHEET_OWNER = "Only the sheet's owner can change it."
+CHARACTER_SHEET_TOO_LARGE = "Character sheet is too large."
+CHARACTER_SHEET_VERSION_MISMATCH = "Character sheet has changed since it was read."
+INVALID_PATCH = "Invalid patch"
+PATCH_TEST_FAILED = "Patch could not be applied"
+INVALID_SHEET_QUERY = "Invalid sheet query."
+
+# endregion Character Sheets Errors
+
+
+# region Homebrew Errors
+
+HOMEBREW_NOT_FOUND = "Homebrew document not found."
+NOT_HOMEBREW_OWNER = "Only the document's owner can change it."
+HOMEBREW_TOO_LARGE = "Homebrew document is too large."
+HOMEBREW_REVISION_CONFLICT = "The document has been edited since that revision."
+REVISION_NOT_FOUND = "Revision not found."
+
+# endregion Homebrew Errors
+
+
+# region Moderation Errors
+
+CONTENT_BLOCKED = "The text contains words that are not allowed."
+INVALID_MODERATION_TERM = "A moderation term must contain at least one letter or digit."
+MODERATION_TERM_NOT_FOUND = "Moderation term not found."
+MODERATION_FLAG_NOT_FOUND = "Moderation flag not found."
+
+# endregion Moderation Errors
+
+
+# region Live Updates Errors
+
+INVALID_LIVE_TOPIC = "Topics must be events:<id> or games:<id>."
+TOO_MANY_LIVE_TOPICS = "Too many topics followed on one connection."
+INVALID_LIVE_REQUEST = "Expected {\"action\": \"subscribe\" or \"unsubscribe\", \"topics\": [...]}."
+
+# endregion Live Updates Errors
+
+
+# region Notification Errors
+
+NOTIFICATION_NOT_FOUND = "Notification not found."
+
+# endregion Notification Errors
+
+
+# region Feed Errors
+
+FOLLOW_TARGET_NOT_FOUND = "User or game to follow not found."
+CANNOT_FOLLOW_SELF = "Users cannot follow themselves."
+NOT_FOLLOWING = "Not following this user or game."
+
+# endregion Feed Errors
+
+
+# region Search Errors
+
+UNKNOWN_SEARCH_TYPE = "Unknown search type."
+UNKNOWN_SUGGESTION_TYPE = "Unknown suggestion type."
+
+# endregion Search Errors
+
+
+# region Pagination Errors
+
+INVALID_CURSOR = "Invalid or expired pagination cursor."
+
+# endregion Pagination Errors
+
+
 # region Generic Errors
 
 COULD_NOT_VALIDATE_CREDENTIALS = "Could not validate credentials."
@@ -0,0 +1,84 @@
+# app/core/metrics.py
+
+"""
+Minimal in-process metrics registry.
+
+Counters, gauges and summaries (count/sum/min/max of observed values) are
+kept per worker process and exposed to admins through GET /api/metrics.
+"""
+
+import threading
+from typing import Callable
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters, gauges and summaries.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._summaries: dict[str, dict[str, float]] = {}
+        self._collectors: dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1):
+        """
+        Increase a counter by `value`.
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """
+        Set a gauge to its current value.
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        """
+        Record one observation of a value, e.g. a batch size or a latency.
+        """
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                self._summaries[name] = {
+                    "count": 1, "sum": value, "min": value, "max": value, "last": value,
+                }
+                return
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+
+    def register_collector(self, name: str, collector: Callable[[], float]):
+        """
+        Register a gauge whose value is computed when the metrics are read,
+        e.g. a queue length.
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> dict:
+        """
+        Return a copy of all metrics.
+        """
+        with self._lock:
+            gauges = dict(self._gauges)
+            collectors = dict(self._collectors)
+            snapshot = {
+                "counters": dict(self._counters),
+                "summaries": {k: dict(v) for k, v in self._summaries.items()},
+            }
+        for name, collector in collectors.items():
+            try:
+                gauges[name] = collector()
+            except Exception:
+                gauges[name] = None
+        snapshot["gauges"] = gauges
+        return snapshot
+
+
+metrics = Metrics()
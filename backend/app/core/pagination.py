@@ -0,0 +1,78 @@
+# app/core/pagination.py
+
+"""
+Opaque keyset pagination cursors.
+
+A cursor holds the sort key values of the last row of a page, so the next
+page is fetched with a `(sort_key, id) > (:last_key, :last_id)` predicate
+that an index can seek to directly, however deep the page is.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.core.messages import INVALID_CURSOR
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return UUID(value["uuid"])
+    return value
+
+
+def encode_cursor(kind: str, values: tuple) -> str:
+    """
+    Encode the sort key of a row into an opaque cursor.
+    `kind` identifies the ordering the cursor belongs to.
+    """
+    payload = json.dumps([kind, [_encode_value(v) for v in values]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _is_instance(value: Any, expected: type) -> bool:
+    # JSON does not tell 1.0 from 1, and bool is an int to isinstance
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: Optional[str], kind: str, types: tuple[type, ...]) -> Optional[tuple]:
+    """
+    Decode a cursor produced by `encode_cursor` for the same `kind`, whose
+    values must have the given `types`. Raises a 400 error for malformed
+    cursors, cursors of another ordering or values of the wrong types.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_kind, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if cursor_kind != kind:
+            raise ValueError("cursor belongs to another ordering")
+        values = tuple(_decode_value(v) for v in values)
+        if len(values) != len(types) or not all(map(_is_instance, values, types)):
+            raise ValueError("cursor values do not match the ordering")
+        return values
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR,
+        )
@@ -0,0 +1,124 @@
+# app/core/pubsub.py
+
+"""
+Change notifications between workers over Redis pub/sub.
+
+Writers publish a small message after committing, e.g.
+`publish_change("games", "upsert", {...})`. Each worker runs a single
+listener thread that hands every message to the handlers subscribed to its
+topic. Pub/sub is fire-and-forget, so consumers keeping derived state in
+memory also register a resync callback, run whenever the listener had to
+reconnect and may have missed messages.
+"""
+
+import json
+import threading
+import traceback
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+import redis
+
+from app.core.metrics import metrics
+from app.core.redis import r
+
+
+CHANNEL = "changes"
+
+# Seconds between reconnection attempts after losing Redis
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+def publish_change(topic: str, action: str, data: dict[str, Any]):
+    """
+    Notify every worker of a committed change. Failures are counted, not
+    raised: the write already succeeded.
+    """
+    message = json.dumps({"topic": topic, "action": action, "data": data}, default=str)
+    try:
+        r.publish(CHANNEL, message)
+    except redis.RedisError:
+        metrics.increment("pubsub.publish_errors")
+
+
+class ChangeListener:
+    """
+    Background thread dispatching change notifications to subscribers.
+    """
+    def __init__(self):
+        self._handlers: dict[str, list[Callable[[str, dict], None]]] = defaultdict(list)
+        self._resync_callbacks: list[Callable[[], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def subscribe(self, topic: str, handler: Callable[[str, dict], None]):
+        """
+        Call `handler(action, data)` for every message on `topic`.
+        """
+        self._handlers[topic].append(handler)
+
+    def on_resync(self, callback: Callable[[], None]):
+        """
+        Call `callback()` after reconnecting, when messages may have been lost.
+        """
+        self._resync_callbacks.append(callback)
+
+    def dispatch(self, raw: str):
+        """
+        Hand a published message to the subscribers of its topic.
+        """
+        message = json.loads(raw)
+        for handler in self._handlers.get(message["topic"], ()):
+            try:
+                handler(message["action"], message["data"])
+            except Exception:
+                metrics.increment("pubsub.handler_errors")
+                traceback.print_exc()
+        metrics.increment("pubsub.messages")
+
+    def start(self):
+        """
+        Start listening in a daemon thread.
+        """
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="change-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stop listening and wait for the thread to exit.
+        """
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+    def _resync(self):
+        for callback in self._resync_callbacks:
+            try:
+                callback()
+            except Exception:
+                traceback.print_exc()
+
+    def _run(self):
+        connected_before = False
+        while not self._stopping.is_set():
+            pubsub = r.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(CHANNEL)
+                if connected_before:
+                    metrics.increment("pubsub.reconnects")
+                    self._resync()
+                connected_before = True
+                while not self._stopping.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.dispatch(message["data"])
+            except redis.RedisError:
+                self._stopping.wait(RECONNECT_DELAY_SECONDS)
+            finally:
+                pubsub.close()
+
+
+change_listener = ChangeListener()
@@ -10,8 +10,10 @@ from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.messages import ADMIN_PRIVILEGES_REQUIRED
 from app.database.crud import get_user_by_username
-from app.core.redis import is_token_blacklisted
+from app.core.activity import record_seen
+from app.core.sessions import is_token_revoked
 from app.schemas.auth import TokenData
 from app.models.user import User as UserORM
 from app.database.database import get_db
@@ -40,10 +42,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def create_access_token(
     data: dict, 
     expires_delta: Optional[timedelta] = None,
-    token_type: str = "access"
+    token_type: str = "access",
+    jti: Optional[str] = None
 ):
     """
     Create an access token with an expiration time.
+    A `jti` can be supplied when the caller needs to know it up front,
+    e.g. to key a login session on the refresh token.
     """
     to_encode = data.copy()
     now = datetime.now()
@@ -51,22 +56,18 @@ def create_access_token(
     to_encode.update({
         "iat": now.timestamp(), 
         "exp": expire.timestamp(),
-        "jti": str(uuid4()),
+        "jti": jti or str(uuid4()),
         "type": token_type
     })
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> UserORM:
+def user_from_token(db: Session, token: str) -> UserORM:
     """
-    Get the current user from the token.
+    Get the user a valid, unrevoked access token belongs to, for
+    connections authenticated outside of a dependency (e.g. WebSockets).
     """
-    if is_token_blacklisted(token):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has been revoked",
-        )
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -83,9 +84,36 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError as e:
         print(f"JWT decoding error: {e}")
         raise credentials_exception
+
+    # Blacklist and session checks share a single Redis round trip
+    if is_token_revoked(token, payload.get("uid"), payload.get("sid")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
     
     user = get_user_by_username(db, username=token_data.sub)
     if user is None:
         print(f"User not found: {token_data.sub}")
         raise credentials_exception
-    return user
\ No newline at end of file
+    record_seen(str(user.id))
+    return user
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> UserORM:
+    """
+    Get the current user from the token.
+    """
+    return user_from_token(db, token)
+
+
+async def get_current_admin(current_user: UserORM = Depends(get_current_user)) -> UserORM:
+    """
+    Get the current user, requiring administrator privileges.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ADMIN_PRIVILEGES_REQUIRED,
+        )
+    return current_user
\ No newline at end of file
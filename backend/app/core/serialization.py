@@ -0,0 +1,84 @@
+# app/core/serialization.py
+
+"""
+Fast JSON response serialization.
+
+FastAPI's default path for a `response_model` validates the returned value,
+serializes it to Python primitives, and finally runs `json.dumps` over the
+result (for sync routes the validation also takes a threadpool hop). The
+helpers here let pydantic-core do validation and JSON encoding straight to
+bytes with compiled serializers, cached per type.
+
+Routes keep declaring `response_model` for the OpenAPI schema and return
+`model_response(...)`; FastAPI passes `Response` instances through untouched.
+"""
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing_extensions import NotRequired, TypedDict
+
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """
+    Build (once) the compiled validator/serializer for a type.
+    """
+    return TypeAdapter(tp)
+
+
+def dump_model_json(tp: Any, obj: Any) -> bytes:
+    """
+    Validate `obj` against `tp` (reading ORM attributes directly) and
+    encode it to JSON bytes.
+    """
+    adapter = type_adapter(tp)
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True))
+
+
+def model_response(
+    tp: Any,
+    obj: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """
+    Serialize `obj` as `tp` into a ready-to-send JSON response.
+    """
+    return Response(
+        content=dump_model_json(tp, obj),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+class ErrorEnvelope(TypedDict):
+    """
+    Standard error response, see app/exceptions/handlers.py.
+    """
+    success: bool
+    error_code: str
+    message: Any
+    detail: NotRequired[Any]
+
+
+_error_envelope_adapter = type_adapter(ErrorEnvelope)
+
+
+class EnvelopeResponse(Response):
+    """
+    JSON response for the error envelopes, encoded in a single pass by the
+    precompiled envelope serializer. Values JSON has no representation for
+    (exceptions in validation error contexts, for instance) are encoded
+    with `str`, so error details need no cleaning beforehand.
+    """
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, content: ErrorEnvelope) -> bytes:
+        return _error_envelope_adapter.dump_json(content, fallback=str, warnings=False)
@@ -0,0 +1,157 @@
+# app/core/sessions.py
+
+"""
+Per-user registry of active login sessions.
+
+Every login creates a session identified by the `jti` of its refresh token.
+Sessions are kept in a Redis sorted set per user, scored by their expiry
+timestamp, with the session metadata in a companion hash:
+
+    sessions:{user_id}        ZSET  session_id -> expires_at
+    sessions:{user_id}:meta   HASH  session_id -> JSON metadata
+
+Revoking every session of a user is a single atomic DEL of both keys, and
+access/refresh tokens carry their session id (`sid`) so that validation is
+one ZSCORE pipelined with the existing token blacklist lookup.
+"""
+
+import json
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.core.redis import r
+
+
+# Removes expired sessions and, if the user still has too many, the ones
+# closest to expiry. Runs atomically so the set and the metadata hash never
+# drift apart.
+_TRIM_SESSIONS = r.register_script("""
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local overflow = redis.call('ZCARD', KEYS[1]) - #expired - tonumber(ARGV[2])
+if overflow > 0 then
+    local oldest = redis.call('ZRANGE', KEYS[1], #expired, #expired + overflow - 1)
+    for _, member in ipairs(oldest) do
+        table.insert(expired, member)
+    end
+end
+if #expired > 0 then
+    redis.call('ZREM', KEYS[1], unpack(expired))
+    redis.call('HDEL', KEYS[2], unpack(expired))
+end
+return #expired
+""")
+
+
+def _sessions_key(user_id: str) -> str:
+    return f"sessions:{user_id}"
+
+
+def _meta_key(user_id: str) -> str:
+    return f"sessions:{user_id}:meta"
+
+
+def trim_sessions(user_id: str) -> int:
+    """
+    Lazily drop expired sessions and cap the number kept per user.
+    """
+    now = datetime.now().timestamp()
+    return _TRIM_SESSIONS(
+        keys=[_sessions_key(user_id), _meta_key(user_id)],
+        args=[now, settings.MAX_SESSIONS_PER_USER],
+    )
+
+
+def register_session(
+    user_id: str,
+    session_id: str,
+    expires_at: datetime,
+    user_agent: Optional[str] = None,
+    ip_address: Optional[str] = None,
+):
+    """
+    Record a new login session for a user.
+    """
+    metadata = {
+        "created_at": datetime.now().timestamp(),
+        "expires_at": expires_at.timestamp(),
+        "user_agent": user_agent,
+        "ip_address": ip_address,
+    }
+    expire_at = int(expires_at.timestamp()) + 1
+    pipe = r.pipeline()
+    pipe.zadd(_sessions_key(user_id), {session_id: expires_at.timestamp()})
+    pipe.hset(_meta_key(user_id), session_id, json.dumps(metadata))
+    # The keys never need to outlive the longest session they hold
+    for key in (_sessions_key(user_id), _meta_key(user_id)):
+        pipe.expireat(key, expire_at, nx=True)
+        pipe.expireat(key, expire_at, gt=True)
+    _TRIM_SESSIONS(
+        keys=[_sessions_key(user_id), _meta_key(user_id)],
+        args=[datetime.now().timestamp(), settings.MAX_SESSIONS_PER_USER],
+        client=pipe,
+    )
+    pipe.execute()
+
+
+def list_sessions(user_id: str) -> list[dict]:
+    """
+    List the active sessions of a user, most recently expiring first.
+    """
+    trim_sessions(user_id)
+    pipe = r.pipeline()
+    pipe.zrevrange(_sessions_key(user_id), 0, -1)
+    pipe.hgetall(_meta_key(user_id))
+    session_ids, metadata = pipe.execute()
+
+    sessions = []
+    for session_id in session_ids:
+        raw = metadata.get(session_id)
+        entry = json.loads(raw) if raw else {}
+        entry["session_id"] = session_id
+        sessions.append(entry)
+    return sessions
+
+
+def revoke_session(user_id: str, session_id: str) -> bool:
+    """
+    Revoke a single session. Returns False if the session was not active.
+    """
+    pipe = r.pipeline()
+    pipe.zrem(_sessions_key(user_id), session_id)
+    pipe.hdel(_meta_key(user_id), session_id)
+    removed, _ = pipe.execute()
+    return bool(removed)
+
+
+def revoke_all_sessions(user_id: str) -> int:
+    """
+    Revoke every session of a user in one atomic operation.
+    Returns the number of sessions that were active.
+    """
+    pipe = r.pipeline(transaction=True)
+    pipe.zcard(_sessions_key(user_id))
+    pipe.delete(_sessions_key(user_id), _meta_key(user_id))
+    count, _ = pipe.execute()
+    return count
+
+
+def is_token_revoked(
+    token: str,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+) -> bool:
+    """
+    Check the token blacklist and, for session-bound tokens, that the session
+    is still active. Both checks share a single round trip to Redis.
+    """
+    if not (user_id and session_id):
+        # Tokens issued before session tracking only have the blacklist
+        return r.get(token) == "revoked"
+    pipe = r.pipeline(transaction=False)
+    pipe.get(token)
+    pipe.zscore(_sessions_key(user_id), session_id)
+    blacklisted, expires_at = pipe.execute()
+    if blacklisted == "revoked" or expires_at is None:
+        return True
+    return expires_at < datetime.now().timestamp()
@@ -0,0 +1,94 @@
+# app/core/storage.py
+
+"""
+Content-addressed blob storage on local disk.
+
+An upload is streamed into a temporary file under STORAGE_ROOT/tmp while its
+SHA-256 is computed, then moved (a rename, never a copy) to
+STORAGE_ROOT/blobs/<aa>/<bb>/<sha256>. Identical content maps to the same
+path, so it is stored once however many times it is uploaded.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from app.core.config import settings
+
+
+class UploadTooLarge(Exception):
+    """
+    Raised when a streamed upload exceeds the size it was allowed.
+    """
+
+
+def _storage_dir(*parts: str) -> str:
+    return os.path.join(settings.STORAGE_ROOT, *parts)
+
+
+def blob_path(sha256: str) -> str:
+    """
+    Where the blob with the given digest is stored.
+    """
+    return _storage_dir("blobs", sha256[:2], sha256[2:4], sha256)
+
+
+class BlobWriter:
+    """
+    Stream data into a temporary file, hashing it on the way.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        os.makedirs(_storage_dir("tmp"), exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=_storage_dir("tmp"), suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+        self.sha256: Optional[str] = None
+
+    def write(self, data: bytes):
+        """
+        Append a chunk. Blocking; call it from a worker thread.
+        """
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge()
+        self._hash.update(data)
+        self._file.write(data)
+
+    def finish(self) -> str:
+        """
+        Flush the file to disk and return the content's SHA-256.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self.sha256 = self._hash.hexdigest()
+        return self.sha256
+
+    def store(self):
+        """
+        Move the finished file to its content address.
+        """
+        path = blob_path(self.sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self.temp_path, path)
+
+    def discard(self):
+        """
+        Drop the temporary file, if it is still there.
+        """
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.unlink(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+def remove_blob(sha256: str):
+    try:
+        os.unlink(blob_path(sha256))
+    except FileNotFoundError:
+        pass
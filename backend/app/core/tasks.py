@@ -0,0 +1,53 @@
+# app/core/tasks.py
+
+"""
+Periodic background tasks run for the lifetime of the application.
+"""
+
+import asyncio
+import traceback
+from typing import Callable, Optional
+
+
+class PeriodicTask:
+    """
+    Run a blocking function every `interval` seconds in a worker thread.
+    The function is run one last time on shutdown so buffered work is not lost.
+    """
+    def __init__(self, name: str, interval: float, func: Callable[[], object]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """
+        Start the task on the running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self):
+        """
+        Cancel the task and run the function a final time.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._run_once()
+
+    async def _run_once(self):
+        try:
+            await asyncio.to_thread(self.func)
+        except Exception:
+            print(f"Background task {self.name} failed")
+            traceback.print_exc()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._run_once()
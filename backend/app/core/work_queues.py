@@ -0,0 +1,153 @@
+# app/core/work_queues.py
+
+"""
+Redis job queues whose jobs outlive the worker process taking them.
+
+Jobs are moved atomically from the shared queue list to a processing list
+owned by the taking process, and removed from it once handled. Each
+process keeps a heartbeat key alive while it runs; a process whose
+heartbeat has expired died with jobs in flight, and any other process
+moves its processing list back to the queue. Jobs of live processes are
+never touched, so several workers and rolling restarts do not handle a
+job twice.
+"""
+
+import os
+import threading
+import traceback
+from typing import Optional
+from uuid import uuid4
+
+import redis
+
+from app.core.config import settings
+from app.core.redis import r
+
+
+_process_id: Optional[tuple[int, str]] = None
+
+
+def process_worker_id() -> str:
+    """
+    Unique id of the current process, renewed in forked children.
+    """
+    global _process_id
+    if _process_id is None or _process_id[0] != os.getpid():
+        _process_id = (os.getpid(), uuid4().hex)
+    return _process_id[1]
+
+
+class WorkQueue:
+    """
+    A queue list plus a processing list per worker process.
+    """
+    def __init__(self, name: str, worker_id: Optional[str] = None):
+        self.name = name
+        self.queue_key = f"{name}:queue"
+        self._workers_key = f"{name}:workers"
+        self._worker_id = worker_id
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def worker_id(self) -> str:
+        return self._worker_id or process_worker_id()
+
+    def processing_key(self, worker_id: Optional[str] = None) -> str:
+        return f"{self.name}:processing:{worker_id or self.worker_id}"
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f"{self.name}:heartbeat:{worker_id}"
+
+    def take(self, timeout: float) -> Optional[str]:
+        """
+        Wait up to `timeout` seconds for a job and hold it as in flight.
+        """
+        return r.blmove(self.queue_key, self.processing_key(), timeout, "RIGHT", "LEFT")
+
+    def take_nowait(self) -> Optional[str]:
+        return r.lmove(self.queue_key, self.processing_key(), "RIGHT", "LEFT")
+
+    def done(self, job: str, pipe=None):
+        """
+        Forget a handled job, in `pipe` if given.
+        """
+        (pipe or r).lrem(self.processing_key(), 1, job)
+
+    def in_flight(self) -> int:
+        """
+        Jobs being handled by every registered worker.
+        """
+        pipe = r.pipeline(transaction=False)
+        for worker_id in r.smembers(self._workers_key):
+            pipe.llen(self.processing_key(worker_id))
+        return sum(pipe.execute())
+
+    def heartbeat(self):
+        pipe = r.pipeline()
+        pipe.set(self._heartbeat_key(self.worker_id), 1, ex=max(1, round(settings.WORK_QUEUE_HEARTBEAT_SECONDS)))
+        pipe.sadd(self._workers_key, self.worker_id)
+        pipe.execute()
+
+    def _requeue(self, worker_id: str) -> int:
+        moved = 0
+        while r.lmove(self.processing_key(worker_id), self.queue_key, "RIGHT", "LEFT"):
+            moved += 1
+        return moved
+
+    def recover(self) -> int:
+        """
+        Queue again the jobs of workers whose heartbeat expired. Returns
+        how many.
+        """
+        moved = 0
+        for worker_id in r.smembers(self._workers_key):
+            if worker_id == self.worker_id or r.exists(self._heartbeat_key(worker_id)):
+                continue
+            moved += self._requeue(worker_id)
+            if not r.exists(self._heartbeat_key(worker_id)):
+                r.srem(self._workers_key, worker_id)
+        return moved
+
+    def start(self):
+        """
+        Register this worker and keep its heartbeat alive in a daemon
+        thread, which also recovers the jobs of dead workers. Jobs left in
+        this worker's own list are from before it started, and queued again.
+        """
+        if self._thread is not None:
+            return
+        try:
+            self.heartbeat()
+            self._requeue(self.worker_id)
+            self.recover()
+        except redis.RedisError:
+            traceback.print_exc()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the heartbeat and unregister. Call once no job is in flight.
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            self._requeue(self.worker_id)
+            r.delete(self._heartbeat_key(self.worker_id))
+            r.srem(self._workers_key, self.worker_id)
+        except redis.RedisError:
+            traceback.print_exc()
+
+    def _run(self):
+        interval = settings.WORK_QUEUE_HEARTBEAT_SECONDS / 3
+        while not self._stopping.wait(interval):
+            try:
+                self.heartbeat()
+                self.recover()
+            except redis.RedisError:
+                traceback.print_exc()
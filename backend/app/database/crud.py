@@ -1,13 +1,33 @@
 # app/database/crud.py
 
-from uuid import uuid4
+from typing import Iterable
+from uuid import UUID, uuid4
 
 from app.models.user import User as UserORM
+from sqlalchemy import String, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.orm import Session
 
 def get_user_by_username(db: Session, username: str) -> UserORM | None:
     return db.query(UserORM).filter(UserORM.username == username).first()
 
+def get_users_by_ids(db: Session, ids: Iterable[UUID]) -> list[UserORM]:
+    # A single array parameter keeps the statement identical for any batch size
+    ids = list(ids)
+    if not ids:
+        return []
+    return db.query(UserORM).filter(
+        UserORM.id == any_(bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+    ).all()
+
+def get_users_by_usernames(db: Session, usernames: Iterable[str]) -> list[UserORM]:
+    usernames = list(usernames)
+    if not usernames:
+        return []
+    return db.query(UserORM).filter(
+        UserORM.username == any_(bindparam("usernames", usernames, type_=ARRAY(String)))
+    ).all()
+
 def get_user_by_email(db: Session, email: str) -> UserORM | None:
     return db.query(UserORM).filter(UserORM.email == email).first()
 
@@ -0,0 +1,284 @@
+# app/database/crud_character_sheets.py
+
+"""
+Character sheets: JSONB documents edited with JSON Patch (RFC 6902).
+
+A patch is compiled into a single UPDATE and applied inside PostgreSQL, so
+neither the client nor the application ever handles the whole document
+for a one-field edit. Each operation becomes a step of a CTE chain that
+rewrites the previous step's document with jsonb_set / jsonb_insert / #-
+and carries the index of the first operation that failed; the final
+UPDATE only writes when every step succeeded, the caller owns the sheet
+and its version still matches the one the client read.
+
+The chain starts from the row read FOR UPDATE, so concurrent patches to a
+sheet apply one after the other to the latest document instead of
+overwriting each other.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import cast, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONPATH
+from sqlalchemy.orm import Session, defer
+
+from app.models.character_sheet import CharacterSheet as CharacterSheetORM
+
+
+_ARRAY_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+PATCH_APPLIED = "applied"
+PATCH_NOT_FOUND = "not_found"
+PATCH_FORBIDDEN = "forbidden"
+PATCH_VERSION_MISMATCH = "version_mismatch"
+PATCH_FAILED = "failed"
+PATCH_TOO_LARGE = "too_large"
+
+
+class InvalidPatch(ValueError):
+    """
+    A patch operation that is malformed whatever the document.
+    """
+
+    def __init__(self, index: int, reason: str):
+        super().__init__(f"operation {index}: {reason}")
+        self.index = index
+
+
+@dataclass
+class PatchResult:
+    status: str
+    version: Optional[int] = None
+    updated_at: Optional[datetime] = None
+    # Index of the first operation that could not be applied
+    failed_operation: Optional[int] = None
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """
+    Split a JSON Pointer (RFC 6901) into its reference tokens.
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError("JSON pointers must be empty or start with '/'")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+class _PatchCompiler:
+    """
+    Builds the CTE chain for a list of operations, with its parameters.
+    """
+
+    def __init__(self):
+        self.steps: list[str] = []
+        self.params: dict[str, Any] = {}
+
+    def _param(self, value: Any) -> str:
+        name = f"p{len(self.params)}"
+        self.params[name] = value
+        return f":{name}"
+
+    def _path(self, tokens: list[str]) -> str:
+        return f"CAST({self._param(tokens)} AS text[])"
+
+    def _value(self, value: Any) -> str:
+        return f"CAST({self._param(json.dumps(value))} AS jsonb)"
+
+    def _exists(self, tokens: list[str]) -> str:
+        parent = f"(data #> {self._path(tokens[:-1])})"
+        key = tokens[-1]
+        in_array = (
+            f"{int(key)} < jsonb_array_length({parent})" if _ARRAY_INDEX.fullmatch(key) else "false"
+        )
+        return (
+            f"CASE jsonb_typeof({parent}) WHEN 'object' THEN {parent} ? {self._param(key)}"
+            f" WHEN 'array' THEN {in_array} ELSE false END"
+        )
+
+    def _add(self, tokens: list[str], value: str) -> tuple[str, str]:
+        path = self._path(tokens)
+        parent_path = self._path(tokens[:-1])
+        parent = f"(data #> {parent_path})"
+        key = tokens[-1]
+        if key == "-":
+            appended = f"{parent} || jsonb_build_array({value})"
+            in_array = "true"
+            array_data = appended if len(tokens) == 1 else f"jsonb_set(data, {parent_path}, {appended})"
+        elif _ARRAY_INDEX.fullmatch(key):
+            in_array = f"{int(key)} <= jsonb_array_length({parent})"
+            array_data = f"jsonb_insert(data, {path}, {value})"
+        else:
+            in_array = "false"
+            array_data = "data"
+        check = f"CASE jsonb_typeof({parent}) WHEN 'object' THEN true WHEN 'array' THEN {in_array} ELSE false END"
+        data = f"CASE jsonb_typeof({parent}) WHEN 'object' THEN jsonb_set(data, {path}, {value}) ELSE {array_data} END"
+        return check, data
+
+    def _step(self, index: int, check: str, data: str, held: str = "held"):
+        previous = f"s{len(self.steps)}"
+        self.steps.append(
+            f"SELECT id, owner_id, version,"
+            f" CASE WHEN failed IS NULL AND NOT ({check}) THEN {index} ELSE failed END AS failed,"
+            f" CASE WHEN failed IS NULL AND ({check}) THEN {data} ELSE data END AS data,"
+            f" {held} AS held"
+            f" FROM {previous}"
+        )
+
+    def compile(self, index: int, operation: dict):
+        op = operation["op"]
+        try:
+            tokens = parse_pointer(operation["path"])
+            source = parse_pointer(operation["from"]) if op in ("move", "copy") else None
+        except ValueError as exc:
+            raise InvalidPatch(index, str(exc))
+        if not tokens and op != "test":
+            # The document stays an object; edit its members instead
+            raise InvalidPatch(index, "only 'test' may target the whole document")
+
+        if op == "test":
+            value = self._value(operation["value"])
+            target = f"data #> {self._path(tokens)}" if tokens else "data"
+            self._step(index, f"COALESCE({target} = {value}, false)", "data")
+        elif op == "add":
+            self._step(index, *self._add(tokens, self._value(operation["value"])))
+        elif op == "remove":
+            self._step(index, self._exists(tokens), f"data #- {self._path(tokens)}")
+        elif op == "replace":
+            path = self._path(tokens)
+            self._step(index, self._exists(tokens), f"jsonb_set(data, {path}, {self._value(operation['value'])}, false)")
+        elif op == "copy":
+            if not source:
+                raise InvalidPatch(index, "cannot copy the whole document")
+            value = f"(data #> {self._path(source)})"
+            check, data = self._add(tokens, value)
+            self._step(index, f"{value} IS NOT NULL AND ({check})", data)
+        elif op == "move":
+            if not source or tokens[:len(source)] == source and tokens != source:
+                raise InvalidPatch(index, "cannot move a value into itself")
+            if tokens == source:
+                self._step(index, self._exists(source), "data")
+                return
+            # Take the value out, holding it for the next step, then add it
+            source_path = self._path(source)
+            self._step(index, self._exists(source), f"data #- {source_path}", held=f"data #> {source_path}")
+            self._step(index, *self._add(tokens, "held"))
+
+    def statement(self, max_bytes: int) -> str:
+        # Materialized, or the planner inlines each step into the next and
+        # the document expression grows exponentially with the patch length
+        steps = ",\n".join(f"s{n + 1} AS MATERIALIZED ({step})" for n, step in enumerate(self.steps))
+        last = f"s{len(self.steps)}"
+        self.params["max_bytes"] = max_bytes
+        return f"""
+            WITH s0 AS (
+                SELECT id, owner_id, version, data,
+                       CAST(NULL AS jsonb) AS held, CAST(NULL AS integer) AS failed
+                FROM character_sheets WHERE id = :sheet_id
+                FOR UPDATE
+            ),
+            {steps},
+            updated AS (
+                UPDATE character_sheets
+                SET data = {last}.data, version = {last}.version + 1, updated_at = now()
+                FROM {last}
+                WHERE character_sheets.id = {last}.id
+                  AND {last}.owner_id = :owner_id
+                  AND (CAST(:expected_version AS integer) IS NULL OR {last}.version = :expected_version)
+                  AND {last}.failed IS NULL
+                  AND pg_column_size({last}.data) <= :max_bytes
+                RETURNING character_sheets.version, character_sheets.updated_at
+            )
+            SELECT {last}.owner_id, {last}.version AS current_version, {last}.failed,
+                   pg_column_size({last}.data) > :max_bytes AS too_large,
+                   updated.version, updated.updated_at
+            FROM {last} LEFT JOIN updated ON true
+        """
+
+
+def create_sheet(db: Session, owner_id: UUID, name: str, data: dict) -> CharacterSheetORM:
+    sheet = CharacterSheetORM(owner_id=owner_id, name=name, data=data)
+    db.add(sheet)
+    db.commit()
+    db.refresh(sheet)
+    return sheet
+
+def get_sheet(db: Session, sheet_id: UUID) -> CharacterSheetORM | None:
+    return db.get(CharacterSheetORM, sheet_id)
+
+def get_sheet_summary(db: Session, sheet_id: UUID) -> CharacterSheetORM | None:
+    """
+    A sheet without its document.
+    """
+    return (
+        db.query(CharacterSheetORM)
+        .options(defer(CharacterSheetORM.data))
+        .filter(CharacterSheetORM.id == sheet_id)
+        .first()
+    )
+
+def list_sheets(
+    db: Session,
+    owner_id: Optional[UUID] = None,
+    contains: Optional[dict] = None,
+    path: Optional[str] = None,
+    after: Optional[tuple] = None,
+    limit: int = 50,
+) -> list[CharacterSheetORM]:
+    """
+    One page of sheets, newest first, without their documents. `contains`
+    and `path` (a jsonpath that must match) are served by the GIN index.
+    """
+    query = db.query(CharacterSheetORM).options(defer(CharacterSheetORM.data))
+    if owner_id is not None:
+        query = query.filter(CharacterSheetORM.owner_id == owner_id)
+    if contains is not None:
+        query = query.filter(CharacterSheetORM.data.contains(contains))
+    if path is not None:
+        query = query.filter(CharacterSheetORM.data.op("@?")(cast(path, JSONPATH)))
+    if after is not None:
+        query = query.filter(tuple_(CharacterSheetORM.created_at, CharacterSheetORM.id) < tuple_(*after))
+    return query.order_by(CharacterSheetORM.created_at.desc(), CharacterSheetORM.id.desc()).limit(limit + 1).all()
+
+def patch_sheet(
+    db: Session,
+    sheet_id: UUID,
+    owner_id: UUID,
+    operations: list[dict],
+    expected_version: Optional[int],
+    max_bytes: int,
+) -> PatchResult:
+    """
+    Apply JSON Patch operations in one statement. Raises InvalidPatch for
+    operations that can never apply; everything that depends on the
+    document is reported in the result.
+    """
+    compiler = _PatchCompiler()
+    for index, operation in enumerate(operations):
+        compiler.compile(index, operation)
+    statement = compiler.statement(max_bytes)
+    row = db.execute(
+        text(statement),
+        {**compiler.params, "sheet_id": sheet_id, "owner_id": owner_id, "expected_version": expected_version},
+    ).first()
+    db.commit()
+    if row is None:
+        return PatchResult(PATCH_NOT_FOUND)
+    if row.owner_id != owner_id:
+        return PatchResult(PATCH_FORBIDDEN)
+    if expected_version is not None and row.current_version != expected_version:
+        return PatchResult(PATCH_VERSION_MISMATCH, version=row.current_version)
+    if row.failed is not None:
+        return PatchResult(PATCH_FAILED, version=row.current_version, failed_operation=row.failed)
+    if row.too_large:
+        return PatchResult(PATCH_TOO_LARGE, version=row.current_version)
+    return PatchResult(PATCH_APPLIED, version=row.version, updated_at=row.updated_at)
+
+def delete_sheet(db: Session, sheet: CharacterSheetORM):
+    db.delete(sheet)
+    db.commit()
@@ -0,0 +1,199 @@
+# app/database/crud_comments.py
+
+"""
+Threaded comments stored as materialized paths.
+
+A comment's `path` is its parent's path plus one fixed-width base36 segment
+from a sequence, so a thread's comments sort depth-first in posting order and
+any subtree is one range scan: `path > p AND path < p || '~'` ('~' sorts
+after every base36 digit in the "C" collation). Pages of top-level threads
+come with the first replies of each in a single LATERAL query.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.comment import PATH_SEGMENT_WIDTH, Comment as CommentORM, comment_path_seq
+from app.models.event import Event
+from app.models.game import Game
+
+
+COMMENT_SUBJECTS = {
+    "games": Game,
+    "events": Event,
+}
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_SUBTREE_END = "~"
+
+
+def encode_segment(value: int) -> str:
+    """
+    Fixed-width base36 path segment of a sequence value.
+    """
+    digits = []
+    while value:
+        value, remainder = divmod(value, 36)
+        digits.append(_DIGITS[remainder])
+    return "".join(reversed(digits)).rjust(PATH_SEGMENT_WIDTH, "0")
+
+
+def subject_exists(db: Session, subject_type: str, subject_id: UUID) -> bool:
+    model = COMMENT_SUBJECTS[subject_type]
+    return db.query(model.id).filter(model.id == subject_id).first() is not None
+
+def get_comment(db: Session, comment_id: UUID) -> CommentORM | None:
+    return db.get(CommentORM, comment_id)
+
+def create_comment(
+    db: Session,
+    author_id: UUID,
+    subject_type: str,
+    subject_id: UUID,
+    body: str,
+    parent: Optional[CommentORM] = None,
+) -> CommentORM | None:
+    """
+    Post a comment, or a reply to `parent`. Returns None if the parent was
+    deleted in the meantime.
+    """
+    segment = encode_segment(db.scalar(comment_path_seq.next_value()))
+    path, depth = segment, 0
+    if parent is not None:
+        # Counting the reply also locks the parent until the reply is in
+        counted = db.execute(
+            update(CommentORM)
+            .where(CommentORM.id == parent.id)
+            .values(reply_count=CommentORM.reply_count + 1)
+            .returning(CommentORM.id)
+        ).first()
+        if counted is None:
+            db.rollback()
+            return None
+        path, depth = parent.path + segment, parent.depth + 1
+    comment = CommentORM(
+        author_id=author_id,
+        subject_type=subject_type,
+        subject_id=subject_id,
+        parent_id=parent.id if parent is not None else None,
+        path=path,
+        depth=depth,
+        body=body,
+    )
+    db.add(comment)
+    db.commit()
+    db.refresh(comment)
+    return comment
+
+def update_comment(db: Session, comment: CommentORM, body: str) -> CommentORM:
+    comment.body = body
+    db.add(comment)
+    db.commit()
+    db.refresh(comment)
+    return comment
+
+def delete_comment(db: Session, comment: CommentORM) -> None:
+    """
+    Delete a comment. One with replies is only blanked, so that its
+    replies keep their place in the thread.
+    """
+    # Conditional on reply_count so a reply posted meanwhile is never lost
+    deleted = db.execute(
+        delete(CommentORM)
+        .where(CommentORM.id == comment.id, CommentORM.reply_count == 0)
+        .returning(CommentORM.id)
+    ).first()
+    if deleted is None:
+        db.execute(
+            update(CommentORM)
+            .where(CommentORM.id == comment.id)
+            .values(body="", is_deleted=True)
+        )
+    elif comment.parent_id is not None:
+        db.execute(
+            update(CommentORM)
+            .where(CommentORM.id == comment.parent_id)
+            .values(reply_count=CommentORM.reply_count - 1)
+        )
+    db.commit()
+
+def list_threads(
+    db: Session,
+    subject_type: str,
+    subject_id: UUID,
+    before: Optional[str] = None,
+    limit: int = 20,
+    replies: int = 3,
+) -> list[tuple[CommentORM, list[CommentORM], bool]]:
+    """
+    One page of a subject's top-level comments, newest first, starting
+    before the path `before`, each with its first `replies` replies in
+    thread order and whether it has more. Fetches `limit + 1` threads so
+    the caller can tell whether a next page exists.
+    """
+    params = {
+        "subject_type": subject_type,
+        "subject_id": subject_id,
+        "limit": limit + 1,
+        "replies": replies + 1,
+        "end": _SUBTREE_END,
+    }
+    keyset = ""
+    if before is not None:
+        keyset = "AND path < :before"
+        params["before"] = before
+    statement = text(f"""
+        WITH threads AS (
+            SELECT * FROM comments
+            WHERE subject_type = :subject_type AND subject_id = :subject_id
+              AND parent_id IS NULL {keyset}
+            ORDER BY path DESC
+            LIMIT :limit
+        )
+        SELECT * FROM threads
+        UNION ALL
+        SELECT reply.* FROM threads CROSS JOIN LATERAL (
+            SELECT * FROM comments
+            WHERE subject_type = :subject_type AND subject_id = :subject_id
+              AND path > threads.path AND path < threads.path || :end
+            ORDER BY path
+            LIMIT :replies
+        ) AS reply
+    """)
+    rows = db.scalars(select(CommentORM).from_statement(statement), params).all()
+
+    threads = sorted((c for c in rows if c.parent_id is None), key=lambda c: c.path, reverse=True)
+    replies_of: dict[str, list[CommentORM]] = {thread.path: [] for thread in threads}
+    for comment in sorted((c for c in rows if c.parent_id is not None), key=lambda c: c.path):
+        replies_of[comment.path[:PATH_SEGMENT_WIDTH]].append(comment)
+    return [
+        (thread, replies_of[thread.path][:replies], len(replies_of[thread.path]) > replies)
+        for thread in threads
+    ]
+
+def list_subtree(
+    db: Session,
+    comment: CommentORM,
+    after: Optional[str] = None,
+    limit: int = 50,
+) -> list[CommentORM]:
+    """
+    One page of a comment's replies at any depth, in thread order, starting
+    after the path `after`. Fetches `limit + 1` rows.
+    """
+    lower = after if after is not None and after > comment.path else comment.path
+    return (
+        db.query(CommentORM)
+        .filter(
+            CommentORM.subject_type == comment.subject_type,
+            CommentORM.subject_id == comment.subject_id,
+            CommentORM.path > lower,
+            CommentORM.path < comment.path + _SUBTREE_END,
+        )
+        .order_by(CommentORM.path)
+        .limit(limit + 1)
+        .all()
+    )
@@ -0,0 +1,202 @@
+# app/database/crud_events.py
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.crud_rsvps import promote_waitlist
+from app.models.event import Event as EventORM, EventDaySummary
+from app.models.rsvp import RSVP_CONFIRMED
+
+
+# Advisory lock namespace for calendar days, see refresh_day_summaries
+_DAY_LOCK_NAMESPACE = 3401
+
+_REFRESH_DAY_SUMMARIES = text("""
+WITH days AS (
+    SELECT d AS day,
+           d::timestamp AT TIME ZONE :tz AS day_start,
+           (d + 1)::timestamp AT TIME ZONE :tz AS day_end
+    FROM unnest(CAST(:days AS date[])) AS d
+),
+summaries AS (
+    SELECT days.day,
+           count(e.id) AS event_count,
+           coalesce(to_jsonb((
+               array_agg(
+                   jsonb_build_object('id', e.id, 'title', e.title, 'starts_at', e.starts_at)
+                   ORDER BY e.starts_at, e.id
+               ) FILTER (WHERE e.id IS NOT NULL)
+           )[1:CAST(:preview AS integer)]), '[]'::jsonb) AS first_events
+    FROM days
+    LEFT JOIN events AS e ON e.during && tstzrange(days.day_start, days.day_end, '[)')
+    GROUP BY days.day
+),
+emptied AS (
+    DELETE FROM event_day_summaries AS s
+    USING summaries
+    WHERE s.day = summaries.day AND summaries.event_count = 0
+)
+INSERT INTO event_day_summaries (day, event_count, first_events)
+SELECT day, event_count, first_events FROM summaries WHERE event_count > 0
+ON CONFLICT (day) DO UPDATE
+SET event_count = EXCLUDED.event_count, first_events = EXCLUDED.first_events
+""")
+
+
+def calendar_days(starts_at: datetime, ends_at: datetime) -> list[date]:
+    """
+    Calendar days, in the calendar's timezone, overlapped by [starts_at, ends_at).
+    """
+    tz = ZoneInfo(settings.EVENTS_CALENDAR_TIMEZONE)
+    first = starts_at.astimezone(tz).date()
+    last = (ends_at - timedelta(microseconds=1)).astimezone(tz).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def refresh_day_summaries(db: Session, days: Iterable[date]):
+    """
+    Recompute the calendar summaries of the given days from the events
+    table, within the caller's transaction.
+    """
+    days = sorted(set(days))
+    if not days:
+        return
+    # Writers touching the same day queue up here, in day order so they
+    # cannot deadlock. Under READ COMMITTED the recompute below then sees
+    # the events committed by whoever held the lock before.
+    db.execute(
+        text(
+            "SELECT pg_advisory_xact_lock(:namespace, d - DATE '2000-01-01') "
+            "FROM (SELECT d FROM unnest(CAST(:days AS date[])) AS d ORDER BY d) AS ordered"
+        ),
+        {"namespace": _DAY_LOCK_NAMESPACE, "days": days},
+    )
+    db.execute(
+        _REFRESH_DAY_SUMMARIES,
+        {
+            "days": days,
+            "tz": settings.EVENTS_CALENDAR_TIMEZONE,
+            "preview": settings.EVENTS_DAY_PREVIEW_SIZE,
+        },
+    )
+
+
+def get_event(db: Session, event_id: UUID) -> EventORM | None:
+    return db.get(EventORM, event_id)
+
+def create_event(db: Session, organizer_id: UUID, **fields) -> EventORM:
+    event = EventORM(organizer_id=organizer_id, **fields)
+    db.add(event)
+    db.flush()
+    refresh_day_summaries(db, calendar_days(event.starts_at, event.ends_at))
+    db.commit()
+    db.refresh(event)
+    return event
+
+def update_event(db: Session, event: EventORM, **fields) -> tuple[EventORM, list[UUID]]:
+    """
+    Update an event. Returns it with the users promoted from the waitlist
+    if its capacity grew.
+    """
+    promoted = []
+    days = calendar_days(event.starts_at, event.ends_at)
+    if "starts_at" in fields and fields["starts_at"] != event.starts_at:
+        # Remind attendees of the new time
+        fields["reminder_sent_at"] = None
+    for key, value in fields.items():
+        setattr(event, key, value)
+    db.add(event)
+    db.flush()
+    # Both the days the event left and the days it moved to
+    refresh_day_summaries(db, days + calendar_days(event.starts_at, event.ends_at))
+    if "capacity" in fields:
+        promoted = promote_waitlist(db, event.id)
+    db.commit()
+    db.refresh(event)
+    return event, promoted
+
+def delete_event(db: Session, event: EventORM) -> None:
+    days = calendar_days(event.starts_at, event.ends_at)
+    db.delete(event)
+    db.flush()
+    refresh_day_summaries(db, days)
+    db.commit()
+
+def list_events(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    after: Optional[tuple] = None,
+    limit: int = 20,
+    organizer_id: Optional[UUID] = None,
+    game_id: Optional[UUID] = None,
+) -> list[EventORM]:
+    """
+    One page of the events overlapping [start, end), by start time, starting
+    after the (starts_at, id) key `after`. Fetches `limit + 1` rows so the
+    caller can tell whether a next page exists.
+    """
+    query = db.query(EventORM).filter(
+        EventORM.during.overlaps(func.tstzrange(start, end, "[)"))
+    )
+    if organizer_id is not None:
+        query = query.filter(EventORM.organizer_id == organizer_id)
+    if game_id is not None:
+        query = query.filter(EventORM.game_id == game_id)
+    if after is not None:
+        query = query.filter(tuple_(EventORM.starts_at, EventORM.id) > tuple_(*after))
+    return query.order_by(EventORM.starts_at, EventORM.id).limit(limit + 1).all()
+
+def get_day_summaries(db: Session, first_day: date, last_day: date) -> list[EventDaySummary]:
+    return (
+        db.query(EventDaySummary)
+        .filter(EventDaySummary.day.between(first_day, last_day))
+        .order_by(EventDaySummary.day)
+        .all()
+    )
+
+_CLAIM_REMINDERS = text("""
+UPDATE events SET reminder_sent_at = now()
+WHERE id IN (
+    SELECT id FROM events
+    WHERE reminder_sent_at IS NULL AND starts_at > now() AND starts_at <= :until
+    ORDER BY starts_at
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, title, location, starts_at
+""")
+
+_REMINDER_RECIPIENTS = text(f"""
+SELECT r.event_id, u.email, u.username
+FROM rsvps AS r JOIN users AS u ON u.id = r.user_id
+WHERE r.event_id = ANY(:event_ids) AND r.status = '{RSVP_CONFIRMED}' AND u.is_active
+UNION
+SELECT e.id, u.email, u.username
+FROM events AS e JOIN users AS u ON u.id = e.organizer_id
+WHERE e.id = ANY(:event_ids) AND u.is_active
+""")
+
+
+def claim_reminders(db: Session, until: datetime, limit: int = 500) -> list:
+    """
+    Mark upcoming events starting by `until` as reminded and return them.
+    Concurrent callers skip each other's rows, so each event is claimed
+    once.
+    """
+    events = db.execute(_CLAIM_REMINDERS, {"until": until, "limit": limit}).all()
+    db.commit()
+    return events
+
+def reminder_recipients(db: Session, event_ids: list[UUID]) -> list:
+    """
+    (event id, email, username) of the confirmed attendees and organizers
+    of events.
+    """
+    return db.execute(_REMINDER_RECIPIENTS, {"event_ids": event_ids}).all()
@@ -0,0 +1,116 @@
+# app/database/crud_follows.py
+
+"""
+Users following other users and games.
+
+Every follow and unfollow adjusts the target's `follower_count` in the same
+transaction, so the activity feed can tell a popular author from a typical
+one with a primary key lookup instead of counting followers.
+"""
+
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.follow import Follow
+from app.models.game import Game
+from app.models.user import User
+
+
+FOLLOW_TARGETS = {
+    "users": User,
+    "games": Game,
+}
+
+
+def target_exists(db: Session, target_type: str, target_id: UUID) -> bool:
+    model = FOLLOW_TARGETS[target_type]
+    return db.query(model.id).filter(model.id == target_id).first() is not None
+
+def _count_follower(db: Session, target_type: str, target_id: UUID, delta: int):
+    model = FOLLOW_TARGETS[target_type]
+    db.execute(
+        update(model)
+        .where(model.id == target_id)
+        .values(follower_count=model.follower_count + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+def follow(db: Session, follower_id: UUID, target_type: str, target_id: UUID) -> bool:
+    """
+    Follow a user or game. Returns False if already following it.
+    """
+    added = db.execute(
+        insert(Follow)
+        .values(follower_id=follower_id, target_type=target_type, target_id=target_id)
+        .on_conflict_do_nothing()
+        .returning(Follow.follower_id)
+    ).first()
+    if added is not None:
+        _count_follower(db, target_type, target_id, 1)
+    db.commit()
+    return added is not None
+
+def unfollow(db: Session, follower_id: UUID, target_type: str, target_id: UUID) -> bool:
+    """
+    Stop following a user or game. Returns False if not following it.
+    """
+    removed = db.execute(
+        delete(Follow)
+        .where(
+            Follow.follower_id == follower_id,
+            Follow.target_type == target_type,
+            Follow.target_id == target_id,
+        )
+        .returning(Follow.follower_id)
+    ).first()
+    if removed is not None:
+        _count_follower(db, target_type, target_id, -1)
+    db.commit()
+    return removed is not None
+
+def follower_counts(db: Session, targets: Iterable[tuple[str, UUID]]) -> dict[tuple[str, UUID], int]:
+    """
+    Follower counts of users and games, by (target_type, target_id).
+    Unknown targets are left out.
+    """
+    by_type: dict[str, list[UUID]] = {}
+    for target_type, target_id in targets:
+        by_type.setdefault(target_type, []).append(target_id)
+    counts = {}
+    for target_type, target_ids in by_type.items():
+        model = FOLLOW_TARGETS[target_type]
+        rows = db.execute(select(model.id, model.follower_count).where(model.id.in_(target_ids)))
+        counts.update({(target_type, target_id): count for target_id, count in rows})
+    return counts
+
+def follower_ids(db: Session, targets: Iterable[tuple[str, UUID]]) -> set[UUID]:
+    """
+    Everyone following any of the given users and games.
+    """
+    targets = list(targets)
+    if not targets:
+        return set()
+    rows = db.execute(
+        select(Follow.follower_id)
+        .where(tuple_(Follow.target_type, Follow.target_id).in_(targets))
+        .distinct()
+    )
+    return set(rows.scalars())
+
+def followed_targets(db: Session, follower_id: UUID) -> list[tuple[str, UUID, int]]:
+    """
+    What a user follows, as (target_type, target_id, follower count).
+    """
+    followed = []
+    for target_type, model in FOLLOW_TARGETS.items():
+        rows = db.execute(
+            select(Follow.target_id, model.follower_count)
+            .join(model, model.id == Follow.target_id)
+            .where(Follow.follower_id == follower_id, Follow.target_type == target_type)
+        )
+        followed += [(target_type, target_id, count) for target_id, count in rows]
+    return followed
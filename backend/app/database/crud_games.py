@@ -0,0 +1,83 @@
+# app/database/crud_games.py
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.models.game import Game as GameORM
+from app.schemas.game import GameSort
+
+
+# Sort key columns and direction of each listing order. The trailing `id`
+# makes every key unique, which keyset pagination relies on.
+SORT_KEYS = {
+    GameSort.title: ((GameORM.title, GameORM.id), False),
+    GameSort.top_rated: ((GameORM.rating, GameORM.id), True),
+    GameSort.newest: ((GameORM.created_at, GameORM.id), True),
+}
+
+
+def get_game(db: Session, game_id: UUID) -> GameORM | None:
+    return db.get(GameORM, game_id)
+
+def create_game(db: Session, **fields) -> GameORM:
+    game = GameORM(**fields)
+    db.add(game)
+    db.commit()
+    db.refresh(game)
+    return game
+
+def update_game(db: Session, game: GameORM, **fields) -> GameORM:
+    for key, value in fields.items():
+        setattr(game, key, value)
+    db.add(game)
+    db.commit()
+    db.refresh(game)
+    return game
+
+def delete_game(db: Session, game: GameORM) -> None:
+    db.delete(game)
+    db.commit()
+
+def list_games(
+    db: Session,
+    sort: GameSort = GameSort.title,
+    after: Optional[tuple] = None,
+    limit: int = 20,
+    genre: Optional[str] = None,
+    players: Optional[int] = None,
+    min_rating: Optional[float] = None,
+) -> list[GameORM]:
+    """
+    One page of games in `sort` order, starting after the sort key `after`.
+    Fetches `limit + 1` rows so the caller can tell whether a next page exists.
+    """
+    columns, descending = SORT_KEYS[sort]
+    query = db.query(GameORM)
+    if genre is not None:
+        query = query.filter(GameORM.genre == genre)
+    if players is not None:
+        query = query.filter(GameORM.min_players <= players, GameORM.max_players >= players)
+    if min_rating is not None:
+        query = query.filter(GameORM.rating >= min_rating)
+    if after is not None:
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+    order = [column.desc() if descending else column.asc() for column in columns]
+    return query.order_by(*order).limit(limit + 1).all()
+
+def sort_key(game: GameORM, sort: GameSort) -> tuple:
+    """
+    The values of `game` for the columns of a listing order.
+    """
+    columns, _ = SORT_KEYS[sort]
+    return tuple(getattr(game, column.key) for column in columns)
+
+def sort_key_types(sort: GameSort) -> tuple[type, ...]:
+    """
+    The Python types of the columns of a listing order.
+    """
+    columns, _ = SORT_KEYS[sort]
+    return tuple(column.type.python_type for column in columns)
@@ -0,0 +1,180 @@
+# app/database/crud_homebrew.py
+
+"""
+Homebrew documents and their revision history.
+
+Each revision is stored either as a compressed snapshot of the whole text
+or as a compressed delta from the revision before it. A snapshot is taken
+at least every HOMEBREW_SNAPSHOT_INTERVAL revisions, and whenever a delta
+would not be much smaller than the snapshot, so any revision is rebuilt
+from one snapshot and fewer than HOMEBREW_SNAPSHOT_INTERVAL deltas, read
+in a single range scan of the primary key.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session, defer
+
+from app.core.config import settings
+from app.models.homebrew import HomebrewDocument as HomebrewDocumentORM, HomebrewRevision
+from app.services.revisions import compress, make_delta, rebuild
+
+
+def _add_revision(
+    db: Session,
+    document: HomebrewDocumentORM,
+    author_id: UUID,
+    content: bytes,
+    previous: Optional[bytes] = None,
+):
+    data = None
+    is_snapshot = (
+        previous is None
+        or document.revision - document.snapshot_revision >= settings.HOMEBREW_SNAPSHOT_INTERVAL
+    )
+    if not is_snapshot:
+        data = compress(make_delta(previous, content))
+        # Deltas of large rewrites can be as big as the text itself
+        if len(data) * 2 > len(content):
+            snapshot = compress(content)
+            is_snapshot = len(snapshot) <= len(data)
+            data = snapshot if is_snapshot else data
+    if is_snapshot:
+        data = data if data is not None else compress(content)
+        document.snapshot_revision = document.revision
+    db.add(HomebrewRevision(
+        document_id=document.id,
+        revision=document.revision,
+        is_snapshot=is_snapshot,
+        data=data,
+        size=len(content),
+        author_id=author_id,
+    ))
+
+def create_document(db: Session, owner_id: UUID, title: str, content: str) -> HomebrewDocumentORM:
+    document = HomebrewDocumentORM(owner_id=owner_id, title=title, content=content, revision=1, snapshot_revision=1)
+    db.add(document)
+    db.flush()
+    _add_revision(db, document, owner_id, content.encode())
+    db.commit()
+    db.refresh(document)
+    return document
+
+def get_document(db: Session, document_id: UUID) -> HomebrewDocumentORM | None:
+    return db.get(HomebrewDocumentORM, document_id)
+
+def list_documents(
+    db: Session,
+    owner_id: UUID,
+    after: Optional[tuple] = None,
+    limit: int = 50,
+) -> list[HomebrewDocumentORM]:
+    """
+    One page of a user's documents, newest first, without their text.
+    """
+    query = (
+        db.query(HomebrewDocumentORM)
+        .options(defer(HomebrewDocumentORM.content))
+        .filter(HomebrewDocumentORM.owner_id == owner_id)
+    )
+    if after is not None:
+        query = query.filter(tuple_(HomebrewDocumentORM.created_at, HomebrewDocumentORM.id) < tuple_(*after))
+    return query.order_by(HomebrewDocumentORM.created_at.desc(), HomebrewDocumentORM.id.desc()).limit(limit + 1).all()
+
+def update_document(
+    db: Session,
+    document_id: UUID,
+    author_id: UUID,
+    content: Optional[str] = None,
+    title: Optional[str] = None,
+    base_revision: Optional[int] = None,
+) -> Optional[HomebrewDocumentORM]:
+    """
+    Save new text as the next revision. Returns None if `base_revision`
+    is given and is no longer the current revision.
+    """
+    document = (
+        db.query(HomebrewDocumentORM)
+        .filter(HomebrewDocumentORM.id == document_id)
+        .with_for_update()
+        .populate_existing()
+        .one()
+    )
+    if base_revision is not None and document.revision != base_revision:
+        db.rollback()
+        return None
+    if title is not None:
+        document.title = title
+    if content is not None and content != document.content:
+        previous = document.content.encode()
+        document.content = content
+        document.revision += 1
+        _add_revision(db, document, author_id, content.encode(), previous)
+    db.commit()
+    db.refresh(document)
+    return document
+
+def delete_document(db: Session, document: HomebrewDocumentORM):
+    db.delete(document)
+    db.commit()
+
+def get_revision_text(db: Session, document_id: UUID, revision: int) -> Optional[str]:
+    """
+    Rebuild the text of a revision from the snapshot at or before it and
+    the deltas in between.
+    """
+    snapshot = (
+        select(func.max(HomebrewRevision.revision))
+        .where(
+            HomebrewRevision.document_id == document_id,
+            HomebrewRevision.revision <= revision,
+            HomebrewRevision.is_snapshot,
+        )
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(HomebrewRevision.data)
+        .where(
+            HomebrewRevision.document_id == document_id,
+            HomebrewRevision.revision.between(snapshot, revision),
+        )
+        .order_by(HomebrewRevision.revision)
+    ).scalars().all()
+    if not rows:
+        return None
+    return rebuild(rows[0], rows[1:]).decode()
+
+def get_revision(db: Session, document_id: UUID, revision: int) -> HomebrewRevision | None:
+    return (
+        db.query(HomebrewRevision)
+        .options(defer(HomebrewRevision.data))
+        .filter(HomebrewRevision.document_id == document_id, HomebrewRevision.revision == revision)
+        .first()
+    )
+
+def list_revisions(
+    db: Session,
+    document_id: UUID,
+    before: Optional[int] = None,
+    limit: int = 50,
+) -> list:
+    """
+    One page of a document's revisions, newest first, with the bytes each
+    takes in storage.
+    """
+    query = (
+        select(
+            HomebrewRevision.revision,
+            HomebrewRevision.is_snapshot,
+            HomebrewRevision.size,
+            func.octet_length(HomebrewRevision.data).label("stored_size"),
+            HomebrewRevision.author_id,
+            HomebrewRevision.created_at,
+        )
+        .where(HomebrewRevision.document_id == document_id)
+    )
+    if before is not None:
+        query = query.where(HomebrewRevision.revision < before)
+    return db.execute(query.order_by(HomebrewRevision.revision.desc()).limit(limit + 1)).all()
@@ -0,0 +1,154 @@
+# app/database/crud_moderation.py
+
+"""
+Moderation term lists and the flags raised on comments and user profiles.
+
+Flags are keyed by (content type, content id, field) and refreshed in
+place, so rescanning unchanged content leaves them, and their position in
+the review queue, as they were.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, exists, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.comment import Comment
+from app.models.moderation import ModerationFlag, ModerationTerm
+from app.models.user import User
+
+
+def all_terms(db: Session) -> list[tuple[str, str]]:
+    return [tuple(row) for row in db.execute(select(ModerationTerm.term, ModerationTerm.action))]
+
+def list_terms(
+    db: Session,
+    action: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = 100,
+) -> list[ModerationTerm]:
+    query = db.query(ModerationTerm)
+    if action is not None:
+        query = query.filter(ModerationTerm.action == action)
+    if after is not None:
+        query = query.filter(ModerationTerm.term > after)
+    return query.order_by(ModerationTerm.term).limit(limit + 1).all()
+
+def save_terms(db: Session, terms: list[str], action: str, created_by: UUID) -> list[ModerationTerm]:
+    """
+    Add normalized terms to a list, moving any already on the other list.
+    """
+    statement = pg_insert(ModerationTerm).values([
+        {"term": term, "action": action, "created_by": created_by}
+        for term in terms
+    ])
+    ids = db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ModerationTerm.term],
+            set_={"action": statement.excluded.action},
+        ).returning(ModerationTerm.id)
+    ).scalars().all()
+    db.commit()
+    return db.query(ModerationTerm).filter(ModerationTerm.id.in_(ids)).order_by(ModerationTerm.term).all()
+
+def get_term(db: Session, term_id: UUID) -> ModerationTerm | None:
+    return db.get(ModerationTerm, term_id)
+
+def delete_term(db: Session, term: ModerationTerm):
+    db.delete(term)
+    db.commit()
+
+def save_flags(db: Session, content_type: str, entries: list[tuple[UUID, str, Optional[str], list[str]]]):
+    """
+    Store the outcome of checking (content id, field, action, terms)
+    entries: fields that matched are flagged, or their flag updated if the
+    matched terms changed; fields without an action lose their flag.
+    """
+    cleared = [(content_id, field) for content_id, field, action, _ in entries if action is None]
+    if cleared:
+        db.execute(delete(ModerationFlag).where(
+            ModerationFlag.content_type == content_type,
+            tuple_(ModerationFlag.content_id, ModerationFlag.field).in_(cleared),
+        ))
+    flagged = [
+        {"content_type": content_type, "content_id": content_id, "field": field, "action": action, "terms": terms}
+        for content_id, field, action, terms in entries
+        if action is not None
+    ]
+    if flagged:
+        statement = pg_insert(ModerationFlag).values(flagged)
+        db.execute(statement.on_conflict_do_update(
+            constraint="uq_moderation_flags_content",
+            set_={"action": statement.excluded.action, "terms": statement.excluded.terms, "updated_at": func.now()},
+            where=or_(
+                ModerationFlag.action != statement.excluded.action,
+                ModerationFlag.terms != statement.excluded.terms,
+            ),
+        ))
+    db.commit()
+
+def clear_flags(db: Session, content_type: str, content_id: UUID):
+    db.execute(delete(ModerationFlag).where(
+        ModerationFlag.content_type == content_type,
+        ModerationFlag.content_id == content_id,
+    ))
+    db.commit()
+
+def purge_orphan_flags(db: Session) -> int:
+    """
+    Drop the flags of comments deleted or blanked since they were flagged,
+    and of users since removed.
+    """
+    live_comment = exists().where(Comment.id == ModerationFlag.content_id, Comment.is_deleted.is_(False))
+    live_user = exists().where(User.id == ModerationFlag.content_id)
+    result = db.execute(delete(ModerationFlag).where(or_(
+        (ModerationFlag.content_type == "comments") & ~live_comment,
+        (ModerationFlag.content_type == "users") & ~live_user,
+    )))
+    db.commit()
+    return result.rowcount
+
+def list_flags(
+    db: Session,
+    content_type: Optional[str] = None,
+    after: Optional[tuple] = None,
+    limit: int = 50,
+) -> list[ModerationFlag]:
+    """
+    One page of the review queue, most recently flagged first.
+    """
+    query = db.query(ModerationFlag)
+    if content_type is not None:
+        query = query.filter(ModerationFlag.content_type == content_type)
+    if after is not None:
+        query = query.filter(tuple_(ModerationFlag.updated_at, ModerationFlag.id) < tuple_(*after))
+    return query.order_by(ModerationFlag.updated_at.desc(), ModerationFlag.id.desc()).limit(limit + 1).all()
+
+def get_flag(db: Session, flag_id: UUID) -> ModerationFlag | None:
+    return db.get(ModerationFlag, flag_id)
+
+def delete_flag(db: Session, flag: ModerationFlag):
+    db.delete(flag)
+    db.commit()
+
+def comment_texts(db: Session, after: Optional[UUID], limit: int) -> list[tuple[UUID, dict[str, str]]]:
+    """
+    (id, {field: text}) of the next comments by id, for rescanning.
+    """
+    query = select(Comment.id, Comment.body).where(Comment.is_deleted.is_(False))
+    if after is not None:
+        query = query.where(Comment.id > after)
+    rows = db.execute(query.order_by(Comment.id).limit(limit))
+    return [(row.id, {"body": row.body}) for row in rows]
+
+def profile_texts(db: Session, after: Optional[UUID], limit: int) -> list[tuple[UUID, dict[str, str]]]:
+    """
+    (id, {field: text}) of the next users by id, for rescanning.
+    """
+    query = select(User.id, User.username, User.full_name)
+    if after is not None:
+        query = query.where(User.id > after)
+    rows = db.execute(query.order_by(User.id).limit(limit))
+    return [(row.id, {"username": row.username, "full_name": row.full_name or ""}) for row in rows]
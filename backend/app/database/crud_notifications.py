@@ -0,0 +1,108 @@
+# app/database/crud_notifications.py
+
+"""
+Notification inboxes.
+
+Notifications are inserted in bulk, one row per recipient, and read
+newest first with a `(created_at, id) < (:last_created_at, :last_id)`
+predicate on the (user_id, created_at, id) index. Marking a user's inbox
+read is a single UPDATE of their unread rows, found through a partial
+index that also serves unread counts.
+"""
+
+from datetime import datetime
+from typing import Any, Iterable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.notification import Notification as NotificationORM
+
+
+def add_notifications(db: Session, rows: list[dict[str, Any]]) -> list[UUID]:
+    """
+    Insert notifications, one dict of column values per row, and commit.
+    Returns the recipient of each row.
+    """
+    if not rows:
+        return []
+    rows = [{"id": uuid4(), **row} for row in rows]
+    recipients = list(db.execute(insert(NotificationORM).returning(NotificationORM.user_id), rows).scalars())
+    db.commit()
+    return recipients
+
+def get_notification(db: Session, notification_id: UUID) -> NotificationORM | None:
+    return db.get(NotificationORM, notification_id)
+
+def mark_read(db: Session, user_id: UUID, notification_id: UUID) -> Optional[bool]:
+    """
+    Mark one of a user's notifications read. Returns whether it was
+    unread, or None if the user has no such notification.
+    """
+    marked = db.execute(
+        update(NotificationORM)
+        .where(
+            NotificationORM.id == notification_id,
+            NotificationORM.user_id == user_id,
+            NotificationORM.read_at.is_(None),
+        )
+        .values(read_at=func.now())
+        .returning(NotificationORM.id)
+    ).first()
+    db.commit()
+    if marked is not None:
+        return True
+    exists = db.query(NotificationORM.id).filter(
+        NotificationORM.id == notification_id, NotificationORM.user_id == user_id
+    ).first()
+    return False if exists is not None else None
+
+def mark_all_read(db: Session, user_id: UUID, until: Optional[datetime] = None) -> int:
+    """
+    Mark every unread notification of a user read, or those created up to
+    `until` (what the user has seen). Returns how many were unread.
+    """
+    statement = (
+        update(NotificationORM)
+        .where(NotificationORM.user_id == user_id, NotificationORM.read_at.is_(None))
+        .values(read_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    if until is not None:
+        statement = statement.where(NotificationORM.created_at <= until)
+    marked = db.execute(statement).rowcount
+    db.commit()
+    return marked
+
+def count_unread(db: Session, user_ids: Iterable[UUID]) -> dict[UUID, int]:
+    """
+    Unread notifications of each of the given users, from the table.
+    """
+    user_ids = list(user_ids)
+    counts = dict.fromkeys(user_ids, 0)
+    rows = db.execute(
+        select(NotificationORM.user_id, func.count())
+        .where(NotificationORM.user_id.in_(user_ids), NotificationORM.read_at.is_(None))
+        .group_by(NotificationORM.user_id)
+    )
+    counts.update({user_id: count for user_id, count in rows})
+    return counts
+
+def list_notifications(
+    db: Session,
+    user_id: UUID,
+    before: Optional[tuple] = None,
+    limit: int = 20,
+    unread: bool = False,
+) -> list[NotificationORM]:
+    """
+    One page of a user's notifications, newest first. Fetches `limit + 1`
+    rows so the caller can tell whether a next page exists.
+    """
+    query = db.query(NotificationORM).filter(NotificationORM.user_id == user_id)
+    if unread:
+        query = query.filter(NotificationORM.read_at.is_(None))
+    if before is not None:
+        query = query.filter(tuple_(NotificationORM.created_at, NotificationORM.id) < tuple_(*before))
+    return query.order_by(NotificationORM.created_at.desc(), NotificationORM.id.desc()).limit(limit + 1).all()
@@ -0,0 +1,191 @@
+# app/database/crud_random_tables.py
+
+"""
+Stored random tables and the graph of tables rolling on each other.
+
+Every reference from an entry to another table is mirrored as an edge in
+`random_table_links`, so saving a table checks in one recursive query that
+the tables it rolls on do not (transitively) roll on it. Saves adding
+edges also check that no table then nests deeper than RANDOM_TABLES_MAX_DEPTH
+or rolls on more than RANDOM_TABLES_MAX_CLOSURE tables in all, so every
+closure loads whole. Saves that change edges are serialized on an advisory
+lock, so two concurrent saves cannot each add half of a cycle.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.random_table import RandomTable as RandomTableORM, RandomTableLink
+
+
+# pg_advisory_xact_lock key guarding the table reference graph
+GRAPH_LOCK_NAMESPACE = 3402
+
+
+class UnknownTableReference(ValueError):
+    """
+    An entry rolls on a table that does not exist.
+    """
+
+
+class TableCycle(ValueError):
+    """
+    The table would end up rolling on itself.
+    """
+
+
+class TableGraphTooLarge(ValueError):
+    """
+    A table would nest too deeply or roll on too many tables.
+    """
+
+
+def references(entries: list[dict]) -> set[UUID]:
+    return {UUID(str(entry["table_id"])) for entry in entries if entry.get("table_id")}
+
+
+def _creates_cycle(db: Session, table_id: UUID, targets: set[UUID]) -> bool:
+    if table_id in targets:
+        return True
+    return db.execute(
+        text("""
+            WITH RECURSIVE reachable(id) AS (
+                SELECT unnest(CAST(:targets AS uuid[]))
+                UNION
+                SELECT links.target_id FROM random_table_links AS links
+                JOIN reachable ON links.table_id = reachable.id
+            )
+            SELECT EXISTS (SELECT 1 FROM reachable WHERE id = :table_id)
+        """),
+        {"targets": list(targets), "table_id": table_id},
+    ).scalar_one()
+
+# Longest chain of tables through the table, and largest closure of the
+# tables rolling on it (itself included), in the graph as it now stands
+_GRAPH_SIZE = text("""
+    WITH RECURSIVE below(id, depth) AS (
+        SELECT CAST(:table_id AS uuid), 0
+        UNION
+        SELECT links.target_id, below.depth + 1 FROM random_table_links AS links
+        JOIN below ON links.table_id = below.id
+        WHERE below.depth <= :max_depth
+    ),
+    above(id, depth) AS (
+        SELECT CAST(:table_id AS uuid), 0
+        UNION
+        SELECT links.table_id, above.depth + 1 FROM random_table_links AS links
+        JOIN above ON links.target_id = above.id
+        WHERE above.depth <= :max_depth
+    ),
+    reach(root, id) AS (
+        SELECT DISTINCT id, id FROM above
+        UNION
+        SELECT reach.root, links.target_id FROM random_table_links AS links
+        JOIN reach ON links.table_id = reach.id
+    )
+    SELECT
+        (SELECT max(depth) FROM below) + (SELECT max(depth) FROM above) AS depth,
+        (SELECT max(tables) FROM (SELECT count(*) AS tables FROM reach GROUP BY root) AS sizes) AS tables
+""")
+
+
+def _too_large(db: Session, table_id: UUID) -> bool:
+    size = db.execute(
+        _GRAPH_SIZE, {"table_id": table_id, "max_depth": settings.RANDOM_TABLES_MAX_DEPTH}
+    ).one()
+    return size.depth > settings.RANDOM_TABLES_MAX_DEPTH or size.tables > settings.RANDOM_TABLES_MAX_CLOSURE
+
+def get_table(db: Session, table_id: UUID) -> RandomTableORM | None:
+    return db.get(RandomTableORM, table_id)
+
+def save_table(
+    db: Session,
+    table: Optional[RandomTableORM],
+    owner_id: UUID,
+    **fields,
+) -> RandomTableORM:
+    """
+    Create a table (`table` None) or update one, bumping its version.
+    Raises UnknownTableReference or TableCycle if its entries refer to
+    missing tables or lead back to it, and TableGraphTooLarge if tables
+    would then nest too deeply or roll on too many tables.
+    """
+    entries = fields.get("entries", table.entries if table is not None else [])
+    targets = references(entries)
+    previous = references(table.entries) if table is not None else set()
+    if targets or previous:
+        db.execute(text("SELECT pg_advisory_xact_lock(:namespace, 0)"), {"namespace": GRAPH_LOCK_NAMESPACE})
+    if targets:
+        found = db.scalar(select(func.count()).where(RandomTableORM.id.in_(targets)))
+        if found != len(targets):
+            db.rollback()
+            raise UnknownTableReference()
+        if table is not None and _creates_cycle(db, table.id, targets):
+            db.rollback()
+            raise TableCycle()
+
+    if table is None:
+        table = RandomTableORM(owner_id=owner_id, **fields)
+    else:
+        for key, value in fields.items():
+            setattr(table, key, value)
+        table.version = RandomTableORM.version + 1
+    db.add(table)
+    db.flush()
+    if targets != previous:
+        db.execute(delete(RandomTableLink).where(RandomTableLink.table_id == table.id))
+        if targets:
+            db.execute(insert(RandomTableLink), [{"table_id": table.id, "target_id": t} for t in targets])
+        # Only new edges make chains longer or closures larger
+        if targets - previous and _too_large(db, table.id):
+            db.rollback()
+            raise TableGraphTooLarge()
+    db.commit()
+    db.refresh(table)
+    return table
+
+def delete_table(db: Session, table: RandomTableORM) -> bool:
+    """
+    Delete a table. Returns False if other tables roll on it.
+    """
+    try:
+        db.delete(table)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+def table_closure(db: Session, table_id: UUID) -> list[tuple[UUID, int]]:
+    """
+    The (id, version) of a table and of every table it rolls on, directly
+    or not. Saves keep closures within RANDOM_TABLES_MAX_CLOSURE tables,
+    the LIMIT only guards against graphs saved before that.
+    """
+    rows = db.execute(
+        text("""
+            WITH RECURSIVE closure(id) AS (
+                SELECT CAST(:table_id AS uuid)
+                UNION
+                SELECT links.target_id FROM random_table_links AS links
+                JOIN closure ON links.table_id = closure.id
+            )
+            SELECT random_tables.id, random_tables.version
+            FROM closure JOIN random_tables ON random_tables.id = closure.id
+            LIMIT :limit
+        """),
+        {"table_id": table_id, "limit": settings.RANDOM_TABLES_MAX_CLOSURE},
+    ).all()
+    return [(row.id, row.version) for row in rows]
+
+def get_table_entries(db: Session, table_ids: list[UUID]) -> list[tuple[UUID, int, list[dict]]]:
+    rows = db.execute(
+        select(RandomTableORM.id, RandomTableORM.version, RandomTableORM.entries)
+        .where(RandomTableORM.id.in_(table_ids))
+    ).all()
+    return [(row.id, row.version, row.entries) for row in rows]
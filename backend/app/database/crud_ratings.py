@@ -0,0 +1,212 @@
+# app/database/crud_ratings.py
+
+"""
+User ratings of games with incrementally maintained aggregates.
+
+Every rating change adjusts the game's `game_rating_stats` row (sum, count
+and per-score histogram) by the difference between the old and new score,
+and mirrors the count and a Bayesian-weighted score onto `games.rating` and
+`games.rating_count`, all in the rating's own transaction. Changes to one
+game's ratings are serialized on its `games` row lock (FOR NO KEY UPDATE,
+which does not block the foreign key checks of concurrent inserts), taken
+first so that lock order matches a cascading game delete.
+
+The weighted score `(w * m + sum) / (w + count)` pulls games with few
+ratings towards the prior mean `m`, so "top rated" is an index scan on
+`games.rating` instead of an aggregate over all ratings. Unrated games
+score 0 and sort last.
+
+`reconcile_batch` recomputes the aggregates of a batch of games from the
+ratings themselves to repair any drift.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, delete, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.game import Game as GameORM
+from app.models.rating import MAX_SCORE, MIN_SCORE, GameRatingStats, Rating as RatingORM
+
+
+def _weighted_score(rating_sum: str, rating_count: str) -> str:
+    # Shared by the incremental and the reconciling updates so both
+    # produce exactly the same float for the same aggregate
+    return (
+        f"CASE WHEN {rating_count} = 0 THEN 0 "
+        f"ELSE (:prior_weight * :prior_mean + {rating_sum})::float8 / (:prior_weight + {rating_count}) END"
+    )
+
+
+def _prior() -> dict:
+    return {
+        "prior_weight": settings.RATINGS_PRIOR_WEIGHT,
+        "prior_mean": settings.RATINGS_PRIOR_MEAN,
+    }
+
+
+def _bucket(score: int) -> int:
+    return score - MIN_SCORE + 1
+
+
+def _apply_change(db: Session, game_id: UUID, added: Optional[int], removed: Optional[int]):
+    """
+    Adjust the game's aggregates for one rating going from `removed` to
+    `added` (either may be None) and mirror them onto the game.
+    """
+    if added == removed:
+        return
+    assignments = [
+        "rating_sum = rating_sum + :delta_sum",
+        "rating_count = rating_count + :delta_count",
+        "updated_at = now()",
+    ]
+    if added is not None:
+        assignments.append(f"histogram[{_bucket(added)}] = histogram[{_bucket(added)}] + 1")
+    if removed is not None:
+        assignments.append(f"histogram[{_bucket(removed)}] = histogram[{_bucket(removed)}] - 1")
+    db.execute(
+        text(f"""
+            WITH stats AS (
+                UPDATE game_rating_stats SET {", ".join(assignments)}
+                WHERE game_id = :game_id
+                RETURNING rating_sum, rating_count
+            )
+            UPDATE games SET
+                rating = {_weighted_score("stats.rating_sum", "stats.rating_count")},
+                rating_count = stats.rating_count
+            FROM stats
+            WHERE games.id = :game_id
+        """),
+        {
+            "game_id": game_id,
+            "delta_sum": (added or 0) - (removed or 0),
+            "delta_count": (added is not None) - (removed is not None),
+            **_prior(),
+        },
+    )
+
+
+def _lock_game(db: Session, game_id: UUID) -> bool:
+    locked = db.execute(
+        select(GameORM.id).where(GameORM.id == game_id).with_for_update(key_share=True)
+    ).first()
+    return locked is not None
+
+
+def get_rating(db: Session, game_id: UUID, user_id: UUID) -> RatingORM | None:
+    return db.get(RatingORM, (game_id, user_id))
+
+def get_rating_stats(db: Session, game_id: UUID) -> GameRatingStats | None:
+    return db.get(GameRatingStats, game_id)
+
+def set_rating(db: Session, game_id: UUID, user_id: UUID, score: int) -> RatingORM | None:
+    """
+    Create or change a user's rating of a game. Returns None if the game
+    does not exist.
+    """
+    if not _lock_game(db, game_id):
+        db.rollback()
+        return None
+    db.execute(insert(GameRatingStats).values(game_id=game_id).on_conflict_do_nothing())
+    previous = db.scalar(
+        select(RatingORM.score).where(RatingORM.game_id == game_id, RatingORM.user_id == user_id)
+    )
+    statement = (
+        insert(RatingORM)
+        .values(game_id=game_id, user_id=user_id, score=score)
+        .on_conflict_do_update(
+            index_elements=[RatingORM.game_id, RatingORM.user_id],
+            set_={"score": score, "updated_at": text("now()")},
+        )
+        .returning(RatingORM)
+    )
+    rating = db.scalars(select(RatingORM).from_statement(statement)).one()
+    _apply_change(db, game_id, added=score, removed=previous)
+    db.commit()
+    db.refresh(rating)
+    return rating
+
+def delete_rating(db: Session, game_id: UUID, user_id: UUID) -> bool:
+    """
+    Remove a user's rating of a game. Returns False if there was none.
+    """
+    if not _lock_game(db, game_id):
+        db.rollback()
+        return False
+    removed = db.scalar(
+        delete(RatingORM)
+        .where(RatingORM.game_id == game_id, RatingORM.user_id == user_id)
+        .returning(RatingORM.score)
+    )
+    if removed is None:
+        db.rollback()
+        return False
+    _apply_change(db, game_id, added=None, removed=removed)
+    db.commit()
+    return True
+
+def reconcile_batch(db: Session, after: Optional[UUID] = None, batch_size: int = 500) -> tuple[Optional[UUID], int]:
+    """
+    Recompute the aggregates of the next `batch_size` games after `after`
+    (by id) from their ratings, fixing those that drifted. Returns the last
+    game id of the batch, None once past the last game, and the number of
+    games repaired.
+    """
+    histogram = ", ".join(
+        f"count(*) FILTER (WHERE ratings.score = {score})" for score in range(MIN_SCORE, MAX_SCORE + 1)
+    )
+    keyset = "WHERE id > :after" if after is not None else ""
+    # Lock the batch on its own first: the aggregate below must see the
+    # ratings committed by writers this lock waited for, which a statement
+    # started before the wait would not
+    game_ids = list(db.scalars(
+        text(f"SELECT id FROM games {keyset} ORDER BY id LIMIT :batch_size FOR NO KEY UPDATE"),
+        {"after": after, "batch_size": batch_size},
+    ))
+    if not game_ids:
+        db.commit()
+        return None, 0
+    repaired = db.scalar(
+        text(f"""
+            WITH actual AS (
+                SELECT batch.id AS game_id,
+                       coalesce(sum(ratings.score), 0) AS rating_sum,
+                       count(ratings.score)::int AS rating_count,
+                       ARRAY[{histogram}]::int[] AS histogram
+                FROM unnest(:game_ids) AS batch(id) LEFT JOIN ratings ON ratings.game_id = batch.id
+                GROUP BY batch.id
+            ),
+            stats AS (
+                INSERT INTO game_rating_stats (game_id, rating_sum, rating_count, histogram)
+                SELECT * FROM actual
+                WHERE rating_count > 0
+                   OR EXISTS (SELECT 1 FROM game_rating_stats s WHERE s.game_id = actual.game_id)
+                ON CONFLICT (game_id) DO UPDATE SET
+                    rating_sum = EXCLUDED.rating_sum,
+                    rating_count = EXCLUDED.rating_count,
+                    histogram = EXCLUDED.histogram,
+                    updated_at = now()
+                WHERE (game_rating_stats.rating_sum, game_rating_stats.rating_count, game_rating_stats.histogram)
+                      IS DISTINCT FROM (EXCLUDED.rating_sum, EXCLUDED.rating_count, EXCLUDED.histogram)
+                RETURNING game_id
+            ),
+            scored AS (
+                UPDATE games SET
+                    rating = {_weighted_score("actual.rating_sum", "actual.rating_count")},
+                    rating_count = actual.rating_count
+                FROM actual
+                WHERE games.id = actual.game_id
+                  AND (games.rating, games.rating_count) IS DISTINCT FROM
+                      ({_weighted_score("actual.rating_sum", "actual.rating_count")}, actual.rating_count)
+                RETURNING games.id
+            )
+            SELECT count(*) FROM (SELECT game_id FROM stats UNION SELECT id FROM scored) AS fixed
+        """).bindparams(bindparam("game_ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+        {"game_ids": game_ids, **_prior()},
+    )
+    db.commit()
+    return game_ids[-1], repaired
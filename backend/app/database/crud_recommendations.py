@@ -0,0 +1,171 @@
+# app/database/crud_recommendations.py
+
+"""
+Interaction data and precomputed "similar games" lists.
+
+A user's interaction with a game is the weighted sum of their rating of it
+(scaled to at most 1) and their RSVPs to events for it. Users come back
+densely numbered, ready to be used as matrix columns.
+"""
+
+from typing import Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.game import Game
+from app.models.rating import MAX_SCORE
+from app.models.recommendation import GameSimilarity
+
+
+_INTERACTIONS = f"""
+SELECT user_id, game_id, score::float8 / {MAX_SCORE} * :rating_weight AS weight FROM ratings
+UNION ALL
+SELECT rsvps.user_id, events.game_id, :rsvp_weight FROM rsvps JOIN events ON events.id = rsvps.event_id
+WHERE events.game_id IS NOT NULL
+"""
+
+# Users who interacted with any of :game_ids, and everything they interacted with
+_INTERACTION_MATRIX = text(f"""
+WITH interactions AS ({_INTERACTIONS}),
+users AS (
+    SELECT DISTINCT user_id FROM interactions
+    WHERE :all_users OR game_id = ANY(:game_ids)
+)
+SELECT dense_rank() OVER (ORDER BY user_id) - 1 AS user_index, game_id, sum(weight) AS weight
+FROM interactions JOIN users USING (user_id)
+GROUP BY user_id, game_id
+""").bindparams(bindparam("game_ids", type_=ARRAY(PG_UUID(as_uuid=True))))
+
+_ITEM_NORMS = f"""
+WITH interactions AS ({_INTERACTIONS}),
+totals AS (
+    SELECT game_id, sum(weight) AS weight FROM interactions GROUP BY user_id, game_id
+)
+SELECT game_id, sqrt(sum(weight * weight)) FROM totals GROUP BY game_id
+"""
+
+# Games whose similarities a set of changed (user, game) pairs can move:
+# every game of those users, whose dot products with the changed games
+# moved, and every game sharing a user with a changed game, whose norm moved
+_CHANGED_GAMES = text(f"""
+WITH changed AS (
+    SELECT * FROM unnest(:user_ids, :game_ids) AS changed(user_id, game_id)
+),
+interactions AS (
+    SELECT user_id, game_id FROM ({_INTERACTIONS}) AS interactions
+),
+users AS (
+    SELECT user_id FROM changed
+    UNION
+    SELECT user_id FROM interactions WHERE game_id IN (SELECT game_id FROM changed)
+)
+SELECT game_id FROM changed
+UNION
+SELECT game_id FROM interactions WHERE user_id IN (SELECT user_id FROM users)
+""").bindparams(
+    bindparam("user_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("game_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+)
+
+def _weights() -> dict:
+    return {
+        "rating_weight": settings.SIMILAR_GAMES_RATING_WEIGHT,
+        "rsvp_weight": settings.SIMILAR_GAMES_RSVP_WEIGHT,
+    }
+
+
+def all_game_ids(db: Session) -> list[UUID]:
+    """
+    Every game, in a stable order used as matrix rows.
+    """
+    return list(db.scalars(select(Game.id).order_by(Game.id)))
+
+def interaction_batches(
+    db: Session,
+    game_ids: Optional[list[UUID]] = None,
+    batch_size: int = 100_000,
+) -> Iterator[list[tuple[int, UUID, float]]]:
+    """
+    (user index, game id, weight) interactions, in batches, of every user
+    or only of the users who interacted with `game_ids`.
+    """
+    params = {**_weights(), "all_users": game_ids is None, "game_ids": game_ids or []}
+    result = db.execute(
+        _INTERACTION_MATRIX.execution_options(stream_results=True, yield_per=batch_size), params
+    )
+    for batch in result.partitions():
+        yield [tuple(row) for row in batch]
+
+def item_norms(db: Session) -> dict[UUID, float]:
+    """
+    Euclidean norm of every game's interaction vector.
+    """
+    return {game_id: norm for game_id, norm in db.execute(text(_ITEM_NORMS), _weights())}
+
+def changed_games(db: Session, changes: list[tuple[UUID, UUID]]) -> list[UUID]:
+    """
+    Games of the given changed (user id, game id) interactions, the other
+    games of those users, and every game sharing a user with a changed
+    game: all whose similarities to a changed game may have moved.
+    """
+    if not changes:
+        return []
+    user_ids, game_ids = (list(column) for column in zip(*changes))
+    params = {**_weights(), "user_ids": user_ids, "game_ids": game_ids}
+    return list(db.scalars(_CHANGED_GAMES, params))
+
+def event_interactions(db: Session, event_id: UUID) -> list[tuple[UUID, UUID]]:
+    """
+    (user id, game id) interactions of an event's RSVPs.
+    """
+    return [tuple(row) for row in db.execute(
+        text(
+            "SELECT rsvps.user_id, events.game_id FROM rsvps JOIN events ON events.id = rsvps.event_id "
+            "WHERE events.id = :event_id AND events.game_id IS NOT NULL"
+        ),
+        {"event_id": event_id},
+    )]
+
+def games_listing(db: Session, game_ids: list[UUID]) -> list[UUID]:
+    """
+    Games whose similar games include any of the given ones.
+    """
+    if not game_ids:
+        return []
+    return list(db.scalars(
+        select(GameSimilarity.game_id).where(GameSimilarity.similar_ids.overlap(game_ids))
+    ))
+
+def save_similarities(db: Session, rows: list[tuple[UUID, list[UUID], list[float]]]):
+    """
+    Store (game id, similar game ids, scores) rows, replacing earlier ones.
+    """
+    if not rows:
+        return
+    statement = insert(GameSimilarity).values([
+        {"game_id": game_id, "similar_ids": similar_ids, "scores": scores}
+        for game_id, similar_ids, scores in rows
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[GameSimilarity.game_id],
+        set_={
+            "similar_ids": statement.excluded.similar_ids,
+            "scores": statement.excluded.scores,
+            "computed_at": func.now(),
+        },
+    ))
+    db.commit()
+
+def get_similarities(db: Session, game_id: UUID) -> GameSimilarity | None:
+    return db.get(GameSimilarity, game_id)
+
+def get_games(db: Session, game_ids: list[UUID]) -> list[Game]:
+    """
+    The given games in the given order, leaving out deleted ones.
+    """
+    games = {game.id: game for game in db.query(Game).filter(Game.id.in_(game_ids))}
+    return [games[game_id] for game_id in game_ids if game_id in games]
@@ -0,0 +1,149 @@
+# app/database/crud_rsvps.py
+
+"""
+RSVPs with atomic capacity enforcement.
+
+Taking a seat is a conditional UPDATE of the event's `rsvp_count` (only
+while it is below capacity) feeding the INSERT of the RSVP, which is
+confirmed if the UPDATE matched and waitlisted otherwise. The event row is
+locked by a statement of its own first: an UPDATE skips a row whose snapshot
+fails its condition without waiting, so without the lock an RSVP could be
+waitlisted on the count of a cancellation still in progress, after that
+cancellation promoted the waitlist without it. The lock is held to the
+commit only, so a burst of RSVPs on one event queues on a single short row
+lock instead of racing on a read-then-write. The unique (event_id, user_id)
+constraint rejects duplicates and rolls the seat back with them.
+
+Freed seats go to the waitlist in arrival order before the counter is
+released, so a newcomer can never jump the queue.
+"""
+
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.rsvp import RSVP_CONFIRMED, RSVP_WAITLISTED, Rsvp as RsvpORM
+
+
+_TAKE_SEAT = text(f"""
+WITH seat AS (
+    UPDATE events SET rsvp_count = rsvp_count + 1
+    WHERE id = :event_id AND (capacity IS NULL OR rsvp_count < capacity)
+    RETURNING id
+)
+INSERT INTO rsvps (id, event_id, user_id, status)
+SELECT :id, :event_id, :user_id,
+       CASE WHEN EXISTS (SELECT 1 FROM seat) THEN '{RSVP_CONFIRMED}' ELSE '{RSVP_WAITLISTED}' END
+RETURNING *
+""")
+
+_PROMOTE_WAITLIST = text(f"""
+WITH event AS (
+    SELECT id, capacity - rsvp_count AS free_seats FROM events WHERE id = :event_id FOR UPDATE
+),
+promoted AS (
+    UPDATE rsvps SET status = '{RSVP_CONFIRMED}', promoted_at = clock_timestamp()
+    WHERE id IN (
+        SELECT id FROM rsvps
+        WHERE event_id = :event_id AND status = '{RSVP_WAITLISTED}'
+        ORDER BY created_at, id
+        -- NULL (unlimited capacity) means no limit
+        LIMIT (SELECT greatest(free_seats, 0) FROM event)
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING user_id
+),
+counted AS (
+    UPDATE events SET rsvp_count = rsvp_count + (SELECT count(*) FROM promoted)
+    WHERE id = :event_id
+)
+SELECT user_id FROM promoted
+""")
+
+
+_CANCEL_RSVP = text("""
+DELETE FROM rsvps WHERE event_id = :event_id AND user_id = :user_id
+RETURNING status
+""")
+
+
+def _lock_event(db: Session, event_id: UUID):
+    # Statements after this one see every seat change committed before it
+    db.execute(
+        select(Event.id).where(Event.id == event_id).with_for_update(key_share=True)
+    )
+
+def get_rsvp(db: Session, event_id: UUID, user_id: UUID) -> RsvpORM | None:
+    return db.query(RsvpORM).filter(RsvpORM.event_id == event_id, RsvpORM.user_id == user_id).first()
+
+def create_rsvp(db: Session, event_id: UUID, user_id: UUID) -> RsvpORM | None:
+    """
+    RSVP a user to an event, confirmed while seats are left and waitlisted
+    after. Returns None if the user already has an RSVP for the event.
+    """
+    params = {"id": uuid4(), "event_id": event_id, "user_id": user_id}
+    try:
+        _lock_event(db, event_id)
+        rsvp = db.scalars(select(RsvpORM).from_statement(_TAKE_SEAT), params).one()
+        # Keep the returned row as is instead of reloading it after commit
+        db.expunge(rsvp)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
+    return rsvp
+
+def promote_waitlist(db: Session, event_id: UUID) -> list[UUID]:
+    """
+    Confirm waitlisted RSVPs, oldest first, into the event's free seats,
+    within the caller's transaction. Returns the promoted users.
+    """
+    return list(db.execute(_PROMOTE_WAITLIST, {"event_id": event_id}).scalars())
+
+def cancel_rsvp(db: Session, event_id: UUID, user_id: UUID) -> Optional[list[UUID]]:
+    """
+    Cancel a user's RSVP, handing a confirmed seat to the waitlist. Returns
+    the users promoted as a result, or None if there was no RSVP to cancel.
+    """
+    # Lock the event first, so the status deleted is the one counted: a
+    # concurrent cancellation may have promoted this RSVP in the meantime
+    _lock_event(db, event_id)
+    status = db.execute(_CANCEL_RSVP, {"event_id": event_id, "user_id": user_id}).scalar()
+    if status is None:
+        db.rollback()
+        return None
+    promoted = []
+    if status == RSVP_CONFIRMED:
+        db.execute(
+            text("UPDATE events SET rsvp_count = rsvp_count - 1 WHERE id = :event_id"),
+            {"event_id": event_id},
+        )
+        promoted = promote_waitlist(db, event_id)
+    db.commit()
+    return promoted
+
+def get_seat_counts(db: Session, event_id: UUID) -> Optional[tuple[int, Optional[int]]]:
+    """
+    (confirmed RSVPs, capacity) of an event.
+    """
+    row = db.execute(select(Event.rsvp_count, Event.capacity).where(Event.id == event_id)).first()
+    return tuple(row) if row is not None else None
+
+def list_rsvps(
+    db: Session,
+    event_id: UUID,
+    status: str,
+    after: Optional[tuple] = None,
+    limit: int = 50,
+) -> list[RsvpORM]:
+    """
+    One page of an event's RSVPs with the given status, in arrival order.
+    """
+    query = db.query(RsvpORM).filter(RsvpORM.event_id == event_id, RsvpORM.status == status)
+    if after is not None:
+        query = query.filter(tuple_(RsvpORM.created_at, RsvpORM.id) > tuple_(*after))
+    return query.order_by(RsvpORM.created_at, RsvpORM.id).limit(limit + 1).all()
@@ -0,0 +1,152 @@
+# app/database/crud_similarity.py
+
+"""
+Storage of MinHash signatures and LSH buckets of homebrew documents.
+
+Looking up a document's candidates is one probe of the (band, bucket)
+primary key per band, whatever the size of the corpus.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.homebrew import HomebrewDocument
+from app.models.similarity import HomebrewBucket, HomebrewSignature
+
+
+def save_signatures(db: Session, entries: list[tuple[UUID, int, bytes, list[int]]]):
+    """
+    Store (document id, revision, signature, band keys) entries, replacing
+    any earlier signature of the same documents.
+    """
+    if not entries:
+        return
+    document_ids = [entry[0] for entry in entries]
+    statement = pg_insert(HomebrewSignature).values([
+        {"document_id": document_id, "revision": revision, "signature": signature}
+        for document_id, revision, signature, _ in entries
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[HomebrewSignature.document_id],
+        set_={"revision": statement.excluded.revision, "signature": statement.excluded.signature, "updated_at": func.now()},
+    ))
+    db.execute(delete(HomebrewBucket).where(HomebrewBucket.document_id.in_(document_ids)))
+    db.execute(insert(HomebrewBucket), [
+        {"band": band, "bucket": key, "document_id": document_id}
+        for document_id, _, _, keys in entries
+        for band, key in enumerate(keys)
+    ])
+    db.commit()
+
+def remove_signature(db: Session, document_id: UUID):
+    db.execute(delete(HomebrewBucket).where(HomebrewBucket.document_id == document_id))
+    db.execute(delete(HomebrewSignature).where(HomebrewSignature.document_id == document_id))
+    db.commit()
+
+def get_signature(db: Session, document_id: UUID) -> Optional[bytes]:
+    return db.scalar(select(HomebrewSignature.signature).where(HomebrewSignature.document_id == document_id))
+
+def get_band_keys(db: Session, document_id: UUID) -> list[tuple[int, int]]:
+    return [
+        tuple(row)
+        for row in db.execute(
+            select(HomebrewBucket.band, HomebrewBucket.bucket).where(HomebrewBucket.document_id == document_id)
+        )
+    ]
+
+def find_candidates(db: Session, document_id: UUID, keys: list[tuple[int, int]], limit: int) -> list[tuple[UUID, bytes]]:
+    """
+    Documents sharing at least one bucket with the given band keys, with
+    their signatures.
+    """
+    if not keys:
+        return []
+    matches = (
+        select(HomebrewBucket.document_id)
+        .where(tuple_(HomebrewBucket.band, HomebrewBucket.bucket).in_(keys))
+        .where(HomebrewBucket.document_id != document_id)
+        .distinct()
+        .limit(limit)
+        .subquery()
+    )
+    return [
+        tuple(row)
+        for row in db.execute(
+            select(HomebrewSignature.document_id, HomebrewSignature.signature)
+            .join(matches, matches.c.document_id == HomebrewSignature.document_id)
+        )
+    ]
+
+def colliding_buckets(db: Session, max_bucket_size: int) -> list[list[UUID]]:
+    """
+    Groups of documents sharing a bucket. Buckets holding more than
+    `max_bucket_size` documents (shared boilerplate) are left out.
+    """
+    rows = db.execute(
+        select(func.array_agg(HomebrewBucket.document_id))
+        .group_by(HomebrewBucket.band, HomebrewBucket.bucket)
+        .having(func.count() > 1)
+        .having(func.count() <= max_bucket_size)
+    ).scalars().all()
+    return [list(group) for group in rows]
+
+def get_signatures(db: Session, document_ids: list[UUID]) -> dict[UUID, bytes]:
+    rows = db.execute(
+        select(HomebrewSignature.document_id, HomebrewSignature.signature)
+        .where(HomebrewSignature.document_id.in_(document_ids))
+    )
+    return {row.document_id: row.signature for row in rows}
+
+def get_document_summaries(db: Session, document_ids: list[UUID]) -> dict[UUID, tuple]:
+    rows = db.execute(
+        select(HomebrewDocument.id, HomebrewDocument.title, HomebrewDocument.owner_id)
+        .where(HomebrewDocument.id.in_(document_ids))
+    )
+    return {row.id: row for row in rows}
+
+def chunk_boundaries(db: Session, chunk_size: int) -> list[UUID]:
+    """
+    Every `chunk_size`-th document id, splitting the documents into chunks.
+    """
+    numbered = select(
+        HomebrewDocument.id,
+        func.row_number().over(order_by=HomebrewDocument.id).label("position"),
+    ).subquery()
+    return list(db.execute(
+        select(numbered.c.id)
+        .where((numbered.c.position - 1) % chunk_size == 0)
+        .order_by(numbered.c.id)
+    ).scalars())
+
+def documents_to_index(
+    db: Session,
+    start: Optional[UUID],
+    end: Optional[UUID],
+    stale_only: bool = True,
+    after: Optional[UUID] = None,
+    limit: int = 200,
+) -> list[tuple[UUID, int, str]]:
+    """
+    (id, revision, content) of documents with ids in [start, end), by id,
+    skipping those whose signature is up to date if `stale_only`.
+    """
+    query = (
+        select(HomebrewDocument.id, HomebrewDocument.revision, HomebrewDocument.content)
+        .outerjoin(HomebrewSignature, HomebrewSignature.document_id == HomebrewDocument.id)
+    )
+    if start is not None:
+        query = query.where(HomebrewDocument.id >= start)
+    if end is not None:
+        query = query.where(HomebrewDocument.id < end)
+    if after is not None:
+        query = query.where(HomebrewDocument.id > after)
+    if stale_only:
+        query = query.where(or_(
+            HomebrewSignature.revision.is_(None),
+            HomebrewSignature.revision != HomebrewDocument.revision,
+        ))
+    return [tuple(row) for row in db.execute(query.order_by(HomebrewDocument.id).limit(limit))]
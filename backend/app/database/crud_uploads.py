@@ -0,0 +1,117 @@
+# app/database/crud_uploads.py
+
+"""
+Uploads, their deduplicated blobs and per-user storage quotas.
+
+The quota is charged with one conditional upsert that only succeeds while
+the new total stays within the quota, so concurrent uploads by one user can
+never overshoot it. A blob's `ref_count` row lock is held from the moment an
+upload claims it (or the last upload releases it) to the commit, and the
+file is moved into place or unlinked under that lock, so an upload and a
+delete of the same content cannot lose the file between them.
+"""
+
+import os
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.storage import BlobWriter, blob_path, remove_blob
+from app.models.upload import StorageUsage, Upload as UploadORM
+
+
+_CHARGE_QUOTA = text("""
+INSERT INTO storage_usage (user_id, used_bytes) VALUES (:user_id, :size)
+ON CONFLICT (user_id) DO UPDATE SET used_bytes = storage_usage.used_bytes + EXCLUDED.used_bytes
+WHERE storage_usage.used_bytes + EXCLUDED.used_bytes <= :quota
+RETURNING used_bytes
+""")
+
+_CLAIM_BLOB = text("""
+INSERT INTO blobs (sha256, size, ref_count) VALUES (:sha256, :size, 1)
+ON CONFLICT (sha256) DO UPDATE SET ref_count = blobs.ref_count + 1
+RETURNING ref_count
+""")
+
+_RELEASE_BLOB = text("""
+UPDATE blobs SET ref_count = ref_count - 1 WHERE sha256 = :sha256 RETURNING ref_count
+""")
+
+
+def get_upload(db: Session, upload_id: UUID) -> UploadORM | None:
+    return db.get(UploadORM, upload_id)
+
+def get_used_bytes(db: Session, user_id: UUID) -> int:
+    return db.scalar(select(StorageUsage.used_bytes).where(StorageUsage.user_id == user_id)) or 0
+
+def create_upload(
+    db: Session,
+    owner_id: UUID,
+    writer: BlobWriter,
+    filename: str,
+    content_type: str,
+    quota: int,
+) -> UploadORM | None:
+    """
+    Record a finished upload and move its file into the blob store, or drop
+    the file if the content is already stored. Returns None, leaving the
+    file for the caller to discard, if the upload would exceed the quota.
+    """
+    if writer.size > quota:
+        return None
+    charged = db.execute(_CHARGE_QUOTA, {"user_id": owner_id, "size": writer.size, "quota": quota}).first()
+    if charged is None:
+        db.rollback()
+        return None
+    ref_count = db.execute(_CLAIM_BLOB, {"sha256": writer.sha256, "size": writer.size}).scalar_one()
+    upload = UploadORM(
+        owner_id=owner_id,
+        sha256=writer.sha256,
+        filename=filename,
+        content_type=content_type,
+        size=writer.size,
+    )
+    db.add(upload)
+    db.flush()
+    # Also repairs a blob whose file went missing
+    if ref_count == 1 or not os.path.exists(blob_path(writer.sha256)):
+        writer.store()
+    else:
+        writer.discard()
+    db.commit()
+    db.refresh(upload)
+    return upload
+
+def delete_upload(db: Session, upload: UploadORM) -> bool:
+    """
+    Delete an upload, refund its size and remove the blob if nothing else
+    uses it. Returns whether the blob was removed.
+    """
+    db.delete(upload)
+    db.execute(
+        text("UPDATE storage_usage SET used_bytes = used_bytes - :size WHERE user_id = :user_id"),
+        {"size": upload.size, "user_id": upload.owner_id},
+    )
+    db.flush()
+    ref_count = db.execute(_RELEASE_BLOB, {"sha256": upload.sha256}).scalar_one()
+    if ref_count == 0:
+        db.execute(text("DELETE FROM blobs WHERE sha256 = :sha256"), {"sha256": upload.sha256})
+        remove_blob(upload.sha256)
+    db.commit()
+    return ref_count == 0
+
+def list_uploads(
+    db: Session,
+    owner_id: UUID,
+    after: Optional[tuple] = None,
+    limit: int = 50,
+) -> list[UploadORM]:
+    """
+    One page of a user's uploads, newest first.
+    """
+    query = db.query(UploadORM).filter(UploadORM.owner_id == owner_id)
+    if after is not None:
+        query = query.filter(tuple_(UploadORM.created_at, UploadORM.id) < tuple_(*after))
+    return query.order_by(UploadORM.created_at.desc(), UploadORM.id.desc()).limit(limit + 1).all()
@@ -0,0 +1,43 @@
+# app/database/fulltext.py
+
+"""
+Trigger-maintained full-text search columns.
+
+Searchable tables keep a stored `tsvector` column, indexed with GIN, that a
+BEFORE INSERT/UPDATE trigger recomputes from weighted text columns. The
+trigger and its function are created together with the table.
+"""
+
+from sqlalchemy import DDL, Table, event
+
+
+SEARCH_CONFIG = "english"
+
+
+def install_search_trigger(table: Table, vector_column: str, weighted_columns: dict[str, str]):
+    """
+    Maintain `vector_column` of `table` from `weighted_columns`, a mapping of
+    column name to tsvector weight ('A' is the most relevant, 'D' the least).
+    """
+    name = table.name
+    vector = " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.{column}::text, '')), '{weight}')"
+        for column, weight in weighted_columns.items()
+    )
+    columns = ", ".join(weighted_columns)
+    event.listen(table, "after_create", DDL(
+        f"CREATE OR REPLACE FUNCTION {name}_search_vector_update() RETURNS trigger AS $$\n"
+        f"BEGIN\n"
+        f"    NEW.{vector_column} := {vector};\n"
+        f"    RETURN NEW;\n"
+        f"END\n"
+        f"$$ LANGUAGE plpgsql"
+    ))
+    event.listen(table, "after_create", DDL(
+        f"CREATE TRIGGER {name}_search_vector_trigger "
+        f"BEFORE INSERT OR UPDATE OF {columns} ON {name} "
+        f"FOR EACH ROW EXECUTE FUNCTION {name}_search_vector_update()"
+    ))
+    event.listen(table, "after_drop", DDL(
+        f"DROP FUNCTION IF EXISTS {name}_search_vector_update()"
+    ))
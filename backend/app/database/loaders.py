@@ -0,0 +1,136 @@
+# app/database/loaders.py
+
+"""
+Request-scoped batching loaders, in the style of DataLoader.
+
+Lookups requested during one event-loop tick are collected and resolved with
+a single query, duplicate keys are coalesced, and results are cached for the
+rest of the request. Queries run in the thread pool, one batch at a time as
+the session is not thread-safe, so the event loop keeps serving other
+requests meanwhile. Use them from async routes through `get_user_loader`:
+
+    users = await asyncio.gather(*(loader.load(c.author_id) for c in comments))
+"""
+
+import asyncio
+from typing import Iterable, Optional
+from uuid import UUID
+
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.database.crud import get_users_by_ids, get_users_by_usernames
+from app.database.database import get_db
+from app.models.user import User as UserORM
+
+
+class UserLoader:
+    """
+    Batch and cache user lookups by id or username for one request.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self._by_id: dict[UUID, asyncio.Future] = {}
+        self._by_username: dict[str, asyncio.Future] = {}
+        self._pending_ids: set[UUID] = set()
+        self._pending_usernames: set[str] = set()
+        self._dispatch_scheduled = False
+        self._query_lock = asyncio.Lock()
+        # Running batches, referenced so they are not garbage collected
+        self._batches: set[asyncio.Task] = set()
+
+    def load(self, user_id: UUID | str) -> asyncio.Future:
+        """
+        Load a user by id. Resolves to None if the user does not exist.
+        """
+        user_id = user_id if isinstance(user_id, UUID) else UUID(str(user_id))
+        future = self._by_id.get(user_id)
+        if future is None:
+            future = self._by_id[user_id] = self._new_future()
+            self._pending_ids.add(user_id)
+            self._schedule_dispatch()
+        return future
+
+    def load_by_username(self, username: str) -> asyncio.Future:
+        """
+        Load a user by username. Resolves to None if the user does not exist.
+        """
+        future = self._by_username.get(username)
+        if future is None:
+            future = self._by_username[username] = self._new_future()
+            self._pending_usernames.add(username)
+            self._schedule_dispatch()
+        return future
+
+    async def load_many(
+        self,
+        ids: Iterable[UUID | str] = (),
+        usernames: Iterable[str] = ()
+    ) -> list[Optional[UserORM]]:
+        """
+        Load several users at once, in the order requested.
+        """
+        futures = [self.load(user_id) for user_id in ids]
+        futures += [self.load_by_username(username) for username in usernames]
+        return list(await asyncio.gather(*futures))
+
+    def prime(self, user: UserORM):
+        """
+        Seed the cache with an already loaded user.
+        """
+        for cache, key in ((self._by_id, user.id), (self._by_username, user.username)):
+            future = cache.get(key)
+            if future is None:
+                cache[key] = future = self._new_future()
+            if not future.done():
+                future.set_result(user)
+
+    def _new_future(self) -> asyncio.Future:
+        return asyncio.get_running_loop().create_future()
+
+    def _schedule_dispatch(self):
+        # Wait until the current tick has queued all of its lookups
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            asyncio.get_running_loop().call_soon(self._dispatch)
+
+    def _dispatch(self):
+        self._dispatch_scheduled = False
+        ids, self._pending_ids = self._pending_ids, set()
+        usernames, self._pending_usernames = self._pending_usernames, set()
+        batch = asyncio.get_running_loop().create_task(self._resolve(ids, usernames))
+        self._batches.add(batch)
+        batch.add_done_callback(self._batches.discard)
+
+    def _query(self, ids: set[UUID], usernames: set[str]) -> list[UserORM]:
+        users = get_users_by_ids(self.db, ids) if ids else []
+        # Skip usernames already resolved by the id query
+        usernames = usernames - {user.username for user in users}
+        return users + (get_users_by_usernames(self.db, usernames) if usernames else [])
+
+    async def _resolve(self, ids: set[UUID], usernames: set[str]):
+        try:
+            async with self._query_lock:
+                users = await run_in_threadpool(self._query, ids, usernames)
+        except Exception as exc:
+            for future in self._pending_futures(ids, usernames):
+                future.set_exception(exc)
+            return
+        for user in users:
+            self.prime(user)
+        # Whatever is still unresolved does not exist
+        for future in self._pending_futures(ids, usernames):
+            future.set_result(None)
+
+    def _pending_futures(self, ids: set[UUID], usernames: set[str]):
+        futures = [self._by_id[user_id] for user_id in ids]
+        futures += [self._by_username[username] for username in usernames]
+        return [future for future in futures if not future.done()]
+
+
+def get_user_loader(db: Session = Depends(get_db)) -> UserLoader:
+    """
+    Dependency providing a fresh loader per request.
+    """
+    return UserLoader(db)
@@ -13,9 +13,9 @@ Standard response schema is defined for consistency.
 
 from fastapi import HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 
 from app.core.messages import INTERNAL_SERVER_ERROR
+from app.core.serialization import EnvelopeResponse
 
 
 
@@ -30,37 +30,16 @@ class EmailVerificationError(Exception):
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
     Custom exception handler for validation errors.
+    The error dicts are passed through as-is: the envelope encoder turns any
+    non-JSON values (such as exceptions in `ctx`) into strings while encoding.
     """
-    cleaned_errors = []
-
-    # Iterate through the errors and clean them
-    errors = exc.errors()
-    for error in errors:
-        msg = error.get("msg")
-        if not isinstance(msg, str):
-            msg = str(msg)
-        error_copy = error.copy()
-        error_copy["msg"] = msg
-
-        # Process context if present
-        if "ctx" in error_copy:
-            ctx = error_copy["ctx"]
-            if isinstance(ctx, dict):
-                new_ctx = {
-                    k: (
-                        str(v) if not isinstance(v, (str, int, float, bool, type(None))) else v
-                        ) for k, v in ctx.items()
-                }
-                error_copy["ctx"] = new_ctx
-                
-        cleaned_errors.append(error_copy)
-    return JSONResponse(
+    return EnvelopeResponse(
         status_code=422,
         content={
             "success": False,
             "error_code": "VALIDATION_ERROR",
             "message": "Input validation failed.",
-            "detail": cleaned_errors,
+            "detail": exc.errors(),
         },
     )
 
@@ -69,13 +48,14 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     """
     Custom exception handler for HTTP exceptions.
     """
-    return JSONResponse(
+    return EnvelopeResponse(
         status_code=exc.status_code,
         content={
             "success": False,
             "error_code": "HTTP_ERROR",
             "message": exc.detail,
-        }
+        },
+        headers=exc.headers,
     )
 
 
@@ -83,7 +63,7 @@ async def email_verification_exception_handler(request: Request, exc: EmailVerif
     """
     Custom exception handler for email verification errors.
     """
-    return JSONResponse(
+    return EnvelopeResponse(
         status_code=400,
         content={
             "success": False,
@@ -99,7 +79,7 @@ async def generic_exception_handler(request: Request, exc: Exception):
     """
     import traceback
     traceback.print_exc()
-    return JSONResponse(
+    return EnvelopeResponse(
         status_code=500,
         content={
             "success": False,
@@ -0,0 +1,60 @@
+# app/models/audit.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Column, DateTime, Index, String
+from app.database.database import Base
+
+
+class AuthAuditEvent(Base):
+    """
+    Append-only authentication audit trail.
+    Range-partitioned by month on `occurred_at`; partitions are created and
+    dropped by app.core.audit, so old months can be discarded cheaply.
+    """
+    __tablename__ = "auth_audit_events"
+    __table_args__ = (
+        Index("ix_auth_audit_events_user_id_occurred_at", "user_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    # Part of the primary key because Postgres requires the partition key
+    # in every unique constraint of a partitioned table
+    occurred_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+    )
+    event_type = Column(
+        String(32),
+        nullable=False,
+    )
+    success = Column(
+        Boolean,
+        nullable=False,
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        nullable=True,
+    )
+    username = Column(
+        String(50),
+        nullable=True,
+    )
+    session_id = Column(
+        String(36),
+        nullable=True,
+    )
+    ip_address = Column(
+        String(45),
+        nullable=True,
+    )
+    user_agent = Column(
+        String(255),
+        nullable=True,
+    )
@@ -0,0 +1,59 @@
+# app/models/character_sheet.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func, text
+from app.database.database import Base
+
+
+class CharacterSheet(Base):
+    __tablename__ = "character_sheets"
+    __table_args__ = (
+        Index("ix_character_sheets_owner_id", "owner_id", "created_at"),
+        # Containment queries (data @> '{"class": "wizard"}') and jsonpath
+        # matches; jsonb_path_ops indexes value paths only, which keeps the
+        # index a fraction of the size of the default operator class
+        Index(
+            "ix_character_sheets_data",
+            "data",
+            postgresql_using="gin",
+            postgresql_ops={"data": "jsonb_path_ops"},
+        ),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    owner_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    name = Column(
+        String(200),
+        nullable=False,
+    )
+    data = Column(
+        JSONB,
+        nullable=False,
+        server_default=text("'{}'::jsonb"),
+    )
+    # Bumped by every write; clients send it back in If-Match
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
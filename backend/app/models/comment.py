@@ -0,0 +1,106 @@
+# app/models/comment.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Sequence,
+    String,
+    Text,
+    func,
+    text
+)
+from app.database.database import Base
+
+
+# Every comment adds one fixed-width segment to its parent's path, the
+# base36 value of this sequence. Paths therefore sort like a depth-first
+# walk of each thread, replies in the order they were posted.
+comment_path_seq = Sequence("comment_path_seq", metadata=Base.metadata)
+
+PATH_SEGMENT_WIDTH = 8
+
+
+class Comment(Base):
+    __tablename__ = "comments"
+    __table_args__ = (
+        CheckConstraint("subject_type IN ('games', 'events')", name="ck_comments_subject_type"),
+        CheckConstraint(f"length(path) = {PATH_SEGMENT_WIDTH} * (depth + 1)", name="ck_comments_path_depth"),
+        # Subtrees are path range scans; the "C" collation makes the index
+        # order byte order, which range and prefix predicates rely on
+        Index("ix_comments_subject_path", "subject_type", "subject_id", "path"),
+        # Top-level threads of a subject, newest first
+        Index(
+            "ix_comments_subject_threads",
+            "subject_type", "subject_id", "path",
+            postgresql_where=text("parent_id IS NULL"),
+        ),
+        Index("ix_comments_author_id", "author_id"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    # What is being discussed, e.g. ("games", game id)
+    subject_type = Column(
+        String(20),
+        nullable=False,
+    )
+    subject_id = Column(
+        UUID(as_uuid=True),
+        nullable=False,
+    )
+    parent_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("comments.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    author_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    path = Column(
+        String(255, collation="C"),
+        nullable=False,
+    )
+    depth = Column(
+        Integer,
+        nullable=False,
+    )
+    body = Column(
+        Text,
+        nullable=False,
+    )
+    # Direct replies, maintained with the replies themselves
+    reply_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # Deleted comments with replies keep their place in the thread
+    is_deleted = Column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default="false",
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
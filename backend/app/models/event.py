@@ -0,0 +1,141 @@
+# app/models/event.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import JSONB, TSTZRANGE, TSVECTOR, UUID
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Computed,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    text
+)
+from sqlalchemy.orm import deferred
+from app.database.database import Base
+from app.database.fulltext import install_search_trigger
+
+
+class Event(Base):
+    __tablename__ = "events"
+    # `during` mirrors [starts_at, ends_at) as a range so that overlap
+    # queries ("events this week") are GiST index scans
+    __table_args__ = (
+        CheckConstraint("ends_at > starts_at", name="ck_events_time_range"),
+        CheckConstraint("capacity IS NULL OR capacity >= 1", name="ck_events_capacity_positive"),
+        # Last line of defence against overbooking, see app.database.crud_rsvps
+        CheckConstraint("capacity IS NULL OR rsvp_count <= capacity", name="ck_events_not_overbooked"),
+        Index("ix_events_during", "during", postgresql_using="gist"),
+        Index("ix_events_starts_at_id", "starts_at", "id"),
+        Index("ix_events_organizer_id", "organizer_id"),
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        # Upcoming events still owing their reminders
+        Index("ix_events_reminder_due", "starts_at", postgresql_where=text("reminder_sent_at IS NULL")),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    title = Column(
+        String(200),
+        nullable=False,
+    )
+    description = Column(
+        Text,
+        nullable=True,
+    )
+    location = Column(
+        String(200),
+        nullable=True,
+    )
+    organizer_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    game_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("games.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    starts_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    ends_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    # Seats, None for unlimited
+    capacity = Column(
+        Integer,
+        nullable=True,
+    )
+    # Confirmed RSVPs, maintained with the RSVP rows
+    rsvp_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    during = Column(
+        TSTZRANGE,
+        Computed("tstzrange(starts_at, ends_at, '[)')", persisted=True),
+    )
+    # When reminder emails were queued; reset when the event is moved
+    reminder_sent_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
+    # Maintained by a trigger; deferred so listings never load it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        nullable=True,
+    ))
+
+
+class EventDaySummary(Base):
+    """
+    Per-day calendar cell: how many events overlap the day and the first few
+    of them. Maintained by app.database.crud_events in the same transaction
+    as the event writes.
+    """
+    __tablename__ = "event_day_summaries"
+
+    day = Column(
+        Date,
+        primary_key=True,
+    )
+    event_count = Column(
+        Integer,
+        nullable=False,
+    )
+    # [{"id", "title", "starts_at"}, ...] ordered by start time
+    first_events = Column(
+        JSONB,
+        nullable=False,
+    )
+
+
+install_search_trigger(
+    Event.__table__,
+    "search_vector",
+    {"title": "A", "description": "B", "location": "C"},
+)
@@ -0,0 +1,44 @@
+# app/models/follow.py
+
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, PrimaryKeyConstraint, String, func
+from app.database.database import Base
+
+
+FOLLOW_TARGET_TYPES = ("users", "games")
+
+
+class Follow(Base):
+    """
+    A user following another user or a game, for their activity feed.
+    """
+    __tablename__ = "follows"
+    __table_args__ = (
+        PrimaryKeyConstraint("follower_id", "target_type", "target_id", name="pk_follows"),
+        CheckConstraint(
+            "target_type IN (" + ", ".join(f"'{target}'" for target in FOLLOW_TARGET_TYPES) + ")",
+            name="ck_follows_target_type",
+        ),
+        # Followers of a user or game, for fan-out
+        Index("ix_follows_target", "target_type", "target_id"),
+    )
+
+    follower_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # What is followed, e.g. ("games", game id)
+    target_type = Column(
+        String(20),
+        nullable=False,
+    )
+    target_id = Column(
+        UUID(as_uuid=True),
+        nullable=False,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
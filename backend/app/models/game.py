@@ -0,0 +1,110 @@
+# app/models/game.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy import CheckConstraint, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import deferred, relationship
+from app.database.database import Base
+from app.database.fulltext import install_search_trigger
+from app.models.upload import Upload
+
+
+class Game(Base):
+    __tablename__ = "games"
+    # Every list ordering is backed by an index ending in `id`, so keyset
+    # pages are index range scans. Genre-filtered listings get their own
+    # composite indexes with the genre first.
+    __table_args__ = (
+        CheckConstraint("min_players >= 1", name="ck_games_min_players_positive"),
+        CheckConstraint("max_players >= min_players", name="ck_games_player_range"),
+        Index("ix_games_title_id", "title", "id"),
+        Index("ix_games_rating_id", "rating", "id"),
+        Index("ix_games_created_at_id", "created_at", "id"),
+        Index("ix_games_genre_title_id", "genre", "title", "id"),
+        Index("ix_games_genre_rating_id", "genre", "rating", "id"),
+        Index("ix_games_genre_created_at_id", "genre", "created_at", "id"),
+        Index("ix_games_players", "min_players", "max_players"),
+        Index("ix_games_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    title = Column(
+        String(200),
+        nullable=False,
+    )
+    description = Column(
+        Text,
+        nullable=True,
+    )
+    genre = Column(
+        String(50),
+        nullable=False,
+    )
+    min_players = Column(
+        Integer,
+        nullable=False,
+        default=1,
+    )
+    max_players = Column(
+        Integer,
+        nullable=False,
+        default=1,
+    )
+    rating = Column(
+        Float,
+        nullable=False,
+        default=0.0,
+        server_default="0",
+    )
+    rating_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # Maintained with the follows themselves; decides how activity reaches them
+    follower_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    image_url = Column(
+        String(500),
+        nullable=True,
+    )
+    # Uploaded cover image, served in resized variants
+    image_upload_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("uploads.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
+    # Maintained by a trigger; deferred so listings never load it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        nullable=True,
+    ))
+
+    # Loaded for a whole page at once with a single IN query
+    image_upload = relationship(Upload, lazy="selectin")
+
+
+install_search_trigger(
+    Game.__table__,
+    "search_vector",
+    {"title": "A", "description": "B", "genre": "C"},
+)
@@ -0,0 +1,99 @@
+# app/models/homebrew.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, func
+from app.database.database import Base
+
+
+class HomebrewDocument(Base):
+    """
+    A homebrew rules document. The current text is kept in full; earlier
+    revisions are rebuilt from `homebrew_revisions`.
+    """
+    __tablename__ = "homebrew_documents"
+    __table_args__ = (
+        Index("ix_homebrew_documents_owner_id", "owner_id", "created_at"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    owner_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    title = Column(
+        String(200),
+        nullable=False,
+    )
+    content = Column(
+        Text,
+        nullable=False,
+    )
+    # Number of the current revision; revisions are numbered from 1
+    revision = Column(
+        Integer,
+        nullable=False,
+        default=1,
+    )
+    # Latest revision stored as a full snapshot
+    snapshot_revision = Column(
+        Integer,
+        nullable=False,
+        default=1,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
+
+
+class HomebrewRevision(Base):
+    """
+    One revision of a document: a compressed snapshot of its text, or a
+    compressed delta from the previous revision.
+    """
+    __tablename__ = "homebrew_revisions"
+
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("homebrew_documents.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    revision = Column(
+        Integer,
+        primary_key=True,
+    )
+    is_snapshot = Column(
+        Boolean,
+        nullable=False,
+    )
+    data = Column(
+        LargeBinary,
+        nullable=False,
+    )
+    # Size of the revision's text in bytes, before any compression
+    size = Column(
+        Integer,
+        nullable=False,
+    )
+    author_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -0,0 +1,89 @@
+# app/models/moderation.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, String, UniqueConstraint, func
+from app.database.database import Base
+
+
+class ModerationTerm(Base):
+    """
+    A word or phrase that blocks content ("block") or marks it for review
+    ("flag"). Terms are stored normalized, as they are matched.
+    """
+    __tablename__ = "moderation_terms"
+    __table_args__ = (
+        CheckConstraint("action IN ('block', 'flag')", name="ck_moderation_terms_action"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    term = Column(
+        String(200),
+        nullable=False,
+        unique=True,
+    )
+    action = Column(
+        String(10),
+        nullable=False,
+    )
+    created_by = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class ModerationFlag(Base):
+    """
+    Content matching moderation terms, awaiting review: one row per field
+    of a comment or user profile.
+    """
+    __tablename__ = "moderation_flags"
+    __table_args__ = (
+        CheckConstraint("content_type IN ('comments', 'users')", name="ck_moderation_flags_content_type"),
+        UniqueConstraint("content_type", "content_id", "field", name="uq_moderation_flags_content"),
+        # Review queue, most recently flagged first
+        Index("ix_moderation_flags_updated", "updated_at", "id"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    content_type = Column(
+        String(20),
+        nullable=False,
+    )
+    content_id = Column(
+        UUID(as_uuid=True),
+        nullable=False,
+    )
+    field = Column(
+        String(30),
+        nullable=False,
+    )
+    # "block" if any matched term blocks, otherwise "flag"; blocked terms
+    # only reach flags through a rescan of content written before them
+    action = Column(
+        String(10),
+        nullable=False,
+    )
+    terms = Column(
+        ARRAY(String),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -0,0 +1,79 @@
+# app/models/notification.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, String, func, text
+from app.database.database import Base
+
+
+NOTIFICATION_COMMENT_REPLY = "comment.reply"
+NOTIFICATION_RSVP_CONFIRMED = "rsvp.confirmed"
+NOTIFICATION_RSVP_PROMOTED = "rsvp.promoted"
+
+NOTIFICATION_KINDS = (NOTIFICATION_COMMENT_REPLY, NOTIFICATION_RSVP_CONFIRMED, NOTIFICATION_RSVP_PROMOTED)
+
+
+class Notification(Base):
+    """
+    An entry in a user's inbox. Rows are only ever inserted, marked read
+    and deleted with their user.
+    """
+    __tablename__ = "notifications"
+    __table_args__ = (
+        CheckConstraint(
+            "kind IN (" + ", ".join(f"'{kind}'" for kind in NOTIFICATION_KINDS) + ")",
+            name="ck_notifications_kind",
+        ),
+        # The inbox, newest first
+        Index("ix_notifications_user_created_at_id", "user_id", "created_at", "id"),
+        # Unread counts and mark-all-read only touch unread rows
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            postgresql_where=text("read_at IS NULL"),
+        ),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    kind = Column(
+        String(40),
+        nullable=False,
+    )
+    # Who caused it, if anyone else
+    actor_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    # What it is about, e.g. ("events", event id)
+    subject_type = Column(
+        String(20),
+        nullable=False,
+    )
+    subject_id = Column(
+        UUID(as_uuid=True),
+        nullable=False,
+    )
+    data = Column(
+        JSONB,
+        nullable=False,
+        server_default=text("'{}'::jsonb"),
+    )
+    read_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.clock_timestamp(),
+        nullable=False,
+    )
@@ -0,0 +1,78 @@
+# app/models/random_table.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, func
+from app.database.database import Base
+
+
+class RandomTable(Base):
+    __tablename__ = "random_tables"
+    __table_args__ = (
+        Index("ix_random_tables_owner_id", "owner_id"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    owner_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    name = Column(
+        String(200),
+        nullable=False,
+    )
+    description = Column(
+        Text,
+        nullable=True,
+    )
+    # [{"weight": 3, "text": "Goblins", "table_id": null}, ...]; an entry
+    # with a table_id rolls on that table, its text a template around "{}"
+    entries = Column(
+        JSONB,
+        nullable=False,
+    )
+    # Bumped on every change; compiled tables are cached per version
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
+
+
+class RandomTableLink(Base):
+    """
+    Edge from a table to a table its entries roll on, for cycle checks.
+    """
+    __tablename__ = "random_table_links"
+    __table_args__ = (
+        # Reverse lookups: which tables roll on this one
+        Index("ix_random_table_links_target_id", "target_id"),
+    )
+
+    table_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("random_tables.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # A table rolled on by others cannot be deleted
+    target_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("random_tables.id", ondelete="RESTRICT"),
+        primary_key=True,
+    )
@@ -0,0 +1,88 @@
+# app/models/rating.py
+
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy import BigInteger, CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, SmallInteger, func, text
+from app.database.database import Base
+
+
+MIN_SCORE = 1
+MAX_SCORE = 5
+
+
+class Rating(Base):
+    __tablename__ = "ratings"
+    __table_args__ = (
+        CheckConstraint(f"score BETWEEN {MIN_SCORE} AND {MAX_SCORE}", name="ck_ratings_score_range"),
+        Index("ix_ratings_user_id", "user_id"),
+    )
+
+    # One rating per user and game
+    game_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("games.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    score = Column(
+        SmallInteger,
+        nullable=False,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
+
+
+class GameRatingStats(Base):
+    """
+    Running aggregate of a game's ratings, adjusted with every rating
+    change so detail pages read one row instead of scanning the ratings.
+    """
+    __tablename__ = "game_rating_stats"
+    __table_args__ = (
+        CheckConstraint("rating_count >= 0", name="ck_game_rating_stats_count"),
+        CheckConstraint(
+            f"array_length(histogram, 1) = {MAX_SCORE - MIN_SCORE + 1}",
+            name="ck_game_rating_stats_histogram",
+        ),
+    )
+
+    game_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("games.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    rating_sum = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    rating_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # Number of ratings of each score, lowest score first
+    histogram = Column(
+        ARRAY(Integer),
+        nullable=False,
+        server_default=text(f"array_fill(0, ARRAY[{MAX_SCORE - MIN_SCORE + 1}])"),
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
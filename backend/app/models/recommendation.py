@@ -0,0 +1,36 @@
+# app/models/recommendation.py
+
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy import REAL, Column, DateTime, ForeignKey, Index, func
+from app.database.database import Base
+
+
+class GameSimilarity(Base):
+    """
+    Precomputed most similar games of a game, best first, by cosine
+    similarity of who rated and played them.
+    """
+    __tablename__ = "game_similarities"
+    __table_args__ = (
+        # Games listing a given game, to refresh when its interactions change
+        Index("ix_game_similarities_similar_ids", "similar_ids", postgresql_using="gin"),
+    )
+
+    game_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("games.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    similar_ids = Column(
+        ARRAY(UUID(as_uuid=True)),
+        nullable=False,
+    )
+    scores = Column(
+        ARRAY(REAL),
+        nullable=False,
+    )
+    computed_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -0,0 +1,51 @@
+# app/models/rsvp.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, String, UniqueConstraint, func
+from app.database.database import Base
+
+
+RSVP_CONFIRMED = "confirmed"
+RSVP_WAITLISTED = "waitlisted"
+
+
+class Rsvp(Base):
+    __tablename__ = "rsvps"
+    __table_args__ = (
+        # One RSVP per user and event, whatever its status
+        UniqueConstraint("event_id", "user_id", name="uq_rsvps_event_user"),
+        CheckConstraint(f"status IN ('{RSVP_CONFIRMED}', '{RSVP_WAITLISTED}')", name="ck_rsvps_status"),
+        # Attendee lists and waitlist order (first come, first promoted)
+        Index("ix_rsvps_event_status_created_at_id", "event_id", "status", "created_at", "id"),
+        Index("ix_rsvps_user_id", "user_id"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    event_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("events.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    status = Column(
+        String(20),
+        nullable=False,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.clock_timestamp(),
+        nullable=False,
+    )
+    promoted_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
@@ -0,0 +1,59 @@
+# app/models/similarity.py
+
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, SmallInteger, func
+from app.database.database import Base
+
+
+class HomebrewSignature(Base):
+    """
+    MinHash signature of a homebrew document's text, for near-duplicate
+    detection.
+    """
+    __tablename__ = "homebrew_signatures"
+
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("homebrew_documents.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Revision of the document the signature was computed from
+    revision = Column(
+        Integer,
+        nullable=False,
+    )
+    # SIMILARITY_NUM_PERM little-endian uint32 values
+    signature = Column(
+        LargeBinary,
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class HomebrewBucket(Base):
+    """
+    LSH bucket of one band of a document's signature. Documents sharing a
+    (band, bucket) are candidate near-duplicates.
+    """
+    __tablename__ = "homebrew_buckets"
+    __table_args__ = (
+        Index("ix_homebrew_buckets_document_id", "document_id"),
+    )
+
+    band = Column(
+        SmallInteger,
+        primary_key=True,
+    )
+    bucket = Column(
+        BigInteger,
+        primary_key=True,
+    )
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("homebrew_documents.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
@@ -0,0 +1,99 @@
+# app/models/upload.py
+
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, String, func
+from app.database.database import Base
+
+
+class Blob(Base):
+    """
+    A stored file, shared by every upload of the same content.
+    """
+    __tablename__ = "blobs"
+    __table_args__ = (
+        CheckConstraint("ref_count >= 0", name="ck_blobs_ref_count"),
+    )
+
+    sha256 = Column(
+        String(64),
+        primary_key=True,
+    )
+    size = Column(
+        BigInteger,
+        nullable=False,
+    )
+    # Uploads pointing at this blob; the file is removed when it drops to zero
+    ref_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class Upload(Base):
+    __tablename__ = "uploads"
+    __table_args__ = (
+        Index("ix_uploads_owner_created_at_id", "owner_id", "created_at", "id"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+        )
+    owner_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sha256 = Column(
+        String(64),
+        ForeignKey("blobs.sha256"),
+        nullable=False,
+    )
+    filename = Column(
+        String(255),
+        nullable=False,
+    )
+    content_type = Column(
+        String(100),
+        nullable=False,
+    )
+    size = Column(
+        BigInteger,
+        nullable=False,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.clock_timestamp(),
+        nullable=False,
+    )
+
+
+class StorageUsage(Base):
+    """
+    Bytes each user has uploaded, charged against their quota.
+    """
+    __tablename__ = "storage_usage"
+    __table_args__ = (
+        CheckConstraint("used_bytes >= 0", name="ck_storage_usage_used_bytes"),
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    used_bytes = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
@@ -2,7 +2,7 @@
 
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Boolean, Column, DateTime, String, Text, func
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, func
 from app.database.database import Base
 
 
@@ -49,6 +49,12 @@ class User(Base):
         default=False,
         nullable=False,
     )
+    is_admin = Column(
+        Boolean,
+        default=False,
+        server_default="false",
+        nullable=False,
+    )
     verification_token = Column(
         String(255),
         nullable=True,
@@ -61,4 +67,20 @@ class User(Base):
         String(15),
         nullable=True,
     )
+    # Maintained write-behind by app.core.activity, not per request
+    last_login_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    last_seen_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    # Maintained with the follows themselves; decides how activity reaches them
+    follower_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
     
\ No newline at end of file
@@ -1,7 +1,35 @@
+from .admin import router as admin_router
 from .auth import router as auth_router
+from .character_sheets import router as character_sheets_router
+from .comments import router as comments_router
+from .dice import router as dice_router
+from .events import router as events_router
+from .feed import router as feed_router
+from .games import router as games_router
+from .homebrew import router as homebrew_router
+from .live import router as live_router
+from .notifications import router as notifications_router
+from .random_tables import router as random_tables_router
+from .search import router as search_router
+from .suggest import router as suggest_router
+from .uploads import router as uploads_router
 from .users import router as users_router
 
 __all__ = [
+    "admin_router",
     "auth_router",
+    "character_sheets_router",
+    "comments_router",
+    "dice_router",
+    "events_router",
+    "feed_router",
+    "games_router",
+    "homebrew_router",
+    "live_router",
+    "notifications_router",
+    "random_tables_router",
+    "search_router",
+    "suggest_router",
+    "uploads_router",
     "users_router"
 ]
\ No newline at end of file
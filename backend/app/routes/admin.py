@@ -0,0 +1,267 @@
+# app/routes/admin.py
+
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.messages import (
+    HOMEBREW_NOT_FOUND,
+    INVALID_MODERATION_TERM,
+    MODERATION_FLAG_NOT_FOUND,
+    MODERATION_TERM_NOT_FOUND
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_admin
+from app.core.serialization import model_response
+from app.database.crud_homebrew import get_document
+from app.database.crud_moderation import (
+    delete_flag,
+    delete_term,
+    get_flag,
+    get_term,
+    list_flags,
+    list_terms,
+    save_terms
+)
+from app.database.crud_similarity import get_document_summaries
+from app.database.database import get_db
+from app.models.user import User
+from app.schemas.homebrew import DuplicateClusters, SimilarDocuments
+from app.schemas.mail import MailRequeued, MailStatus
+from app.schemas.moderation import (
+    ModerationCheck,
+    ModerationCheckResult,
+    ModerationFlagPage,
+    ModerationTermOut,
+    ModerationTermPage,
+    ModerationTermsCreate
+)
+from app.services.duplicates import find_clusters, find_similar
+from app.services.mail import mail_status, requeue_dead
+from app.services.moderation import moderation_filter, normalize, publish_reload, rescan
+
+
+router = APIRouter()
+
+TERMS_CURSOR_KIND = "moderation_terms"
+FLAGS_CURSOR_KIND = "moderation_flags"
+
+
+def _ref(summary) -> dict:
+    return {"id": summary.id, "title": summary.title, "owner_id": summary.owner_id}
+
+
+@router.get("/duplicates", response_model=DuplicateClusters)
+def read_duplicate_clusters(
+    threshold: Optional[float] = Query(None, ge=0, le=1, description="Minimum estimated similarity"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Clusters of homebrew documents that are likely reposts or light edits
+    of each other, largest first (admin only).
+    """
+    clusters = find_clusters(db, threshold)
+    shown = clusters[:limit]
+    summaries = get_document_summaries(db, [i for cluster in shown for i in cluster.document_ids])
+    return model_response(
+        DuplicateClusters,
+        {
+            "clusters": [
+                {
+                    "documents": [_ref(summaries[i]) for i in cluster.document_ids if i in summaries],
+                    "min_similarity": cluster.min_similarity,
+                }
+                for cluster in shown
+            ],
+            "total": len(clusters),
+        },
+    )
+
+
+@router.get("/duplicates/{document_id}", response_model=SimilarDocuments)
+def read_document_duplicates(
+    document_id: UUID,
+    threshold: Optional[float] = Query(None, ge=0, le=1, description="Minimum estimated similarity"),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Homebrew documents likely duplicating a given one (admin only).
+    """
+    if get_document(db, document_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=HOMEBREW_NOT_FOUND,
+        )
+    similar = find_similar(db, document_id, threshold)
+    summaries = get_document_summaries(db, [i for i, _ in similar])
+    return model_response(
+        SimilarDocuments,
+        {
+            "document_id": document_id,
+            "matches": [
+                {"document": _ref(summaries[i]), "similarity": score}
+                for i, score in similar
+                if i in summaries
+            ],
+        },
+    )
+
+
+@router.get("/moderation/terms", response_model=ModerationTermPage)
+def read_moderation_terms(
+    action: Optional[Literal["block", "flag"]] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    List the moderation terms alphabetically, optionally only one list
+    (admin only).
+    """
+    after = decode_cursor(cursor, TERMS_CURSOR_KIND, (str,))
+    terms = list_terms(db, action, after=after[0] if after else None, limit=limit)
+    next_cursor = None
+    if len(terms) > limit:
+        terms = terms[:limit]
+        next_cursor = encode_cursor(TERMS_CURSOR_KIND, (terms[-1].term,))
+    return model_response(ModerationTermPage, {"items": terms, "next_cursor": next_cursor})
+
+
+@router.post("/moderation/terms", response_model=list[ModerationTermOut], status_code=status.HTTP_201_CREATED)
+def add_moderation_terms(
+    terms_data: ModerationTermsCreate,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Add words or phrases to the block or flag list (admin only). Every
+    worker switches to the new lists once they are saved.
+    """
+    terms = sorted({normalize(term) for term in terms_data.terms})
+    if "" in terms:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=INVALID_MODERATION_TERM,
+        )
+    saved = save_terms(db, terms, terms_data.action, current_admin.id)
+    moderation_filter.reload()
+    publish_reload()
+    return model_response(list[ModerationTermOut], saved, status_code=status.HTTP_201_CREATED)
+
+
+@router.delete("/moderation/terms/{term_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_moderation_term(
+    term_id: UUID,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Remove a term from its list (admin only).
+    """
+    term = get_term(db, term_id)
+    if term is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=MODERATION_TERM_NOT_FOUND,
+        )
+    delete_term(db, term)
+    moderation_filter.reload()
+    publish_reload()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/moderation/check", response_model=ModerationCheckResult)
+def check_moderation(
+    check_data: ModerationCheck,
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Show how a text is normalized and which terms it matches (admin only).
+    """
+    return model_response(
+        ModerationCheckResult,
+        {
+            "normalized": normalize(check_data.text),
+            "matches": [{"term": m.term, "action": m.action} for m in moderation_filter.scan(check_data.text)],
+        },
+    )
+
+
+@router.get("/moderation/flags", response_model=ModerationFlagPage)
+def read_moderation_flags(
+    content_type: Optional[Literal["comments", "users"]] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    The review queue: content matching moderation terms, most recently
+    flagged first (admin only).
+    """
+    flags = list_flags(db, content_type, after=decode_cursor(cursor, FLAGS_CURSOR_KIND, (datetime, UUID)), limit=limit)
+    next_cursor = None
+    if len(flags) > limit:
+        flags = flags[:limit]
+        next_cursor = encode_cursor(FLAGS_CURSOR_KIND, (flags[-1].updated_at, flags[-1].id))
+    return model_response(ModerationFlagPage, {"items": flags, "next_cursor": next_cursor})
+
+
+@router.delete("/moderation/flags/{flag_id}", status_code=status.HTTP_204_NO_CONTENT)
+def dismiss_moderation_flag(
+    flag_id: UUID,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Dismiss a flag after review (admin only). Editing the content or a
+    later rescan raises it again if the content still matches.
+    """
+    flag = get_flag(db, flag_id)
+    if flag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=MODERATION_FLAG_NOT_FOUND,
+        )
+    delete_flag(db, flag)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/moderation/rescan", status_code=status.HTTP_202_ACCEPTED)
+def start_moderation_rescan(
+    background_tasks: BackgroundTasks,
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Check all existing comments and profiles against the current lists in
+    the background (admin only). Results appear in the review queue.
+    """
+    background_tasks.add_task(rescan)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/mail", response_model=MailStatus)
+def read_mail_status(
+    dead_letters: int = Query(20, ge=1, le=200),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Outbound mail queue sizes and the latest undeliverable messages
+    (admin only).
+    """
+    return model_response(MailStatus, mail_status(dead_letters))
+
+
+@router.post("/mail/dead/requeue", response_model=MailRequeued)
+def requeue_dead_letters(current_admin: User = Depends(get_current_admin)):
+    """
+    Queue every undeliverable message again, e.g. after fixing the mail
+    server settings (admin only).
+    """
+    return model_response(MailRequeued, {"requeued": requeue_dead()})
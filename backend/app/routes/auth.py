@@ -1,7 +1,8 @@
 # app/routes/auth.py
 
-from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta
+from uuid import uuid4
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from jose import jwt
@@ -9,9 +10,11 @@ from jose import jwt
 from app.core.config import settings
 from app.database.database import get_db
 from app.schemas.user import UserCreate
-from app.schemas.auth import Token, TokenPair, TokenRefreshRequest
+from app.schemas.auth import SessionOut, Token, TokenPair, TokenRefreshRequest
+from app.models.user import User
 from app.core.security import (
     create_access_token, 
+    get_current_user,
     hash_password, 
     verify_password, 
     oauth2_scheme
@@ -23,18 +26,41 @@ from app.database.crud import (
     get_user_by_verification_token, 
     update_user
 )
-from app.core.redis import blacklist_token, is_token_blacklisted
+from app.core import audit
+from app.core.activity import record_login
+from app.core.redis import blacklist_token
+from app.core.serialization import model_response
+from app.core.sessions import (
+    is_token_revoked,
+    list_sessions,
+    register_session,
+    revoke_all_sessions,
+    revoke_session
+)
 from app.core.messages import (
     EMAIL_ALREADY_REGISTERED, 
     INVALID_CREDENTIALS,
     INVALID_TOKEN,
     REFRESH_TOKEN_REVOKED, 
+    SESSION_NOT_FOUND,
     USERNAME_ALREADY_REGISTERED
 )
+from app.services.mail import send_verification_email
+from app.services.typeahead import publish_upsert
 
 
 router = APIRouter()
 
+
+def _token_claims(token: str) -> dict:
+    """
+    Decode a token's claims, returning an empty dict if it is invalid.
+    """
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.JWTError:
+        return {}
+
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
@@ -59,46 +85,72 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         email=user_data.email, 
         hashed_password=hashed
         )
+    publish_upsert("users", user)
+    send_verification_email(user)
     return {
         "msg": "User registered successfully",
         "id": str(user.id),
     }
     
 @router.post("/login", response_model=TokenPair)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db)
+):
     """
     Login a user and return an access token.
     """
     # Validate user credentials
     user = get_user_by_username(db, form_data.username)
     if not user or not verify_password(form_data.password, user.hashed_password):
+        audit.record_auth_event(
+            audit.LOGIN_FAILED,
+            request,
+            success=False,
+            username=form_data.username[:50],
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=INVALID_CREDENTIALS,
         )
-    # Issue JWT token
-    access_token = create_access_token(data={"sub": user.username})
+    # Issue JWT tokens bound to a new session keyed by the refresh token jti
+    session_id = str(uuid4())
+    refresh_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    claims = {"sub": user.username, "uid": str(user.id), "sid": session_id}
+    access_token = create_access_token(data=claims)
     refresh_token = create_access_token(
-        data={"sub": user.username}, 
-        expires_delta=timedelta(days=7),
-        token_type="refresh"
+        data=claims, 
+        expires_delta=refresh_expires,
+        token_type="refresh",
+        jti=session_id
     )
-    return {
+    register_session(
+        str(user.id),
+        session_id,
+        expires_at=datetime.now() + refresh_expires,
+        user_agent=request.headers.get("user-agent"),
+        ip_address=request.client.host if request.client else None,
+    )
+    record_login(str(user.id))
+    audit.record_auth_event(
+        audit.LOGIN,
+        request,
+        username=user.username,
+        user_id=str(user.id),
+        session_id=session_id,
+    )
+    return model_response(TokenPair, {
         "access_token": access_token,
         "refresh_token": refresh_token,
         "token_type": "bearer"
-    }
+    })
     
 @router.post("/refresh-token", response_model=Token)
-def refresh_token(token_data: TokenRefreshRequest):
+def refresh_token(request: Request, token_data: TokenRefreshRequest):
     """
     Refresh the access token using a valid refresh token.
     """
-    if is_token_blacklisted(token_data.refresh_token):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=REFRESH_TOKEN_REVOKED,
-        )
     try:
         payload = jwt.decode(
             token_data.refresh_token,
@@ -112,19 +164,44 @@ def refresh_token(token_data: TokenRefreshRequest):
                 detail=INVALID_TOKEN,
             )
     except jwt.JWTError:
+        audit.record_auth_event(audit.REFRESH_FAILED, request, success=False)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=INVALID_TOKEN,
         )
+    user_id, session_id = payload.get("uid"), payload.get("sid")
+    if is_token_revoked(token_data.refresh_token, user_id, session_id):
+        audit.record_auth_event(
+            audit.REFRESH_FAILED,
+            request,
+            success=False,
+            username=username,
+            user_id=user_id,
+            session_id=session_id,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=REFRESH_TOKEN_REVOKED,
+        )
     
+    claims = {"sub": username}
+    if user_id and session_id:
+        claims.update({"uid": user_id, "sid": session_id})
     new_access_token = create_access_token(
-        data={"sub": username},
+        data=claims,
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    return {
+    audit.record_auth_event(
+        audit.REFRESH,
+        request,
+        username=username,
+        user_id=user_id,
+        session_id=session_id,
+    )
+    return model_response(Token, {
         "access_token": new_access_token,
         "token_type": "bearer"
-    }
+    })
 
 @router.post("/verify-email")
 def verify_email(token: str, db: Session = Depends(get_db)):
@@ -151,18 +228,81 @@ def verify_email(token: str, db: Session = Depends(get_db)):
     
 @router.post("/logout")
 def logout(
+    request: Request,
     current_token: str = Depends(oauth2_scheme),
     refresh_token_payload: TokenRefreshRequest = None
 ):
     """
-    Logout a user by blacklisting the access token and refresh token.
+    Logout a user by blacklisting the access token and refresh token,
+    and ending the session they belong to.
     """
     # Blacklist the access token
     blacklist_token(current_token)
     # If a refresh token is provided, blacklist it as well
     if refresh_token_payload and refresh_token_payload.refresh_token:
         blacklist_token(refresh_token_payload.refresh_token)
+    # End the session so its other tokens stop working too
+    claims = _token_claims(current_token)
+    if claims.get("uid") and claims.get("sid"):
+        revoke_session(claims["uid"], claims["sid"])
+    audit.record_auth_event(
+        audit.LOGOUT,
+        request,
+        username=claims.get("sub"),
+        user_id=claims.get("uid"),
+        session_id=claims.get("sid"),
+    )
     return {
         "success": True,
         "message": "Logged out successfully",
+    }
+
+
+@router.get("/sessions", response_model=list[SessionOut])
+def read_sessions(
+    current_token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List the active sessions of the current user.
+    """
+    current_session = _token_claims(current_token).get("sid")
+    return model_response(list[SessionOut], [
+        {**session, "current": session["session_id"] == current_session}
+        for session in list_sessions(str(current_user.id))
+    ])
+
+
+@router.delete("/sessions/{session_id}")
+def delete_session(session_id: str, current_user: User = Depends(get_current_user)):
+    """
+    Revoke a single session of the current user, e.g. a lost device.
+    """
+    if not revoke_session(str(current_user.id), session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=SESSION_NOT_FOUND,
+        )
+    return {
+        "success": True,
+        "message": "Session revoked successfully",
+    }
+
+
+@router.post("/logout-all")
+def logout_all(request: Request, current_user: User = Depends(get_current_user)):
+    """
+    Log out of every device by revoking all sessions of the current user.
+    """
+    revoked = revoke_all_sessions(str(current_user.id))
+    audit.record_auth_event(
+        audit.LOGOUT_ALL,
+        request,
+        username=current_user.username,
+        user_id=str(current_user.id),
+    )
+    return {
+        "success": True,
+        "message": "Logged out of all sessions successfully",
+        "revoked_sessions": revoked,
     }
\ No newline at end of file
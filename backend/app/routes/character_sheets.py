@@ -0,0 +1,248 @@
+# app/routes/character_sheets.py
+
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from sqlalchemy.exc import DataError, ProgrammingError
+from sqlalchemy.orm import Session
+
+from app.core.caching import is_not_modified, not_modified_response
+from app.core.config import settings
+from app.core.messages import (
+    CHARACTER_SHEET_NOT_FOUND,
+    CHARACTER_SHEET_TOO_LARGE,
+    CHARACTER_SHEET_VERSION_MISMATCH,
+    INVALID_PATCH,
+    INVALID_SHEET_QUERY,
+    NOT_CHARACTER_SHEET_OWNER,
+    PATCH_TEST_FAILED
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_user
+from app.core.serialization import model_response
+from app.database.crud_character_sheets import (
+    PATCH_FAILED,
+    PATCH_FORBIDDEN,
+    PATCH_NOT_FOUND,
+    PATCH_TOO_LARGE,
+    PATCH_VERSION_MISMATCH,
+    InvalidPatch,
+    create_sheet,
+    delete_sheet,
+    get_sheet,
+    get_sheet_summary,
+    list_sheets,
+    patch_sheet
+)
+from app.database.database import get_db
+from app.models.user import User
+from app.schemas.character_sheet import (
+    CharacterSheetCreate,
+    CharacterSheetOut,
+    CharacterSheetPage,
+    PatchOperation,
+    SheetVersion
+)
+
+
+router = APIRouter()
+
+CURSOR_KIND = "character_sheets"
+
+
+def _sheet_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _expected_version(if_match: Optional[str]) -> Optional[int]:
+    """
+    The version named by an If-Match header; "*" matches any version.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().strip('"')
+    if not tag.isdigit():
+        # Weak or foreign validators never match (RFC 9110 strong comparison)
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=CHARACTER_SHEET_VERSION_MISMATCH,
+        )
+    return int(tag)
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=CHARACTER_SHEET_NOT_FOUND,
+    )
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=CHARACTER_SHEET_TOO_LARGE,
+    )
+
+
+@router.post("", response_model=CharacterSheetOut, status_code=status.HTTP_201_CREATED)
+def add_sheet(
+    sheet_data: CharacterSheetCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create a character sheet.
+    """
+    if len(json.dumps(sheet_data.data).encode()) > settings.CHARACTER_SHEETS_MAX_BYTES:
+        raise _too_large()
+    sheet = create_sheet(db, current_user.id, sheet_data.name, sheet_data.data)
+    return model_response(
+        CharacterSheetOut,
+        sheet,
+        status_code=status.HTTP_201_CREATED,
+        headers={"ETag": _sheet_etag(sheet.version)},
+    )
+
+
+@router.get("", response_model=CharacterSheetPage)
+def read_sheets(
+    owner_id: Optional[UUID] = None,
+    contains: Optional[str] = Query(None, description='JSON the sheet must contain, e.g. {"class": "wizard"}'),
+    path: Optional[str] = Query(None, description='jsonpath that must match, e.g. $.skills[*] ? (@ == "stealth")'),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    Find character sheets by owner and by their contents, newest first.
+    Documents are not included; fetch a sheet for its data.
+    """
+    try:
+        containment = json.loads(contains) if contains is not None else None
+    except ValueError:
+        containment = None
+    if contains is not None and not isinstance(containment, (dict, list)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_SHEET_QUERY,
+        )
+    try:
+        sheets = list_sheets(
+            db,
+            owner_id=owner_id,
+            contains=containment,
+            path=path,
+            after=decode_cursor(cursor, CURSOR_KIND, (datetime, UUID)),
+            limit=limit,
+        )
+    except (DataError, ProgrammingError):
+        # Malformed jsonpath
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_SHEET_QUERY,
+        )
+    next_cursor = None
+    if len(sheets) > limit:
+        sheets = sheets[:limit]
+        next_cursor = encode_cursor(CURSOR_KIND, (sheets[-1].created_at, sheets[-1].id))
+    return model_response(CharacterSheetPage, {"items": sheets, "next_cursor": next_cursor})
+
+
+@router.get("/{sheet_id}", response_model=CharacterSheetOut)
+def read_sheet(sheet_id: UUID, request: Request, db: Session = Depends(get_db)):
+    """
+    Get a character sheet. Its ETag is the sheet's version, to send back
+    in If-Match when patching.
+    """
+    sheet = get_sheet(db, sheet_id)
+    if sheet is None:
+        raise _not_found()
+    etag = _sheet_etag(sheet.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return model_response(CharacterSheetOut, sheet, headers={"ETag": etag})
+
+
+@router.patch("/{sheet_id}", response_model=SheetVersion)
+def edit_sheet(
+    sheet_id: UUID,
+    operations: list[PatchOperation] = Body(
+        ...,
+        min_length=1,
+        max_length=settings.CHARACTER_SHEETS_MAX_PATCH_OPERATIONS,
+        media_type="application/json-patch+json",
+    ),
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Apply a JSON Patch (RFC 6902) to a sheet (owner only). The patch is
+    applied atomically in the database; with If-Match it only applies to
+    the version the client last read. Returns the new version, not the
+    document.
+    """
+    try:
+        result = patch_sheet(
+            db,
+            sheet_id,
+            current_user.id,
+            [operation.model_dump(by_alias=True) for operation in operations],
+            expected_version=_expected_version(if_match),
+            max_bytes=settings.CHARACTER_SHEETS_MAX_BYTES,
+        )
+    except InvalidPatch as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{INVALID_PATCH}: {exc}.",
+        )
+    if result.status == PATCH_NOT_FOUND:
+        raise _not_found()
+    if result.status == PATCH_FORBIDDEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_CHARACTER_SHEET_OWNER,
+        )
+    if result.status == PATCH_VERSION_MISMATCH:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=CHARACTER_SHEET_VERSION_MISMATCH,
+            headers={"ETag": _sheet_etag(result.version)},
+        )
+    if result.status == PATCH_FAILED:
+        # A failed "test" or a path that does not exist in this document
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{PATCH_TEST_FAILED}: operation {result.failed_operation} failed.",
+        )
+    if result.status == PATCH_TOO_LARGE:
+        raise _too_large()
+    return model_response(
+        SheetVersion,
+        {"id": sheet_id, "version": result.version, "updated_at": result.updated_at},
+        headers={"ETag": _sheet_etag(result.version)},
+    )
+
+
+@router.delete("/{sheet_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_sheet(
+    sheet_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delete a character sheet (owner or admin only).
+    """
+    sheet = get_sheet_summary(db, sheet_id)
+    if sheet is None:
+        raise _not_found()
+    if sheet.owner_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_CHARACTER_SHEET_OWNER,
+        )
+    delete_sheet(db, sheet)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
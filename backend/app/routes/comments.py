@@ -0,0 +1,284 @@
+# app/routes/comments.py
+
+from typing import Literal, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.messages import (
+    COMMENT_NOT_FOUND,
+    COMMENT_SUBJECT_NOT_FOUND,
+    COMMENT_TOO_DEEP,
+    CONTENT_BLOCKED,
+    NOT_COMMENT_AUTHOR
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_user
+from app.core.serialization import model_response
+from app.database.crud_comments import (
+    create_comment,
+    delete_comment,
+    get_comment,
+    list_subtree,
+    list_threads,
+    subject_exists,
+    update_comment
+)
+from app.database.crud_moderation import clear_flags
+from app.database.database import get_db
+from app.database.loaders import UserLoader, get_user_loader
+from app.models.comment import Comment
+from app.models.notification import NOTIFICATION_COMMENT_REPLY
+from app.models.user import User
+from app.schemas.comment import (
+    CommentCreate,
+    CommentOut,
+    CommentPage,
+    CommentThreadPage,
+    CommentUpdate
+)
+from app.services.feed import ACTIVITY_COMMENT_CREATED, publish_activity
+from app.services.live import publish_live
+from app.services.moderation import ContentBlocked, Match, record_flags, screen
+from app.services.notifications import notify
+
+
+router = APIRouter()
+
+CURSOR_KIND = "comments"
+REPLIES_CURSOR_KIND = "comment_replies"
+
+# Characters of a comment shown in activity feeds
+FEED_EXCERPT_LENGTH = 140
+
+_COMMENT_FIELDS = [name for name in CommentOut.model_fields if name != "author"]
+
+
+def _get_comment_or_404(db: Session, comment_id: UUID) -> Comment:
+    comment = get_comment(db, comment_id)
+    if comment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=COMMENT_NOT_FOUND,
+        )
+    return comment
+
+
+def _screen_body(body: str) -> dict[str, list[Match]]:
+    try:
+        return screen({"body": body})
+    except ContentBlocked:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=CONTENT_BLOCKED,
+        )
+
+
+def _live_data(comment: Comment) -> dict:
+    return {
+        "id": comment.id,
+        "parent_id": comment.parent_id,
+        "author_id": comment.author_id,
+        "body": comment.body,
+        "created_at": comment.created_at,
+        "updated_at": comment.updated_at,
+    }
+
+
+def _as_dict(comment: Comment, authors: dict[UUID, User]) -> dict:
+    fields = {name: getattr(comment, name) for name in _COMMENT_FIELDS}
+    fields["author"] = None if comment.is_deleted else authors.get(comment.author_id)
+    return fields
+
+
+async def _load_authors(loader: UserLoader, comments: list[Comment]) -> dict[UUID, User]:
+    # One query for every author on the page
+    users = await loader.load_many(ids={comment.author_id for comment in comments})
+    return {user.id: user for user in users if user is not None}
+
+
+@router.get("", response_model=CommentThreadPage)
+async def read_comments(
+    subject_type: Literal["games", "events"],
+    subject_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    replies: int = Query(settings.COMMENTS_REPLY_PREVIEW, ge=0, le=20),
+    db: Session = Depends(get_db),
+    loader: UserLoader = Depends(get_user_loader)
+):
+    """
+    List a game's or event's comment threads, newest first, each with its
+    first replies in thread order. Deeper replies are loaded per thread
+    from /comments/{comment_id}/replies.
+    """
+    after = decode_cursor(cursor, CURSOR_KIND, (str,))
+    threads = await run_in_threadpool(
+        list_threads,
+        db,
+        subject_type,
+        subject_id,
+        before=after[0] if after else None,
+        limit=limit,
+        replies=replies,
+    )
+    next_cursor = None
+    if len(threads) > limit:
+        threads = threads[:limit]
+        next_cursor = encode_cursor(CURSOR_KIND, (threads[-1][0].path,))
+    authors = await _load_authors(
+        loader, [comment for thread, shown, _ in threads for comment in (thread, *shown)]
+    )
+    items = [
+        {
+            **_as_dict(thread, authors),
+            "replies": [_as_dict(reply, authors) for reply in shown],
+            "has_more_replies": has_more,
+        }
+        for thread, shown, has_more in threads
+    ]
+    return model_response(CommentThreadPage, {"items": items, "next_cursor": next_cursor})
+
+
+@router.get("/{comment_id}/replies", response_model=CommentPage)
+async def read_replies(
+    comment_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    loader: UserLoader = Depends(get_user_loader)
+):
+    """
+    List all replies below a comment, at any depth, in thread order.
+    """
+    comment = await run_in_threadpool(_get_comment_or_404, db, comment_id)
+    after = decode_cursor(cursor, REPLIES_CURSOR_KIND, (str,))
+    replies = await run_in_threadpool(
+        list_subtree, db, comment, after=after[0] if after else None, limit=limit
+    )
+    next_cursor = None
+    if len(replies) > limit:
+        replies = replies[:limit]
+        next_cursor = encode_cursor(REPLIES_CURSOR_KIND, (replies[-1].path,))
+    authors = await _load_authors(loader, replies)
+    return model_response(
+        CommentPage,
+        {"items": [_as_dict(reply, authors) for reply in replies], "next_cursor": next_cursor},
+    )
+
+
+@router.post("", response_model=CommentOut, status_code=status.HTTP_201_CREATED)
+def add_comment(
+    comment_data: CommentCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Comment on a game or event, or reply to a comment.
+    """
+    moderation = _screen_body(comment_data.body)
+    parent = None
+    if comment_data.parent_id is not None:
+        parent = _get_comment_or_404(db, comment_data.parent_id)
+        if (parent.subject_type, parent.subject_id) != (comment_data.subject_type, comment_data.subject_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=COMMENT_NOT_FOUND,
+            )
+        if parent.depth + 1 >= settings.COMMENTS_MAX_DEPTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=COMMENT_TOO_DEEP,
+            )
+    elif not subject_exists(db, comment_data.subject_type, comment_data.subject_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=COMMENT_SUBJECT_NOT_FOUND,
+        )
+    comment = create_comment(
+        db,
+        author_id=current_user.id,
+        subject_type=comment_data.subject_type,
+        subject_id=comment_data.subject_id,
+        body=comment_data.body,
+        parent=parent,
+    )
+    if comment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=COMMENT_NOT_FOUND,
+        )
+    record_flags(db, "comments", comment.id, moderation)
+    publish_live(comment.subject_type, comment.subject_id, "comment.created", _live_data(comment))
+    publish_activity(
+        db,
+        ACTIVITY_COMMENT_CREATED,
+        current_user.id,
+        comment.subject_type,
+        comment.subject_id,
+        {"comment_id": str(comment.id), "excerpt": comment.body[:FEED_EXCERPT_LENGTH]},
+        game_id=comment.subject_id if comment.subject_type == "games" else None,
+    )
+    if parent is not None:
+        notify(
+            db,
+            [parent.author_id],
+            NOTIFICATION_COMMENT_REPLY,
+            comment.subject_type,
+            comment.subject_id,
+            actor_id=current_user.id,
+            data={"comment_id": str(comment.id), "parent_id": str(parent.id)},
+        )
+    return model_response(
+        CommentOut,
+        _as_dict(comment, {current_user.id: current_user}),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.put("/{comment_id}", response_model=CommentOut)
+def edit_comment(
+    comment_id: UUID,
+    comment_data: CommentUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Edit a comment (author only).
+    """
+    comment = _get_comment_or_404(db, comment_id)
+    if comment.author_id != current_user.id or comment.is_deleted:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_COMMENT_AUTHOR,
+        )
+    moderation = _screen_body(comment_data.body)
+    comment = update_comment(db, comment, comment_data.body)
+    record_flags(db, "comments", comment.id, moderation)
+    publish_live(comment.subject_type, comment.subject_id, "comment.updated", _live_data(comment))
+    return model_response(CommentOut, _as_dict(comment, {current_user.id: current_user}))
+
+
+@router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_comment(
+    comment_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delete a comment (author or admin only). A comment with replies is
+    blanked instead, keeping the thread intact.
+    """
+    comment = _get_comment_or_404(db, comment_id)
+    if comment.author_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_COMMENT_AUTHOR,
+        )
+    subject_type, subject_id = comment.subject_type, comment.subject_id
+    delete_comment(db, comment)
+    clear_flags(db, "comments", comment_id)
+    publish_live(subject_type, subject_id, "comment.deleted", {"id": comment_id})
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
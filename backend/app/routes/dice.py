@@ -0,0 +1,102 @@
+# app/routes/dice.py
+
+from typing import Optional
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.core.config import settings
+from app.core.messages import DICE_BATCH_TOO_LARGE, INVALID_DICE_EXPRESSION, TOO_MANY_DICE_ROLLS
+from app.core.serialization import model_response
+from app.schemas.dice import DiceDistribution, DiceRollRequest, DiceRollResponse
+from app.services.dice import DiceError, DiceExpression, compile_expression
+
+
+router = APIRouter()
+
+
+def _invalid_expression(exc: DiceError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"{INVALID_DICE_EXPRESSION}: {exc}.",
+    )
+
+
+def _parse_or_400(expression: str) -> DiceExpression:
+    try:
+        compiled = compile_expression(expression)
+        compiled.width
+    except DiceError as exc:
+        raise _invalid_expression(exc)
+    return compiled
+
+
+def _evaluate_or_400(compiled: DiceExpression) -> DiceExpression:
+    try:
+        # Evaluate now so size limits surface as a 400 too
+        compiled.distribution
+    except DiceError as exc:
+        raise _invalid_expression(exc)
+    return compiled
+
+
+def _compile_or_400(expression: str) -> DiceExpression:
+    return _evaluate_or_400(_parse_or_400(expression))
+
+
+@router.get("/distribution", response_model=DiceDistribution)
+def read_distribution(
+    expression: str = Query(..., min_length=1, description='e.g. "4d6dl1 + 2"'),
+    target: Optional[int] = Query(None, description="Also return the chance of reaching this, e.g. a DC"),
+):
+    """
+    Exact outcome distribution of a dice expression. For large expressions
+    the far tails are truncated: those outcomes, less likely than about
+    1e-13 times the likeliest, are reported with probability 0.
+    """
+    compiled = _compile_or_400(expression)
+    distribution = compiled.distribution
+    return model_response(
+        DiceDistribution,
+        {
+            "expression": compiled.text,
+            "min": distribution.min,
+            "max": distribution.max,
+            "mean": distribution.mean,
+            "stddev": distribution.stddev,
+            "probabilities": distribution.probabilities.tolist(),
+            "truncated": distribution.truncated,
+            "target": target,
+            "probability_at_least": distribution.at_least(target) if target is not None else None,
+        },
+    )
+
+
+@router.post("/roll", response_model=DiceRollResponse)
+def roll_dice(roll_data: DiceRollRequest):
+    """
+    Roll each expression `count` times. Rolls are drawn from the exact
+    distributions in one vectorized pass per expression.
+    """
+    if len(roll_data.expressions) * roll_data.count > settings.DICE_MAX_ROLLS_PER_REQUEST:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=TOO_MANY_DICE_ROLLS,
+        )
+    compiled = [_parse_or_400(expression) for expression in roll_data.expressions]
+    # Distributions cost about their dice times their outcomes, so the
+    # whole batch is bounded before any is computed
+    if (
+        sum(expression.dice for expression in compiled) > settings.DICE_MAX_DICE_PER_REQUEST
+        or sum(expression.width for expression in compiled) > settings.DICE_MAX_OUTCOMES_PER_REQUEST
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=DICE_BATCH_TOO_LARGE,
+        )
+    compiled = [_evaluate_or_400(expression) for expression in compiled]
+    rng = np.random.default_rng(roll_data.seed)
+    results = [
+        {"expression": expression.text, "rolls": expression.roll(roll_data.count, rng).tolist()}
+        for expression in compiled
+    ]
+    return model_response(DiceRollResponse, {"results": results})
@@ -0,0 +1,360 @@
+# app/routes/events.py
+
+import calendar
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.caching import bump_version, collection_etag, is_not_modified, not_modified_response
+from app.core.config import settings
+from app.core.messages import (
+    ALREADY_RSVPED,
+    CAPACITY_BELOW_RSVPS,
+    EVENT_NOT_FOUND,
+    INVALID_EVENT_RANGE,
+    INVALID_EVENT_TIME_RANGE,
+    NOT_EVENT_ORGANIZER,
+    RSVP_NOT_FOUND
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_user
+from app.core.serialization import model_response
+from app.database.crud_events import (
+    create_event,
+    delete_event,
+    get_day_summaries,
+    get_event,
+    list_events,
+    update_event
+)
+from app.database.crud_recommendations import event_interactions
+from app.database.crud_rsvps import cancel_rsvp, create_rsvp, get_rsvp, get_seat_counts, list_rsvps
+from app.database.database import get_db
+from app.models.event import Event
+from app.models.notification import NOTIFICATION_RSVP_CONFIRMED, NOTIFICATION_RSVP_PROMOTED
+from app.models.rsvp import RSVP_CONFIRMED, RSVP_WAITLISTED
+from app.models.user import User
+from app.schemas.event import (
+    CalendarMonth,
+    EventCreate,
+    EventOut,
+    EventPage,
+    EventUpdate,
+    RsvpOut,
+    RsvpPage
+)
+from app.services.feed import ACTIVITY_EVENT_CREATED, publish_activity
+from app.services.live import publish_live
+from app.services.notifications import notify
+from app.services.recommendations import record_interactions
+from app.services.typeahead import publish_delete, publish_upsert
+
+
+router = APIRouter()
+
+# Cache scope of the events listings and calendar; any write invalidates its ETags
+EVENTS_SCOPE = "events"
+
+CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+CURSOR_KIND = "events"
+RSVP_CURSOR_KIND = "rsvps"
+
+
+def _get_event_or_404(db: Session, event_id: UUID) -> Event:
+    event = get_event(db, event_id)
+    if event is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=EVENT_NOT_FOUND,
+        )
+    return event
+
+
+def _check_organizer(event: Event, user: User):
+    if event.organizer_id != user.id and not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_EVENT_ORGANIZER,
+        )
+
+
+def _publish_seats(db: Session, event_id: UUID):
+    # Live RSVP count for the clients following the event
+    counts = get_seat_counts(db, event_id)
+    if counts is not None:
+        publish_live("events", event_id, "rsvp.changed", {"rsvp_count": counts[0], "capacity": counts[1]})
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.get("", response_model=EventPage)
+def read_events(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    organizer_id: Optional[UUID] = None,
+    game_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    List the events overlapping [start, end) by start time, one keyset page
+    at a time. Defaults to the coming month.
+    """
+    etag = collection_etag(request, EVENTS_SCOPE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, CACHE_HEADERS)
+
+    start = _as_utc(start) if start else datetime.now(timezone.utc)
+    end = _as_utc(end) if end else start + timedelta(days=31)
+    if end <= start or end - start > timedelta(days=settings.EVENTS_MAX_RANGE_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_EVENT_RANGE,
+        )
+    events = list_events(
+        db,
+        start=start,
+        end=end,
+        after=decode_cursor(cursor, CURSOR_KIND, (datetime, UUID)),
+        limit=limit,
+        organizer_id=organizer_id,
+        game_id=game_id,
+    )
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor(CURSOR_KIND, (events[-1].starts_at, events[-1].id))
+    return model_response(
+        EventPage,
+        {"items": events, "next_cursor": next_cursor},
+        headers={"ETag": etag, **CACHE_HEADERS},
+    )
+
+
+@router.get("/calendar", response_model=CalendarMonth)
+def read_calendar(
+    request: Request,
+    year: int = Query(..., ge=1970, le=9999),
+    month: int = Query(..., ge=1, le=12),
+    db: Session = Depends(get_db)
+):
+    """
+    Month view: event counts and the first events of each day that has any,
+    read from the precomputed day summaries.
+    """
+    etag = collection_etag(request, EVENTS_SCOPE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, CACHE_HEADERS)
+
+    last_day = calendar.monthrange(year, month)[1]
+    days = get_day_summaries(db, date(year, month, 1), date(year, month, last_day))
+    return model_response(
+        CalendarMonth,
+        {"year": year, "month": month, "days": days},
+        headers={"ETag": etag, **CACHE_HEADERS},
+    )
+
+
+@router.get("/{event_id}", response_model=EventOut)
+def read_event(event_id: UUID, request: Request, db: Session = Depends(get_db)):
+    """
+    Get a single event.
+    """
+    etag = collection_etag(request, EVENTS_SCOPE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, CACHE_HEADERS)
+    event = _get_event_or_404(db, event_id)
+    return model_response(EventOut, event, headers={"ETag": etag, **CACHE_HEADERS})
+
+
+@router.post("", response_model=EventOut, status_code=status.HTTP_201_CREATED)
+def add_event(
+    event_data: EventCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Schedule an event organized by the current user.
+    """
+    event = create_event(db, organizer_id=current_user.id, **event_data.model_dump())
+    bump_version(EVENTS_SCOPE)
+    publish_upsert("events", event)
+    publish_activity(
+        db,
+        ACTIVITY_EVENT_CREATED,
+        current_user.id,
+        "events",
+        event.id,
+        {"title": event.title, "starts_at": event.starts_at.isoformat()},
+        game_id=event.game_id,
+    )
+    return model_response(EventOut, event, status_code=status.HTTP_201_CREATED)
+
+
+@router.put("/{event_id}", response_model=EventOut)
+def edit_event(
+    event_id: UUID,
+    event_data: EventUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Update an event (organizer or admin only). Fields sent as null, such as
+    capacity or game_id, are cleared.
+    """
+    event = _get_event_or_404(db, event_id)
+    _check_organizer(event, current_user)
+    fields = event_data.model_dump(exclude_unset=True)
+    # Validate the resulting time range as a whole
+    starts_at = fields.get("starts_at", event.starts_at)
+    ends_at = fields.get("ends_at", event.ends_at)
+    if ends_at <= starts_at or ends_at - starts_at > timedelta(days=settings.EVENTS_MAX_DURATION_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_EVENT_TIME_RANGE,
+        )
+    # Moving an event to another game moves its RSVPs' interactions
+    previous_game_id = event.game_id
+    moved = event_interactions(db, event_id) if fields.get("game_id", previous_game_id) != previous_game_id else []
+    try:
+        event, promoted = update_event(db, event, **fields)
+    except IntegrityError:
+        # Only the overbooking check can fail here
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=CAPACITY_BELOW_RSVPS,
+        )
+    bump_version(EVENTS_SCOPE)
+    publish_upsert("events", event)
+    if moved:
+        record_interactions(moved + event_interactions(db, event_id))
+    if promoted:
+        notify(db, promoted, NOTIFICATION_RSVP_PROMOTED, "events", event_id)
+    return model_response(EventOut, event)
+
+
+@router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_event(
+    event_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Cancel an event (organizer or admin only).
+    """
+    event = _get_event_or_404(db, event_id)
+    _check_organizer(event, current_user)
+    interactions = event_interactions(db, event_id)
+    delete_event(db, event)
+    record_interactions(interactions)
+    bump_version(EVENTS_SCOPE)
+    publish_delete("events", event_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/{event_id}/rsvp", response_model=RsvpOut, status_code=status.HTTP_201_CREATED)
+def rsvp_to_event(
+    event_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    RSVP to an event. The RSVP is confirmed while seats are left and
+    waitlisted after; waitlisted RSVPs are confirmed as seats free up.
+    """
+    event = _get_event_or_404(db, event_id)
+    game_id = event.game_id
+    rsvp = create_rsvp(db, event_id, current_user.id)
+    if rsvp is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=ALREADY_RSVPED,
+        )
+    if game_id is not None:
+        record_interactions([(current_user.id, game_id)])
+    bump_version(EVENTS_SCOPE)
+    _publish_seats(db, event_id)
+    if rsvp.status == RSVP_CONFIRMED:
+        # A taken seat raises the event in suggestions
+        publish_upsert("events", event)
+        notify(db, [current_user.id], NOTIFICATION_RSVP_CONFIRMED, "events", event_id)
+    return model_response(RsvpOut, rsvp, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("/{event_id}/rsvp", response_model=RsvpOut)
+def read_my_rsvp(
+    event_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the current user's RSVP to an event.
+    """
+    rsvp = get_rsvp(db, event_id, current_user.id)
+    if rsvp is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=RSVP_NOT_FOUND,
+        )
+    return model_response(RsvpOut, rsvp)
+
+
+@router.delete("/{event_id}/rsvp", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_my_rsvp(
+    event_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Cancel the current user's RSVP, giving the seat to the waitlist.
+    """
+    promoted = cancel_rsvp(db, event_id, current_user.id)
+    if promoted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=RSVP_NOT_FOUND,
+        )
+    event = get_event(db, event_id)
+    if event is not None and event.game_id is not None:
+        record_interactions([(current_user.id, event.game_id)])
+    bump_version(EVENTS_SCOPE)
+    _publish_seats(db, event_id)
+    if event is not None:
+        publish_upsert("events", event)
+    notify(db, promoted, NOTIFICATION_RSVP_PROMOTED, "events", event_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{event_id}/rsvps", response_model=RsvpPage)
+def read_event_rsvps(
+    event_id: UUID,
+    waitlisted: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    List an event's confirmed (or waitlisted) RSVPs in arrival order.
+    """
+    _get_event_or_404(db, event_id)
+    rsvps = list_rsvps(
+        db,
+        event_id,
+        status=RSVP_WAITLISTED if waitlisted else RSVP_CONFIRMED,
+        after=decode_cursor(cursor, RSVP_CURSOR_KIND, (datetime, UUID)),
+        limit=limit,
+    )
+    next_cursor = None
+    if len(rsvps) > limit:
+        rsvps = rsvps[:limit]
+        next_cursor = encode_cursor(RSVP_CURSOR_KIND, (rsvps[-1].created_at, rsvps[-1].id))
+    return model_response(RsvpPage, {"items": rsvps, "next_cursor": next_cursor})
@@ -0,0 +1,107 @@
+# app/routes/feed.py
+
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.messages import CANNOT_FOLLOW_SELF, FOLLOW_TARGET_NOT_FOUND, NOT_FOLLOWING
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_user
+from app.core.serialization import model_response
+from app.database.crud_follows import follow, followed_targets, follower_counts, target_exists, unfollow
+from app.database.database import get_db
+from app.models.user import User
+from app.schemas.feed import FeedPage, FollowList, FollowTargetType
+from app.services.feed import backfill, is_popular, read_feed
+
+
+router = APIRouter()
+
+CURSOR_KIND = "feed"
+
+
+@router.get("", response_model=FeedPage)
+def read_my_feed(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Recent activity of the users and games the current user follows,
+    newest first.
+    """
+    entries = read_feed(db, current_user.id, before=decode_cursor(cursor, CURSOR_KIND, (float, str)), limit=limit)
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(CURSOR_KIND, (entries[-1]["ts"], entries[-1]["id"]))
+    items = [
+        {**entry, "created_at": datetime.fromtimestamp(entry["ts"], timezone.utc)}
+        for entry in entries
+    ]
+    return model_response(FeedPage, {"items": items, "next_cursor": next_cursor})
+
+
+@router.get("/follows", response_model=FollowList)
+def read_my_follows(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List the users and games the current user follows.
+    """
+    followed = [
+        {"target_type": target_type, "target_id": target_id, "follower_count": count}
+        for target_type, target_id, count in followed_targets(db, current_user.id)
+    ]
+    return model_response(FollowList, {"items": followed})
+
+
+@router.put("/follows/{target_type}/{target_id}", status_code=status.HTTP_204_NO_CONTENT)
+def follow_target(
+    target_type: FollowTargetType,
+    target_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Follow a user or game; their new activity appears in the current
+    user's feed.
+    """
+    if target_type == "users" and target_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=CANNOT_FOLLOW_SELF,
+        )
+    if not target_exists(db, target_type, target_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=FOLLOW_TARGET_NOT_FOUND,
+        )
+    if follow(db, current_user.id, target_type, target_id):
+        count = follower_counts(db, [(target_type, target_id)]).get((target_type, target_id), 0)
+        # Popular sources are merged on read, recent activity included
+        if not is_popular(count):
+            backfill(current_user.id, target_type, target_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.delete("/follows/{target_type}/{target_id}", status_code=status.HTTP_204_NO_CONTENT)
+def unfollow_target(
+    target_type: FollowTargetType,
+    target_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stop following a user or game.
+    """
+    if not unfollow(db, current_user.id, target_type, target_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=NOT_FOLLOWING,
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,299 @@
+# app/routes/games.py
+
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.caching import GAMES_SCOPE, bump_version, collection_etag, is_not_modified, not_modified_response
+from app.core.messages import GAME_NOT_FOUND, INVALID_GAME_IMAGE, INVALID_PLAYER_RANGE, RATING_NOT_FOUND
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_admin, get_current_user
+from app.core.serialization import model_response, type_adapter
+from app.database.crud_games import (
+    create_game,
+    delete_game,
+    get_game,
+    list_games,
+    sort_key,
+    sort_key_types,
+    update_game
+)
+from app.database.crud_ratings import delete_rating, get_rating, get_rating_stats, set_rating
+from app.database.crud_recommendations import get_games, get_similarities
+from app.database.crud_uploads import get_upload
+from app.database.database import get_db
+from app.models.game import Game
+from app.models.rating import MAX_SCORE, MIN_SCORE
+from app.models.user import User
+from app.schemas.game import (
+    GameCreate,
+    GameOut,
+    GamePage,
+    GameSort,
+    GameUpdate,
+    RatingIn,
+    RatingOut,
+    RatingSummary,
+    SimilarGames
+)
+from app.services.images import image_variants, is_image
+from app.services.recommendations import record_interactions
+from app.services.typeahead import publish_delete, publish_upsert
+
+
+router = APIRouter()
+
+# Clients must revalidate, which costs them a 304 while nothing changed
+CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+
+def _get_game_or_404(db: Session, game_id: UUID):
+    game = get_game(db, game_id)
+    if game is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=GAME_NOT_FOUND,
+        )
+    return game
+
+
+def _check_image_upload(db: Session, upload_id: Optional[UUID]):
+    if upload_id is None:
+        return
+    upload = get_upload(db, upload_id)
+    if upload is None or not is_image(upload.content_type):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_GAME_IMAGE,
+        )
+
+
+def _games_out(games: list[Game]) -> list[GameOut]:
+    """
+    Games as responses, with the variant URLs of their cover images looked
+    up for all of them at once.
+    """
+    images = image_variants([game.image_upload for game in games if game.image_upload is not None])
+    adapter = type_adapter(GameOut)
+    items = []
+    for game in games:
+        item = adapter.validate_python(game, from_attributes=True)
+        if game.image_upload is not None:
+            item.images = images[game.image_upload.id]
+        items.append(item)
+    return items
+
+
+@router.get("", response_model=GamePage)
+def read_games(
+    request: Request,
+    sort: GameSort = GameSort.title,
+    genre: Optional[str] = None,
+    players: Optional[int] = Query(None, ge=1),
+    min_rating: Optional[float] = Query(None, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    List games, filtered and sorted, one keyset page at a time.
+    Pass the returned `next_cursor` to fetch the following page.
+    """
+    # The ETag only depends on the catalog version and the query, so an
+    # unchanged page is answered without touching the database
+    etag = collection_etag(request, GAMES_SCOPE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, CACHE_HEADERS)
+
+    games = list_games(
+        db,
+        sort=sort,
+        after=decode_cursor(cursor, sort.value, sort_key_types(sort)),
+        limit=limit,
+        genre=genre,
+        players=players,
+        min_rating=min_rating,
+    )
+    next_cursor = None
+    if len(games) > limit:
+        games = games[:limit]
+        next_cursor = encode_cursor(sort.value, sort_key(games[-1], sort))
+    return model_response(
+        GamePage,
+        {"items": _games_out(games), "next_cursor": next_cursor},
+        headers={"ETag": etag, **CACHE_HEADERS},
+    )
+
+
+@router.get("/{game_id}", response_model=GameOut)
+def read_game(game_id: UUID, request: Request, db: Session = Depends(get_db)):
+    """
+    Get a single game.
+    """
+    etag = collection_etag(request, GAMES_SCOPE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, CACHE_HEADERS)
+    game = _get_game_or_404(db, game_id)
+    return model_response(GameOut, _games_out([game])[0], headers={"ETag": etag, **CACHE_HEADERS})
+
+
+@router.post("", response_model=GameOut, status_code=status.HTTP_201_CREATED)
+def add_game(
+    game_data: GameCreate,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Add a game to the directory (admin only).
+    """
+    _check_image_upload(db, game_data.image_upload_id)
+    game = create_game(db, **game_data.model_dump())
+    bump_version(GAMES_SCOPE)
+    publish_upsert("games", game)
+    return model_response(GameOut, _games_out([game])[0], status_code=status.HTTP_201_CREATED)
+
+
+@router.put("/{game_id}", response_model=GameOut)
+def edit_game(
+    game_id: UUID,
+    game_data: GameUpdate,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Update a game (admin only).
+    """
+    game = _get_game_or_404(db, game_id)
+    fields = game_data.model_dump(exclude_none=True)
+    # Validate the resulting player range as a whole
+    min_players = fields.get("min_players", game.min_players)
+    max_players = fields.get("max_players", game.max_players)
+    if max_players < min_players:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_PLAYER_RANGE,
+        )
+    _check_image_upload(db, fields.get("image_upload_id"))
+    game = update_game(db, game, **fields)
+    bump_version(GAMES_SCOPE)
+    publish_upsert("games", game)
+    return model_response(GameOut, _games_out([game])[0])
+
+
+@router.delete("/{game_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_game(
+    game_id: UUID,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Delete a game (admin only).
+    """
+    game = _get_game_or_404(db, game_id)
+    delete_game(db, game)
+    bump_version(GAMES_SCOPE)
+    publish_delete("games", game_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{game_id}/ratings", response_model=RatingSummary)
+def read_game_ratings(game_id: UUID, request: Request, db: Session = Depends(get_db)):
+    """
+    Get a game's rating summary, read from its precomputed aggregate.
+    """
+    etag = collection_etag(request, GAMES_SCOPE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, CACHE_HEADERS)
+    game = _get_game_or_404(db, game_id)
+    stats = get_rating_stats(db, game_id)
+    histogram = stats.histogram if stats else [0] * (MAX_SCORE - MIN_SCORE + 1)
+    count = stats.rating_count if stats else 0
+    summary = {
+        "game_id": game_id,
+        "rating_count": count,
+        "average": stats.rating_sum / count if count else None,
+        "weighted_score": game.rating,
+        "histogram": histogram,
+    }
+    return model_response(RatingSummary, summary, headers={"ETag": etag, **CACHE_HEADERS})
+
+
+@router.get("/{game_id}/similar", response_model=SimilarGames)
+def read_similar_games(
+    game_id: UUID,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the games most often rated and played by the same people, read from
+    the precomputed list.
+    """
+    _get_game_or_404(db, game_id)
+    similarities = get_similarities(db, game_id)
+    if similarities is None:
+        return model_response(SimilarGames, {"items": []})
+    scores = dict(zip(similarities.similar_ids, similarities.scores))
+    games = get_games(db, similarities.similar_ids[:limit])
+    items = [{"game": out, "score": scores[game.id]} for game, out in zip(games, _games_out(games))]
+    return model_response(SimilarGames, {"items": items, "computed_at": similarities.computed_at})
+
+
+@router.put("/{game_id}/rating", response_model=RatingOut)
+def rate_game(
+    game_id: UUID,
+    rating_data: RatingIn,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Rate a game, or change the current user's rating of it.
+    """
+    rating = set_rating(db, game_id, current_user.id, rating_data.score)
+    if rating is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=GAME_NOT_FOUND,
+        )
+    bump_version(GAMES_SCOPE)
+    record_interactions([(current_user.id, game_id)])
+    publish_upsert("games", get_game(db, game_id))
+    return model_response(RatingOut, rating)
+
+
+@router.get("/{game_id}/rating", response_model=RatingOut)
+def read_my_rating(
+    game_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the current user's rating of a game.
+    """
+    rating = get_rating(db, game_id, current_user.id)
+    if rating is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=RATING_NOT_FOUND,
+        )
+    return model_response(RatingOut, rating)
+
+
+@router.delete("/{game_id}/rating", status_code=status.HTTP_204_NO_CONTENT)
+def unrate_game(
+    game_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Remove the current user's rating of a game.
+    """
+    if not delete_rating(db, game_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=RATING_NOT_FOUND,
+        )
+    bump_version(GAMES_SCOPE)
+    record_interactions([(current_user.id, game_id)])
+    publish_upsert("games", get_game(db, game_id))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
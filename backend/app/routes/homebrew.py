@@ -0,0 +1,249 @@
+# app/routes/homebrew.py
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.messages import (
+    HOMEBREW_NOT_FOUND,
+    HOMEBREW_REVISION_CONFLICT,
+    HOMEBREW_TOO_LARGE,
+    NOT_HOMEBREW_OWNER,
+    REVISION_NOT_FOUND
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_user
+from app.core.serialization import model_response
+from app.database.crud_homebrew import (
+    create_document,
+    delete_document,
+    get_document,
+    get_revision,
+    get_revision_text,
+    list_documents,
+    list_revisions,
+    update_document
+)
+from app.database.database import get_db
+from app.models.homebrew import HomebrewDocument
+from app.models.user import User
+from app.schemas.homebrew import (
+    HomebrewCreate,
+    HomebrewOut,
+    HomebrewPage,
+    HomebrewUpdate,
+    RevisionContent,
+    RevisionDiff,
+    RevisionPage
+)
+from app.services.duplicates import index_document
+from app.services.feed import ACTIVITY_HOMEBREW_CREATED, publish_activity
+from app.services.revisions import unified_diff
+
+
+router = APIRouter()
+
+CURSOR_KIND = "homebrew"
+REVISIONS_CURSOR_KIND = "homebrew_revisions"
+
+
+def _get_document_or_404(db: Session, document_id: UUID) -> HomebrewDocument:
+    document = get_document(db, document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=HOMEBREW_NOT_FOUND,
+        )
+    return document
+
+
+def _check_owner(document: HomebrewDocument, user: User, allow_admin: bool = False):
+    if document.owner_id != user.id and not (allow_admin and user.is_admin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_HOMEBREW_OWNER,
+        )
+
+
+def _check_size(content: Optional[str]):
+    if content is not None and len(content.encode()) > settings.HOMEBREW_MAX_DOCUMENT_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=HOMEBREW_TOO_LARGE,
+        )
+
+
+def _revision_text_or_404(db: Session, document: HomebrewDocument, revision: int) -> str:
+    if revision == document.revision:
+        return document.content
+    text = get_revision_text(db, document.id, revision) if 1 <= revision < document.revision else None
+    if text is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=REVISION_NOT_FOUND,
+        )
+    return text
+
+
+@router.post("", response_model=HomebrewOut, status_code=status.HTTP_201_CREATED)
+def add_document(
+    document_data: HomebrewCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create a homebrew document at revision 1.
+    """
+    _check_size(document_data.content)
+    document = create_document(db, current_user.id, document_data.title, document_data.content)
+    index_document(db, document)
+    publish_activity(
+        db, ACTIVITY_HOMEBREW_CREATED, current_user.id, "homebrew", document.id, {"title": document.title}
+    )
+    return model_response(HomebrewOut, document, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("", response_model=HomebrewPage)
+def read_documents(
+    owner_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    List a user's homebrew documents, newest first, without their text.
+    """
+    documents = list_documents(db, owner_id, after=decode_cursor(cursor, CURSOR_KIND, (datetime, UUID)), limit=limit)
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor(CURSOR_KIND, (documents[-1].created_at, documents[-1].id))
+    return model_response(HomebrewPage, {"items": documents, "next_cursor": next_cursor})
+
+
+@router.get("/{document_id}", response_model=HomebrewOut)
+def read_document(document_id: UUID, db: Session = Depends(get_db)):
+    """
+    Get a homebrew document at its current revision.
+    """
+    return model_response(HomebrewOut, _get_document_or_404(db, document_id))
+
+
+@router.put("/{document_id}", response_model=HomebrewOut)
+def edit_document(
+    document_id: UUID,
+    document_data: HomebrewUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Update a homebrew document (owner only). New text is saved as the next
+    revision; pass base_revision to refuse overwriting someone else's edit.
+    """
+    _check_owner(_get_document_or_404(db, document_id), current_user)
+    _check_size(document_data.content)
+    document = update_document(
+        db,
+        document_id,
+        current_user.id,
+        content=document_data.content,
+        title=document_data.title,
+        base_revision=document_data.base_revision,
+    )
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=HOMEBREW_REVISION_CONFLICT,
+        )
+    if document_data.content is not None:
+        index_document(db, document)
+    return model_response(HomebrewOut, document)
+
+
+@router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_document(
+    document_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delete a homebrew document and its history (owner or admin only).
+    """
+    document = _get_document_or_404(db, document_id)
+    _check_owner(document, current_user, allow_admin=True)
+    delete_document(db, document)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{document_id}/revisions", response_model=RevisionPage)
+def read_revisions(
+    document_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    List a document's revisions, newest first.
+    """
+    _get_document_or_404(db, document_id)
+    after = decode_cursor(cursor, REVISIONS_CURSOR_KIND, (int,))
+    revisions = list_revisions(db, document_id, before=after[0] if after else None, limit=limit)
+    next_cursor = None
+    if len(revisions) > limit:
+        revisions = revisions[:limit]
+        next_cursor = encode_cursor(REVISIONS_CURSOR_KIND, (revisions[-1].revision,))
+    return model_response(RevisionPage, {"items": revisions, "next_cursor": next_cursor})
+
+
+@router.get("/{document_id}/revisions/{revision}", response_model=RevisionContent)
+def read_revision(document_id: UUID, revision: int, db: Session = Depends(get_db)):
+    """
+    Get the text of a document as of a revision.
+    """
+    document = _get_document_or_404(db, document_id)
+    content = _revision_text_or_404(db, document, revision)
+    stored = get_revision(db, document_id, revision)
+    return model_response(
+        RevisionContent,
+        {"revision": revision, "content": content, "author_id": stored.author_id, "created_at": stored.created_at},
+    )
+
+
+@router.get("/{document_id}/diff", response_model=RevisionDiff)
+def diff_revisions(
+    document_id: UUID,
+    from_revision: int = Query(..., alias="from", ge=1),
+    to_revision: Optional[int] = Query(None, alias="to", ge=1, description="Defaults to the current revision"),
+    context: int = Query(3, ge=0, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Unified diff between two revisions of a document, in either order.
+    Lines are matched in linear time, so large repetitive documents diff
+    as fast as any.
+    """
+    document = _get_document_or_404(db, document_id)
+    to_revision = to_revision or document.revision
+    old = _revision_text_or_404(db, document, from_revision).splitlines(keepends=True)
+    new = _revision_text_or_404(db, document, to_revision).splitlines(keepends=True)
+    lines = list(unified_diff(
+        old,
+        new,
+        fromfile=f"revision {from_revision}",
+        tofile=f"revision {to_revision}",
+        context=context,
+    ))
+    changes = [line[0] for line in lines[2:] if not line.startswith("@@")]
+    return model_response(
+        RevisionDiff,
+        {
+            "from_revision": from_revision,
+            "to_revision": to_revision,
+            "lines_added": changes.count("+"),
+            "lines_removed": changes.count("-"),
+            "diff": "".join(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n" for line in lines),
+        },
+    )
@@ -0,0 +1,136 @@
+# app/routes/live.py
+
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.messages import INVALID_LIVE_REQUEST, INVALID_LIVE_TOPIC, TOO_MANY_LIVE_TOPICS
+from app.core.security import user_from_token
+from app.database.database import SessionLocal
+from app.models.user import User
+from app.services.live import CLOSE, HEARTBEAT, LiveClient, live_hub, parse_topic, sse_frames
+
+
+router = APIRouter()
+
+
+def _authenticate(authorization: Optional[str], token: Optional[str]) -> User:
+    """
+    The user of a bearer token from the Authorization header or, for
+    clients that cannot set headers (EventSource, browser WebSockets),
+    from the `token` query parameter. The session is closed right away
+    rather than held for the life of the connection.
+    """
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    db = SessionLocal()
+    try:
+        return user_from_token(db, token or "")
+    finally:
+        db.close()
+
+
+def _parse_topics(topics: list[str]) -> list[str]:
+    parsed = [parse_topic(topic) for topic in topics]
+    if None in parsed:
+        raise ValueError(INVALID_LIVE_TOPIC)
+    return parsed
+
+
+@router.get("/stream")
+async def stream_updates(
+    request: Request,
+    topics: list[str] = Query(..., description="events:<id> or games:<id>, repeated"),
+    token: Optional[str] = None
+):
+    """
+    Follow games and events over Server-Sent Events. Each update is sent
+    as `data: {"topic", "type", "data"}`; comment lines keep idle
+    connections open. Clients that fall behind are disconnected and
+    should reconnect.
+    """
+    await run_in_threadpool(_authenticate, request.headers.get("authorization"), token)
+    try:
+        parsed = set(_parse_topics(topics))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=INVALID_LIVE_TOPIC,
+        )
+    if len(parsed) > settings.LIVE_MAX_TOPICS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=TOO_MANY_LIVE_TOPICS,
+        )
+    client = live_hub.connect()
+    for topic in parsed:
+        live_hub.follow(client, topic)
+    return StreamingResponse(
+        sse_frames(client),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _receive_requests(websocket: WebSocket, client: LiveClient):
+    """
+    Apply the client's {"action": "subscribe" | "unsubscribe", "topics"}
+    requests, answering each with the topics now followed or an error.
+    """
+    while True:
+        try:
+            request = json.loads(await websocket.receive_text())
+            action, topics = request["action"], _parse_topics(request["topics"])
+            if action not in ("subscribe", "unsubscribe"):
+                raise ValueError(INVALID_LIVE_REQUEST)
+        except WebSocketDisconnect:
+            return
+        except (ValueError, KeyError, TypeError) as error:
+            detail = str(error) if str(error) == INVALID_LIVE_TOPIC else INVALID_LIVE_REQUEST
+            live_hub.send(client, json.dumps({"type": "error", "detail": detail}))
+            continue
+        if action == "subscribe":
+            if not all([live_hub.follow(client, topic) for topic in topics]):
+                live_hub.send(client, json.dumps({"type": "error", "detail": TOO_MANY_LIVE_TOPICS}))
+        else:
+            for topic in topics:
+                live_hub.unfollow(client, topic)
+        live_hub.send(client, json.dumps({"type": "subscribed", "topics": sorted(client.topics)}))
+
+
+async def _send_updates(websocket: WebSocket, client: LiveClient):
+    while True:
+        item = await client.queue.get()
+        if item is CLOSE:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+        if item is not HEARTBEAT:
+            await websocket.send_text(item)
+
+
+@router.websocket("/ws")
+async def live_socket(websocket: WebSocket, token: Optional[str] = None):
+    """
+    Follow games and events over a WebSocket, subscribing and
+    unsubscribing with {"action", "topics"} messages.
+    """
+    try:
+        await run_in_threadpool(_authenticate, websocket.headers.get("authorization"), token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    client = live_hub.connect()
+    receiver = asyncio.create_task(_receive_requests(websocket, client))
+    sender = asyncio.create_task(_send_updates(websocket, client))
+    try:
+        # Whichever ends first, the client leaving or being dropped
+        await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        receiver.cancel()
+        sender.cancel()
+        live_hub.disconnect(client)
@@ -0,0 +1,99 @@
+# app/routes/notifications.py
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.messages import NOTIFICATION_NOT_FOUND
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_user
+from app.core.serialization import model_response
+from app.database.crud_notifications import list_notifications
+from app.database.database import get_db
+from app.models.user import User
+from app.schemas.notification import (
+    NotificationPage,
+    NotificationsMarked,
+    NotificationsRead,
+    UnreadCount
+)
+from app.services.notifications import mark_all_read, mark_read, unread_count
+
+
+router = APIRouter()
+
+CURSOR_KIND = "notifications"
+
+
+@router.get("", response_model=NotificationPage)
+def read_notifications(
+    unread: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List the current user's notifications, newest first, optionally only
+    the unread ones.
+    """
+    notifications = list_notifications(
+        db,
+        current_user.id,
+        before=decode_cursor(cursor, CURSOR_KIND, (datetime, UUID)),
+        limit=limit,
+        unread=unread,
+    )
+    next_cursor = None
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        next_cursor = encode_cursor(CURSOR_KIND, (notifications[-1].created_at, notifications[-1].id))
+    return model_response(
+        NotificationPage,
+        {"items": notifications, "next_cursor": next_cursor, "unread": unread_count(db, current_user.id)},
+    )
+
+
+@router.get("/unread", response_model=UnreadCount)
+def read_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the number of unread notifications of the current user.
+    """
+    return model_response(UnreadCount, {"unread": unread_count(db, current_user.id)})
+
+
+@router.post("/read", response_model=NotificationsMarked)
+def read_all_notifications(
+    read_data: Optional[NotificationsRead] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Mark the current user's notifications read, all or those created up
+    to a given time.
+    """
+    until = read_data.until if read_data is not None else None
+    marked = mark_all_read(db, current_user.id, until)
+    return model_response(NotificationsMarked, {"marked": marked, "unread": unread_count(db, current_user.id)})
+
+
+@router.post("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
+def read_notification(
+    notification_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Mark one of the current user's notifications read.
+    """
+    if mark_read(db, current_user.id, notification_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=NOTIFICATION_NOT_FOUND,
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
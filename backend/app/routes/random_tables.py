@@ -0,0 +1,157 @@
+# app/routes/random_tables.py
+
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.messages import (
+    NOT_RANDOM_TABLE_OWNER,
+    RANDOM_TABLE_CYCLE,
+    RANDOM_TABLE_IN_USE,
+    RANDOM_TABLE_NOT_FOUND,
+    RANDOM_TABLE_TOO_DEEP,
+    TOO_MANY_TABLE_RESULTS,
+    UNKNOWN_NESTED_TABLE
+)
+from app.core.security import get_current_user
+from app.core.serialization import model_response
+from app.database.crud_random_tables import (
+    TableCycle,
+    TableGraphTooLarge,
+    UnknownTableReference,
+    delete_table,
+    get_table,
+    save_table
+)
+from app.database.database import get_db
+from app.models.random_table import RandomTable
+from app.models.user import User
+from app.schemas.random_table import RandomTableCreate, RandomTableOut, RandomTableUpdate, TableRolls
+from app.services.random_tables import ResultsTooLarge, compile_table, compiled_tables, roll_table
+
+
+router = APIRouter()
+
+
+def _get_table_or_404(db: Session, table_id: UUID) -> RandomTable:
+    table = get_table(db, table_id)
+    if table is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=RANDOM_TABLE_NOT_FOUND,
+        )
+    return table
+
+
+def _save(db: Session, table: Optional[RandomTable], owner_id: UUID, fields: dict) -> RandomTable:
+    try:
+        table = save_table(db, table, owner_id, **fields)
+    except UnknownTableReference:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=UNKNOWN_NESTED_TABLE,
+        )
+    except TableCycle:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=RANDOM_TABLE_CYCLE,
+        )
+    except TableGraphTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=RANDOM_TABLE_TOO_DEEP,
+        )
+    # Compile on save so this worker's first roll is already warm
+    compiled_tables.put(compile_table(table.id, table.version, table.entries))
+    return table
+
+
+@router.post("", response_model=RandomTableOut, status_code=status.HTTP_201_CREATED)
+def add_table(
+    table_data: RandomTableCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create a weighted random table. Entries with a table_id roll on that
+    table, e.g. {"text": "A chest holding {}", "table_id": ...}.
+    """
+    table = _save(db, None, current_user.id, table_data.model_dump(mode="json"))
+    return model_response(RandomTableOut, table, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("/{table_id}", response_model=RandomTableOut)
+def read_table(table_id: UUID, db: Session = Depends(get_db)):
+    """
+    Get a random table.
+    """
+    return model_response(RandomTableOut, _get_table_or_404(db, table_id))
+
+
+@router.put("/{table_id}", response_model=RandomTableOut)
+def edit_table(
+    table_id: UUID,
+    table_data: RandomTableUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Update a random table (owner only).
+    """
+    table = _get_table_or_404(db, table_id)
+    if table.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_RANDOM_TABLE_OWNER,
+        )
+    table = _save(db, table, table.owner_id, table_data.model_dump(mode="json", exclude_none=True))
+    return model_response(RandomTableOut, table)
+
+
+@router.delete("/{table_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_table(
+    table_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delete a random table (owner or admin only). Tables other tables roll
+    on cannot be deleted.
+    """
+    table = _get_table_or_404(db, table_id)
+    if table.owner_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_RANDOM_TABLE_OWNER,
+        )
+    if not delete_table(db, table):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=RANDOM_TABLE_IN_USE,
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{table_id}/roll", response_model=TableRolls)
+def roll_on_table(
+    table_id: UUID,
+    count: int = Query(1, ge=1, le=settings.RANDOM_TABLES_MAX_ROLLS),
+    seed: Optional[int] = Query(None, ge=0, description="Seed for reproducible rolls"),
+    db: Session = Depends(get_db)
+):
+    """
+    Roll on a table `count` times, resolving nested tables. All rolls are
+    drawn in one vectorized pass per table. Batches whose results could
+    exceed RANDOM_TABLES_MAX_RESULT_CHARS are refused.
+    """
+    table = _get_table_or_404(db, table_id)
+    try:
+        results = roll_table(db, table.id, count, seed)
+    except ResultsTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=TOO_MANY_TABLE_RESULTS,
+        )
+    return model_response(TableRolls, {"table_id": table.id, "version": table.version, "results": results})
@@ -0,0 +1,60 @@
+# app/routes/search.py
+
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.messages import UNKNOWN_SEARCH_TYPE
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import JSON_MEDIA_TYPE, dump_model_json
+from app.database.database import get_db
+from app.schemas.search import SearchPage
+from app.services.search import (
+    SEARCH_SOURCES,
+    cache_results,
+    get_cached_results,
+    normalize_query,
+    search
+)
+
+
+router = APIRouter()
+
+CURSOR_KIND = "search"
+
+
+@router.get("", response_model=SearchPage)
+def search_content(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: list[str] = Query(default=[]),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search across games and events, best
+    matches first, with highlighted snippets.
+    """
+    types = sorted(set(types)) or sorted(SEARCH_SOURCES)
+    unknown = [t for t in types if t not in SEARCH_SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=UNKNOWN_SEARCH_TYPE,
+        )
+    query = normalize_query(q)
+
+    cached = get_cached_results(query, types, cursor, limit)
+    if cached is not None:
+        return Response(content=cached, media_type=JSON_MEDIA_TYPE)
+
+    rows = search(db, query, types, after=decode_cursor(cursor, CURSOR_KIND, (float, UUID)), limit=limit)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(CURSOR_KIND, (rows[-1]["rank"], rows[-1]["id"]))
+
+    body = dump_model_json(SearchPage, {"items": rows, "next_cursor": next_cursor})
+    cache_results(query, types, cursor, limit, body)
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
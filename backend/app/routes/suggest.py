@@ -0,0 +1,35 @@
+# app/routes/suggest.py
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.messages import UNKNOWN_SUGGESTION_TYPE
+from app.core.serialization import model_response
+from app.schemas.typeahead import Suggestion
+from app.services.typeahead import TYPEAHEAD_SOURCES, typeahead
+
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[Suggestion])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    types: list[str] = Query(default=[]),
+    limit: int = Query(5, ge=1, le=settings.TYPEAHEAD_MAX_RESULTS)
+):
+    """
+    Typeahead suggestions for names starting with `q`, most popular first.
+    Served from this worker's in-memory index, never from the database.
+    """
+    types = sorted(set(types)) or sorted(TYPEAHEAD_SOURCES)
+    if any(t not in TYPEAHEAD_SOURCES for t in types):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=UNKNOWN_SUGGESTION_TYPE,
+        )
+    # Normally built on startup; covers workers started without the lifespan
+    if not typeahead.built:
+        await run_in_threadpool(typeahead.ensure_built)
+    return model_response(list[Suggestion], typeahead.suggest(q, types, limit))
@@ -0,0 +1,232 @@
+# app/routes/uploads.py
+
+import os
+import posixpath
+from datetime import datetime
+from typing import Optional
+from urllib.parse import quote
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.downloads import file_download
+from app.core.messages import (
+    INVALID_UPLOAD_FILENAME,
+    NOT_UPLOAD_OWNER,
+    UPLOAD_NOT_FOUND,
+    UPLOAD_QUOTA_EXCEEDED,
+    UPLOAD_TOO_LARGE,
+    VARIANT_NOT_FOUND
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import get_current_user
+from app.core.serialization import model_response
+from app.core.storage import BlobWriter, UploadTooLarge, blob_path
+from app.database.crud_uploads import create_upload, delete_upload, get_upload, get_used_bytes, list_uploads
+from app.database.database import get_db
+from app.models.upload import Upload
+from app.models.user import User
+from app.schemas.upload import StorageQuota, UploadOut, UploadPage
+from app.services.images import (
+    VARIANT_FORMATS,
+    VARIANT_SIZES,
+    enqueue_variants,
+    remove_variants,
+    variant_path,
+    variants_ready
+)
+
+
+router = APIRouter()
+
+CURSOR_KIND = "uploads"
+
+# Content behind an upload id never changes
+DOWNLOAD_CACHE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+
+def _get_upload_or_404(db: Session, upload_id: UUID) -> Upload:
+    upload = get_upload(db, upload_id)
+    if upload is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=UPLOAD_NOT_FOUND,
+        )
+    return upload
+
+
+def _clean_filename(filename: str) -> str:
+    # Keep the last path component only, whatever the client's separator
+    name = posixpath.basename(filename.replace("\\", "/")).strip()
+    if not name or name in (".", "..") or any(ord(c) < 32 for c in name):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_UPLOAD_FILENAME,
+        )
+    return name
+
+
+def _too_large(over_quota: bool) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=UPLOAD_QUOTA_EXCEEDED if over_quota else UPLOAD_TOO_LARGE,
+    )
+
+
+@router.post("", response_model=UploadOut, status_code=status.HTTP_201_CREATED)
+async def upload_file(
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload a file sent as the raw request body, with its type in the
+    Content-Type header. The body is streamed to disk and hashed on the
+    way; identical files are stored once.
+    """
+    filename = _clean_filename(filename)
+    content_type = request.headers.get("content-type", "application/octet-stream")[:100]
+    remaining = settings.UPLOAD_QUOTA_BYTES - await run_in_threadpool(get_used_bytes, db, current_user.id)
+    limit = min(settings.UPLOAD_MAX_BYTES, remaining)
+    over_quota = remaining < settings.UPLOAD_MAX_BYTES
+    # Reject a declared oversize body before reading any of it
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise _too_large(over_quota)
+
+    writer = await run_in_threadpool(BlobWriter, max(limit, 0))
+    try:
+        buffer = bytearray()
+        async for chunk in request.stream():
+            buffer += chunk
+            if len(buffer) >= settings.UPLOAD_CHUNK_SIZE:
+                await run_in_threadpool(writer.write, bytes(buffer))
+                buffer.clear()
+        await run_in_threadpool(writer.write, bytes(buffer))
+        await run_in_threadpool(writer.finish)
+        upload = await run_in_threadpool(
+            create_upload,
+            db,
+            owner_id=current_user.id,
+            writer=writer,
+            filename=filename,
+            content_type=content_type,
+            quota=settings.UPLOAD_QUOTA_BYTES,
+        )
+    except UploadTooLarge:
+        raise _too_large(over_quota)
+    finally:
+        # No-op once the file has been moved into the blob store
+        await run_in_threadpool(writer.discard)
+    if upload is None:
+        # Another upload used up the quota in the meantime
+        raise _too_large(True)
+    await run_in_threadpool(enqueue_variants, upload.sha256, upload.content_type)
+    return model_response(UploadOut, upload, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("", response_model=UploadPage)
+def read_my_uploads(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List the current user's uploads, newest first.
+    """
+    uploads = list_uploads(db, current_user.id, after=decode_cursor(cursor, CURSOR_KIND, (datetime, UUID)), limit=limit)
+    next_cursor = None
+    if len(uploads) > limit:
+        uploads = uploads[:limit]
+        next_cursor = encode_cursor(CURSOR_KIND, (uploads[-1].created_at, uploads[-1].id))
+    return model_response(UploadPage, {"items": uploads, "next_cursor": next_cursor})
+
+
+@router.get("/quota", response_model=StorageQuota)
+def read_my_quota(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the current user's storage use and quota.
+    """
+    return model_response(
+        StorageQuota,
+        {"used_bytes": get_used_bytes(db, current_user.id), "quota_bytes": settings.UPLOAD_QUOTA_BYTES},
+    )
+
+
+@router.get("/{upload_id}", response_model=UploadOut)
+def read_upload(upload_id: UUID, db: Session = Depends(get_db)):
+    """
+    Get an upload's metadata.
+    """
+    return model_response(UploadOut, _get_upload_or_404(db, upload_id))
+
+
+@router.get("/{upload_id}/content")
+def download_upload(upload_id: UUID, request: Request, db: Session = Depends(get_db)):
+    """
+    Download an upload. Supports single byte ranges (resuming, seeking in
+    PDFs) and revalidation by ETag, which is the content's SHA-256.
+    """
+    upload = _get_upload_or_404(db, upload_id)
+    return file_download(
+        request,
+        blob_path(upload.sha256),
+        size=upload.size,
+        etag=f'"{upload.sha256}"',
+        media_type=upload.content_type,
+        headers={
+            "Content-Disposition": f"attachment; filename*=utf-8''{quote(upload.filename)}",
+            **DOWNLOAD_CACHE_HEADERS,
+        },
+    )
+
+
+@router.get("/{upload_id}/variants/{variant_name}")
+def download_variant(upload_id: UUID, variant_name: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Download a rendered variant of an image upload, e.g. "thumb.webp".
+    """
+    upload = _get_upload_or_404(db, upload_id)
+    variant, _, extension = variant_name.partition(".")
+    if variant not in VARIANT_SIZES or extension not in VARIANT_FORMATS or not variants_ready(upload.sha256):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=VARIANT_NOT_FOUND,
+        )
+    path = variant_path(upload.sha256, variant, extension)
+    return file_download(
+        request,
+        path,
+        size=os.path.getsize(path),
+        etag=f'"{upload.sha256[:32]}-{variant_name}"',
+        media_type="image/webp" if extension == "webp" else "image/jpeg",
+        headers=DOWNLOAD_CACHE_HEADERS,
+    )
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_upload(
+    upload_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delete an upload (owner or admin only), returning its size to the
+    owner's quota.
+    """
+    upload = _get_upload_or_404(db, upload_id)
+    if upload.owner_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=NOT_UPLOAD_OWNER,
+        )
+    if delete_upload(db, upload):
+        remove_variants(upload.sha256)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
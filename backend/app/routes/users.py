@@ -1,14 +1,25 @@
 # app/routes/users.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.core.messages import EMAIL_ALREADY_REGISTERED, USERNAME_ALREADY_REGISTERED
+from app.core.config import settings
+from app.core.messages import (
+    CONTENT_BLOCKED,
+    EMAIL_ALREADY_REGISTERED,
+    TOO_MANY_USERS_REQUESTED,
+    USERNAME_ALREADY_REGISTERED
+)
 from app.core.security import get_current_user
+from app.core.serialization import model_response
 from app.database.crud import get_user_by_username, update_user
 from app.database.database import get_db
+from app.database.loaders import UserLoader, get_user_loader
 from app.models.user import User
-from app.schemas.user import UserOut, UserUpdate
+from app.schemas.user import UserOut, UserPublic, UserUpdate
+from app.services.moderation import ContentBlocked, record_flags, screen
+from app.services.typeahead import publish_upsert
 
 
 router = APIRouter()
@@ -16,7 +27,7 @@ router = APIRouter()
 @router.get("/profile", response_model=UserOut)
 def read_profile(current_user: User = Depends(get_current_user)):
     # Current user is already injected by the dependency
-    return current_user
+    return model_response(UserOut, current_user)
 
 @router.put("/profile", response_model=UserOut)
 def update_profile(
@@ -38,10 +49,41 @@ def update_profile(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=EMAIL_ALREADY_REGISTERED
             )
+    # Reject blocked words in the public profile fields
+    try:
+        moderation = screen({"username": updated_data.username, "full_name": updated_data.full_name})
+    except ContentBlocked:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=CONTENT_BLOCKED
+        )
     # Perform the update and persist
     user = update_user(
         db,
         current_user,
         **{k: v for k, v in updated_data.model_dump(exclude_none=True).items()}
     )
-    return user
\ No newline at end of file
+    record_flags(db, "users", user.id, moderation)
+    publish_upsert("users", user)
+    return model_response(UserOut, user)
+
+
+@router.get("/batch", response_model=list[UserPublic])
+async def read_users_batch(
+    ids: list[UUID] = Query(default=[]),
+    usernames: list[str] = Query(default=[]),
+    loader: UserLoader = Depends(get_user_loader),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Resolve many users by id and/or username with a single lookup.
+    Unknown users are omitted and duplicates are returned once.
+    """
+    if len(ids) + len(usernames) > settings.USER_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=TOO_MANY_USERS_REQUESTED
+        )
+    users = await loader.load_many(ids=ids, usernames=usernames)
+    unique = {user.id: user for user in users if user is not None}
+    return model_response(list[UserPublic], list(unique.values()))
\ No newline at end of file
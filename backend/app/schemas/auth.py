@@ -1,5 +1,6 @@
 # app/schemas/auth.py
 
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
 
@@ -17,4 +18,12 @@ class TokenRefreshRequest(BaseModel):
 class TokenPair(BaseModel):
     access_token: str
     refresh_token: str
-    token_type: str = 'bearer'
\ No newline at end of file
+    token_type: str = 'bearer'
+    
+class SessionOut(BaseModel):
+    session_id: str
+    created_at: datetime
+    expires_at: datetime
+    user_agent: Optional[str] = None
+    ip_address: Optional[str] = None
+    current: bool = False
\ No newline at end of file
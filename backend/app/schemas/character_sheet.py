@@ -0,0 +1,57 @@
+# app/schemas/character_sheet.py
+
+from datetime import datetime
+from typing import Any, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class CharacterSheetCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    data: dict[str, Any] = Field(default_factory=dict, description="The sheet document")
+
+
+class CharacterSheetSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    owner_id: UUID
+    name: str
+    version: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class CharacterSheetOut(CharacterSheetSummary):
+    data: dict[str, Any]
+
+
+class CharacterSheetPage(BaseModel):
+    items: list[CharacterSheetSummary]
+    next_cursor: Optional[str] = None
+
+
+class PatchOperation(BaseModel):
+    """
+    One JSON Patch (RFC 6902) operation.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str = Field(..., max_length=1000, description='JSON Pointer, e.g. "/hp/current"')
+    value: Any = None
+    from_: Optional[str] = Field(None, alias="from", max_length=1000)
+
+    @model_validator(mode="after")
+    def check_arguments(self):
+        if self.op in ("add", "replace", "test") and "value" not in self.model_fields_set:
+            raise ValueError(f"'{self.op}' requires a value")
+        if self.op in ("move", "copy") and self.from_ is None:
+            raise ValueError(f"'{self.op}' requires from")
+        return self
+
+
+class SheetVersion(BaseModel):
+    id: UUID
+    version: int
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,51 @@
+# app/schemas/comment.py
+
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.user import UserPublic
+
+
+class CommentCreate(BaseModel):
+    subject_type: Literal["games", "events"]
+    subject_id: UUID
+    parent_id: Optional[UUID] = Field(None, description="Comment being replied to")
+    body: str = Field(..., min_length=1, max_length=10_000)
+
+
+class CommentUpdate(BaseModel):
+    body: str = Field(..., min_length=1, max_length=10_000)
+
+
+class CommentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    subject_type: str
+    subject_id: UUID
+    parent_id: Optional[UUID] = None
+    depth: int
+    body: str
+    reply_count: int
+    is_deleted: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    # None once the comment is deleted
+    author: Optional[UserPublic] = None
+
+
+class CommentThread(CommentOut):
+    replies: list[CommentOut]
+    has_more_replies: bool
+
+
+class CommentThreadPage(BaseModel):
+    items: list[CommentThread]
+    next_cursor: Optional[str] = None
+
+
+class CommentPage(BaseModel):
+    items: list[CommentOut]
+    next_cursor: Optional[str] = None
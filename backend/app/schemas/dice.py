@@ -0,0 +1,34 @@
+# app/schemas/dice.py
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class DiceDistribution(BaseModel):
+    expression: str
+    min: int
+    max: int
+    mean: float
+    stddev: float
+    # Probability of each outcome from min to max
+    probabilities: list[float]
+    # Outcomes far in the tails of large expressions are reported as 0
+    truncated: bool = False
+    target: Optional[int] = None
+    # Probability of rolling the target or more, e.g. beating a DC
+    probability_at_least: Optional[float] = None
+
+
+class DiceRollRequest(BaseModel):
+    expressions: list[str] = Field(..., min_length=1, max_length=100)
+    count: int = Field(1, ge=1, le=10_000, description="Rolls of each expression")
+    seed: Optional[int] = Field(None, ge=0, description="Seed for reproducible rolls")
+
+
+class DiceRolls(BaseModel):
+    expression: str
+    rolls: list[int]
+
+
+class DiceRollResponse(BaseModel):
+    results: list[DiceRolls]
@@ -0,0 +1,103 @@
+# app/schemas/event.py
+
+from datetime import date, datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from pydantic import AwareDatetime, BaseModel, ConfigDict, Field, model_validator
+
+from app.core.config import settings
+
+
+class EventBase(BaseModel):
+    title: str = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Title of the event",
+    )
+    description: Optional[str] = None
+    location: Optional[str] = Field(None, max_length=200)
+    game_id: Optional[UUID] = None
+    starts_at: AwareDatetime
+    ends_at: AwareDatetime
+    capacity: Optional[int] = Field(None, ge=1, description="Seats, unlimited if omitted")
+
+    @model_validator(mode="after")
+    def check_time_range(self):
+        if self.ends_at <= self.starts_at:
+            raise ValueError("ends_at must be after starts_at")
+        if self.ends_at - self.starts_at > timedelta(days=settings.EVENTS_MAX_DURATION_DAYS):
+            raise ValueError(f"events cannot last more than {settings.EVENTS_MAX_DURATION_DAYS} days")
+        return self
+
+
+class EventCreate(EventBase):
+    pass
+
+
+class EventUpdate(BaseModel):
+    # Fields sent as null are cleared; omitted ones are left as they are
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    location: Optional[str] = Field(None, max_length=200)
+    game_id: Optional[UUID] = None
+    starts_at: Optional[AwareDatetime] = None
+    ends_at: Optional[AwareDatetime] = None
+    capacity: Optional[int] = Field(None, ge=1, description="Seats, unlimited if null")
+
+    @model_validator(mode="after")
+    def check_required_fields(self):
+        for name in ("title", "starts_at", "ends_at"):
+            if name in self.model_fields_set and getattr(self, name) is None:
+                raise ValueError(f"{name} cannot be null")
+        return self
+
+
+class EventOut(EventBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    organizer_id: UUID
+    rsvp_count: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class EventPage(BaseModel):
+    items: list[EventOut]
+    next_cursor: Optional[str] = None
+
+
+class CalendarEvent(BaseModel):
+    id: UUID
+    title: str
+    starts_at: datetime
+
+
+class CalendarDay(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    event_count: int
+    first_events: list[CalendarEvent]
+
+
+class CalendarMonth(BaseModel):
+    year: int
+    month: int
+    days: list[CalendarDay]
+
+
+class RsvpOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    event_id: UUID
+    user_id: UUID
+    status: str
+    created_at: datetime
+    promoted_at: Optional[datetime] = None
+
+
+class RsvpPage(BaseModel):
+    items: list[RsvpOut]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,35 @@
+# app/schemas/feed.py
+
+from datetime import datetime
+from typing import Any, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+FollowTargetType = Literal["users", "games"]
+
+
+class FeedItem(BaseModel):
+    id: UUID
+    kind: str
+    actor_id: UUID
+    subject_type: str
+    subject_id: UUID
+    # e.g. the title of new homebrew or an event
+    data: dict[str, Any]
+    created_at: datetime
+
+
+class FeedPage(BaseModel):
+    items: list[FeedItem]
+    next_cursor: Optional[str] = None
+
+
+class FollowOut(BaseModel):
+    target_type: FollowTargetType
+    target_id: UUID
+    follower_count: int
+
+
+class FollowList(BaseModel):
+    items: list[FollowOut]
@@ -0,0 +1,108 @@
+# app/schemas/game.py
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.models.rating import MAX_SCORE, MIN_SCORE
+
+
+class GameSort(str, Enum):
+    title = "title"
+    top_rated = "-rating"
+    newest = "-created_at"
+
+
+class GameBase(BaseModel):
+    title: str = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Title of the game",
+    )
+    description: Optional[str] = None
+    genre: str = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Genre of the game",
+    )
+    min_players: int = Field(1, ge=1)
+    max_players: int = Field(1, ge=1)
+    image_url: Optional[str] = Field(None, max_length=500)
+    image_upload_id: Optional[UUID] = Field(None, description="Uploaded cover image")
+
+    @model_validator(mode="after")
+    def check_player_range(self):
+        if self.max_players < self.min_players:
+            raise ValueError("max_players must be greater than or equal to min_players")
+        return self
+
+
+class GameCreate(GameBase):
+    pass
+
+
+class GameUpdate(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    genre: Optional[str] = Field(None, min_length=1, max_length=50)
+    min_players: Optional[int] = Field(None, ge=1)
+    max_players: Optional[int] = Field(None, ge=1)
+    image_url: Optional[str] = Field(None, max_length=500)
+    image_upload_id: Optional[UUID] = None
+
+
+class GameOut(GameBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    rating: float
+    rating_count: int
+    # Cover image variants by "<size>.<format>", the original until rendered
+    images: Optional[dict[str, str]] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class GamePage(BaseModel):
+    items: list[GameOut]
+    next_cursor: Optional[str] = None
+
+
+class SimilarGame(BaseModel):
+    game: GameOut
+    # Cosine similarity of who rated and played the two games, up to 1
+    score: float
+
+
+class SimilarGames(BaseModel):
+    items: list[SimilarGame]
+    # When the list was last computed, None if it has not been yet
+    computed_at: Optional[datetime] = None
+
+
+class RatingIn(BaseModel):
+    score: int = Field(..., ge=MIN_SCORE, le=MAX_SCORE)
+
+
+class RatingOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    game_id: UUID
+    user_id: UUID
+    score: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class RatingSummary(BaseModel):
+    game_id: UUID
+    rating_count: int
+    average: Optional[float] = None
+    # Bayesian-weighted score used for "top rated"
+    weighted_score: float
+    # Number of ratings of each score, lowest score first
+    histogram: list[int]
@@ -0,0 +1,101 @@
+# app/schemas/homebrew.py
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class HomebrewCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    content: str = ""
+
+
+class HomebrewUpdate(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    content: Optional[str] = None
+    base_revision: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Revision the edit was made against; rejected if it is no longer current",
+    )
+
+
+class HomebrewSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    owner_id: UUID
+    title: str
+    revision: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class HomebrewOut(HomebrewSummary):
+    content: str
+
+
+class HomebrewPage(BaseModel):
+    items: list[HomebrewSummary]
+    next_cursor: Optional[str] = None
+
+
+class RevisionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    revision: int
+    is_snapshot: bool
+    # Size of the text, and of what is stored for this revision
+    size: int
+    stored_size: int
+    author_id: Optional[UUID] = None
+    created_at: datetime
+
+
+class RevisionPage(BaseModel):
+    items: list[RevisionOut]
+    next_cursor: Optional[str] = None
+
+
+class RevisionContent(BaseModel):
+    revision: int
+    content: str
+    author_id: Optional[UUID] = None
+    created_at: datetime
+
+
+class RevisionDiff(BaseModel):
+    from_revision: int
+    to_revision: int
+    lines_added: int
+    lines_removed: int
+    # Unified diff of the two texts
+    diff: str
+
+
+class HomebrewRef(BaseModel):
+    id: UUID
+    title: str
+    owner_id: UUID
+
+
+class SimilarDocument(BaseModel):
+    document: HomebrewRef
+    # Estimated Jaccard similarity of the two texts' shingles
+    similarity: float
+
+
+class SimilarDocuments(BaseModel):
+    document_id: UUID
+    matches: list[SimilarDocument]
+
+
+class DuplicateClusterOut(BaseModel):
+    documents: list[HomebrewRef]
+    min_similarity: float
+
+
+class DuplicateClusters(BaseModel):
+    clusters: list[DuplicateClusterOut]
+    total: int
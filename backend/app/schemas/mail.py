@@ -0,0 +1,29 @@
+# app/schemas/mail.py
+
+from typing import Any, Optional
+from pydantic import BaseModel
+
+
+class DeadLetter(BaseModel):
+    id: str
+    template: str
+    to: str
+    attempts: int
+    # Last error, e.g. "SMTPRecipientsRefused: ..."
+    error: Optional[str] = None
+    # Unix time of the last attempt
+    failed_at: Optional[float] = None
+    values: dict[str, Any]
+
+
+class MailStatus(BaseModel):
+    queued: int
+    sending: int
+    retrying: int
+    dead: int
+    # Most recent first
+    dead_letters: list[DeadLetter]
+
+
+class MailRequeued(BaseModel):
+    requeued: int
@@ -0,0 +1,64 @@
+# app/schemas/moderation.py
+
+from datetime import datetime
+from typing import Annotated, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.core.config import settings
+
+
+class ModerationTermsCreate(BaseModel):
+    action: Literal["block", "flag"]
+    terms: list[Annotated[str, Field(min_length=1, max_length=200)]] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.MODERATION_MAX_TERMS_PER_REQUEST,
+        description="Words or phrases to add; a term already on the other list moves to this one",
+    )
+
+
+class ModerationTermOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    # Normalized, as matched
+    term: str
+    action: str
+    created_at: datetime
+
+
+class ModerationTermPage(BaseModel):
+    items: list[ModerationTermOut]
+    next_cursor: Optional[str] = None
+
+
+class ModerationCheck(BaseModel):
+    text: str = Field(..., max_length=10_000)
+
+
+class ModerationMatch(BaseModel):
+    term: str
+    action: str
+
+
+class ModerationCheckResult(BaseModel):
+    normalized: str
+    matches: list[ModerationMatch]
+
+
+class ModerationFlagOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    content_type: str
+    content_id: UUID
+    field: str
+    action: str
+    terms: list[str]
+    updated_at: datetime
+
+
+class ModerationFlagPage(BaseModel):
+    items: list[ModerationFlagOut]
+    next_cursor: Optional[str] = None
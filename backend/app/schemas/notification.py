@@ -0,0 +1,39 @@
+# app/schemas/notification.py
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+
+
+class NotificationOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    kind: str
+    actor_id: Optional[UUID] = None
+    subject_type: str
+    subject_id: UUID
+    data: dict[str, Any]
+    read_at: Optional[datetime] = None
+    created_at: datetime
+
+
+class NotificationPage(BaseModel):
+    items: list[NotificationOut]
+    next_cursor: Optional[str] = None
+    unread: int
+
+
+class UnreadCount(BaseModel):
+    unread: int
+
+
+class NotificationsRead(BaseModel):
+    # Only notifications created up to this time, e.g. the newest one shown
+    until: Optional[datetime] = None
+
+
+class NotificationsMarked(BaseModel):
+    marked: int
+    unread: int
@@ -0,0 +1,49 @@
+# app/schemas/random_table.py
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.core.config import settings
+
+
+class TableEntry(BaseModel):
+    weight: float = Field(1, gt=0, le=1e9)
+    text: str = Field(
+        "",
+        max_length=500,
+        description='Result text; for nested entries a template around "{}"',
+    )
+    table_id: Optional[UUID] = Field(None, description="Roll on this table instead")
+
+
+class RandomTableCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = None
+    entries: list[TableEntry] = Field(..., min_length=1, max_length=settings.RANDOM_TABLES_MAX_ENTRIES)
+
+
+class RandomTableUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    entries: Optional[list[TableEntry]] = Field(None, min_length=1, max_length=settings.RANDOM_TABLES_MAX_ENTRIES)
+
+
+class RandomTableOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    owner_id: UUID
+    name: str
+    description: Optional[str] = None
+    entries: list[TableEntry]
+    version: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class TableRolls(BaseModel):
+    table_id: UUID
+    version: int
+    results: list[str]
@@ -0,0 +1,18 @@
+# app/schemas/search.py
+
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    type: str
+    id: UUID
+    title: str
+    snippet: str
+    rank: float
+
+
+class SearchPage(BaseModel):
+    items: list[SearchResult]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,9 @@
+# app/schemas/typeahead.py
+
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    type: str
+    id: str
+    label: str
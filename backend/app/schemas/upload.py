@@ -0,0 +1,28 @@
+# app/schemas/upload.py
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+
+
+class UploadOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    owner_id: UUID
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    created_at: datetime
+
+
+class UploadPage(BaseModel):
+    items: list[UploadOut]
+    next_cursor: Optional[str] = None
+
+
+class StorageQuota(BaseModel):
+    used_bytes: int
+    quota_bytes: int
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class UserBase(BaseModel):
@@ -33,12 +33,19 @@ class UserUpdate(BaseModel):
         None,
         description="New email of the user",
     )
+    full_name: Optional[str] = Field(
+        None,
+        max_length=100,
+        description="New full name of the user",
+    )
     is_verified: Optional[bool] = Field(
         None,
         description="Mark the user as verified or not (admin use)",
     )
     
 class UserOut(UserBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     created_at: datetime
     updated_at: datetime
@@ -47,9 +54,19 @@ class UserOut(UserBase):
     verification_token: Optional[str]
     full_name: Optional[str]
     phone_number: Optional[str]
-    
-    class Config:
-        orm_mode = True
+    last_login_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+
+class UserPublic(BaseModel):
+    """
+    Public view of a user, safe to embed in other users' responses.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    username: str
+    full_name: Optional[str] = None
+    created_at: datetime
         
         
 class Token(BaseModel):
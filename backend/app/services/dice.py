@@ -0,0 +1,433 @@
+# app/services/dice.py
+
+"""
+Dice expressions with exact outcome distributions.
+
+An expression is a sum of dice groups and constants, e.g. "4d6dl1 + 2",
+"2d20kh1", "3d6! - 1d4", "4dF" or "8d10r<2". Group modifiers:
+
+    kh N / k N    keep the N highest dice     kl N    keep the N lowest
+    dh N          drop the N highest          dl N / d N    drop the N lowest
+    !             explode: a die showing its maximum is rolled again and added
+    r X / ro X    reroll dice showing X until they do not / once; X may be
+                  prefixed with <, <=, > or >=
+
+A distribution is a probability array over consecutive integer values
+starting at an offset, i.e. the coefficients of a generating polynomial.
+Summing independent groups multiplies their polynomials (convolution), n
+identical dice are one polynomial raised to the n-th power by repeated
+squaring, and keep/drop is a dynamic program over face values that counts
+how many dice show each face. Nothing is simulated: rolls are drawn from
+the exact distribution by inverse transform sampling, vectorized with NumPy.
+Large convolutions go through the FFT, which is exact but for the far tails:
+those outcomes keep their place between min and max with probability 0, and
+the distribution is marked truncated.
+
+Compiled expressions, and with them their distributions, are kept in an LRU
+cache keyed by the normalized expression text. Group distributions have an
+LRU cache of their own keyed by the group, so expressions that differ only in
+constants or in other groups share the costly powers and keep/drop tables.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+
+class DiceError(ValueError):
+    """
+    Raised for expressions that are malformed or too large to evaluate.
+    """
+
+
+# Exploding dice are expanded until the probability of exploding further
+# is below this; that remaining mass stays on the last, unexploded roll
+EXPLODE_TAIL_PROBABILITY = 1e-12
+# Convolutions of more coefficients than this go through the FFT, whose
+# round-off hides tail outcomes below FFT_NOISE_FLOOR times the likeliest
+FFT_THRESHOLD = 500_000
+FFT_NOISE_FLOOR = 1e-13
+
+_TERM = re.compile(
+    r"(?P<sign>[+-])?(?:"
+    r"(?P<count>\d*)d(?P<sides>\d+|%|f)(?P<modifiers>(?:kh|kl|dh|dl|k|d|ro|r|!|<=|>=|<|>|\d)*)"
+    r"|(?P<constant>\d+))",
+    re.IGNORECASE,
+)
+_MODIFIER = re.compile(r"(kh|kl|dh|dl|k|d)(\d+)|(!)|(ro|r)(<=|>=|<|>)?(\d+)")
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """
+    Probabilities of the integer outcomes offset, offset + 1, ... If
+    `truncated`, outcomes less likely than FFT_NOISE_FLOOR times the likeliest
+    one have probability 0 though they are possible.
+    """
+    offset: int
+    probabilities: np.ndarray
+    truncated: bool = False
+
+    @property
+    def min(self) -> int:
+        return self.offset
+
+    @property
+    def max(self) -> int:
+        return self.offset + len(self.probabilities) - 1
+
+    @cached_property
+    def values(self) -> np.ndarray:
+        return np.arange(self.offset, self.max + 1)
+
+    @cached_property
+    def mean(self) -> float:
+        return float(self.values @ self.probabilities)
+
+    @cached_property
+    def stddev(self) -> float:
+        return math.sqrt(max(float(((self.values - self.mean) ** 2) @ self.probabilities), 0.0))
+
+    @cached_property
+    def _cdf(self) -> np.ndarray:
+        cdf = np.cumsum(self.probabilities)
+        cdf /= cdf[-1]
+        return cdf
+
+    def at_least(self, target: int) -> float:
+        """
+        Probability of an outcome of `target` or more.
+        """
+        if target <= self.min:
+            return 1.0
+        if target > self.max:
+            return 0.0
+        return float(1.0 - self._cdf[target - self.offset - 1])
+
+    def sample(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw `count` outcomes at once by inverse transform sampling.
+        """
+        index = np.searchsorted(self._cdf, rng.random(count), side="right")
+        return self.offset + np.minimum(index, len(self._cdf) - 1)
+
+
+def _trim(offset: int, probabilities: np.ndarray) -> Distribution:
+    # Drop impossible outcomes at both ends
+    nonzero = np.flatnonzero(probabilities)
+    if len(nonzero) == 0:
+        raise DiceError("no possible outcome")
+    first, last = nonzero[0], nonzero[-1]
+    return Distribution(offset + int(first), probabilities[first:last + 1])
+
+
+def _uses_fft(a: np.ndarray, b: np.ndarray) -> bool:
+    return len(a) * len(b) > FFT_THRESHOLD
+
+
+def _convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if len(a) + len(b) - 1 > settings.DICE_MAX_OUTCOMES:
+        raise DiceError("too many possible outcomes")
+    if not _uses_fft(a, b):
+        return np.convolve(a, b)
+    size = len(a) + len(b) - 1
+    product = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)
+    # Round-off leaves noise around zero; outcomes this unlikely read as 0
+    product[product < FFT_NOISE_FLOOR * product.max()] = 0.0
+    return product
+
+
+def add(a: Distribution, b: Distribution) -> Distribution:
+    """
+    Distribution of the sum of two independent outcomes. Both end outcomes
+    of each are possible, so the sum ranges over every outcome between
+    theirs, even where the FFT floor reads its probability as 0.
+    """
+    # A certain outcome only shifts the other
+    if len(a.probabilities) == 1:
+        return Distribution(a.offset + b.offset, b.probabilities * a.probabilities[0], b.truncated)
+    if len(b.probabilities) == 1:
+        return Distribution(a.offset + b.offset, a.probabilities * b.probabilities[0], a.truncated)
+    return Distribution(
+        a.offset + b.offset,
+        _convolve(a.probabilities, b.probabilities),
+        a.truncated or b.truncated or _uses_fft(a.probabilities, b.probabilities),
+    )
+
+
+def negate(a: Distribution) -> Distribution:
+    return Distribution(-a.max, a.probabilities[::-1].copy(), a.truncated)
+
+
+def power(a: Distribution, count: int) -> Distribution:
+    """
+    Distribution of the sum of `count` independent copies of an outcome.
+    """
+    result = Distribution(0, np.ones(1))
+    base = a
+    while count:
+        if count & 1:
+            result = add(result, base)
+        count >>= 1
+        if count:
+            base = add(base, base)
+    return result
+
+
+_COMPARISONS = {
+    "=": np.equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+@lru_cache(maxsize=1024)
+def die(
+    sides: int,
+    fudge: bool = False,
+    explode: bool = False,
+    reroll: Optional[tuple[str, int, bool]] = None,
+) -> Distribution:
+    """
+    Distribution of a single die, after rerolls and explosions. `reroll` is
+    (comparison, value, once).
+    """
+    values = np.arange(-1, 2) if fudge else np.arange(1, sides + 1)
+    probabilities = np.full(len(values), 1.0 / len(values))
+    if reroll is not None:
+        comparison, target, once = reroll
+        matching = _COMPARISONS[comparison](values, target)
+        if matching.all():
+            raise DiceError("every face is rerolled")
+        rerolled = probabilities[matching].sum()
+        kept = np.where(matching, 0.0, probabilities)
+        # Once: the second roll stands, whatever it shows
+        probabilities = kept + rerolled * probabilities if once else kept / kept.sum()
+    base = _trim(int(values[0]), probabilities)
+    if not explode:
+        return base
+    if fudge or sides < 2:
+        raise DiceError("only dice with two or more sides can explode")
+    # Each level adds the maximum and rolls again
+    top = probabilities[-1]
+    levels = 1
+    while top ** levels > EXPLODE_TAIL_PROBABILITY:
+        levels += 1
+    result = np.zeros(sides * levels + 1)
+    stays = probabilities.copy()
+    stays[-1] = 0.0
+    for level in range(levels):
+        start = level * sides
+        weight = top ** level
+        last = level == levels - 1
+        result[start:start + sides] += (probabilities if last else stays) * weight
+    return _trim(int(values[0]), result[:sides * levels])
+
+
+def keep(single: Distribution, count: int, kept: int, highest: bool) -> Distribution:
+    """
+    Distribution of the sum of the `kept` highest (or lowest) of `count`
+    independent dice.
+
+    Faces are visited from the best to the worst; dp[j] is the generating
+    polynomial of the kept sum over the ways of assigning j dice to the faces
+    seen so far, each weighted p^c / c! for c dice on a face of probability p
+    (multinomial coefficient numerators). The first `kept` dice assigned are
+    the ones kept. That is faces x count^2 / 2 row operations over every
+    possible sum, so the work is estimated up front and refused above
+    DICE_MAX_KEEP_WORK (about a second per billion).
+    """
+    if kept >= count:
+        return power(single, count)
+    if kept <= 0:
+        return Distribution(0, np.ones(1))
+    if count > settings.DICE_MAX_KEEP_POOL:
+        raise DiceError("too many dice to keep or drop from")
+    faces = [
+        (single.offset + index, p)
+        for index, p in enumerate(single.probabilities) if p > 0
+    ]
+    if highest:
+        faces.reverse()
+    spread = max(abs(single.min), abs(single.max))
+    length = 2 * spread * kept + 1
+    if length > settings.DICE_MAX_OUTCOMES:
+        raise DiceError("too many possible outcomes")
+    if len(faces) * (count + 1) * (count + 2) // 2 * length > settings.DICE_MAX_KEEP_WORK:
+        raise DiceError("too many faces and dice to keep or drop from")
+    # Sums are indexed from -spread * kept so negative faces fit too
+    base = spread * kept
+    dp = np.zeros((count + 1, length))
+    dp[0, base] = 1.0
+    for value, p in faces:
+        weights = [p ** c / math.factorial(c) for c in range(count + 1)]
+        new = np.zeros_like(dp)
+        for assigned in range(count + 1):
+            row = dp[assigned]
+            if not row.any():
+                continue
+            for c in range(count - assigned + 1):
+                added = (min(kept, assigned + c) - min(kept, assigned)) * value
+                target = new[assigned + c]
+                if added >= 0:
+                    target[added:] += row[:length - added] * weights[c]
+                else:
+                    target[:added] += row[-added:] * weights[c]
+        dp = new
+    return _trim(-base, dp[count] * math.factorial(count))
+
+
+@dataclass(frozen=True)
+class DiceGroup:
+    count: int
+    sides: int
+    fudge: bool = False
+    explode: bool = False
+    reroll: Optional[tuple[str, int, bool]] = None
+    # (number kept, keep highest)
+    keep: Optional[tuple[int, bool]] = None
+
+    @property
+    def single(self) -> Distribution:
+        return die(self.sides, self.fudge, self.explode, self.reroll)
+
+    @property
+    def width(self) -> int:
+        """
+        Number of possible sums, known before computing the distribution.
+        """
+        rolled = self.count if self.keep is None else min(self.keep[0], self.count)
+        return rolled * (len(self.single.probabilities) - 1) + 1
+
+    @property
+    def distribution(self) -> Distribution:
+        return _group_distribution(self)
+
+
+@lru_cache(maxsize=settings.DICE_CACHE_SIZE)
+def _group_distribution(group: DiceGroup) -> Distribution:
+    if group.keep is None:
+        return power(group.single, group.count)
+    return keep(group.single, group.count, *group.keep)
+
+
+class DiceExpression:
+    """
+    A parsed dice expression: signed dice groups and a constant.
+    """
+    def __init__(self, text: str, groups: list[tuple[int, DiceGroup]], constant: int):
+        self.text = text
+        self.groups = groups
+        self.constant = constant
+
+    @property
+    def dice(self) -> int:
+        return sum(group.count for _, group in self.groups)
+
+    @property
+    def width(self) -> int:
+        """
+        Number of possible outcomes. Raises DiceError for impossible dice.
+        """
+        return sum(group.width - 1 for _, group in self.groups) + 1
+
+    @cached_property
+    def distribution(self) -> Distribution:
+        total = Distribution(self.constant, np.ones(1))
+        for sign, group in self.groups:
+            distribution = group.distribution
+            total = add(total, distribution if sign > 0 else negate(distribution))
+        return total
+
+    def roll(self, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Roll the expression `count` times.
+        """
+        return self.distribution.sample(count, rng or np.random.default_rng())
+
+
+def _parse_group(match: re.Match) -> DiceGroup:
+    count = int(match["count"] or 1)
+    sides_text = match["sides"].lower()
+    fudge = sides_text == "f"
+    sides = 3 if fudge else 100 if sides_text == "%" else int(sides_text)
+    if count < 1 or sides < 1:
+        raise DiceError("dice need a positive count and number of sides")
+    if count > settings.DICE_MAX_DICE or sides > settings.DICE_MAX_SIDES:
+        raise DiceError("too many dice or sides")
+
+    modifiers = match["modifiers"].lower()
+    explode, reroll, kept = False, None, None
+    position = 0
+    while position < len(modifiers):
+        modifier = _MODIFIER.match(modifiers, position)
+        if modifier is None:
+            raise DiceError(f"invalid modifier '{modifiers[position:]}'")
+        position = modifier.end()
+        if modifier[1]:
+            number = int(modifier[2])
+            kind = {"k": "kh", "d": "dl"}.get(modifier[1], modifier[1])
+            if number > count:
+                raise DiceError("cannot keep or drop more dice than are rolled")
+            if kept is not None:
+                raise DiceError("only one keep or drop modifier per group")
+            kept = {
+                "kh": (number, True),
+                "kl": (number, False),
+                "dh": (count - number, False),
+                "dl": (count - number, True),
+            }[kind]
+        elif modifier[3]:
+            explode = True
+        else:
+            if reroll is not None:
+                raise DiceError("only one reroll modifier per group")
+            reroll = (modifier[5] or "=", int(modifier[6]), modifier[4] == "ro")
+    if explode and kept is not None and sides > settings.DICE_MAX_KEEP_EXPLODING_SIDES:
+        raise DiceError("too many sides to keep or drop from exploding dice")
+    return DiceGroup(count, sides, fudge, explode, reroll, kept)
+
+
+def normalize_expression(text: str) -> str:
+    # Whitespace is only allowed around operators, so "2d6 3" stays an error
+    return re.sub(r"\s*([+-])\s*", r"\1", text.strip().lower())
+
+
+@lru_cache(maxsize=settings.DICE_CACHE_SIZE)
+def _compile(normalized: str) -> DiceExpression:
+    groups, constant, position, dice = [], 0, 0, 0
+    if not normalized:
+        raise DiceError("empty expression")
+    while position < len(normalized):
+        match = _TERM.match(normalized, position)
+        if match is None or match.end() == position or (position and not match["sign"]):
+            raise DiceError(f"unexpected '{normalized[position:]}'")
+        position = match.end()
+        sign = -1 if match["sign"] == "-" else 1
+        if match["constant"] is not None:
+            constant += sign * int(match["constant"])
+            continue
+        group = _parse_group(match)
+        dice += group.count
+        if dice > settings.DICE_MAX_DICE:
+            raise DiceError("too many dice")
+        groups.append((sign, group))
+    return DiceExpression(normalized, groups, constant)
+
+
+def compile_expression(text: str) -> DiceExpression:
+    """
+    Parse an expression, reusing the cached compilation of the same
+    normalized text. Raises DiceError if it is invalid.
+    """
+    if len(text) > settings.DICE_MAX_EXPRESSION_LENGTH:
+        raise DiceError("expression too long")
+    return _compile(normalize_expression(text))
@@ -0,0 +1,188 @@
+# app/services/duplicates.py
+
+"""
+Near-duplicate detection for homebrew documents.
+
+Documents are indexed when they are saved: their MinHash signature and LSH
+bucket keys (see app.services.minhash) are stored in Postgres. Finding the
+likely duplicates of one document probes its buckets and checks the few
+candidates against their signatures; clustering the corpus groups every
+bucket shared by more than one document the same way.
+
+Existing documents are indexed by the backfill, which splits the corpus
+into chunks of ids and indexes them in parallel processes. Run from the
+backend directory:
+    python -m app.services.duplicates [--workers 4] [--chunk-size 1000] [--rebuild]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from multiprocessing import get_context
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.database.crud_similarity import (
+    chunk_boundaries,
+    colliding_buckets,
+    documents_to_index,
+    find_candidates,
+    get_band_keys,
+    get_signature,
+    get_signatures,
+    remove_signature,
+    save_signatures
+)
+from app.database.database import SessionLocal
+from app.services.minhash import band_keys, shingle_hashes, signatures, similarity
+
+
+@dataclass
+class DuplicateCluster:
+    document_ids: list[UUID]
+    # Lowest estimated similarity among the pairs joining the cluster
+    min_similarity: float
+
+
+def _decode(signature: bytes) -> np.ndarray:
+    return np.frombuffer(signature, dtype="<u4")
+
+
+def index_documents(db: Session, documents: list[tuple[UUID, int, str]]) -> int:
+    """
+    Compute and store signatures of (id, revision, content) documents in
+    one vectorized batch. Documents without any words are unindexed.
+    Returns the number indexed.
+    """
+    hash_sets = [shingle_hashes(content) for _, _, content in documents]
+    rows = signatures(hash_sets)
+    keys = band_keys(rows)
+    entries = []
+    for (document_id, revision, _), hashes, row, row_keys in zip(documents, hash_sets, rows, keys):
+        if len(hashes):
+            entries.append((document_id, revision, row.astype("<u4").tobytes(), row_keys.tolist()))
+        else:
+            remove_signature(db, document_id)
+    save_signatures(db, entries)
+    metrics.increment("similarity.indexed", len(entries))
+    return len(entries)
+
+
+def index_document(db: Session, document) -> int:
+    return index_documents(db, [(document.id, document.revision, document.content)])
+
+
+def find_similar(db: Session, document_id: UUID, threshold: Optional[float] = None) -> list[tuple[UUID, float]]:
+    """
+    Indexed documents whose estimated similarity to this one reaches the
+    threshold, most similar first.
+    """
+    threshold = settings.SIMILARITY_THRESHOLD if threshold is None else threshold
+    signature = get_signature(db, document_id)
+    if signature is None:
+        return []
+    candidates = find_candidates(db, document_id, get_band_keys(db, document_id), settings.SIMILARITY_MAX_CANDIDATES)
+    if not candidates:
+        return []
+    scores = similarity(_decode(signature), np.stack([_decode(s) for _, s in candidates]))
+    found = [(candidate_id, float(score)) for (candidate_id, _), score in zip(candidates, scores) if score >= threshold]
+    return sorted(found, key=lambda item: -item[1])
+
+
+def find_clusters(db: Session, threshold: Optional[float] = None) -> list[DuplicateCluster]:
+    """
+    Groups of likely duplicates across the whole corpus, largest first.
+    Candidate pairs come from shared buckets and are kept if their
+    signatures agree; clusters are the connected components of those pairs.
+    """
+    threshold = settings.SIMILARITY_THRESHOLD if threshold is None else threshold
+    groups = colliding_buckets(db, settings.SIMILARITY_MAX_BUCKET_SIZE)
+    stored = get_signatures(db, list({document_id for group in groups for document_id in group}))
+    parent: dict[UUID, UUID] = {}
+    weakest: dict[UUID, float] = {}
+
+    def find(node: UUID) -> UUID:
+        while parent.setdefault(node, node) != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    checked = set()
+    for group in groups:
+        group = sorted(document_id for document_id in group if document_id in stored)
+        if len(group) < 2:
+            continue
+        matrix = np.stack([_decode(stored[document_id]) for document_id in group])
+        # Pairwise agreement of every signature in the bucket at once
+        scores = (matrix[:, None, :] == matrix[None, :, :]).mean(axis=-1)
+        for i, j in zip(*np.triu_indices(len(group), k=1)):
+            pair = (group[i], group[j])
+            if pair in checked or scores[i, j] < threshold:
+                continue
+            checked.add(pair)
+            a, b = find(pair[0]), find(pair[1])
+            if a != b:
+                parent[b] = a
+                weakest[a] = float(min(scores[i, j], weakest.get(a, 1.0), weakest.get(b, 1.0)))
+
+    members: dict[UUID, list[UUID]] = {}
+    for node in parent:
+        members.setdefault(find(node), []).append(node)
+    clusters = [
+        DuplicateCluster(sorted(ids), weakest.get(root, 1.0))
+        for root, ids in members.items()
+        if len(ids) > 1
+    ]
+    return sorted(clusters, key=lambda cluster: (-len(cluster.document_ids), cluster.min_similarity))
+
+
+def _index_chunk(bounds: tuple[Optional[UUID], Optional[UUID]], rebuild: bool) -> int:
+    """
+    Index the documents with ids in [start, end). Runs in a worker process.
+    """
+    start, end = bounds
+    indexed = 0
+    after = None
+    db = SessionLocal()
+    try:
+        while True:
+            documents = documents_to_index(db, start, end, stale_only=not rebuild, after=after)
+            if not documents:
+                return indexed
+            indexed += index_documents(db, documents)
+            after = documents[-1][0]
+    finally:
+        db.close()
+
+
+def backfill(workers: int = 4, chunk_size: Optional[int] = None, rebuild: bool = False) -> int:
+    """
+    Index every document whose signature is missing or stale (all of them
+    with `rebuild`), in chunks spread over worker processes.
+    """
+    chunk_size = chunk_size or settings.SIMILARITY_BACKFILL_CHUNK_SIZE
+    db = SessionLocal()
+    try:
+        boundaries = chunk_boundaries(db, chunk_size)
+    finally:
+        db.close()
+    if not boundaries:
+        return 0
+    chunks = list(zip([None, *boundaries[1:]], [*boundaries[1:], None]))
+    with ProcessPoolExecutor(min(workers, len(chunks)), mp_context=get_context("spawn")) as pool:
+        return sum(pool.map(_index_chunk, chunks, repeat(rebuild)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the homebrew near-duplicate index.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--rebuild", action="store_true", help="re-index documents that are up to date")
+    args = parser.parse_args()
+    print(f"Indexed {backfill(args.workers, args.chunk_size, args.rebuild)} documents.")
@@ -0,0 +1,203 @@
+# app/services/feed.py
+
+"""
+Activity feeds: new homebrew, events and comments from the users and
+games a user follows.
+
+Every activity is pushed onto the capped timeline of each of its sources,
+its author and, when there is one, its game:
+
+    feed:source:{type}:{id}   LIST  newest first, FEED_SOURCE_MAX_ITEMS
+    feed:user:{user_id}       LIST  newest first, FEED_MAX_ITEMS
+
+Sources with fewer than FEED_FANOUT_THRESHOLD followers are fanned out on
+write: the activity is also pushed onto each follower's own feed, so
+reading a feed is a single LRANGE. Popular sources are not, since one
+activity would cost a write per follower. Their timelines are merged into
+the follower's feed on read instead, with a k-way heap merge of lists that
+are each already newest first.
+
+Feeds are filtered on read against what the user follows now, so an
+unfollow takes effect at once without rewriting anything. A source that
+crosses the threshold switches strategy for new activity only.
+"""
+
+import heapq
+import json
+import time
+import traceback
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional
+from uuid import UUID, uuid4
+
+from redis import RedisError, WatchError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import r
+from app.database.crud_follows import follower_counts, follower_ids, followed_targets
+
+
+ACTIVITY_HOMEBREW_CREATED = "homebrew.created"
+ACTIVITY_EVENT_CREATED = "event.created"
+ACTIVITY_COMMENT_CREATED = "comment.created"
+
+
+def _source(target_type: str, target_id: Any) -> str:
+    return f"{target_type}:{target_id}"
+
+
+def _source_key(source: str) -> str:
+    return f"feed:source:{source}"
+
+
+def _feed_key(user_id: Any) -> str:
+    return f"feed:user:{user_id}"
+
+
+def _sort_key(entry: dict[str, Any]) -> tuple[float, str]:
+    return entry["ts"], entry["id"]
+
+
+def _decoded(raw: Iterable[str]) -> Iterator[dict[str, Any]]:
+    # Lazily, as the merge only consumes the head of each list
+    return map(json.loads, raw)
+
+
+def is_popular(follower_count: int) -> bool:
+    """
+    Whether a source's activity is merged on read rather than fanned out.
+    """
+    return follower_count >= settings.FEED_FANOUT_THRESHOLD
+
+
+def publish_activity(
+    db: Session,
+    kind: str,
+    actor_id: UUID,
+    subject_type: str,
+    subject_id: UUID,
+    data: dict[str, Any],
+    game_id: Optional[UUID] = None,
+) -> int:
+    """
+    Add an activity to the feeds of its author's and game's followers.
+    Call after committing. Returns the number of follower feeds written to.
+    Redis errors are counted, not raised, as the activity itself is saved.
+    """
+    sources = [("users", actor_id)] + ([("games", game_id)] if game_id is not None else [])
+    counts = follower_counts(db, sources)
+    entry = json.dumps({
+        "id": str(uuid4()),
+        "ts": time.time(),
+        "kind": kind,
+        "actor_id": str(actor_id),
+        "subject_type": subject_type,
+        "subject_id": str(subject_id),
+        "sources": [_source(*source) for source in sources],
+        "data": data,
+    })
+    pushed = [source for source in sources if counts.get(source, 0) > 0 and not is_popular(counts[source])]
+    recipients = follower_ids(db, pushed)
+    recipients.discard(actor_id)
+
+    try:
+        pipe = r.pipeline(transaction=False)
+        for source in sources:
+            pipe.lpush(_source_key(_source(*source)), entry)
+            pipe.ltrim(_source_key(_source(*source)), 0, settings.FEED_SOURCE_MAX_ITEMS - 1)
+        for n, user_id in enumerate(recipients, 1):
+            pipe.lpush(_feed_key(user_id), entry)
+            pipe.ltrim(_feed_key(user_id), 0, settings.FEED_MAX_ITEMS - 1)
+            if n % settings.FEED_FANOUT_CHUNK_SIZE == 0:
+                pipe.execute()
+        pipe.execute()
+    except RedisError:
+        metrics.increment("feed.publish_errors")
+        traceback.print_exc()
+        return 0
+
+    metrics.increment("feed.activities")
+    metrics.increment("feed.writes", len(sources) + len(recipients))
+    # Write amplification: follower feeds written per activity
+    metrics.observe("feed.fanout", len(recipients))
+    return len(recipients)
+
+
+def backfill(user_id: UUID, target_type: str, target_id: UUID) -> int:
+    """
+    Merge the recent activity of a newly followed source into a user's
+    feed, so it does not start out empty. Returns the number of entries
+    added.
+    """
+    feed_key = _feed_key(user_id)
+    source_key = _source_key(_source(target_type, target_id))
+    with r.pipeline() as pipe:
+        while True:
+            try:
+                # Retried if an activity is pushed onto the feed meanwhile
+                pipe.watch(feed_key)
+                feed = pipe.lrange(feed_key, 0, -1)
+                added = pipe.lrange(source_key, 0, -1)
+                known = {json.loads(raw)["id"] for raw in feed}
+                added = [raw for raw in added if json.loads(raw)["id"] not in known]
+                if not added:
+                    pipe.unwatch()
+                    return 0
+                merged = heapq.merge(
+                    zip(_decoded(feed), feed),
+                    zip(_decoded(added), added),
+                    key=lambda pair: _sort_key(pair[0]),
+                    reverse=True,
+                )
+                entries = [raw for _, raw in islice(merged, settings.FEED_MAX_ITEMS)]
+                pipe.multi()
+                pipe.delete(feed_key)
+                pipe.rpush(feed_key, *entries)
+                pipe.execute()
+                return len(added)
+            except WatchError:
+                continue
+
+
+def read_feed(
+    db: Session,
+    user_id: UUID,
+    before: Optional[tuple] = None,
+    limit: int = 20,
+) -> list[dict[str, Any]]:
+    """
+    One page of a user's feed, newest first, starting before the
+    (timestamp, id) `before`. Fetches `limit + 1` entries so the caller
+    can tell whether a next page exists.
+    """
+    started = time.perf_counter()
+    followed = followed_targets(db, user_id)
+    following = {_source(target_type, target_id) for target_type, target_id, _ in followed}
+    pulled = [
+        _source(target_type, target_id)
+        for target_type, target_id, count in followed
+        if is_popular(count)
+    ]
+    pipe = r.pipeline(transaction=False)
+    pipe.lrange(_feed_key(user_id), 0, -1)
+    for source in pulled:
+        pipe.lrange(_source_key(source), 0, -1)
+    timelines = [_decoded(raw) for raw in pipe.execute()]
+
+    entries, seen = [], set()
+    for entry in heapq.merge(*timelines, key=_sort_key, reverse=True):
+        if before is not None and _sort_key(entry) >= before:
+            continue
+        # Followed through both the author and the game, or no longer followed
+        if entry["id"] in seen or following.isdisjoint(entry["sources"]):
+            continue
+        seen.add(entry["id"])
+        entries.append(entry)
+        if len(entries) > limit:
+            break
+
+    metrics.observe("feed.read_seconds", time.perf_counter() - started)
+    metrics.observe("feed.read_sources", len(pulled))
+    return entries
@@ -0,0 +1,273 @@
+# app/services/images.py
+
+"""
+Background pipeline producing resized variants of uploaded images.
+
+Image uploads push their content hash onto a Redis work queue (see
+app.core.work_queues). A consumer thread in each worker takes jobs onto its
+own processing list, so the jobs of a worker that died are picked up again
+by the others, and renders them in a process pool, keeping Pillow's CPU
+work off the request path and out of the GIL.
+
+Variants are files keyed by content hash, variant and spec version, so
+identical images are rendered once and a spec change renders afresh. A
+manifest written after the last variant marks them ready; until then the
+variant URLs point at the original. Rendered hashes are also kept in a
+Redis set, so listing a page of images looks all of them up at once, and
+the games catalog's ETags change when its URLs switch to the variants.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Optional
+from uuid import UUID
+
+import redis
+
+from app.core.caching import GAMES_SCOPE, bump_version
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import r
+from app.core.storage import blob_path
+from app.core.work_queues import WorkQueue
+
+
+image_queue = WorkQueue("images")
+IMAGE_QUEUE_KEY = image_queue.queue_key
+# Hashes queued or being rendered, so an image is queued at most once
+IMAGE_PENDING_KEY = "images:pending"
+
+# Longest side in pixels; images are never upscaled
+VARIANT_SIZES = {
+    "thumb": 160,
+    "small": 320,
+    "medium": 640,
+    "large": 1280,
+}
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+# Bump when sizes or encoder settings change, to render every image again
+VARIANT_SPEC_VERSION = 1
+# Hashes whose variants of the current spec are rendered
+IMAGE_READY_KEY = f"images:ready:v{VARIANT_SPEC_VERSION}"
+
+_MANIFEST = "manifest.json"
+
+# Positive readiness is cached; variants never become unready
+_ready: set[str] = set()
+_READY_CACHE_SIZE = 100_000
+
+
+def is_image(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in {
+        "image/jpeg", "image/png", "image/webp", "image/gif",
+    }
+
+
+def variant_dir(sha256: str) -> str:
+    return os.path.join(settings.STORAGE_ROOT, "derivatives", f"v{VARIANT_SPEC_VERSION}", sha256[:2], sha256)
+
+
+def variant_path(sha256: str, variant: str, extension: str) -> str:
+    return os.path.join(variant_dir(sha256), f"{variant}.{extension}")
+
+
+def variants_ready(sha256: str) -> bool:
+    if sha256 in _ready:
+        return True
+    if not os.path.exists(os.path.join(variant_dir(sha256), _MANIFEST)):
+        return False
+    _cache_ready(sha256)
+    return True
+
+
+def _cache_ready(sha256: str):
+    if len(_ready) >= _READY_CACHE_SIZE:
+        _ready.clear()
+    _ready.add(sha256)
+
+
+def image_variants(uploads: list) -> dict[UUID, dict[str, str]]:
+    """
+    URLs of the variants of image uploads by "<variant>.<format>", by upload
+    id, all pointing at the original until the variants have been rendered.
+    Readiness of the whole list is one Redis round trip.
+    """
+    unknown = list({upload.sha256 for upload in uploads} - _ready)
+    if unknown:
+        for sha256, ready in zip(unknown, r.smismember(IMAGE_READY_KEY, unknown)):
+            if ready:
+                _cache_ready(sha256)
+    variants = {}
+    for upload in uploads:
+        if upload.sha256 in _ready:
+            variants[upload.id] = {
+                f"{variant}.{extension}": f"/uploads/{upload.id}/variants/{variant}.{extension}"
+                for variant in VARIANT_SIZES
+                for extension in VARIANT_FORMATS
+            }
+        else:
+            original = f"/uploads/{upload.id}/content"
+            variants[upload.id] = {
+                f"{variant}.{extension}": original for variant in VARIANT_SIZES for extension in VARIANT_FORMATS
+            }
+    return variants
+
+
+def enqueue_variants(sha256: str, content_type: str) -> bool:
+    """
+    Queue the rendering of an uploaded image's variants, unless they exist
+    or are already queued. Call after committing the upload.
+    """
+    if not is_image(content_type):
+        return False
+    if variants_ready(sha256):
+        # Rendered before the ready set was (re)built
+        r.sadd(IMAGE_READY_KEY, sha256)
+        return False
+    if not r.sadd(IMAGE_PENDING_KEY, sha256):
+        return False
+    r.lpush(IMAGE_QUEUE_KEY, sha256)
+    return True
+
+
+def remove_variants(sha256: str):
+    """
+    Delete an image's variants along with its blob.
+    """
+    _ready.discard(sha256)
+    r.srem(IMAGE_READY_KEY, sha256)
+    directory = variant_dir(sha256)
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        try:
+            os.unlink(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass
+
+
+def render_variants(sha256: str) -> float:
+    """
+    Render every variant of a stored image. Runs in a pool process and
+    returns the time it took.
+    """
+    from PIL import Image, ImageOps
+
+    started = time.perf_counter()
+    directory = variant_dir(sha256)
+    os.makedirs(directory, exist_ok=True)
+    with Image.open(blob_path(sha256)) as source:
+        # JPEG sources decode at a reduced scale close to the largest variant
+        source.draft("RGB", (max(VARIANT_SIZES.values()),) * 2)
+        image = ImageOps.exif_transpose(source).convert("RGB")
+    # Largest first, each resized from the previous one
+    for variant, size in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1]):
+        image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        for extension, (image_format, options) in VARIANT_FORMATS.items():
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+            with os.fdopen(fd, "wb") as file:
+                image.save(file, image_format, **options)
+            os.replace(temp_path, variant_path(sha256, variant, extension))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    with os.fdopen(fd, "w") as file:
+        json.dump({"version": VARIANT_SPEC_VERSION, "variants": VARIANT_SIZES}, file)
+    os.replace(temp_path, os.path.join(directory, _MANIFEST))
+    return time.perf_counter() - started
+
+
+class DerivativeWorker:
+    """
+    Background thread feeding queued images to a process pool.
+    """
+    def __init__(self, processes: int, max_in_flight: int):
+        self.processes = processes
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """
+        Start consuming in a daemon thread, requeueing jobs left in
+        processing by dead workers.
+        """
+        if self._thread is not None:
+            return
+        image_queue.start()
+        # Fresh interpreters rather than forks of a threaded server
+        self._pool = ProcessPoolExecutor(self.processes, mp_context=get_context("spawn"))
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="image-derivatives", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop taking jobs and wait for those in flight.
+        """
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            image_queue.stop()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            if not self._slots.acquire(timeout=1.0):
+                continue
+            try:
+                sha256 = image_queue.take(1.0)
+            except redis.RedisError:
+                self._slots.release()
+                self._stopping.wait(1.0)
+                continue
+            if sha256 is None:
+                self._slots.release()
+                continue
+            future = self._pool.submit(render_variants, sha256)
+            future.add_done_callback(lambda f, sha256=sha256: self._finished(sha256, f))
+
+    def _finished(self, sha256: str, future: Future):
+        self._slots.release()
+        rendered = False
+        try:
+            metrics.observe("images.render_seconds", future.result())
+            metrics.increment("images.rendered")
+            rendered = True
+        except Exception:
+            metrics.increment("images.failed")
+            traceback.print_exc()
+        try:
+            pipe = r.pipeline()
+            if rendered:
+                pipe.sadd(IMAGE_READY_KEY, sha256)
+            image_queue.done(sha256, pipe)
+            pipe.srem(IMAGE_PENDING_KEY, sha256)
+            pipe.execute()
+            if rendered:
+                # Game responses now list the variant URLs
+                bump_version(GAMES_SCOPE)
+        except redis.RedisError:
+            traceback.print_exc()
+
+
+derivative_worker = DerivativeWorker(
+    processes=settings.IMAGE_WORKER_PROCESSES,
+    max_in_flight=2 * settings.IMAGE_WORKER_PROCESSES,
+)
+
+metrics.register_collector("images.queue_depth", lambda: r.llen(IMAGE_QUEUE_KEY))
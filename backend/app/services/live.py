@@ -0,0 +1,198 @@
+# app/services/live.py
+
+"""
+Live updates for event and game pages, pushed over Server-Sent Events and
+WebSockets.
+
+Writers publish small updates on a topic such as "events:<id>" after
+committing (`publish_live`). Updates travel over the change notification
+channel (app.core.pubsub), so a worker holds one Redis subscription
+however many clients it serves. The worker's hub encodes each update once
+and puts it on the bounded send queue of every client following its
+topic. A client whose queue is full is not keeping up: it is disconnected
+rather than left to grow without bound or hold up the others, and is
+expected to reconnect and reload the page state.
+
+Idle connections cost a queue and a waiting task each. Keep-alives are
+queued for every client by a single timer per worker, not one per
+connection.
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.pubsub import change_listener, publish_change
+
+
+TOPIC = "live"
+
+# Queue items besides encoded updates
+HEARTBEAT = object()
+CLOSE = object()
+
+_TOPIC_PATTERN = re.compile(r"^(events|games):(.+)$")
+
+
+def parse_topic(topic: str) -> Optional[str]:
+    """
+    Canonical form of a client-supplied topic, or None if it is invalid.
+    """
+    match = _TOPIC_PATTERN.match(topic)
+    if match is None:
+        return None
+    try:
+        return f"{match.group(1)}:{UUID(match.group(2))}"
+    except ValueError:
+        return None
+
+
+def publish_live(subject_type: str, subject_id: Any, kind: str, data: dict[str, Any]):
+    """
+    Push an update to every client following a game or event. Call after
+    committing.
+    """
+    publish_change(TOPIC, kind, {"topic": f"{subject_type}:{subject_id}", "data": data})
+
+
+class LiveClient:
+    """
+    One connection: the topics it follows and its pending messages.
+    """
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.topics: set[str] = set()
+        self.dropped = False
+
+
+class LiveHub:
+    """
+    The connected clients of a worker, by topic. Used from the event loop
+    only; updates from the change listener thread are handed over to it.
+    """
+    def __init__(self):
+        self._topics: dict[str, set[LiveClient]] = {}
+        self._clients: set[LiveClient] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A worker runs one loop; a new one means the old has finished
+            self._loop = loop
+            self._topics.clear()
+            self._clients.clear()
+            self._heartbeat = loop.create_task(self._beat(loop))
+
+    def connect(self) -> LiveClient:
+        self._bind()
+        client = LiveClient(settings.LIVE_QUEUE_SIZE)
+        self._clients.add(client)
+        metrics.increment("live.connections")
+        return client
+
+    def disconnect(self, client: LiveClient):
+        for topic in client.topics:
+            followers = self._topics.get(topic)
+            if followers is not None:
+                followers.discard(client)
+                if not followers:
+                    del self._topics[topic]
+        client.topics.clear()
+        self._clients.discard(client)
+
+    def follow(self, client: LiveClient, topic: str) -> bool:
+        """
+        Add a topic to a client's, unless it already follows the most allowed.
+        """
+        if topic not in client.topics and len(client.topics) >= settings.LIVE_MAX_TOPICS:
+            return False
+        client.topics.add(topic)
+        self._topics.setdefault(topic, set()).add(client)
+        return True
+
+    def unfollow(self, client: LiveClient, topic: str):
+        client.topics.discard(topic)
+        followers = self._topics.get(topic)
+        if followers is not None:
+            followers.discard(client)
+            if not followers:
+                del self._topics[topic]
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def handle(self, kind: str, data: dict[str, Any]):
+        """
+        Change listener callback: deliver an update on the event loop.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        message = json.dumps({"topic": data["topic"], "type": kind, "data": data["data"]})
+        try:
+            loop.call_soon_threadsafe(self.deliver, data["topic"], message)
+        except RuntimeError:
+            # The loop closed in the meantime
+            pass
+
+    def deliver(self, topic: str, message: str):
+        followers = self._topics.get(topic)
+        if not followers:
+            return
+        for client in list(followers):
+            self.send(client, message)
+        metrics.increment("live.delivered", len(followers))
+
+    def send(self, client: LiveClient, item: object):
+        """
+        Queue a message for a client, dropping the client if its queue is full.
+        """
+        try:
+            client.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._drop(client)
+
+    def _drop(self, client: LiveClient):
+        self.disconnect(client)
+        client.dropped = True
+        # Discard the backlog so the client's sender sees CLOSE next
+        while not client.queue.empty():
+            client.queue.get_nowait()
+        client.queue.put_nowait(CLOSE)
+        metrics.increment("live.dropped")
+
+    async def _beat(self, loop: asyncio.AbstractEventLoop):
+        while self._loop is loop:
+            await asyncio.sleep(settings.LIVE_HEARTBEAT_SECONDS)
+            for client in list(self._clients):
+                self.send(client, HEARTBEAT)
+
+
+live_hub = LiveHub()
+change_listener.subscribe(TOPIC, live_hub.handle)
+metrics.register_collector("live.clients", lambda: live_hub.client_count)
+
+
+async def sse_frames(client: LiveClient):
+    """
+    The Server-Sent Events stream of a client, until it is dropped.
+    """
+    try:
+        yield ": connected\n\n"
+        while True:
+            item = await client.queue.get()
+            if item is CLOSE:
+                return
+            if item is HEARTBEAT:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {item}\n\n"
+    finally:
+        live_hub.disconnect(client)
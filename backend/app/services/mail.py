@@ -0,0 +1,405 @@
+# app/services/mail.py
+
+"""
+Outbound email, delivered in the background.
+
+Requests never talk to SMTP: they queue a message (template, recipient
+and template values) on a Redis list and return. Sender threads in each
+worker take queued messages in batches and send a batch over one SMTP
+connection, which each thread keeps open between batches (until idle for
+SMTP_IDLE_SECONDS) rather than connecting per message. As with image
+jobs (see app.core.work_queues), messages being sent sit on the sending
+worker's own processing list, so those of a worker that died mid-batch
+are queued again by the others, and those of live workers never are.
+
+A message failing temporarily (lost connection, 4xx reply) is retried
+after a delay doubling with every attempt: it waits in a sorted set
+scored by due time, from which the senders move due messages back to the
+queue. Permanent failures (5xx replies, broken templates) and messages
+out of attempts go to a capped dead-letter list, for admins to inspect
+and requeue.
+
+Templates are files in app/templates/mail: a "Subject:" line, a blank
+line and the body, with $name placeholders. Each is parsed once per
+process into literal and placeholder parts, so rendering is a join.
+"""
+
+import json
+import random
+import smtplib
+import string
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Any, Optional
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import redis
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import r
+from app.core.work_queues import WorkQueue
+from app.database.crud_events import claim_reminders, reminder_recipients
+from app.database.database import SessionLocal
+
+
+mail_queue = WorkQueue("mail")
+MAIL_QUEUE_KEY = mail_queue.queue_key
+# Sorted set of messages waiting for a retry, scored by due time
+MAIL_RETRY_KEY = "mail:retry"
+MAIL_DEAD_KEY = "mail:dead"
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "mail"
+
+
+class MailTemplate:
+    """
+    A subject and body template, parsed into parts once.
+    """
+    def __init__(self, source: str):
+        first_line, _, body = source.partition("\n")
+        if not first_line.startswith("Subject:"):
+            raise ValueError("a mail template starts with a Subject: line")
+        self.subject = self._compile(first_line[len("Subject:"):].strip())
+        self.body = self._compile(body.lstrip("\n"))
+
+    @staticmethod
+    def _compile(text: str) -> tuple[tuple[bool, str], ...]:
+        # (is placeholder, literal text or placeholder name)
+        parts = []
+        position = 0
+        for match in string.Template.pattern.finditer(text):
+            parts.append((False, text[position:match.start()]))
+            if match.group("escaped") is not None:
+                parts.append((False, "$"))
+            elif match.group("invalid") is not None:
+                raise ValueError(f"invalid placeholder at offset {match.start()}")
+            else:
+                parts.append((True, match.group("named") or match.group("braced")))
+            position = match.end()
+        parts.append((False, text[position:]))
+        return tuple(part for part in parts if part[0] or part[1])
+
+    @staticmethod
+    def _render(parts: tuple[tuple[bool, str], ...], values: dict[str, Any]) -> str:
+        return "".join(str(values[text]) if is_field else text for is_field, text in parts)
+
+    def render(self, values: dict[str, Any]) -> tuple[str, str]:
+        """
+        (subject, body) with the placeholders filled in. Raises KeyError
+        for missing values.
+        """
+        return self._render(self.subject, values), self._render(self.body, values)
+
+
+_templates: dict[str, MailTemplate] = {}
+_templates_lock = threading.Lock()
+
+
+def get_template(name: str) -> MailTemplate:
+    template = _templates.get(name)
+    if template is None:
+        if not name.isidentifier():
+            raise ValueError(f"invalid template name {name!r}")
+        with _templates_lock:
+            template = _templates.get(name)
+            if template is None:
+                template = MailTemplate((TEMPLATE_DIR / f"{name}.txt").read_text())
+                _templates[name] = template
+    return template
+
+
+def enqueue_mail(template: str, to: str, values: dict[str, Any], pipe=None) -> Optional[str]:
+    """
+    Queue a message for delivery and return its id. Failures to queue
+    are counted, not raised: the request that sends mail has succeeded.
+    """
+    get_template(template)
+    message_id = uuid4().hex
+    job = json.dumps({"id": message_id, "template": template, "to": to, "values": values, "attempts": 0}, default=str)
+    try:
+        (pipe or r).lpush(MAIL_QUEUE_KEY, job)
+    except redis.RedisError:
+        metrics.increment("mail.enqueue_errors")
+        traceback.print_exc()
+        return None
+    metrics.increment("mail.enqueued")
+    return message_id
+
+
+def build_message(job: dict[str, Any]) -> EmailMessage:
+    subject, body = get_template(job["template"]).render({"app_name": settings.APP_NAME, **job["values"]})
+    message = EmailMessage()
+    message["From"] = settings.MAIL_FROM
+    message["To"] = job["to"]
+    message["Subject"] = subject
+    # Stable across retries, so receivers can drop duplicates
+    message["Message-ID"] = f"<{job['id']}@{settings.MAIL_FROM.rpartition('@')[2]}>"
+    message.set_content(body)
+    return message
+
+
+class SmtpConnection:
+    """
+    A sender thread's SMTP session, opened on first use and reused until
+    it goes idle or the server drops it.
+    """
+    def __init__(self):
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        if settings.SMTP_STARTTLS:
+            smtp.starttls()
+        if settings.SMTP_USERNAME:
+            smtp.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD or "")
+        metrics.increment("mail.connections")
+        return smtp
+
+    def send(self, message: EmailMessage):
+        self.close_if_idle()
+        # A connection the server closed since the last batch is only
+        # noticed when used: reconnect once
+        for attempt in range(2):
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(message)
+                break
+            except smtplib.SMTPServerDisconnected:
+                self._smtp = None
+                if attempt:
+                    raise
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self):
+        if self._smtp is not None and time.monotonic() - self._last_used > settings.SMTP_IDLE_SECONDS:
+            self.close()
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def _is_permanent(error: Exception) -> bool:
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    # Missing template values and other bugs do not fix themselves
+    return isinstance(error, (KeyError, ValueError))
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Seconds before retrying a message that failed `attempts` times:
+    doubling from MAIL_RETRY_BASE_SECONDS, with jitter so failures of a
+    batch are not retried in lockstep.
+    """
+    delay = min(settings.MAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.MAIL_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _deliver(connection: SmtpConnection, raw: str):
+    job = json.loads(raw)
+    try:
+        connection.send(build_message(job))
+    except Exception as error:
+        if not isinstance(error, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused, KeyError, ValueError)):
+            # The session may be unusable; start the next message afresh
+            connection.close()
+        job["attempts"] += 1
+        job["error"] = f"{type(error).__name__}: {error}"
+        pipe = r.pipeline()
+        mail_queue.done(raw, pipe)
+        if _is_permanent(error) or job["attempts"] >= settings.MAIL_MAX_ATTEMPTS:
+            job["failed_at"] = time.time()
+            pipe.lpush(MAIL_DEAD_KEY, json.dumps(job))
+            pipe.ltrim(MAIL_DEAD_KEY, 0, settings.MAIL_DEAD_LETTER_MAX - 1)
+            metrics.increment("mail.dead")
+        else:
+            pipe.zadd(MAIL_RETRY_KEY, {json.dumps(job): time.time() + retry_delay(job["attempts"])})
+            metrics.increment("mail.retried")
+        pipe.execute()
+        return
+    mail_queue.done(raw)
+    metrics.increment("mail.sent")
+
+
+def deliver_batch(connection: SmtpConnection, timeout: float = 1.0) -> int:
+    """
+    Wait up to `timeout` seconds for queued messages and send up to
+    MAIL_BATCH_SIZE of them over one connection. Returns how many were
+    taken.
+    """
+    raw = mail_queue.take(timeout)
+    if raw is None:
+        connection.close_if_idle()
+        return 0
+    batch = [raw]
+    while len(batch) < settings.MAIL_BATCH_SIZE:
+        raw = mail_queue.take_nowait()
+        if raw is None:
+            break
+        batch.append(raw)
+    for raw in batch:
+        _deliver(connection, raw)
+    metrics.observe("mail.batch_size", len(batch))
+    return len(batch)
+
+
+def promote_due(now: Optional[float] = None) -> int:
+    """
+    Move messages whose retry is due back to the queue. Returns how many.
+    """
+    due = r.zrangebyscore(MAIL_RETRY_KEY, "-inf", now or time.time(), start=0, num=settings.MAIL_BATCH_SIZE)
+    promoted = 0
+    for raw in due:
+        # Whichever sender removes it requeues it
+        if r.zrem(MAIL_RETRY_KEY, raw):
+            r.lpush(MAIL_QUEUE_KEY, raw)
+            promoted += 1
+    return promoted
+
+
+def requeue_dead() -> int:
+    """
+    Queue every dead letter again with a fresh set of attempts.
+    """
+    requeued = 0
+    while True:
+        raw = r.rpop(MAIL_DEAD_KEY)
+        if raw is None:
+            return requeued
+        job = json.loads(raw)
+        job.update(attempts=0, error=None, failed_at=None)
+        r.lpush(MAIL_QUEUE_KEY, json.dumps(job))
+        requeued += 1
+
+
+def mail_status(dead_letters: int = 20) -> dict[str, Any]:
+    pipe = r.pipeline()
+    pipe.llen(MAIL_QUEUE_KEY)
+    pipe.zcard(MAIL_RETRY_KEY)
+    pipe.llen(MAIL_DEAD_KEY)
+    pipe.lrange(MAIL_DEAD_KEY, 0, dead_letters - 1)
+    queued, retrying, dead, latest = pipe.execute()
+    sending = mail_queue.in_flight()
+    return {
+        "queued": queued,
+        "sending": sending,
+        "retrying": retrying,
+        "dead": dead,
+        "dead_letters": [json.loads(raw) for raw in latest],
+    }
+
+
+class MailWorker:
+    """
+    Sender threads, each with its own SMTP connection.
+    """
+    def __init__(self, threads: int):
+        self.threads = threads
+        self._threads: list[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    def start(self):
+        """
+        Start the sender threads, requeueing messages left in processing
+        by dead workers.
+        """
+        if self._threads:
+            return
+        mail_queue.start()
+        self._stopping.clear()
+        for number in range(self.threads):
+            thread = threading.Thread(target=self._run, name=f"mail-sender-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        Stop after the batches being sent.
+        """
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        mail_queue.stop()
+
+    def _run(self):
+        connection = SmtpConnection()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    promote_due()
+                    deliver_batch(connection)
+                except redis.RedisError:
+                    self._stopping.wait(1.0)
+                except Exception:
+                    traceback.print_exc()
+                    connection.close()
+                    self._stopping.wait(1.0)
+        finally:
+            connection.close()
+
+
+mail_worker = MailWorker(settings.MAIL_SENDER_THREADS)
+
+metrics.register_collector("mail.queue_depth", lambda: r.llen(MAIL_QUEUE_KEY))
+metrics.register_collector("mail.retry_depth", lambda: r.zcard(MAIL_RETRY_KEY))
+
+
+def send_verification_email(user):
+    enqueue_mail(
+        "verify_email",
+        user.email,
+        {
+            "username": user.username,
+            "verify_url": f"{settings.FRONTEND_URL}/verify-email?token={user.verification_token}",
+        },
+    )
+
+
+def send_event_reminders():
+    """
+    Queue reminders for the events starting within MAIL_REMINDER_LEAD_HOURS
+    that have not had theirs yet, to their attendees and organizer.
+    """
+    until = datetime.now(timezone.utc) + timedelta(hours=settings.MAIL_REMINDER_LEAD_HOURS)
+    local = ZoneInfo(settings.EVENTS_CALENDAR_TIMEZONE)
+    db = SessionLocal()
+    try:
+        while True:
+            events = claim_reminders(db, until)
+            if not events:
+                return
+            by_id = {event.id: event for event in events}
+            pipe = r.pipeline(transaction=False)
+            for event_id, email, username in reminder_recipients(db, list(by_id)):
+                event = by_id[event_id]
+                enqueue_mail(
+                    "event_reminder",
+                    email,
+                    {
+                        "username": username,
+                        "title": event.title,
+                        "starts_at": event.starts_at.astimezone(local).strftime("%A %d %B at %H:%M %Z"),
+                        "location": event.location or "see the event page",
+                        "event_url": f"{settings.FRONTEND_URL}/events/{event.id}",
+                    },
+                    pipe=pipe,
+                )
+            pipe.execute()
+    finally:
+        db.close()
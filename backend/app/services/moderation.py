@@ -0,0 +1,290 @@
+# app/services/moderation.py
+
+"""
+Moderation filter for comments and profile fields.
+
+Admins keep two lists of words and phrases: "block" terms reject the text,
+"flag" terms let it through and put it in the review queue. Both lists are
+compiled into a single Aho-Corasick automaton, so checking a text is one
+pass over its characters however many terms there are.
+
+Texts and terms are normalized alike before matching: compatibility
+decomposition and case folding (fullwidth or stylized letters become
+plain ones), combining marks and invisible format characters dropped,
+common leetspeak digits and symbols folded to letters, and every run of
+other characters collapsed to one space. Terms match whole words only:
+the automaton holds " term " and is run over the text padded with spaces.
+
+Every worker keeps its automaton in memory. Editing the lists publishes a
+change notification, on which each worker builds a new automaton from the
+database and swaps it in with a single assignment: a check sees either
+the old lists or the new ones, never a mix.
+
+Content written before a term was added is checked by the rescan, which
+walks comments and user profiles in batches. Run from the backend
+directory:
+    python -m app.services.moderation [--batch-size 500]
+"""
+
+import argparse
+import threading
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.pubsub import change_listener, publish_change
+from app.database.crud_moderation import (
+    all_terms,
+    comment_texts,
+    profile_texts,
+    purge_orphan_flags,
+    save_flags
+)
+from app.database.database import SessionLocal
+
+
+TOPIC = "moderation"
+
+BLOCK = "block"
+FLAG = "flag"
+
+_LEET = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "@": "a", "$": "s"}
+_DROPPED_CATEGORIES = {"Mn", "Me", "Cf"}
+
+
+class _FoldTable(dict):
+    """
+    str.translate table, filled in per code point on first use.
+    """
+    def __missing__(self, code_point: int) -> str:
+        decomposed = unicodedata.normalize("NFKD", chr(code_point))
+        folded = []
+        for char in unicodedata.normalize("NFKD", decomposed.casefold()):
+            if unicodedata.category(char) in _DROPPED_CATEGORIES:
+                continue
+            char = _LEET.get(char, char)
+            folded.append(char if char.isalnum() else " ")
+        self[code_point] = result = "".join(folded)
+        return result
+
+
+_FOLD = _FoldTable()
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.translate(_FOLD).split())
+
+
+@dataclass(frozen=True)
+class Match:
+    term: str
+    action: str
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton over normalized (term, action) pairs. Never
+    changed once built.
+    """
+    def __init__(self, terms: Iterable[tuple[str, str]]):
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[tuple[Match, ...]] = [()]
+        for term, action in terms:
+            state = 0
+            for char in f" {term} ":
+                following = goto[state].get(char)
+                if following is None:
+                    following = goto[state][char] = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                state = following
+            outputs[state] = (Match(term, action),)
+
+        # Failure links, breadth first so shorter suffixes are done first
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in goto[state].items():
+                queue.append(following)
+                suffix = fail[state]
+                while suffix and char not in goto[suffix]:
+                    suffix = fail[suffix]
+                fail[following] = goto[suffix].get(char, 0)
+                outputs[following] += outputs[fail[following]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self.size = sum(1 for output in outputs if output)
+
+    def scan(self, normalized: str) -> list[Match]:
+        """
+        Distinct terms found in a normalized text.
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = {}
+        state = 0
+        for char in f" {normalized} ":
+            while True:
+                following = goto[state].get(char)
+                if following is not None:
+                    state = following
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            if outputs[state]:
+                for match in outputs[state]:
+                    found[match.term] = match
+        return list(found.values())
+
+
+class ContentBlocked(ValueError):
+    """
+    Raised for text containing a blocked term.
+    """
+    def __init__(self, field: str, matches: list[Match]):
+        super().__init__(f"{field} contains blocked terms")
+        self.field = field
+        self.matches = matches
+
+
+class ModerationFilter:
+    """
+    The current automaton of a worker, rebuilt when the lists change.
+    """
+    def __init__(self):
+        self._automaton = Automaton(())
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def reload(self):
+        """
+        Build an automaton from the stored lists and swap it in.
+        """
+        with self._lock:
+            db = SessionLocal()
+            try:
+                terms = all_terms(db)
+            finally:
+                db.close()
+            self._automaton = Automaton(terms)
+            self.loaded = True
+        metrics.increment("moderation.reloads")
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.reload()
+
+    def subscribe(self):
+        """
+        Rebuild on every change notification, and after missing some.
+        """
+        change_listener.subscribe(TOPIC, lambda action, data: self.reload())
+        change_listener.on_resync(self.reload)
+
+    @property
+    def size(self) -> int:
+        return self._automaton.size
+
+    def scan(self, text: str) -> list[Match]:
+        self.ensure_loaded()
+        return self._automaton.scan(normalize(text))
+
+
+moderation_filter = ModerationFilter()
+moderation_filter.subscribe()
+
+
+def publish_reload():
+    """
+    Tell every worker the lists changed. Call after committing.
+    """
+    publish_change(TOPIC, "reload", {})
+
+
+def _outcome(matches: list[Match]) -> tuple[Optional[str], list[str]]:
+    if not matches:
+        return None, []
+    action = BLOCK if any(match.action == BLOCK for match in matches) else FLAG
+    return action, sorted(match.term for match in matches)
+
+
+def screen(fields: dict[str, Optional[str]]) -> dict[str, list[Match]]:
+    """
+    Check the given fields of new or edited content, raising
+    ContentBlocked on the first one containing a blocked term.
+    """
+    results = {}
+    for field, text in fields.items():
+        if text is None:
+            continue
+        matches = moderation_filter.scan(text)
+        if any(match.action == BLOCK for match in matches):
+            metrics.increment("moderation.blocked")
+            raise ContentBlocked(field, matches)
+        results[field] = matches
+    return results
+
+
+def record_flags(db: Session, content_type: str, content_id: UUID, results: dict[str, list[Match]]):
+    """
+    Flag the fields of saved content that matched, clearing the flags of
+    fields that no longer do.
+    """
+    entries = [(content_id, field, *_outcome(matches)) for field, matches in results.items()]
+    if any(action is not None for _, _, action, _ in entries):
+        metrics.increment("moderation.flagged")
+    save_flags(db, content_type, entries)
+
+
+SCAN_SOURCES = {
+    "comments": comment_texts,
+    "users": profile_texts,
+}
+
+
+def rescan(batch_size: Optional[int] = None) -> dict[str, int]:
+    """
+    Check every comment and user profile against the current lists,
+    refreshing their flags. Returns the number of items flagged per type.
+    """
+    batch_size = batch_size or settings.MODERATION_RESCAN_BATCH_SIZE
+    moderation_filter.reload()
+    flagged = {}
+    db = SessionLocal()
+    try:
+        for content_type, fetch in SCAN_SOURCES.items():
+            flagged[content_type] = 0
+            after = None
+            while True:
+                rows = fetch(db, after, batch_size)
+                if not rows:
+                    break
+                entries = []
+                for content_id, fields in rows:
+                    outcomes = [(field, *_outcome(moderation_filter.scan(text))) for field, text in fields.items()]
+                    flagged[content_type] += any(action is not None for _, action, _ in outcomes)
+                    entries.extend((content_id, *outcome) for outcome in outcomes)
+                save_flags(db, content_type, entries)
+                after = rows[-1][0]
+        purge_orphan_flags(db)
+    finally:
+        db.close()
+    metrics.increment("moderation.rescans")
+    return flagged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check existing comments and profiles against the moderation lists.")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    for content_type, count in rescan(args.batch_size).items():
+        print(f"Flagged {count} {content_type}.")
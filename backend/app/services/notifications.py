@@ -0,0 +1,205 @@
+# app/services/notifications.py
+
+"""
+Notifications and their unread counters.
+
+The unread count shown on every page comes from a Redis counter per user
+instead of a COUNT over the inbox. A counter is loaded from the table on
+first read, with a TTL so inactive users' counters expire, and from then
+on adjusted after every committed insert and mark-read. Adjustments only
+apply to counters that exist: a missing counter is not guessed at but
+reloaded on its next read.
+
+An adjustment can still be lost when a counter is loaded concurrently
+with a write, or when Redis fails after the commit (the failure is counted,
+not raised, as the write itself succeeded), so a periodic reconciliation
+recounts the cached counters a batch at a time. It only replaces a counter
+that did not change while it was being recounted, leaving that one to the
+next run.
+"""
+
+import traceback
+from datetime import datetime
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import r
+from app.database.crud_notifications import add_notifications, count_unread
+from app.database.crud_notifications import mark_all_read as mark_all_read_rows
+from app.database.crud_notifications import mark_read as mark_read_row
+from app.database.database import SessionLocal
+
+
+UNREAD_KEY_PREFIX = "notifications:unread:"
+RECONCILE_CURSOR_KEY = "notifications:reconcile:cursor"
+
+# Adds to a counter if it is loaded, never going below zero
+_ADJUST = r.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    return 0
+end
+return value
+""")
+
+# Replaces a counter only if it still holds the value it was recounted from
+_REPLACE = r.register_script("""
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'KEEPTTL')
+return 1
+""")
+
+
+def _unread_key(user_id: Any) -> str:
+    return f"{UNREAD_KEY_PREFIX}{user_id}"
+
+
+def _adjust(counts: dict[Any, int]):
+    # Runs after the commit, so a Redis failure must not fail the request;
+    # the reconciliation recounts the counters it left wrong
+    try:
+        pipe = r.pipeline(transaction=False)
+        for user_id, delta in counts.items():
+            if delta:
+                _ADJUST(keys=[_unread_key(user_id)], args=[delta], client=pipe)
+        pipe.execute()
+    except redis.RedisError:
+        metrics.increment("notifications.adjust_errors")
+        traceback.print_exc()
+
+
+def notify(
+    db: Session,
+    user_ids: Iterable[UUID],
+    kind: str,
+    subject_type: str,
+    subject_id: UUID,
+    actor_id: Optional[UUID] = None,
+    data: Optional[dict[str, Any]] = None,
+) -> int:
+    """
+    Notify users of something, except the user who did it. Call after
+    committing the change notified about. Returns the number notified.
+    """
+    rows = [
+        {
+            "user_id": user_id,
+            "kind": kind,
+            "actor_id": actor_id,
+            "subject_type": subject_type,
+            "subject_id": subject_id,
+            "data": data or {},
+        }
+        for user_id in dict.fromkeys(user_ids)
+        if user_id != actor_id
+    ]
+    recipients = add_notifications(db, rows)
+    counts: dict[UUID, int] = {}
+    for user_id in recipients:
+        counts[user_id] = counts.get(user_id, 0) + 1
+    _adjust(counts)
+    metrics.increment("notifications.created", len(recipients))
+    return len(recipients)
+
+
+def unread_count(db: Session, user_id: UUID) -> int:
+    """
+    Number of unread notifications of a user.
+    """
+    key = _unread_key(user_id)
+    cached = r.get(key)
+    if cached is not None:
+        metrics.increment("notifications.unread.hits")
+        return int(cached)
+    metrics.increment("notifications.unread.misses")
+    count = count_unread(db, [user_id])[user_id]
+    # Another request may have loaded it first, after a newer write
+    if not r.set(key, count, ex=settings.NOTIFICATIONS_UNREAD_TTL_SECONDS, nx=True):
+        cached = r.get(key)
+        if cached is not None:
+            return int(cached)
+    return count
+
+
+def mark_read(db: Session, user_id: UUID, notification_id: UUID) -> Optional[bool]:
+    """
+    Mark a notification read. Returns whether it was unread, or None if
+    the user has no such notification.
+    """
+    marked = mark_read_row(db, user_id, notification_id)
+    if marked:
+        _adjust({user_id: -1})
+    return marked
+
+
+def mark_all_read(db: Session, user_id: UUID, until: Optional[datetime] = None) -> int:
+    """
+    Mark a user's notifications read, all or up to `until`. Returns how
+    many were unread.
+    """
+    marked = mark_all_read_rows(db, user_id, until)
+    # Subtract rather than zero: notifications added meanwhile stay unread
+    _adjust({user_id: -marked})
+    return marked
+
+
+def reconcile_unread_counts(max_batches: Optional[int] = None) -> int:
+    """
+    Recount the next batches of cached unread counters, resuming the scan
+    where the previous run stopped. Returns the number that had drifted.
+    """
+    max_batches = max_batches or settings.NOTIFICATIONS_RECONCILE_BATCHES_PER_RUN
+    cursor = int(r.get(RECONCILE_CURSOR_KEY) or 0)
+    repaired = 0
+    db = SessionLocal()
+    try:
+        for _ in range(max_batches):
+            cursor, keys = r.scan(
+                cursor, match=f"{UNREAD_KEY_PREFIX}*", count=settings.NOTIFICATIONS_RECONCILE_BATCH_SIZE
+            )
+            if keys:
+                repaired += _reconcile_keys(db, keys)
+            if cursor == 0:
+                break
+    except Exception:
+        db.rollback()
+        metrics.increment("notifications.reconcile.errors")
+        raise
+    finally:
+        db.close()
+    if cursor == 0:
+        r.delete(RECONCILE_CURSOR_KEY)
+    else:
+        r.set(RECONCILE_CURSOR_KEY, cursor)
+    metrics.increment("notifications.reconcile.repaired", repaired)
+    return repaired
+
+
+def _reconcile_keys(db: Session, keys: list[str]) -> int:
+    # Read the counters before counting, so a write in between shows as a change
+    cached = dict(zip(keys, r.mget(keys)))
+    user_ids = {}
+    for key in keys:
+        try:
+            user_ids[UUID(key[len(UNREAD_KEY_PREFIX):])] = key
+        except ValueError:
+            continue
+    counts = count_unread(db, user_ids)
+    db.rollback()
+    repaired = 0
+    for user_id, key in user_ids.items():
+        value = cached[key]
+        if value is not None and int(value) != counts[user_id]:
+            repaired += _REPLACE(keys=[key], args=[value, counts[user_id]])
+    return repaired
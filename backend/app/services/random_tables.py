@@ -0,0 +1,222 @@
+# app/services/random_tables.py
+
+"""
+Weighted random tables compiled into alias tables.
+
+A table's weights are turned into a Walker alias table with Vose's method:
+each of the n slots holds a probability and an alias, and a roll picks a
+slot uniformly and keeps it or takes its alias by one more uniform draw.
+That makes a roll O(1) whatever the number of entries, and a batch of k
+rolls a handful of vectorized NumPy operations.
+
+An entry can roll on another table, its text a template around "{}". The
+tables reachable from the one being rolled form a DAG (cycles, deep chains
+and large closures are refused when saving), resolved by drawing from each
+nested table once for all the rolls that landed on an entry pointing to it.
+Results are built as lists of pieces joined once, and a batch whose
+results could exceed RANDOM_TABLES_MAX_RESULT_CHARS is refused up front.
+
+Compiled tables live in a per-process LRU keyed by (table id, version).
+A table's version is bumped on every change, so stale entries are never
+served and simply age out.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.crud_random_tables import get_table_entries, table_closure
+
+
+PLACEHOLDER = "{}"
+
+
+class ResultsTooLarge(ValueError):
+    """
+    The rolls asked for could build too much text.
+    """
+
+
+@dataclass(frozen=True)
+class CompiledTable:
+    id: UUID
+    version: int
+    prob: np.ndarray
+    alias: np.ndarray
+    texts: np.ndarray
+    lengths: np.ndarray
+    # (entry index, table id) of entries that roll on another table
+    nested: tuple[tuple[int, UUID], ...]
+
+    def sample(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw `count` entry indexes.
+        """
+        slots = rng.integers(len(self.prob), size=count)
+        keep = rng.random(count) < self.prob[slots]
+        return np.where(keep, slots, self.alias[slots])
+
+
+def build_alias(weights: list[float]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vose's alias method: the (prob, alias) arrays for these weights.
+    """
+    n = len(weights)
+    scaled = np.asarray(weights, dtype=np.float64)
+    scaled = scaled * (n / scaled.sum())
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    # Whatever is left is 1 up to rounding, and keeps its own slot
+    return prob, alias
+
+
+def compile_table(table_id: UUID, version: int, entries: list[dict]) -> CompiledTable:
+    prob, alias = build_alias([entry["weight"] for entry in entries])
+    texts = np.array(
+        [entry.get("text") or (PLACEHOLDER if entry.get("table_id") else "") for entry in entries],
+        dtype=object,
+    )
+    lengths = np.array([len(text) for text in texts])
+    # Templates without a placeholder have nothing to fill in
+    nested = tuple(
+        (index, UUID(str(entry["table_id"])))
+        for index, entry in enumerate(entries)
+        if entry.get("table_id") and PLACEHOLDER in texts[index]
+    )
+    return CompiledTable(table_id, version, prob, alias, texts, lengths, nested)
+
+
+class CompiledTableCache:
+    """
+    Thread-safe LRU of compiled tables keyed by (table id, version).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._tables: OrderedDict[tuple[UUID, int], CompiledTable] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, table_id: UUID, version: int) -> Optional[CompiledTable]:
+        with self._lock:
+            table = self._tables.get((table_id, version))
+            if table is not None:
+                self._tables.move_to_end((table_id, version))
+            return table
+
+    def put(self, table: CompiledTable):
+        with self._lock:
+            self._tables[(table.id, table.version)] = table
+            self._tables.move_to_end((table.id, table.version))
+            while len(self._tables) > self.capacity:
+                self._tables.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+
+compiled_tables = CompiledTableCache(settings.RANDOM_TABLES_CACHE_SIZE)
+
+
+def load_compiled(db: Session, table_id: UUID) -> dict[UUID, CompiledTable]:
+    """
+    The compiled table and every table it rolls on, compiling only those
+    missing from the cache at their current version.
+    """
+    compiled = {}
+    missing = []
+    for closure_id, version in table_closure(db, table_id):
+        table = compiled_tables.get(closure_id, version)
+        if table is None:
+            missing.append(closure_id)
+        else:
+            compiled[closure_id] = table
+    if missing:
+        for closure_id, version, entries in get_table_entries(db, missing):
+            table = compile_table(closure_id, version, entries)
+            compiled_tables.put(table)
+            compiled[closure_id] = table
+    return compiled
+
+
+def max_result_length(
+    tables: dict[UUID, CompiledTable],
+    table_id: UUID,
+    known: Optional[dict[UUID, int]] = None,
+) -> int:
+    """
+    Length of the longest result a roll on the table can give.
+    """
+    known = {} if known is None else known
+    if table_id not in known:
+        table = tables[table_id]
+        lengths = table.lengths.copy()
+        for index, target in table.nested:
+            if target in tables:
+                lengths[index] += max_result_length(tables, target, known) - len(PLACEHOLDER)
+        known[table_id] = int(lengths.max())
+    return known[table_id]
+
+
+def _draw_pieces(
+    tables: dict[UUID, CompiledTable],
+    table_id: UUID,
+    count: int,
+    rng: np.random.Generator,
+) -> list[list[str]]:
+    # Each result as pieces to join, so that nesting never copies the
+    # text drawn from the tables below
+    table = tables[table_id]
+    picks = table.sample(count, rng)
+    pieces = [[text] for text in table.texts[picks]]
+    for index, target in table.nested:
+        positions = np.flatnonzero(picks == index)
+        if not len(positions) or target not in tables:
+            continue
+        before, _, after = table.texts[index].partition(PLACEHOLDER)
+        inner = _draw_pieces(tables, target, len(positions), rng)
+        for position, parts in zip(positions, inner):
+            parts.insert(0, before)
+            parts.append(after)
+            pieces[position] = parts
+    return pieces
+
+
+def draw(
+    tables: dict[UUID, CompiledTable],
+    table_id: UUID,
+    count: int,
+    rng: np.random.Generator,
+) -> list[str]:
+    """
+    Roll `count` times on a table, resolving nested tables.
+    """
+    return ["".join(parts) for parts in _draw_pieces(tables, table_id, count, rng)]
+
+
+def roll_table(db: Session, table_id: UUID, count: int, seed: Optional[int] = None) -> list[str]:
+    """
+    Roll on a table. Raises ResultsTooLarge if the results could be longer
+    than RANDOM_TABLES_MAX_RESULT_CHARS in all.
+    """
+    tables = load_compiled(db, table_id)
+    if count * max_result_length(tables, table_id) > settings.RANDOM_TABLES_MAX_RESULT_CHARS:
+        raise ResultsTooLarge()
+    return draw(tables, table_id, count, np.random.default_rng(seed))
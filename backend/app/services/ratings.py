@@ -0,0 +1,51 @@
+# app/services/ratings.py
+
+"""
+Background reconciliation of the incrementally maintained rating aggregates.
+
+Each run repairs a bounded number of batches of games and remembers where it
+stopped in Redis, so the whole catalog is swept a slice at a time and the
+next run (on any worker) picks up from there, wrapping around at the end.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import r
+from app.database.crud_ratings import reconcile_batch
+from app.database.database import SessionLocal
+
+
+RECONCILE_POSITION_KEY = "ratings:reconcile:after"
+
+
+def reconcile_ratings(max_batches: Optional[int] = None) -> int:
+    """
+    Recompute rating aggregates for the next slice of games.
+    Returns the number of games whose aggregates had drifted.
+    """
+    max_batches = max_batches or settings.RATINGS_RECONCILE_BATCHES_PER_RUN
+    position = r.get(RECONCILE_POSITION_KEY)
+    after = UUID(position) if position else None
+    repaired = 0
+    db = SessionLocal()
+    try:
+        for _ in range(max_batches):
+            after, fixed = reconcile_batch(db, after, settings.RATINGS_RECONCILE_BATCH_SIZE)
+            repaired += fixed
+            if after is None:
+                break
+    except Exception:
+        db.rollback()
+        metrics.increment("ratings.reconcile.errors")
+        raise
+    finally:
+        db.close()
+    if after is None:
+        r.delete(RECONCILE_POSITION_KEY)
+    else:
+        r.set(RECONCILE_POSITION_KEY, str(after))
+    metrics.increment("ratings.reconcile.repaired", repaired)
+    return repaired
@@ -0,0 +1,214 @@
+# app/services/recommendations.py
+
+"""
+"Similar games" recommendations, precomputed in batch.
+
+Interactions (ratings and RSVPs to events for a game; see
+app.database.crud_recommendations) form a sparse game x user matrix. The
+similarity of two games is the cosine of their rows: mostly the same
+people, with the same enthusiasm. Each game's top SIMILAR_GAMES_K are
+computed a block of games at a time, as one sparse matrix product per
+block turned dense, scaled by the norms and cut down with argpartition;
+blocks are sized so the dense part stays within SIMILAR_GAMES_CHUNK_BYTES.
+The results are stored one row per game, so a detail page reads them with
+a primary key lookup.
+
+A full build covers every game. The periodic refresh only recomputes the
+games whose similarities may have changed since the last run: those with
+changed interactions, the other games of the users behind them, every game
+sharing a user with a changed game (its norm changed, which moves its
+cosine with all of them), and the games listing any of those. Changes to a
+very popular game therefore cost close to a full build. It loads the
+interactions of the users involved only, with every game's norm. Changed
+interactions, removed ones included, are recorded as (user, game) pairs in
+a Redis set by the rating and RSVP routes after they commit, and the
+refresh drains that set rather than looking for recent rows: deletions
+leave none, and timestamps of transactions committing late fall behind the
+last run.
+Run a full build from the backend directory:
+    python -m app.services.recommendations [--full]
+"""
+
+import argparse
+import traceback
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+import redis
+from scipy import sparse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import r
+from app.database.crud_recommendations import (
+    all_game_ids,
+    changed_games,
+    games_listing,
+    interaction_batches,
+    item_norms,
+    save_similarities
+)
+from app.database.database import SessionLocal
+
+
+REFRESHED_AT_KEY = "recommendations:refreshed_at"
+REFRESH_LOCK_KEY = "recommendations:refresh:lock"
+# "<user id>:<game id>" of interactions changed since the last refresh
+CHANGES_KEY = "recommendations:changes"
+
+
+def record_interactions(changes: list[tuple[UUID, UUID]]):
+    """
+    Note changed (user id, game id) interactions for the next refresh.
+    Call after committing them; failures are counted, not raised.
+    """
+    if not changes:
+        return
+    try:
+        r.sadd(CHANGES_KEY, *(f"{user_id}:{game_id}" for user_id, game_id in changes))
+    except redis.RedisError:
+        metrics.increment("recommendations.record_errors")
+        traceback.print_exc()
+
+
+def top_k_cosine(
+    items: sparse.csr_matrix,
+    norms: np.ndarray,
+    rows: np.ndarray,
+    k: int,
+    chunk_bytes: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The `k` rows of `items` most cosine-similar to each of `rows`, given
+    the norm of every row. Returns (indices, scores), each of shape
+    (len(rows), k) and best first; missing neighbours (similarity 0) have
+    index -1.
+    """
+    n_items = items.shape[0]
+    k = min(k, max(n_items - 1, 0))
+    indices = np.full((len(rows), k), -1, dtype=np.int64)
+    scores = np.zeros((len(rows), k), dtype=np.float32)
+    if k == 0 or len(rows) == 0:
+        return indices, scores
+    inverse = np.divide(1.0, norms, out=np.zeros(n_items, dtype=np.float32), where=norms > 0).astype(np.float32)
+    # The product, its scaled copy and the partition indices per block row
+    block_rows = max(1, chunk_bytes // (n_items * 16))
+    transposed = items.T.tocsr()
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        dots = (items[block] @ transposed).toarray().astype(np.float32, copy=False)
+        dots *= inverse
+        dots *= inverse[block, None]
+        dots[np.arange(len(block)), block] = 0
+        top = np.argpartition(dots, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(dots, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        top[top_scores <= settings.SIMILAR_GAMES_MIN_SCORE] = -1
+        indices[start:start + len(block)] = top
+        scores[start:start + len(block)] = np.where(top >= 0, top_scores, 0)
+    return indices, scores
+
+
+def _load_matrix(
+    db: Session,
+    game_ids: list[UUID],
+    involved: Optional[list[UUID]],
+) -> sparse.csr_matrix:
+    """
+    The game x user interaction matrix of every user, or of the users who
+    interacted with `involved`.
+    """
+    position = {game_id: n for n, game_id in enumerate(game_ids)}
+    users, games, weights = [], [], []
+    for batch in interaction_batches(db, involved):
+        for user_index, game_id, weight in batch:
+            row = position.get(game_id)
+            if row is not None:
+                users.append(user_index)
+                games.append(row)
+                weights.append(weight)
+    n_users = max(users) + 1 if users else 0
+    return sparse.csr_matrix(
+        (np.asarray(weights, dtype=np.float32), (np.asarray(games), np.asarray(users))),
+        shape=(len(game_ids), n_users),
+    )
+
+
+def compute_similarities(db: Session, targets: Optional[list[UUID]] = None) -> int:
+    """
+    Compute and store the similar games of `targets`, or of every game.
+    Returns the number of games updated.
+    """
+    game_ids = all_game_ids(db)
+    position = {game_id: n for n, game_id in enumerate(game_ids)}
+    if targets is None:
+        rows = np.arange(len(game_ids))
+        items = _load_matrix(db, game_ids, None)
+        norms = np.sqrt(np.asarray(items.multiply(items).sum(axis=1)).ravel())
+    else:
+        rows = np.asarray(sorted({position[game_id] for game_id in targets if game_id in position}), dtype=np.int64)
+        items = _load_matrix(db, game_ids, [game_ids[row] for row in rows])
+        # Rows only hold the involved users; norms must count everyone
+        known = item_norms(db)
+        norms = np.asarray([known.get(game_id, 0.0) for game_id in game_ids], dtype=np.float32)
+    indices, scores = top_k_cosine(items, norms, rows, settings.SIMILAR_GAMES_K, settings.SIMILAR_GAMES_CHUNK_BYTES)
+
+    saved = []
+    for row, neighbours, row_scores in zip(rows, indices, scores):
+        found = neighbours >= 0
+        saved.append((
+            game_ids[row],
+            [game_ids[n] for n in neighbours[found]],
+            [round(float(score), 6) for score in row_scores[found]],
+        ))
+        if len(saved) >= settings.SIMILAR_GAMES_SAVE_BATCH_SIZE:
+            save_similarities(db, saved)
+            saved = []
+    save_similarities(db, saved)
+    metrics.increment("recommendations.games_updated", len(rows))
+    return len(rows)
+
+
+def refresh_similar_games(full: bool = False) -> int:
+    """
+    Recompute the similar games of the games whose interactions changed
+    since the last refresh, or of all games. Runs on one worker at a time.
+    Returns the number of games updated.
+    """
+    if not r.set(REFRESH_LOCK_KEY, 1, nx=True, ex=settings.SIMILAR_GAMES_REFRESH_LOCK_SECONDS):
+        return 0
+    db = SessionLocal()
+    try:
+        # Changes are recorded after their commit, so the queries below see
+        # them; those recorded while this runs are left for the next run
+        recorded = r.smembers(CHANGES_KEY)
+        if full or r.get(REFRESHED_AT_KEY) is None:
+            updated = compute_similarities(db)
+        else:
+            changes = [tuple(UUID(part) for part in member.split(":")) for member in recorded]
+            changed = changed_games(db, changes)
+            targets = changed + games_listing(db, changed)
+            updated = compute_similarities(db, targets) if targets else 0
+        if recorded:
+            r.srem(CHANGES_KEY, *recorded)
+        r.set(REFRESHED_AT_KEY, datetime.now(timezone.utc).isoformat())
+        return updated
+    except Exception:
+        db.rollback()
+        metrics.increment("recommendations.refresh.errors")
+        raise
+    finally:
+        db.close()
+        r.delete(REFRESH_LOCK_KEY)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute the similar games of each game.")
+    parser.add_argument("--full", action="store_true", help="recompute every game, not only changed ones")
+    args = parser.parse_args()
+    print(f"Updated the similar games of {refresh_similar_games(args.full)} games.")
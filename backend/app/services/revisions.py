@@ -0,0 +1,299 @@
+# app/services/revisions.py
+
+"""
+Compact binary deltas between revisions of a text document.
+
+A delta rebuilds the new text from the previous one as a sequence of
+operations: copy a byte range of the old text, or insert literal bytes.
+Ranges are found by matching lines (after trimming the common prefix and
+suffix, which is most of a typical edit), so a one-line change costs a
+few bytes of varints plus the changed line. Lines of the middle are
+matched greedily through a hash index of the old lines, trying at most
+_MAX_CANDIDATES places per line, so the work stays linear in the size of
+the texts however repetitive they are; moved blocks are copied too.
+Deltas and snapshots are zlib-compressed. The same matcher, kept to
+in-order matches, gives the unified diffs shown between revisions.
+
+Format: varint length of the new text, then operations, each a tag byte
+followed by varints: COPY offset length | INSERT length bytes.
+"""
+
+import zlib
+from bisect import bisect_left
+from itertools import accumulate
+from typing import AnyStr, Iterator
+
+
+_COPY = 0
+_INSERT = 1
+
+# Places of the old text tried for each new line
+_MAX_CANDIDATES = 8
+# Shorter matches cost more as a COPY than as literal bytes
+_MIN_COPY_BYTES = 8
+
+COMPRESSION_LEVEL = 6
+
+
+class DeltaError(ValueError):
+    """
+    Raised for deltas that do not apply to the given text.
+    """
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        if position >= len(data):
+            raise DeltaError("truncated delta")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _offsets(lines: list[bytes]) -> list[int]:
+    return [0, *accumulate(len(line) for line in lines)]
+
+
+def _match_lines(
+    old_lines: list[AnyStr],
+    new_lines: list[AnyStr],
+    ordered: bool = False,
+    min_size: int = _MIN_COPY_BYTES,
+) -> list[tuple[str, int, int, int, int]]:
+    """
+    Opcodes turning `old_lines` into `new_lines`: ("equal", i1, i2, j1, j2)
+    for copied runs and ("insert", i1, i1, j1, j2) for the lines between.
+    Runs shorter than `min_size` are not copied. If `ordered`, each run
+    starts after the previous one in the old text too, as in a diff.
+    """
+    index: dict[AnyStr, list[int]] = {}
+    for i, line in enumerate(old_lines):
+        index.setdefault(line, []).append(i)
+
+    blocks = []
+    j = inserted = floor = 0
+    while j < len(new_lines):
+        best, best_length, best_size = 0, 0, 0
+        positions = index.get(new_lines[j], [])
+        start = bisect_left(positions, floor) if ordered else 0
+        for i in positions[start:start + _MAX_CANDIDATES]:
+            length = size = 0
+            while (
+                i + length < len(old_lines)
+                and j + length < len(new_lines)
+                and old_lines[i + length] == new_lines[j + length]
+            ):
+                size += len(new_lines[j + length])
+                length += 1
+            if length > best_length:
+                best, best_length, best_size = i, length, size
+                if i + length == len(old_lines) or j + length == len(new_lines):
+                    # Nothing can match longer
+                    break
+        if best_length == 0 or best_size < min_size:
+            j += 1
+            continue
+        if inserted < j:
+            blocks.append(("insert", best, best, inserted, j))
+        blocks.append(("equal", best, best + best_length, j, j + best_length))
+        j = inserted = j + best_length
+        floor = best + best_length
+    if inserted < len(new_lines):
+        blocks.append(("insert", len(old_lines), len(old_lines), inserted, len(new_lines)))
+    return blocks
+
+
+def _common_ends(old_lines: list[AnyStr], new_lines: list[AnyStr]) -> tuple[int, int]:
+    # Lengths of the common prefix and of the common suffix after it
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and old_lines[len(old_lines) - 1 - suffix] == new_lines[len(new_lines) - 1 - suffix]
+    ):
+        suffix += 1
+    return prefix, suffix
+
+
+def make_delta(old: bytes, new: bytes) -> bytes:
+    """
+    Uncompressed delta turning `old` into `new`.
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    prefix, suffix = _common_ends(old_lines, new_lines)
+
+    old_offsets = _offsets(old_lines)
+    new_offsets = _offsets(new_lines)
+    # Opcodes over the whole texts: the common prefix, the matches in the
+    # middle, then the common suffix
+    blocks = [("equal", 0, prefix, 0, prefix)]
+    middle = _match_lines(old_lines[prefix:len(old_lines) - suffix], new_lines[prefix:len(new_lines) - suffix])
+    for tag, i1, i2, j1, j2 in middle:
+        blocks.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    blocks.append(("equal", len(old_lines) - suffix, len(old_lines), len(new_lines) - suffix, len(new_lines)))
+
+    out = bytearray()
+    _write_varint(out, len(new))
+    for tag, i1, i2, j1, j2 in blocks:
+        if tag == "equal":
+            if i2 > i1:
+                out.append(_COPY)
+                _write_varint(out, old_offsets[i1])
+                _write_varint(out, old_offsets[i2] - old_offsets[i1])
+        elif j2 > j1:
+            literal = new[new_offsets[j1]:new_offsets[j2]]
+            out.append(_INSERT)
+            _write_varint(out, len(literal))
+            out += literal
+    return bytes(out)
+
+
+def apply_delta(old: bytes, delta: bytes) -> bytes:
+    """
+    Rebuild the new text from `old` and an uncompressed delta.
+    """
+    size, position = _read_varint(delta, 0)
+    parts = []
+    while position < len(delta):
+        tag = delta[position]
+        position += 1
+        if tag == _COPY:
+            offset, position = _read_varint(delta, position)
+            length, position = _read_varint(delta, position)
+            if offset + length > len(old):
+                raise DeltaError("copy past the end of the base text")
+            parts.append(old[offset:offset + length])
+        elif tag == _INSERT:
+            length, position = _read_varint(delta, position)
+            parts.append(delta[position:position + length])
+            position += length
+        else:
+            raise DeltaError(f"unknown operation {tag}")
+    new = b"".join(parts)
+    if len(new) != size:
+        raise DeltaError("rebuilt text has the wrong length")
+    return new
+
+
+def diff_opcodes(old_lines: list[str], new_lines: list[str]) -> list[tuple[str, int, int, int, int]]:
+    """
+    Opcodes turning `old_lines` into `new_lines` in the form of
+    difflib.SequenceMatcher.get_opcodes, found by the same linear matcher
+    as deltas but keeping matches in order and matching single lines.
+    """
+    prefix, suffix = _common_ends(old_lines, new_lines)
+    matches = [
+        (i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+        for tag, i1, i2, j1, j2 in _match_lines(
+            old_lines[prefix:len(old_lines) - suffix],
+            new_lines[prefix:len(new_lines) - suffix],
+            ordered=True,
+            min_size=0,
+        )
+        if tag == "equal"
+    ]
+    matches = [(0, prefix, 0, prefix), *matches, (len(old_lines) - suffix, len(old_lines), len(new_lines) - suffix, len(new_lines))]
+    opcodes = []
+    i = j = 0
+    for i1, i2, j1, j2 in matches:
+        if i < i1 and j < j1:
+            opcodes.append(("replace", i, i1, j, j1))
+        elif i < i1:
+            opcodes.append(("delete", i, i1, j, j1))
+        elif j < j1:
+            opcodes.append(("insert", i, i1, j, j1))
+        if i1 < i2:
+            opcodes.append(("equal", i1, i2, j1, j2))
+        i, j = i2, j2
+    return opcodes
+
+
+def _grouped_opcodes(
+    opcodes: list[tuple[str, int, int, int, int]], context: int
+) -> Iterator[list[tuple[str, int, int, int, int]]]:
+    # Hunks of changes with up to `context` equal lines around them, as
+    # difflib.SequenceMatcher.get_grouped_opcodes
+    if not opcodes:
+        return
+    opcodes = list(opcodes)
+    tag, i1, i2, j1, j2 = opcodes[0]
+    if tag == "equal":
+        opcodes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    tag, i1, i2, j1, j2 = opcodes[-1]
+    if tag == "equal":
+        opcodes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+    group = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _hunk_range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def unified_diff(
+    old_lines: list[str], new_lines: list[str], fromfile: str, tofile: str, context: int = 3
+) -> Iterator[str]:
+    """
+    Lines of a unified diff, as difflib.unified_diff gives, in time linear
+    in the size of the texts.
+    """
+    started = False
+    for group in _grouped_opcodes(diff_opcodes(old_lines, new_lines), context):
+        if not started:
+            started = True
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_hunk_range(first[1], last[2])} +{_hunk_range(first[3], last[4])} @@\n"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                yield from (" " + line for line in old_lines[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                yield from ("-" + line for line in old_lines[i1:i2])
+            if tag in ("replace", "insert"):
+                yield from ("+" + line for line in new_lines[j1:j2])
+
+
+def compress(data: bytes) -> bytes:
+    return zlib.compress(data, COMPRESSION_LEVEL)
+
+
+def decompress(data: bytes) -> bytes:
+    return zlib.decompress(data)
+
+
+def rebuild(snapshot: bytes, deltas: list[bytes]) -> bytes:
+    """
+    Text from a compressed snapshot and the compressed deltas after it.
+    """
+    text = decompress(snapshot)
+    for delta in deltas:
+        text = apply_delta(text, decompress(delta))
+    return text
@@ -0,0 +1,136 @@
+# app/services/search.py
+
+"""
+Full-text search over the searchable tables.
+
+Each source table carries a trigger-maintained, GIN-indexed `search_vector`
+(see app.database.fulltext). A search ranks the matches of every requested
+source with `ts_rank`, merges them, and only builds `ts_headline` snippets for
+the rows of the returned page. Snippets are HTML-escaped text with matches
+wrapped in <mark> tags. Pages are keyset-paginated on (rank, id).
+Popular queries are served from a short-lived Redis cache of the encoded
+response, keyed by the normalized query text.
+
+Ranking has to look at every match, which is what makes broad queries slow
+(a word found in a third of a million rows costs over half a second). Each
+source therefore only ranks its SEARCH_MAX_CANDIDATES most recent matches;
+selective queries are still ranked exactly. The candidates are cut before
+the keyset, so every page of a query ranks the same rows and pages neither
+skip nor repeat results.
+"""
+
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import r
+from app.database.fulltext import SEARCH_CONFIG
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """
+    A searchable table: its name plus the columns shown in results.
+    """
+    table: str
+    title_column: str
+    body_column: str
+
+
+SEARCH_SOURCES: dict[str, SearchSource] = {
+    "games": SearchSource(table="games", title_column="title", body_column="description"),
+    "events": SearchSource(table="events", title_column="title", body_column="description"),
+}
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+# Snippets are HTML: the text is escaped, only the <mark> tags are markup
+_ESCAPED_BODY = "replace(replace(replace(coalesce(hit.body, ''), '&', '&amp;'), '<', '&lt;'), '>', '&gt;')"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query, used for the cache key.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip().casefold()
+
+
+def search(
+    db: Session,
+    query: str,
+    types: list[str],
+    after: Optional[tuple] = None,
+    limit: int = 20,
+) -> list[dict]:
+    """
+    Ranked matches of `query` in the given source types, best first,
+    starting after the (rank, id) key `after`. Returns up to `limit + 1`
+    rows so the caller can tell whether there is a next page.
+    """
+    params = {
+        "query": query,
+        "limit": limit + 1,
+        "candidates": settings.SEARCH_MAX_CANDIDATES,
+        "headline": HEADLINE_OPTIONS,
+    }
+    keyset = ""
+    if after is not None:
+        keyset = "WHERE (ts_rank(t.search_vector, q.query), t.id) < (CAST(:after_rank AS real), CAST(:after_id AS uuid))"
+        params.update({"after_rank": after[0], "after_id": str(after[1])})
+
+    # Each source contributes at most one page of its best rows; snippets
+    # are only generated for those
+    selects = []
+    for source_type in types:
+        source = SEARCH_SOURCES[source_type]
+        selects.append(
+            f"SELECT '{source_type}' AS type, hit.id, hit.title, "
+            f"ts_headline('{SEARCH_CONFIG}', {_ESCAPED_BODY}, q.query, :headline) AS snippet, "
+            f"hit.rank "
+            f"FROM q, ("
+            f"SELECT t.id, t.title, t.body, ts_rank(t.search_vector, q.query) AS rank "
+            f"FROM q, ("
+            f"SELECT m.id, m.{source.title_column} AS title, m.{source.body_column} AS body, m.search_vector "
+            f"FROM {source.table} AS m, q "
+            f"WHERE m.search_vector @@ q.query "
+            f"ORDER BY m.created_at DESC, m.id DESC LIMIT :candidates"
+            f") AS t {keyset} "
+            f"ORDER BY rank DESC, t.id DESC LIMIT :limit"
+            f") AS hit"
+        )
+    statement = (
+        f"WITH q AS (SELECT websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS query) "
+        + " UNION ALL ".join(f"({select})" for select in selects)
+        + " ORDER BY rank DESC, id DESC LIMIT :limit"
+    )
+    return [dict(row) for row in db.execute(text(statement), params).mappings()]
+
+
+# region Result cache
+
+def _cache_key(query: str, types: list[str], cursor: Optional[str], limit: int) -> str:
+    raw = "\x1f".join([normalize_query(query), ",".join(sorted(types)), cursor or "", str(limit)])
+    return f"search:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def get_cached_results(query: str, types: list[str], cursor: Optional[str], limit: int) -> Optional[str]:
+    """
+    Encoded response of a recent identical search, if any.
+    """
+    return r.get(_cache_key(query, types, cursor, limit))
+
+
+def cache_results(query: str, types: list[str], cursor: Optional[str], limit: int, body: bytes):
+    """
+    Keep an encoded search response for a few seconds.
+    """
+    r.setex(_cache_key(query, types, cursor, limit), settings.SEARCH_CACHE_TTL_SECONDS, body)
+
+# endregion Result cache
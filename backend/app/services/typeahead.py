@@ -0,0 +1,329 @@
+# app/services/typeahead.py
+
+"""
+In-memory prefix index for typeahead suggestions.
+
+Every worker keeps, per suggestion type, a sorted array of normalized names.
+A prefix lookup is two binary searches delimiting the matching range, then a
+top-k by popularity within it. The top-k of prefixes matching many entries
+(short prefixes, whose range scan dominates) is cached until an entry under
+the prefix changes.
+
+The indexes are built from the database at startup and kept current from the
+change notifications writers publish after committing (see app.core.pubsub),
+so keystrokes never reach Postgres.
+"""
+
+import heapq
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import literal, select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.pubsub import change_listener, publish_change
+from app.database.database import SessionLocal
+from app.models.event import Event
+from app.models.game import Game
+from app.models.user import User
+
+
+# Sorts before every character, so an exact name comes before its extensions
+_SEPARATOR = "\x00"
+_PREFIX_END = "\U0010ffff"
+
+
+def normalize_name(name: str) -> str:
+    """
+    Case- and accent-insensitive form of a name, with whitespace collapsed.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split())
+
+
+class PrefixIndex:
+    """
+    Sorted array of `normalized name + separator + id` keys, with labels and
+    popularity scores in parallel arrays.
+    """
+    def __init__(
+        self,
+        cached_results: int = 10,
+        cache_min_matches: int = 256,
+        cache_size: int = 10_000,
+        warm_prefix_length: int = 2
+    ):
+        self.cached_results = cached_results
+        self.cache_min_matches = cache_min_matches
+        self.cache_size = cache_size
+        self.warm_prefix_length = warm_prefix_length
+        self._lock = threading.Lock()
+        self._keys: list[str] = []
+        self._labels: list[str] = []
+        self._scores = array("d")
+        self._key_of: dict[str, str] = {}
+        # Top (id, label, score) entries of prefixes with many matches
+        self._top: dict[str, list[tuple[str, str, float]]] = {}
+        # Changes received during a rebuild, None when not rebuilding
+        self._replay: Optional[list[tuple[str, Optional[str], float]]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def build(self, entries: Iterable[tuple[Any, str, float]]):
+        """
+        Replace the contents with (id, label, score) entries, then precompute
+        the top entries of the shortest prefixes. Changes applied while the
+        entries are read are replayed on top of them.
+        """
+        with self._lock:
+            self._replay = []
+        rows = sorted(
+            (f"{normalize_name(label)}{_SEPARATOR}{entry_id}", label, score)
+            for entry_id, label, score in entries
+        )
+        keys = [key for key, _, _ in rows]
+        labels = [label for _, label, _ in rows]
+        scores = array("d", (score for _, _, score in rows))
+        key_of = {key.rpartition(_SEPARATOR)[2]: key for key in keys}
+        with self._lock:
+            self._keys, self._labels, self._scores = keys, labels, scores
+            self._key_of, self._top = key_of, {}
+            replay, self._replay = self._replay, None
+            for entry_id, label, score in replay:
+                self._remove(entry_id)
+                if label is not None:
+                    self._insert(entry_id, label, score)
+            self._warm()
+
+    def upsert(self, entry_id: Any, label: str, score: float = 0):
+        """
+        Add an entry, or update its label and score.
+        """
+        entry_id = str(entry_id)
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((entry_id, label, score))
+            self._remove(entry_id)
+            self._insert(entry_id, label, score)
+
+    def remove(self, entry_id: Any):
+        """
+        Remove an entry, if present.
+        """
+        entry_id = str(entry_id)
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((entry_id, None, 0))
+            self._remove(entry_id)
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[str, str]]:
+        """
+        (id, label) of the most popular entries starting with `prefix`,
+        ties in name order.
+        """
+        prefix = normalize_name(prefix)
+        with self._lock:
+            top = self._top.get(prefix) if limit <= self.cached_results else None
+            if top is None:
+                start = bisect_left(self._keys, prefix)
+                end = bisect_left(self._keys, prefix + _PREFIX_END, start)
+                if end - start >= self.cache_min_matches and limit <= self.cached_results:
+                    top = self._cache(prefix, start, end)
+                else:
+                    top = self._top_k(start, end, limit)
+        return [(entry_id, label) for entry_id, label, _ in top[:limit]]
+
+    def _top_k(self, start: int, end: int, count: int) -> list[tuple[str, str, float]]:
+        if end - start <= count:
+            positions = sorted(range(start, end), key=self._scores.__getitem__, reverse=True)
+        else:
+            # nlargest keeps the original (name) order among equal scores
+            positions = heapq.nlargest(count, range(start, end), key=self._scores.__getitem__)
+        return [
+            (self._keys[i].rpartition(_SEPARATOR)[2], self._labels[i], self._scores[i])
+            for i in positions
+        ]
+
+    def _cache(self, prefix: str, start: int, end: int) -> list[tuple[str, str, float]]:
+        if len(self._top) >= self.cache_size:
+            self._top.clear()
+        top = self._top[prefix] = self._top_k(start, end, self.cached_results)
+        return top
+
+    def _warm(self):
+        # Every prefix up to `warm_prefix_length` characters with enough
+        # matches, found by walking the array one prefix range at a time
+        for length in range(1, self.warm_prefix_length + 1):
+            start = 0
+            while start < len(self._keys):
+                prefix = self._keys[start][:length]
+                end = bisect_left(self._keys, prefix + _PREFIX_END, start)
+                if end - start >= self.cache_min_matches:
+                    self._cache(prefix, start, end)
+                start = end
+
+    def _insert(self, entry_id: str, label: str, score: float):
+        key = f"{normalize_name(label)}{_SEPARATOR}{entry_id}"
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._labels.insert(position, label)
+        self._scores.insert(position, score)
+        self._key_of[entry_id] = key
+        # A cached top list only changes if the new entry can make it
+        for prefix, top in self._cached_prefixes(key):
+            if len(top) < self.cached_results or score >= top[-1][2]:
+                del self._top[prefix]
+
+    def _remove(self, entry_id: str):
+        key = self._key_of.pop(entry_id, None)
+        if key is None:
+            return
+        position = bisect_left(self._keys, key)
+        del self._keys[position]
+        del self._labels[position]
+        del self._scores[position]
+        # ...and only loses an entry it contains
+        for prefix, top in self._cached_prefixes(key):
+            if any(cached_id == entry_id for cached_id, _, _ in top):
+                del self._top[prefix]
+
+    def _cached_prefixes(self, key: str) -> list[tuple[str, list]]:
+        if not self._top:
+            return []
+        name = key.partition(_SEPARATOR)[0]
+        prefixes = (name[:length] for length in range(len(name) + 1))
+        return [(prefix, self._top[prefix]) for prefix in prefixes if prefix in self._top]
+
+
+@dataclass(frozen=True)
+class TypeaheadSource:
+    """
+    A suggestion type: the table, the name column and the column ranking
+    suggestions by popularity (None ranks by name only).
+    """
+    model: Any
+    label_column: str
+    score_column: Optional[str] = None
+    active_column: Optional[str] = None
+
+    def query(self):
+        model = self.model
+        score = getattr(model, self.score_column) if self.score_column else literal(0)
+        statement = select(model.id, getattr(model, self.label_column), score)
+        if self.active_column:
+            statement = statement.where(getattr(model, self.active_column).is_(True))
+        return statement
+
+    def entry(self, obj) -> dict[str, Any]:
+        return {
+            "id": str(obj.id),
+            "label": getattr(obj, self.label_column),
+            "score": getattr(obj, self.score_column) if self.score_column else 0,
+        }
+
+
+TYPEAHEAD_SOURCES: dict[str, TypeaheadSource] = {
+    "games": TypeaheadSource(Game, "title", score_column="rating_count"),
+    "events": TypeaheadSource(Event, "title", score_column="rsvp_count"),
+    "users": TypeaheadSource(User, "username", active_column="is_active"),
+}
+
+
+def _topic(source_type: str) -> str:
+    return f"typeahead:{source_type}"
+
+
+class Typeahead:
+    """
+    The prefix indexes of every suggestion type in this worker.
+    """
+    def __init__(self, sources: dict[str, TypeaheadSource]):
+        self.sources = sources
+        self.indexes = {
+            source_type: PrefixIndex(cached_results=settings.TYPEAHEAD_MAX_RESULTS)
+            for source_type in sources
+        }
+        self.built = False
+        self._build_lock = threading.Lock()
+
+    def build(self):
+        """
+        (Re)load every index from the database.
+        """
+        with self._build_lock:
+            db = SessionLocal()
+            try:
+                for source_type, source in self.sources.items():
+                    rows = db.execute(source.query().execution_options(yield_per=10_000))
+                    self.indexes[source_type].build(rows)
+                    metrics.set_gauge(f"typeahead.{source_type}.entries", len(self.indexes[source_type]))
+            finally:
+                db.close()
+            self.built = True
+
+    def ensure_built(self):
+        """
+        Build the indexes unless already done.
+        """
+        if not self.built:
+            self.build()
+
+    def subscribe(self):
+        """
+        Follow change notifications, rebuilding if any may have been missed.
+        """
+        for source_type in self.sources:
+            change_listener.subscribe(
+                _topic(source_type),
+                lambda action, data, source_type=source_type: self.apply(source_type, action, data),
+            )
+        change_listener.on_resync(self.build)
+
+    def apply(self, source_type: str, action: str, data: dict[str, Any]):
+        """
+        Apply one change notification to an index.
+        """
+        index = self.indexes[source_type]
+        if action == "upsert":
+            index.upsert(data["id"], data["label"], data["score"])
+        elif action == "delete":
+            index.remove(data["id"])
+
+    def suggest(self, prefix: str, types: list[str], limit: int) -> list[dict[str, str]]:
+        """
+        Top suggestions for a prefix across the given types, each type
+        contributing its best entries in turn.
+        """
+        per_type = [
+            [{"type": source_type, "id": entry_id, "label": label}
+             for entry_id, label in self.indexes[source_type].suggest(prefix, limit)]
+            for source_type in types
+        ]
+        merged = [item for rank in zip_longest(*per_type) for item in rank if item is not None]
+        return merged[:limit]
+
+
+typeahead = Typeahead(TYPEAHEAD_SOURCES)
+typeahead.subscribe()
+
+
+def publish_upsert(source_type: str, obj):
+    """
+    Tell every worker to add or refresh an entry. Call after committing.
+    """
+    publish_change(_topic(source_type), "upsert", TYPEAHEAD_SOURCES[source_type].entry(obj))
+
+
+def publish_delete(source_type: str, entry_id: Any):
+    """
+    Tell every worker to drop an entry. Call after committing.
+    """
+    publish_change(_topic(source_type), "delete", {"id": str(entry_id)})
@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.database.database import SessionLocal
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def register_user(username: str, admin: bool = False) -> tuple[str, dict]:
+    """
+    Register a user, made an administrator if `admin`, and log them in.
+    Returns the new user's id (None if they already existed) and an
+    Authorization header.
+    """
+    response = client.post(
+        "/auth/register",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "Testpassword123!"
+        }
+    )
+    user_id = response.json().get("id")
+    if admin:
+        db = SessionLocal()
+        try:
+            db.execute(text("UPDATE users SET is_admin = true WHERE username = :u"), {"u": username})
+            db.commit()
+        finally:
+            db.close()
+    response = client.post(
+        "/auth/login",
+        data={"username": username, "password": "Testpassword123!"}
+    )
+    assert response.status_code == 200, f"Login failed: {response.json()}"
+    return user_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def register_and_login(username: str, admin: bool = False) -> dict:
+    """
+    Register a user as `register_user` does and return their Authorization
+    header.
+    """
+    return register_user(username, admin)[1]
+
+# endregion Helper functions
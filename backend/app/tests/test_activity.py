@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+from backend.app.core.activity import flush_activity
+from backend.main import app
+
+
+client = TestClient(app)
+
+
+def test_activity_is_written_behind():
+    """
+    Test that login and request activity is only persisted once the
+    write-behind flusher runs, and that repeated hits coalesce.
+    """
+    client.post(
+        "/auth/register",
+        json={
+            "username": "activityuser",
+            "email": "activity@example.com",
+            "password": "Testpassword123!"
+        }
+    )
+    login_response = client.post(
+        "/auth/login",
+        data={
+            "username": "activityuser",
+            "password": "Testpassword123!"
+        }
+    )
+    assert login_response.status_code == 200
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    # Several requests before any flush
+    for _ in range(3):
+        profile = client.get("/users/profile", headers=headers)
+        assert profile.status_code == 200
+
+    # Apply the pending activity to the database
+    assert flush_activity() >= 1, "Pending activity should have been flushed."
+
+    profile = client.get("/users/profile", headers=headers).json()
+    assert profile["last_login_at"] is not None, "Login time should be persisted after a flush."
+    assert profile["last_seen_at"] is not None, "Last seen time should be persisted after a flush."
+    assert profile["last_seen_at"] >= profile["last_login_at"]
+
+    # Nothing left to write on the next flush for this user
+    flush_activity()
+    assert flush_activity() == 0, "A second flush should find no pending activity."
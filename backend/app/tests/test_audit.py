@@ -0,0 +1,92 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+# Imported the way main.py does, so the test shares the app's buffer
+from app.core.audit import (
+    LOGIN,
+    LOGIN_FAILED,
+    AuditBuffer,
+    audit_buffer,
+    ensure_audit_partitions,
+    flush_audit_events
+)
+from app.database.database import SessionLocal
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Buffer backpressure tests
+
+def make_event(event_type: str) -> dict:
+    return {"event_type": event_type}
+
+
+def test_buffer_samples_routine_events_under_load():
+    """
+    Test that above the high watermark only one in `sample_every` routine
+    events is kept, while failed logins are always kept.
+    """
+    buffer = AuditBuffer(capacity=100, high_watermark=10, sample_every=5)
+    for _ in range(10):
+        assert buffer.record(make_event(LOGIN))
+
+    kept = sum(buffer.record(make_event(LOGIN)) for _ in range(20))
+    assert kept == 4, "Routine events should be sampled above the high watermark."
+    assert all(buffer.record(make_event(LOGIN_FAILED)) for _ in range(5)),\
+        "Failed logins should not be sampled."
+    assert len(buffer) == 19
+
+
+def test_buffer_drops_when_full():
+    """
+    Test that a full buffer sheds new events and that a failed write
+    requeues as much as fits, oldest first.
+    """
+    buffer = AuditBuffer(capacity=3, high_watermark=3, sample_every=1)
+    assert all(buffer.record(make_event(LOGIN_FAILED)) for _ in range(3))
+    assert not buffer.record(make_event(LOGIN_FAILED)), "A full buffer should drop events."
+
+    batch = buffer.drain(2)
+    assert len(batch) == 2 and len(buffer) == 1
+    buffer.record(make_event(LOGIN))
+    buffer.requeue(batch)
+    assert len(buffer) == 3, "Requeued events beyond capacity should be dropped."
+
+# endregion Buffer backpressure tests
+
+
+
+# region Flush test
+
+def test_auth_events_are_flushed_in_batches():
+    """
+    Test that login attempts end up in the partitioned audit table once
+    the buffer is flushed.
+    """
+    ensure_audit_partitions()
+    audit_buffer.drain(audit_buffer.capacity)
+
+    client.post(
+        "/auth/register",
+        json={
+            "username": "audituser",
+            "email": "audit@example.com",
+            "password": "Testpassword123!"
+        }
+    )
+    client.post("/auth/login", data={"username": "audituser", "password": "wrongpassword"})
+    client.post("/auth/login", data={"username": "audituser", "password": "Testpassword123!"})
+
+    assert flush_audit_events() >= 2, "Both login attempts should be written."
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(text(
+            "SELECT event_type, success FROM auth_audit_events "
+            "WHERE username = 'audituser' ORDER BY occurred_at"
+        )).all()
+    finally:
+        db.close()
+    assert [tuple(row) for row in rows] == [(LOGIN_FAILED, False), (LOGIN, True)]
+
+# endregion Flush test
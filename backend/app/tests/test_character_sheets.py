@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def create_sheet(headers: dict, name: str, data: dict) -> dict:
+    response = client.post("/sheets", headers=headers, json={"name": name, "data": data})
+    assert response.status_code == 201, f"Sheet creation failed: {response.json()}"
+    return response.json()
+
+
+def patch(sheet_id: str, headers: dict, operations: list[dict], if_match: str | None = None):
+    if if_match is not None:
+        headers = {**headers, "If-Match": if_match}
+    return client.patch(f"/sheets/{sheet_id}", headers=headers, json=operations)
+
+# endregion Helper functions
+
+
+
+# region Character sheet tests
+
+def test_patch_operations_are_applied_in_place():
+    """
+    Test that every JSON Patch operation applies to nested members and
+    arrays, and that the whole patch bumps the version once.
+    """
+    headers = register_and_login("sheetsowner")
+    sheet = create_sheet(
+        headers,
+        "Mira",
+        {"hp": {"current": 12, "max": 20}, "inventory": ["rope", "torch"], "notes": "a/b"},
+    )
+    response = patch(sheet["id"], headers, [
+        {"op": "test", "path": "/hp/current", "value": 12},
+        {"op": "replace", "path": "/hp/current", "value": 7},
+        {"op": "add", "path": "/inventory/-", "value": "potion"},
+        {"op": "add", "path": "/inventory/0", "value": "dagger"},
+        {"op": "remove", "path": "/inventory/2"},
+        {"op": "add", "path": "/conditions", "value": {"poisoned": True}},
+        {"op": "copy", "from": "/hp/max", "path": "/hp/temporary"},
+        {"op": "move", "from": "/notes", "path": "/backstory~1notes"},
+    ], if_match=f'"{sheet["version"]}"')
+    assert response.status_code == 200, response.json()
+    assert response.json()["version"] == sheet["version"] + 1
+    assert "data" not in response.json()
+
+    data = client.get(f"/sheets/{sheet['id']}").json()["data"]
+    assert data == {
+        "hp": {"current": 7, "max": 20, "temporary": 20},
+        "inventory": ["dagger", "rope", "potion"],
+        "conditions": {"poisoned": True},
+        "backstory/notes": "a/b",
+    }
+
+
+def test_failed_operations_leave_the_sheet_untouched():
+    """
+    Test that a failing test, a missing path or an out-of-range index
+    rejects the whole patch, and malformed operations are refused.
+    """
+    headers = register_and_login("sheetsfailures")
+    sheet = create_sheet(headers, "Bram", {"hp": 10, "spells": []})
+    for operations in (
+        [{"op": "replace", "path": "/hp", "value": 3}, {"op": "test", "path": "/hp", "value": 10}],
+        [{"op": "replace", "path": "/hp", "value": 3}, {"op": "remove", "path": "/missing"}],
+        [{"op": "add", "path": "/spells/1", "value": "light"}],
+        [{"op": "add", "path": "/hp/x", "value": 1}],
+    ):
+        response = patch(sheet["id"], headers, operations)
+        assert response.status_code == 409, operations
+    assert patch(sheet["id"], headers, [{"op": "remove", "path": ""}]).status_code == 422
+    assert patch(sheet["id"], headers, [{"op": "add", "path": "hp", "value": 1}]).status_code == 422
+    assert patch(sheet["id"], headers, [{"op": "add", "path": "/hp"}]).status_code == 422
+
+    current = client.get(f"/sheets/{sheet['id']}").json()
+    assert current["data"] == {"hp": 10, "spells": []}
+    assert current["version"] == sheet["version"]
+
+
+def test_stale_versions_and_other_users_are_rejected():
+    """
+    Test that If-Match with an old version gets 412, and only the owner
+    can patch.
+    """
+    headers = register_and_login("sheetsversions")
+    sheet = create_sheet(headers, "Cor", {"hp": 5})
+    stale = f'"{sheet["version"]}"'
+    assert patch(sheet["id"], headers, [{"op": "replace", "path": "/hp", "value": 4}], stale).status_code == 200
+    response = patch(sheet["id"], headers, [{"op": "replace", "path": "/hp", "value": 9}], stale)
+    assert response.status_code == 412
+    assert response.headers["ETag"] == f'"{sheet["version"] + 1}"'
+
+    other = register_and_login("sheetsintruder")
+    assert patch(sheet["id"], other, [{"op": "replace", "path": "/hp", "value": 0}]).status_code == 403
+    assert client.get(f"/sheets/{sheet['id']}").json()["data"] == {"hp": 4}
+
+
+def test_concurrent_patches_are_not_lost():
+    """
+    Test that concurrent patches without If-Match each apply on top of
+    the others.
+    """
+    headers = register_and_login("sheetsconcurrency")
+    sheet = create_sheet(headers, "Dax", {"log": []})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(
+            lambda n: patch(sheet["id"], headers, [{"op": "add", "path": "/log/-", "value": n}]),
+            range(16),
+        ))
+    assert all(response.status_code == 200 for response in responses)
+    current = client.get(f"/sheets/{sheet['id']}").json()
+    assert sorted(current["data"]["log"]) == list(range(16))
+    assert current["version"] == sheet["version"] + 16
+
+
+def test_sheets_can_be_queried_by_contents():
+    """
+    Test that sheets can be found by JSON containment and by jsonpath.
+    """
+    headers = register_and_login("sheetsqueries")
+    wizard = create_sheet(headers, "Wiz", {"class": "sheetwizard", "level": 7, "skills": ["arcana"]})
+    create_sheet(headers, "Rog", {"class": "sheetrogue", "level": 3, "skills": ["stealth"]})
+
+    response = client.get("/sheets", params={"owner_id": wizard["owner_id"], "contains": '{"class": "sheetwizard"}'})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [wizard["id"]]
+    response = client.get("/sheets", params={"path": '$.skills[*] ? (@ == "arcana")'})
+    assert wizard["id"] in [item["id"] for item in response.json()["items"]]
+    assert client.get("/sheets", params={"contains": "not json"}).status_code == 400
+    assert client.get("/sheets", params={"path": "$$ nonsense"}).status_code == 400
+
+# endregion Character sheet tests
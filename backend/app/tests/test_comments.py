@@ -0,0 +1,153 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.database.database import engine
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def create_event(headers: dict, title: str) -> str:
+    response = client.post(
+        "/events",
+        headers=headers,
+        json={
+            "title": title,
+            "starts_at": "2031-10-04T18:00:00Z",
+            "ends_at": "2031-10-04T22:00:00Z",
+        }
+    )
+    assert response.status_code == 201, f"Event creation failed: {response.json()}"
+    return response.json()["id"]
+
+
+def post_comment(headers: dict, event_id: str, body: str, parent_id: str = None) -> dict:
+    response = client.post(
+        "/comments",
+        headers=headers,
+        json={"subject_type": "events", "subject_id": event_id, "parent_id": parent_id, "body": body}
+    )
+    assert response.status_code == 201, f"Comment creation failed: {response.json()}"
+    return response.json()
+
+
+class QueryCounter:
+    """
+    Collects the SQL statements executed while it is active.
+    """
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+# endregion Helper functions
+
+
+
+# region Comment tests
+
+def test_threads_come_with_their_first_replies_in_thread_order():
+    """
+    Test that threads are listed newest first, each with its first replies
+    depth-first, and that reply counts follow the replies.
+    """
+    headers = register_and_login("threadauthor")
+    event_id = create_event(headers, "Threaded Night")
+    older = post_comment(headers, event_id, "First!")
+    newer = post_comment(headers, event_id, "Second thread")
+    a = post_comment(headers, event_id, "reply a", older["id"])
+    b = post_comment(headers, event_id, "reply b", older["id"])
+    a1 = post_comment(headers, event_id, "reply a1", a["id"])
+    post_comment(headers, event_id, "reply c", older["id"])
+
+    response = client.get("/comments", params={"subject_type": "events", "subject_id": event_id, "replies": 3})
+    assert response.status_code == 200, f"Listing comments failed: {response.json()}"
+    threads = response.json()["items"]
+    assert [t["id"] for t in threads] == [newer["id"], older["id"]]
+    assert [r["id"] for r in threads[1]["replies"]] == [a["id"], a1["id"], b["id"]]
+    assert threads[1]["has_more_replies"] is True and threads[0]["has_more_replies"] is False
+    assert threads[1]["reply_count"] == 3 and threads[1]["replies"][0]["reply_count"] == 1
+    assert threads[1]["replies"][1]["author"]["username"] == "threadauthor"
+
+
+def test_thread_page_is_one_query_for_comments_and_one_for_authors():
+    """
+    Test that a page of threads with replies by several authors is loaded
+    without per-thread or per-author queries.
+    """
+    authors = [register_and_login(f"pageauthor{i}") for i in range(3)]
+    event_id = create_event(authors[0], "Busy Table")
+    for i in range(4):
+        thread = post_comment(authors[i % 3], event_id, f"thread {i}")
+        for j in range(3):
+            post_comment(authors[j], event_id, f"reply {j}", thread["id"])
+
+    with QueryCounter() as counter:
+        response = client.get("/comments", params={"subject_type": "events", "subject_id": event_id})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 4
+    assert len([s for s in counter.statements if "comments" in s]) == 1
+    assert len([s for s in counter.statements if "FROM users" in s]) == 1
+
+
+def test_pages_and_subtrees_are_walked_by_path():
+    """
+    Test that thread pages and a subtree's replies are paginated by cursor
+    without gaps or repeats.
+    """
+    headers = register_and_login("pageswalker")
+    event_id = create_event(headers, "Long Campaign")
+    threads = [post_comment(headers, event_id, f"thread {i}")["id"] for i in range(5)]
+    root = threads[0]
+    replies = [post_comment(headers, event_id, "r0", root)["id"]]
+    replies.append(post_comment(headers, event_id, "r0.0", replies[0])["id"])
+    replies.append(post_comment(headers, event_id, "r1", root)["id"])
+
+    seen, cursor = [], None
+    while True:
+        params = {"subject_type": "events", "subject_id": event_id, "limit": 2, "cursor": cursor}
+        page = client.get("/comments", params=params).json()
+        seen += [t["id"] for t in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == threads[::-1]
+
+    first = client.get(f"/comments/{root}/replies", params={"limit": 2}).json()
+    rest = client.get(f"/comments/{root}/replies", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [r["id"] for r in first["items"] + rest["items"]] == replies
+    assert rest["next_cursor"] is None
+
+
+def test_deleting_keeps_threads_intact():
+    """
+    Test that a comment with replies is blanked rather than removed, and
+    that removing a leaf reply updates its parent's reply count.
+    """
+    headers = register_and_login("deleteauthor")
+    other = register_and_login("deleteother")
+    event_id = create_event(headers, "Tidy Table")
+    root = post_comment(headers, event_id, "Root")
+    reply = post_comment(headers, event_id, "Reply", root["id"])
+
+    assert client.delete(f"/comments/{root['id']}", headers=other).status_code == 403
+    assert client.delete(f"/comments/{root['id']}", headers=headers).status_code == 204
+    thread = client.get("/comments", params={"subject_type": "events", "subject_id": event_id}).json()["items"][0]
+    assert thread["is_deleted"] is True and thread["body"] == "" and thread["author"] is None
+    assert thread["replies"][0]["id"] == reply["id"]
+
+    assert client.delete(f"/comments/{reply['id']}", headers=headers).status_code == 204
+    thread = client.get("/comments", params={"subject_type": "events", "subject_id": event_id}).json()["items"][0]
+    assert thread["reply_count"] == 0 and thread["replies"] == []
+
+# endregion Comment tests
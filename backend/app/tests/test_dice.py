@@ -0,0 +1,150 @@
+import itertools
+from collections import Counter
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.services.dice import DiceError, compile_expression
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def enumerate_keep_highest(count: int, sides: int, kept: int, bonus: int = 0) -> dict[int, float]:
+    """
+    Exact distribution by listing every roll.
+    """
+    totals = Counter(
+        sum(sorted(roll)[count - kept:]) + bonus
+        for roll in itertools.product(range(1, sides + 1), repeat=count)
+    )
+    return {total: n / sides ** count for total, n in totals.items()}
+
+# endregion Helper functions
+
+
+
+# region Distribution tests
+
+@pytest.mark.parametrize("expression, count, sides, kept, bonus", [
+    ("4d6dl1 + 2", 4, 6, 3, 2),
+    ("5d6kh3", 5, 6, 3, 0),
+    ("3d8k1", 3, 8, 1, 0),
+    ("2d20 - 3", 2, 20, 2, -3),
+])
+def test_distributions_match_enumeration(expression, count, sides, kept, bonus):
+    """
+    Test that computed distributions equal exhaustive enumeration.
+    """
+    distribution = compile_expression(expression).distribution
+    expected = enumerate_keep_highest(count, sides, kept, bonus)
+    assert (distribution.min, distribution.max) == (min(expected), max(expected))
+    for total, probability in expected.items():
+        assert distribution.probabilities[total - distribution.offset] == pytest.approx(probability, abs=1e-12)
+
+
+def test_modifiers_have_the_expected_means():
+    """
+    Test keep-lowest, exploding, rerolled and fudge dice against their
+    known expectations.
+    """
+    assert compile_expression("2d20kl1").distribution.mean == pytest.approx(7.175)
+    # E = 3.5 / (1 - 1/6)
+    assert compile_expression("1d6!").distribution.mean == pytest.approx(4.2, abs=1e-9)
+    assert compile_expression("1d6r1").distribution.mean == pytest.approx(4.0)
+    assert compile_expression("1d6ro<2").distribution.mean == pytest.approx(3.5 / 6 + 20 / 6)
+    fudge = compile_expression("4dF").distribution
+    assert (fudge.min, fudge.max, fudge.mean) == (-4, 4, pytest.approx(0.0))
+
+
+def test_large_distributions_keep_their_full_range():
+    """
+    Test that FFT-sized distributions report the expression's own min and
+    max and are marked truncated, while small ones are not.
+    """
+    large = compile_expression("1000d1000").distribution
+    assert (large.min, large.max, large.truncated) == (1000, 1_000_000, True)
+    assert large.mean == pytest.approx(500_500)
+    small = compile_expression("1d6r1 + 2").distribution
+    assert (small.min, small.max, small.truncated) == (4, 8, False)
+
+
+@pytest.mark.parametrize("expression", ["4d6x", "d", "2d6 3", "++2", "5d6kh6", "1d1!", "1d6r<7", "25d6kh3", "1d6r1r2", "20d1000kh19", "20d1000!kh10"])
+def test_invalid_expressions_are_rejected(expression):
+    """
+    Test that malformed or oversized expressions raise DiceError.
+    """
+    with pytest.raises(DiceError):
+        compile_expression(expression).distribution
+
+
+def test_compiled_expressions_are_cached():
+    """
+    Test that equivalent spellings of an expression share one compilation.
+    """
+    assert compile_expression("4d6DL1+2") is compile_expression(" 4d6dl1 +  2 ")
+
+
+def test_group_distributions_are_shared_across_expressions():
+    """
+    Test that expressions differing only in their constant reuse the same
+    group distribution.
+    """
+    first, second = compile_expression("30d20 + 1"), compile_expression("30d20 + 2")
+    assert first.groups[0][1].distribution is second.groups[0][1].distribution
+    assert second.distribution.min == first.distribution.min + 1
+
+# endregion Distribution tests
+
+
+
+# region Dice API tests
+
+def test_distribution_endpoint_reports_the_chance_to_beat_a_dc():
+    """
+    Test the distribution endpoint, including the probability of reaching
+    a target.
+    """
+    response = client.get("/dice/distribution", params={"expression": "4d6dl1 + 2", "target": 15})
+    assert response.status_code == 200, f"Distribution failed: {response.json()}"
+    body = response.json()
+    expected = enumerate_keep_highest(4, 6, 3, 2)
+    assert body["min"] == 5 and body["max"] == 20
+    assert body["probability_at_least"] == pytest.approx(sum(p for t, p in expected.items() if t >= 15))
+    assert sum(body["probabilities"]) == pytest.approx(1.0)
+
+    response = client.get("/dice/distribution", params={"expression": "4d6 banana"})
+    assert response.status_code == 400
+
+
+def test_batch_rolls_are_reproducible_and_in_range():
+    """
+    Test that batch rolls stay within each expression's range, follow its
+    distribution and repeat with the same seed.
+    """
+    payload = {"expressions": ["1d20", "4d6dl1 + 2"], "count": 5000, "seed": 42}
+    first = client.post("/dice/roll", json=payload).json()["results"]
+    assert first == client.post("/dice/roll", json=payload).json()["results"]
+    d20, stats = (np.array(result["rolls"]) for result in first)
+    assert d20.min() >= 1 and d20.max() <= 20 and len(d20) == 5000
+    assert stats.min() >= 5 and stats.max() <= 20
+    assert abs(stats.mean() - compile_expression("4d6dl1+2").distribution.mean) < 0.15
+
+    payload = {"expressions": ["1d6"] * 100, "count": 10_000}
+    assert client.post("/dice/roll", json=payload).status_code == 400
+
+
+def test_batches_of_costly_expressions_are_refused_up_front():
+    """
+    Test that a batch whose expressions together have too many dice or
+    outcomes is refused before any distribution is computed.
+    """
+    payload = {"expressions": [f"1000d1000 + {i}" for i in range(3)]}
+    response = client.post("/dice/roll", json=payload)
+    assert response.status_code == 422, f"Costly batch accepted: {response.json()}"
+
+    payload = {"expressions": ["1d6"] * 101}
+    assert client.post("/dice/roll", json=payload).status_code == 422
+
+# endregion Dice API tests
@@ -0,0 +1,108 @@
+import random
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.database.crud_homebrew import create_document
+from app.database.crud_similarity import get_signature
+from app.database.database import SessionLocal
+from app.services.duplicates import backfill
+from app.services.minhash import shingle_hashes, signatures, similarity
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+WORDS = [f"word{n}" for n in range(5000)]
+
+# region Helper functions
+
+def random_text(seed: int, words: int = 400) -> list[str]:
+    rng = random.Random(seed)
+    return [rng.choice(WORDS) for _ in range(words)]
+
+
+def light_edit(words: list[str], seed: int, changes: int = 8) -> list[str]:
+    rng = random.Random(seed)
+    words = list(words)
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return words
+
+# endregion Helper functions
+
+
+
+# region MinHash tests
+
+def test_signatures_estimate_jaccard_similarity():
+    """
+    Test that the share of agreeing signature rows tracks the exact
+    Jaccard similarity of the shingle sets, across a batch.
+    """
+    base = random_text(1)
+    texts = [base, light_edit(base, 2, 10), light_edit(base, 3, 60), random_text(4)]
+    hash_sets = [shingle_hashes(" ".join(words)) for words in texts]
+    rows = signatures(hash_sets)
+    assert rows.shape == (4, 128)
+    for hashes, row in zip(hash_sets[1:], rows[1:]):
+        exact = len(np.intersect1d(hash_sets[0], hashes)) / len(np.union1d(hash_sets[0], hashes))
+        assert abs(similarity(rows[0], row[None, :])[0] - exact) < 0.12
+    # Batching does not change a signature
+    assert (signatures([hash_sets[2]])[0] == rows[2]).all()
+
+# endregion MinHash tests
+
+
+
+# region Duplicate detection tests
+
+def test_edited_reposts_are_found_and_clustered():
+    """
+    Test that a lightly edited repost is reported as a duplicate of the
+    original and clustered with it, while unrelated text is not.
+    """
+    author = register_and_login("dupesauthor")
+    admin = register_and_login("dupesadmin", admin=True)
+    original = random_text(10)
+    ids = []
+    for title, words in (
+        ("Original", original),
+        ("Repost", light_edit(original, 11)),
+        ("Unrelated", random_text(12)),
+    ):
+        response = client.post("/homebrew", headers=author, json={"title": title, "content": " ".join(words)})
+        ids.append(response.json()["id"])
+
+    response = client.get(f"/admin/duplicates/{ids[0]}", headers=admin)
+    assert response.status_code == 200
+    matches = response.json()["matches"]
+    assert [match["document"]["id"] for match in matches] == [ids[1]]
+    assert matches[0]["similarity"] > 0.7
+
+    clusters = client.get("/admin/duplicates", headers=admin).json()["clusters"]
+    cluster = next(c for c in clusters if ids[0] in [d["id"] for d in c["documents"]])
+    assert {d["id"] for d in cluster["documents"]} == {ids[0], ids[1]}
+    assert client.get("/admin/duplicates", headers=author).status_code == 403
+
+
+def test_backfill_indexes_existing_documents():
+    """
+    Test that the parallel backfill indexes documents saved without a
+    signature, and skips them once they are up to date.
+    """
+    register_and_login("dupesbackfill")
+    db = SessionLocal()
+    try:
+        owner_id = db.execute(text("SELECT id FROM users WHERE username = 'dupesbackfill'")).scalar_one()
+        documents = [create_document(db, owner_id, f"Unindexed {n}", " ".join(random_text(100 + n))) for n in range(6)]
+        assert all(get_signature(db, document.id) is None for document in documents)
+
+        assert backfill(workers=2, chunk_size=3) >= 6
+        db.expire_all()
+        assert all(get_signature(db, document.id) is not None for document in documents)
+        assert backfill(workers=2, chunk_size=3) == 0
+    finally:
+        db.close()
+
+# endregion Duplicate detection tests
@@ -0,0 +1,197 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Pytest Fixtures Setup
+
+@pytest.fixture(scope="module")
+def organizer_header():
+    """
+    Logs in the user organizing the test events.
+    """
+    return register_and_login("eventorganizer")
+
+
+def create_event(headers: dict, title: str, starts_at: str, ends_at: str) -> dict:
+    response = client.post(
+        "/events",
+        headers=headers,
+        json={"title": title, "starts_at": starts_at, "ends_at": ends_at}
+    )
+    assert response.status_code == 201, f"Event creation failed: {response.json()}"
+    return response.json()
+
+
+@pytest.fixture(scope="module")
+def march_events(organizer_header):
+    """
+    Schedules events in March 2031, including one spanning three days.
+    """
+    return {
+        "one_shot": create_event(
+            organizer_header, "Lighthouse One-Shot", "2031-03-03T18:00:00Z", "2031-03-03T22:00:00Z"
+        ),
+        "weekend": create_event(
+            organizer_header, "Lighthouse Weekend Con", "2031-03-07T09:00:00Z", "2031-03-09T20:00:00Z"
+        ),
+        "late": create_event(
+            organizer_header, "Lighthouse Night Game", "2031-03-09T21:00:00Z", "2031-03-10T01:00:00Z"
+        ),
+    }
+
+# endregion Pytest Fixtures Setup
+
+
+
+# region Range query tests
+
+def test_range_query_returns_overlapping_events(march_events):
+    """
+    Test that listing a time range returns the events overlapping it,
+    including events that started before it, by start time.
+    """
+    response = client.get(
+        "/events",
+        params={"start": "2031-03-08T00:00:00Z", "end": "2031-03-10T00:00:00Z"}
+    )
+    assert response.status_code == 200, f"Listing events failed: {response.json()}"
+    assert [e["title"] for e in response.json()["items"]] ==\
+        ["Lighthouse Weekend Con", "Lighthouse Night Game"]
+
+
+def test_range_query_pages_with_cursor(march_events):
+    """
+    Test that following next_cursor returns every event of the range once.
+    """
+    params = {"start": "2031-03-01T00:00:00Z", "end": "2031-04-01T00:00:00Z", "limit": 2}
+    first = client.get("/events", params=params).json()
+    second = client.get("/events", params={**params, "cursor": first["next_cursor"]}).json()
+    assert [e["title"] for e in first["items"] + second["items"]] ==\
+        ["Lighthouse One-Shot", "Lighthouse Weekend Con", "Lighthouse Night Game"]
+    assert second["next_cursor"] is None
+
+
+def test_oversized_range_is_rejected():
+    """
+    Test that a listing range longer than the allowed span fails.
+    """
+    response = client.get(
+        "/events",
+        params={"start": "2031-01-01T00:00:00Z", "end": "2032-01-01T00:00:00Z"}
+    )
+    assert response.status_code == 400
+
+# endregion Range query tests
+
+
+
+# region Calendar tests
+
+def calendar_days(year: int, month: int) -> dict:
+    response = client.get("/events/calendar", params={"year": year, "month": month})
+    assert response.status_code == 200, f"Calendar failed: {response.json()}"
+    return {day["day"]: day for day in response.json()["days"]}
+
+
+def test_calendar_summarizes_each_day(march_events):
+    """
+    Test that every day an event overlaps is counted, with its first events
+    in start order.
+    """
+    days = calendar_days(2031, 3)
+    assert {day: summary["event_count"] for day, summary in days.items()} == {
+        "2031-03-03": 1, "2031-03-07": 1, "2031-03-08": 1, "2031-03-09": 2, "2031-03-10": 1,
+    }
+    assert [e["title"] for e in days["2031-03-09"]["first_events"]] ==\
+        ["Lighthouse Weekend Con", "Lighthouse Night Game"]
+
+
+def test_calendar_follows_event_changes(organizer_header):
+    """
+    Test that moving and cancelling an event updates the summaries of both
+    the days it left and the days it moved to.
+    """
+    event = create_event(
+        organizer_header, "Moving Campaign", "2031-05-04T18:00:00Z", "2031-05-04T21:00:00Z"
+    )
+    assert calendar_days(2031, 5)["2031-05-04"]["event_count"] == 1
+
+    response = client.put(
+        f"/events/{event['id']}",
+        headers=organizer_header,
+        json={"starts_at": "2031-05-11T18:00:00Z", "ends_at": "2031-05-11T21:00:00Z"}
+    )
+    assert response.status_code == 200, f"Event update failed: {response.json()}"
+    assert list(calendar_days(2031, 5)) == ["2031-05-11"]
+
+    client.delete(f"/events/{event['id']}", headers=organizer_header)
+    assert calendar_days(2031, 5) == {}
+
+
+def test_calendar_supports_conditional_requests(organizer_header):
+    """
+    Test that an unchanged calendar answers 304, and that a new event
+    invalidates the ETag.
+    """
+    params = {"year": 2031, "month": 6}
+    etag = client.get("/events/calendar", params=params).headers["ETag"]
+    response = client.get("/events/calendar", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    create_event(organizer_header, "June Jam", "2031-06-01T10:00:00Z", "2031-06-01T12:00:00Z")
+    response = client.get("/events/calendar", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["days"][0]["event_count"] == 1
+
+# endregion Calendar tests
+
+
+
+# region Update tests
+
+def test_null_clears_optional_fields(organizer_header):
+    """
+    Test that sending null clears capacity and game, that omitted fields
+    are kept, and that required fields cannot be cleared.
+    """
+    admin = register_and_login("eventgameadmin", admin=True)
+    game_id = client.post(
+        "/games",
+        headers=admin,
+        json={"title": "Cleared Game", "genre": "eventtest", "min_players": 1, "max_players": 4}
+    ).json()["id"]
+    event = create_event(organizer_header, "Clearable Night", "2031-04-05T18:00:00Z", "2031-04-05T22:00:00Z")
+    response = client.put(
+        f"/events/{event['id']}", headers=organizer_header, json={"capacity": 4, "game_id": game_id}
+    )
+    assert (response.json()["capacity"], response.json()["game_id"]) == (4, game_id)
+
+    response = client.put(f"/events/{event['id']}", headers=organizer_header, json={"capacity": None, "game_id": None})
+    assert response.status_code == 200, f"Clearing failed: {response.json()}"
+    updated = response.json()
+    assert (updated["capacity"], updated["game_id"], updated["title"]) == (None, None, "Clearable Night")
+    response = client.put(f"/events/{event['id']}", headers=organizer_header, json={"title": None})
+    assert response.status_code == 422
+
+# endregion Update tests
+
+
+
+# region Permission tests
+
+def test_only_the_organizer_can_edit(march_events):
+    """
+    Test that another user cannot change or cancel an event.
+    """
+    other_header = register_and_login("eventbystander")
+    event_id = march_events["one_shot"]["id"]
+    response = client.put(f"/events/{event_id}", headers=other_header, json={"title": "Mine now"})
+    assert response.status_code == 403
+    response = client.delete(f"/events/{event_id}", headers=other_header)
+    assert response.status_code == 403
+
+# endregion Permission tests
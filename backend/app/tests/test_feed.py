@@ -0,0 +1,128 @@
+import uuid
+import redis
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.redis import r
+from app.services import feed
+from app.tests.conftest import register_user
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def add_homebrew(headers: dict, title: str) -> str:
+    response = client.post("/homebrew", headers=headers, json={"title": title, "content": f"Rules for {title}."})
+    assert response.status_code == 201, f"Homebrew creation failed: {response.json()}"
+    return response.json()["id"]
+
+
+def feed_titles(headers: dict, limit: int = 100) -> list[str]:
+    items = client.get("/feed", headers=headers, params={"limit": limit}).json()["items"]
+    return [item["data"].get("title") or item["data"].get("excerpt") for item in items]
+
+# endregion Helper functions
+
+
+
+# region Feed tests
+
+def test_activity_is_fanned_out_to_followers_and_unfollow_hides_it():
+    """
+    Test that activity of a followed author lands in the follower's own
+    feed list, newest first, that earlier activity is backfilled on
+    follow, and that unfollowing hides it.
+    """
+    author_id, author = register_user("feedauthor")
+    follower_id, follower = register_user("feedfollower")
+    add_homebrew(author, "Feed Before Follow")
+
+    assert client.put(f"/feed/follows/users/{follower_id}", headers=follower).status_code == 400
+    assert client.put(f"/feed/follows/users/{uuid.uuid4()}", headers=follower).status_code == 404
+    assert client.put(f"/feed/follows/users/{author_id}", headers=follower).status_code == 204
+    assert client.put(f"/feed/follows/users/{author_id}", headers=follower).status_code == 204
+    follows = client.get("/feed/follows", headers=follower).json()["items"]
+    assert [(f["target_id"], f["follower_count"]) for f in follows if f["target_type"] == "users"] == [(author_id, 1)]
+
+    add_homebrew(author, "Feed After Follow")
+    client.post(
+        "/events",
+        headers=author,
+        json={"title": "Feed Game Night", "starts_at": "2031-12-06T18:00:00Z", "ends_at": "2031-12-06T22:00:00Z"}
+    )
+    assert feed_titles(follower) == ["Feed Game Night", "Feed After Follow", "Feed Before Follow"]
+    assert r.llen(f"feed:user:{follower_id}") == 3
+    assert feed_titles(author) == []
+
+    assert client.delete(f"/feed/follows/users/{author_id}", headers=follower).status_code == 204
+    assert client.delete(f"/feed/follows/users/{author_id}", headers=follower).status_code == 404
+    assert feed_titles(follower) == []
+
+
+def test_popular_sources_are_merged_on_read(monkeypatch):
+    """
+    Test that activity of sources over the fan-out threshold is not written
+    to follower feeds but merged into them on read, in time order, once
+    even when followed through both the author and the game, and across
+    pages.
+    """
+    monkeypatch.setattr(settings, "FEED_FANOUT_THRESHOLD", 2)
+    _, admin = register_user("feedadmin", admin=True)
+    star_id, star = register_user("feedstar")
+    regular_id, regular = register_user("feedregular")
+    fan_id, fan = register_user("feedfan")
+    _, other_fan = register_user("feedotherfan")
+    game_id = client.post(
+        "/games",
+        headers=admin,
+        json={"title": "Feed Merge Game", "genre": "feedtest", "min_players": 1, "max_players": 4}
+    ).json()["id"]
+
+    for headers in (fan, other_fan):
+        client.put(f"/feed/follows/users/{star_id}", headers=headers)
+    client.put(f"/feed/follows/users/{regular_id}", headers=fan)
+    client.put(f"/feed/follows/games/{game_id}", headers=fan)
+
+    add_homebrew(star, "Star One")
+    add_homebrew(regular, "Regular One")
+    client.post(
+        "/comments",
+        headers=star,
+        json={"subject_type": "games", "subject_id": game_id, "body": "Star on the game"}
+    )
+    add_homebrew(regular, "Regular Two")
+    add_homebrew(star, "Star Two")
+
+    # The star's homebrew was not written to the fan's feed; the comment
+    # was, through the game
+    assert r.llen(f"feed:user:{fan_id}") == 3
+    expected = ["Star Two", "Regular Two", "Star on the game", "Regular One", "Star One"]
+    assert feed_titles(fan) == expected
+
+    titles, cursor = [], None
+    while True:
+        page = client.get("/feed", headers=fan, params={"limit": 2, "cursor": cursor}).json()
+        titles += [item["data"].get("title") or item["data"]["excerpt"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert titles == expected
+
+
+def test_unavailable_redis_does_not_fail_the_saved_activity(monkeypatch):
+    """
+    Test that creating homebrew succeeds when its activity cannot be
+    published.
+    """
+    _, author = register_user("feedredisdown")
+
+    class Unavailable:
+        def __getattr__(self, name):
+            raise redis.ConnectionError("Redis is down")
+
+    monkeypatch.setattr(feed, "r", Unavailable())
+    document_id = add_homebrew(author, "Published Offline")
+    assert client.get(f"/homebrew/{document_id}").status_code == 200
+
+# endregion Feed tests
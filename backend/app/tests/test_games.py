@@ -0,0 +1,151 @@
+from uuid import uuid4
+import pytest
+from fastapi.testclient import TestClient
+from app.core.pagination import encode_cursor
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Pytest Fixtures Setup
+
+@pytest.fixture(scope="module")
+def admin_header():
+    """
+    Logs in a user with administrator privileges.
+    """
+    return register_and_login("gamesadmin", admin=True)
+
+
+@pytest.fixture(scope="module")
+def catalog(admin_header):
+    """
+    Seeds a small catalog of games in a dedicated genre.
+    """
+    ids = []
+    for i in range(7):
+        response = client.post(
+            "/games",
+            headers=admin_header,
+            json={
+                "title": f"Catalog Game {i}",
+                "genre": "catalogtest",
+                "min_players": 1 + i % 3,
+                "max_players": 4,
+            }
+        )
+        assert response.status_code == 201, f"Game creation failed: {response.json()}"
+        ids.append(response.json()["id"])
+    return ids
+
+# endregion Pytest Fixtures Setup
+
+
+
+# region Admin access tests
+
+def test_non_admin_cannot_create_games():
+    """
+    Test that regular users cannot add games to the directory.
+    """
+    headers = register_and_login("gamesplayer")
+    response = client.post(
+        "/games",
+        headers=headers,
+        json={"title": "Nope", "genre": "catalogtest"}
+    )
+    assert response.status_code == 403
+
+
+def test_invalid_player_range_is_rejected(admin_header):
+    """
+    Test that a game cannot have fewer maximum than minimum players.
+    """
+    response = client.post(
+        "/games",
+        headers=admin_header,
+        json={"title": "Broken", "genre": "catalogtest", "min_players": 4, "max_players": 2}
+    )
+    assert response.status_code == 422
+
+# endregion Admin access tests
+
+
+
+# region Keyset pagination tests
+
+def test_keyset_pages_cover_catalog_once(catalog):
+    """
+    Test that following next_cursor walks every game exactly once, in order.
+    """
+    seen = []
+    cursor = None
+    while True:
+        params = {"genre": "catalogtest", "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/games", params=params)
+        assert response.status_code == 200, f"Listing failed: {response.json()}"
+        page = response.json()
+        seen += [game["title"] for game in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(f"Catalog Game {i}" for i in range(7))
+
+
+def test_player_count_filter(catalog):
+    """
+    Test that the player filter only returns games playable by that many players.
+    """
+    response = client.get("/games", params={"genre": "catalogtest", "players": 1})
+    assert response.status_code == 200
+    assert {game["min_players"] for game in response.json()["items"]} == {1}
+
+
+def test_cursor_of_another_ordering_is_rejected(catalog):
+    """
+    Test that a cursor can only be used with the ordering that produced it.
+    """
+    page = client.get("/games", params={"genre": "catalogtest", "limit": 2}).json()
+    response = client.get(
+        "/games",
+        params={"genre": "catalogtest", "sort": "-rating", "cursor": page["next_cursor"]}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("values", [("Catan",), ("Catan", "not-a-uuid", 3), (3, {"uuid": str(uuid4())}), ("Catan", 7)])
+def test_forged_cursors_are_rejected(catalog, values):
+    """
+    Test that a cursor of the right ordering but with the wrong number or
+    types of values is refused rather than reaching the query.
+    """
+    cursor = encode_cursor("title", tuple(values))
+    response = client.get("/games", params={"genre": "catalogtest", "cursor": cursor})
+    assert response.status_code == 400
+
+# endregion Keyset pagination tests
+
+
+
+# region Conditional request tests
+
+def test_unchanged_page_returns_304(admin_header, catalog):
+    """
+    Test that a page is revalidated with 304 until the catalog changes.
+    """
+    params = {"genre": "catalogtest", "limit": 3}
+    response = client.get("/games", params=params)
+    etag = response.headers["etag"]
+
+    response = client.get("/games", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304, "An unchanged page should not be sent again."
+
+    client.put(f"/games/{catalog[0]}", headers=admin_header, json={"description": "Updated"})
+    response = client.get("/games", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200, "A write should invalidate the page's ETag."
+    assert response.headers["etag"] != etag
+
+# endregion Conditional request tests
@@ -0,0 +1,167 @@
+import difflib
+import random
+import time
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.services.revisions import apply_delta, make_delta, unified_diff
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def edit(lines: list[str], rng: random.Random) -> list[str]:
+    lines = list(lines)
+    position = rng.randrange(len(lines) + 1)
+    action = rng.choice(["insert", "change", "delete"])
+    if action == "insert" or not lines:
+        lines.insert(position, f"Rule {rng.random():.6f}: dragons é {position}\n")
+    elif action == "change":
+        lines[min(position, len(lines) - 1)] = f"Amended {rng.random():.6f}\n"
+    else:
+        del lines[min(position, len(lines) - 1)]
+    return lines
+
+# endregion Helper functions
+
+
+
+# region Delta tests
+
+def test_deltas_rebuild_the_new_text():
+    """
+    Test that applying a delta to the old text gives back the new text,
+    for random edits, rewrites and texts without trailing newlines.
+    """
+    rng = random.Random(5)
+    lines = [f"Line {n}\n" for n in range(200)]
+    for _ in range(300):
+        new_lines = edit(lines, rng)
+        old, new = "".join(lines).encode(), "".join(new_lines).encode()
+        assert apply_delta(old, make_delta(old, new)) == new
+        lines = new_lines
+    for old, new in ((b"", b"abc"), (b"abc", b""), (b"a\nb", b"a\nb\nc"), (b"same\n", b"same\n")):
+        assert apply_delta(old, make_delta(old, new)) == new
+    text = "".join(lines).encode()
+    assert len(make_delta(text, text.replace(b"Line 100\n", b"Line one hundred\n"))) < 40
+
+
+def test_deltas_of_repetitive_texts_stay_linear():
+    """
+    Test that a large text of repeated short lines and a shuffle of its
+    blocks are diffed quickly, and moved blocks are copied, not inserted.
+    """
+    old = b"a\nb\n" * 100_000
+    new = b"b\na\n" * 100_000
+    started = time.perf_counter()
+    delta = make_delta(old, new)
+    assert time.perf_counter() - started < 2
+    assert apply_delta(old, delta) == new and len(delta) < 40
+
+    blocks = [f"## Rule {n}\n\nRoll a d{n} and add your bonus.\n".encode() for n in range(2000)]
+    shuffled = blocks[:]
+    random.Random(9).shuffle(shuffled)
+    old, new = b"".join(blocks), b"".join(shuffled)
+    delta = make_delta(old, new)
+    assert apply_delta(old, delta) == new and len(delta) < len(new) // 2
+
+
+def test_unified_diffs_match_difflib_and_stay_linear():
+    """
+    Test that unified diffs equal difflib's for ordinary edits and stay
+    fast for a large text of repeated short lines.
+    """
+    rng = random.Random(3)
+    lines = [f"Line {n}\n" for n in range(100)]
+    for _ in range(100):
+        new_lines = edit(edit(lines, rng), rng)
+        assert list(unified_diff(lines, new_lines, "a", "b")) == list(difflib.unified_diff(lines, new_lines, "a", "b"))
+        lines = new_lines
+
+    old, new = ["a\n", "b\n"] * 100_000, ["b\n", "a\n"] * 100_000
+    started = time.perf_counter()
+    diff = list(unified_diff(old, new, "a", "b"))
+    assert time.perf_counter() - started < 2
+    changes = [line[0] for line in diff[2:] if not line.startswith("@@")]
+    assert (changes.count("+"), changes.count("-")) == (1, 1)
+
+# endregion Delta tests
+
+
+
+# region Homebrew document tests
+
+def test_every_revision_can_be_rebuilt():
+    """
+    Test that every revision of a document reads back as saved, with
+    snapshots at least every HOMEBREW_SNAPSHOT_INTERVAL revisions and
+    deltas far smaller than the text.
+    """
+    headers = register_and_login("homebrewowner")
+    rng = random.Random(11)
+    lines = [f"Homebrew rule {n}: roll with advantage.\n" for n in range(100)]
+    response = client.post("/homebrew", headers=headers, json={"title": "Rules", "content": "".join(lines)})
+    assert response.status_code == 201
+    document_id = response.json()["id"]
+    texts = {1: "".join(lines)}
+    for revision in range(2, 46):
+        lines = edit(lines, rng)
+        texts[revision] = "".join(lines)
+        response = client.put(f"/homebrew/{document_id}", headers=headers, json={"content": texts[revision]})
+        assert response.json()["revision"] == revision
+
+    for revision, text in texts.items():
+        response = client.get(f"/homebrew/{document_id}/revisions/{revision}")
+        assert response.status_code == 200
+        assert response.json()["content"] == text
+
+    revisions = client.get(f"/homebrew/{document_id}/revisions", params={"limit": 200}).json()["items"]
+    assert [item["revision"] for item in revisions] == list(range(45, 0, -1))
+    snapshots = [item["revision"] for item in revisions if item["is_snapshot"]]
+    assert all(b - a <= settings.HOMEBREW_SNAPSHOT_INTERVAL for a, b in zip(sorted(snapshots), sorted(snapshots)[1:] + [46]))
+    deltas = [item for item in revisions if not item["is_snapshot"]]
+    assert all(item["stored_size"] * 20 < item["size"] for item in deltas)
+    assert client.get(f"/homebrew/{document_id}/revisions/46").status_code == 404
+
+
+def test_diff_between_revisions():
+    """
+    Test that the diff endpoint compares arbitrary revisions.
+    """
+    headers = register_and_login("homebrewdiff")
+    document_id = client.post(
+        "/homebrew", headers=headers, json={"title": "Spells", "content": "Fireball\nShield\n"}
+    ).json()["id"]
+    client.put(f"/homebrew/{document_id}", headers=headers, json={"content": "Fireball\nMage Armor\n"})
+    client.put(f"/homebrew/{document_id}", headers=headers, json={"content": "Fireball\nMage Armor\nHaste\n"})
+
+    response = client.get(f"/homebrew/{document_id}/diff", params={"from": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["to_revision"], body["lines_added"], body["lines_removed"]) == (3, 2, 1)
+    assert "-Shield\n" in body["diff"] and "+Haste\n" in body["diff"]
+    backwards = client.get(f"/homebrew/{document_id}/diff", params={"from": 3, "to": 2}).json()
+    assert (backwards["lines_added"], backwards["lines_removed"]) == (0, 1)
+    assert client.get(f"/homebrew/{document_id}/diff", params={"from": 9}).status_code == 404
+
+
+def test_stale_edits_and_other_users_are_rejected():
+    """
+    Test that an edit against an old base revision gets 409 and only the
+    owner can edit.
+    """
+    headers = register_and_login("homebrewconflict")
+    document_id = client.post("/homebrew", headers=headers, json={"title": "Feats", "content": "A\n"}).json()["id"]
+    assert client.put(
+        f"/homebrew/{document_id}", headers=headers, json={"content": "B\n", "base_revision": 1}
+    ).status_code == 200
+    assert client.put(
+        f"/homebrew/{document_id}", headers=headers, json={"content": "C\n", "base_revision": 1}
+    ).status_code == 409
+    other = register_and_login("homebrewintruder")
+    assert client.put(f"/homebrew/{document_id}", headers=other, json={"content": "D\n"}).status_code == 403
+    assert client.get(f"/homebrew/{document_id}").json()["content"] == "B\n"
+
+# endregion Homebrew document tests
@@ -0,0 +1,120 @@
+import io
+import os
+import time
+from fastapi.testclient import TestClient
+from PIL import Image
+from app.core.metrics import metrics
+from app.core.redis import r
+from app.core.work_queues import WorkQueue
+from app.services.images import IMAGE_QUEUE_KEY, DerivativeWorker, enqueue_variants, variants_ready
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def png_bytes(width: int, height: int, color: tuple) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def upload(headers: dict, filename: str, content: bytes, content_type: str) -> dict:
+    response = client.post(
+        "/uploads",
+        params={"filename": filename},
+        headers={**headers, "Content-Type": content_type},
+        content=content,
+    )
+    assert response.status_code == 201, f"Upload failed: {response.json()}"
+    return response.json()
+
+# endregion Helper functions
+
+
+
+# region Image pipeline tests
+
+def test_game_images_fall_back_to_the_original_until_rendered():
+    """
+    Test that a game's cover image variants point at the original upload
+    until the worker has rendered them, and at the variants after.
+    """
+    admin = register_and_login("imagesadmin", admin=True)
+    # A fresh color, so no variants are left over from an earlier run
+    cover = upload(admin, "cover.png", png_bytes(800, 600, tuple(os.urandom(3))), "image/png")
+    response = client.post(
+        "/games",
+        headers=admin,
+        json={"title": "Pictured Game", "genre": "imagetest", "image_upload_id": cover["id"]}
+    )
+    assert response.status_code == 201, f"Game creation failed: {response.json()}"
+    game = response.json()
+    assert game["images"]["thumb.webp"] == f"/uploads/{cover['id']}/content"
+    assert r.llen(IMAGE_QUEUE_KEY) >= 1
+    etag = client.get(f"/games/{game['id']}").headers["ETag"]
+
+    worker = DerivativeWorker(processes=1, max_in_flight=2)
+    worker.start()
+    try:
+        deadline = time.monotonic() + 60
+        while not variants_ready(cover["sha256"]) and time.monotonic() < deadline:
+            time.sleep(0.1)
+    finally:
+        worker.stop()
+    assert variants_ready(cover["sha256"]), "The variants should be rendered."
+    assert metrics.snapshot()["summaries"]["images.render_seconds"]["count"] >= 1
+
+    response = client.get(f"/games/{game['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200, "Rendering the variants should change the ETag."
+    images = response.json()["images"]
+    assert images["thumb.webp"] == f"/uploads/{cover['id']}/variants/thumb.webp"
+    thumb = client.get(images["thumb.webp"])
+    assert thumb.status_code == 200 and thumb.headers["content-type"] == "image/webp"
+    assert Image.open(io.BytesIO(thumb.content)).size == (160, 120)
+    large = client.get(images["large.jpg"])
+    assert Image.open(io.BytesIO(large.content)).size == (800, 600), "Images are never upscaled."
+
+    assert enqueue_variants(cover["sha256"], "image/png") is False, "Rendered images are not queued again."
+
+
+def test_only_image_uploads_can_be_game_covers():
+    """
+    Test that a non-image upload is rejected as a game's cover image.
+    """
+    admin = register_and_login("imagesadmin2", admin=True)
+    document = upload(admin, "rules.pdf", b"%PDF-1.7 not an image", "application/pdf")
+    response = client.post(
+        "/games",
+        headers=admin,
+        json={"title": "Coverless Game", "genre": "imagetest", "image_upload_id": document["id"]}
+    )
+    assert response.status_code == 400
+
+
+def test_only_the_jobs_of_dead_workers_are_requeued():
+    """
+    Test that a starting worker leaves the in-flight jobs of live workers
+    alone and queues those of a worker whose heartbeat expired again.
+    """
+    live, dead, starting = (WorkQueue("testjobs", worker_id=name) for name in ("live", "dead", "starting"))
+    r.delete(live.queue_key)
+    r.lpush(live.queue_key, "a", "b")
+    live.heartbeat()
+    dead.heartbeat()
+    assert live.take(0.1) == "a" and dead.take(0.1) == "b"
+    r.delete("testjobs:heartbeat:dead")
+
+    starting.start()
+    try:
+        assert r.lrange(live.queue_key, 0, -1) == ["b"]
+        assert r.lrange(live.processing_key(), 0, -1) == ["a"]
+        assert starting.in_flight() == 1
+    finally:
+        starting.stop()
+    live.done("a")
+    assert r.smembers("testjobs:workers") == {"live"}
+
+# endregion Image pipeline tests
@@ -0,0 +1,158 @@
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from app.core.pubsub import change_listener
+from app.services.live import CLOSE, LiveHub, live_hub, sse_frames
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def create_event(headers: dict, title: str) -> str:
+    response = client.post(
+        "/events",
+        headers=headers,
+        json={
+            "title": title,
+            "starts_at": "2031-10-04T18:00:00Z",
+            "ends_at": "2031-10-04T22:00:00Z",
+            "capacity": 10,
+        }
+    )
+    assert response.status_code == 201, f"Event creation failed: {response.json()}"
+    return response.json()["id"]
+
+
+@pytest.fixture
+def listening():
+    """
+    Runs the change listener, as the app does during its lifespan.
+    """
+    change_listener.start()
+    # Give the listener time to subscribe before publishing
+    time.sleep(0.2)
+    yield
+    change_listener.stop()
+
+# endregion Helper functions
+
+
+
+# region Hub tests
+
+def test_updates_are_queued_once_encoded_and_slow_clients_dropped():
+    """
+    Test that an update reaches every follower of its topic as the same
+    encoded message, and that a client whose queue fills up is dropped
+    without affecting the others.
+    """
+    async def scenario():
+        hub = LiveHub()
+        fast, slow, other = hub.connect(), hub.connect(), hub.connect()
+        for connected in (fast, slow):
+            hub.follow(connected, "events:1")
+        hub.follow(other, "games:1")
+
+        hub.deliver("events:1", '{"n": 0}')
+        first = fast.queue.get_nowait()
+        assert first is slow.queue.get_nowait()
+        assert other.queue.empty()
+
+        for n in range(fast.queue.maxsize + 1):
+            hub.deliver("events:1", f'{{"n": {n}}}')
+            fast.queue.get_nowait()
+        assert slow.dropped and not fast.dropped
+        assert slow.queue.get_nowait() is CLOSE
+        assert hub.client_count == 2
+
+        hub.deliver("events:1", '{"n": "last"}')
+        assert fast.queue.get_nowait() == '{"n": "last"}'
+        assert slow.queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_server_sent_events_frames():
+    """
+    Test that the SSE stream sends updates as data frames and heartbeats
+    as comments, and ends once the client is dropped.
+    """
+    async def scenario():
+        subscriber = live_hub.connect()
+        live_hub.follow(subscriber, "games:1")
+        live_hub.deliver("games:1", '{"type": "x"}')
+        live_hub.send(subscriber, CLOSE)
+        frames = [frame async for frame in sse_frames(subscriber)]
+        assert frames == [": connected\n\n", 'data: {"type": "x"}\n\n']
+        assert live_hub.client_count == 0
+
+    asyncio.run(scenario())
+
+# endregion Hub tests
+
+
+
+# region Endpoint tests
+
+def test_websocket_receives_comments_and_rsvp_counts(listening):
+    """
+    Test that a WebSocket following an event receives its new comments and
+    RSVP counts published by other requests, and nothing after
+    unsubscribing.
+    """
+    organizer = register_and_login("liveorganizer")
+    guest = register_and_login("liveguest")
+    event_id = create_event(organizer, "Live Event")
+    token = organizer["Authorization"].split()[1]
+
+    with client.websocket_connect(f"/live/ws?token={token}") as websocket:
+        websocket.send_json({"action": "subscribe", "topics": [f"events:{event_id}"]})
+        assert websocket.receive_json() == {"type": "subscribed", "topics": [f"events:{event_id}"]}
+
+        response = client.post(
+            "/comments",
+            headers=guest,
+            json={"subject_type": "events", "subject_id": event_id, "body": "See you there"}
+        )
+        update = websocket.receive_json()
+        assert (update["topic"], update["type"]) == (f"events:{event_id}", "comment.created")
+        assert update["data"]["id"] == response.json()["id"]
+        assert update["data"]["body"] == "See you there"
+
+        client.post(f"/events/{event_id}/rsvp", headers=guest)
+        update = websocket.receive_json()
+        assert update["type"] == "rsvp.changed"
+        assert update["data"] == {"rsvp_count": 1, "capacity": 10}
+
+        websocket.send_json({"action": "subscribe", "topics": ["events:nope"]})
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_json({"action": "unsubscribe", "topics": [f"events:{event_id}"]})
+        assert websocket.receive_json() == {"type": "subscribed", "topics": []}
+        client.delete(f"/events/{event_id}/rsvp", headers=guest)
+        websocket.send_json({"action": "subscribe", "topics": []})
+        # The RSVP cancellation was not delivered ahead of the answer
+        assert websocket.receive_json() == {"type": "subscribed", "topics": []}
+
+
+def test_connections_require_a_valid_token():
+    """
+    Test that WebSockets and event streams are refused without a valid
+    token, and streams with invalid topics.
+    """
+    with pytest.raises(WebSocketDisconnect) as disconnect:
+        with client.websocket_connect("/live/ws?token=invalid") as websocket:
+            websocket.receive_json()
+    assert disconnect.value.code == 1008
+
+    response = client.get("/live/stream", params={"topics": "events:1"})
+    assert response.status_code == 401
+    headers = register_and_login("livestreamer")
+    response = client.get("/live/stream", params={"topics": "tables:1"}, headers=headers)
+    assert response.status_code == 422
+
+# endregion Endpoint tests
@@ -0,0 +1,268 @@
+import email
+import json
+import socketserver
+import threading
+import time
+from email import policy
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.redis import r
+from app.database.database import SessionLocal
+from app.services.mail import (
+    MAIL_DEAD_KEY,
+    MAIL_QUEUE_KEY,
+    MAIL_RETRY_KEY,
+    MailTemplate,
+    SmtpConnection,
+    deliver_batch,
+    enqueue_mail,
+    get_template,
+    mail_queue,
+    promote_due,
+    send_event_reminders
+)
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def clear_mail():
+    r.delete(MAIL_QUEUE_KEY, mail_queue.processing_key(), MAIL_RETRY_KEY, MAIL_DEAD_KEY)
+
+
+def queued_jobs() -> list[dict]:
+    return [json.loads(raw) for raw in r.lrange(MAIL_QUEUE_KEY, 0, -1)]
+
+
+class SmtpSinkHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP to accept messages, answering RCPT for the addresses
+    in `server.replies` with the given reply instead of accepting them.
+    """
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply("220 sink ESMTP")
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 sink")
+            elif verb in ("MAIL", "RSET"):
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip().strip("<>")
+                answer = self.server.replies.get(address, "250 OK")
+                if answer.startswith("250"):
+                    recipients.append(address)
+                self.reply(answer)
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (line := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(line)
+                with self.server.lock:
+                    self.server.messages.append((recipients, b"".join(data).decode()))
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SmtpSinkHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages: list[tuple[list[str], str]] = []
+        self.replies: dict[str, str] = {}
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    """
+    A local SMTP server the mail settings point at.
+    """
+    server = SmtpSink()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_PORT", server.server_address[1])
+    yield server
+    server.shutdown()
+    server.server_close()
+
+# endregion Helper functions
+
+
+
+# region Template tests
+
+def test_templates_are_compiled_once_and_rendered():
+    """
+    Test that templates render placeholders and escapes, fail on missing
+    values, and are parsed once per process.
+    """
+    template = MailTemplate("Subject: Hi $name\n\nCosts $$${amount} for ${name}.\n")
+    assert template.render({"name": "Ada", "amount": 5}) == ("Hi Ada", "Costs $5 for Ada.\n")
+    with pytest.raises(KeyError):
+        template.render({"name": "Ada"})
+    with pytest.raises(ValueError):
+        MailTemplate("Hi $name")
+    assert get_template("verify_email") is get_template("verify_email")
+
+# endregion Template tests
+
+
+
+# region Delivery tests
+
+def test_verification_emails_are_sent_in_batches_over_one_connection(sink):
+    """
+    Test that registering queues a verification email instead of sending
+    it, and that queued messages go out in a batch over a connection kept
+    open for the next batch.
+    """
+    clear_mail()
+    for n in range(5):
+        client.post(
+            "/auth/register",
+            json={"username": f"mailuser{n}", "email": f"mailuser{n}@example.com", "password": "Testpassword123!"}
+        )
+    jobs = queued_jobs()
+    assert sorted(job["to"] for job in jobs) == [f"mailuser{n}@example.com" for n in range(5)]
+    assert sink.messages == []
+
+    connection = SmtpConnection()
+    try:
+        assert deliver_batch(connection, timeout=0.1) == 5
+        enqueue_mail("verify_email", "late@example.com", {"username": "late", "verify_url": "http://x"})
+        assert deliver_batch(connection, timeout=0.1) == 1
+    finally:
+        connection.close()
+    assert sink.connections == 1
+    assert len(sink.messages) == 6
+    assert r.llen(mail_queue.processing_key()) == 0
+
+    db = SessionLocal()
+    try:
+        token = db.execute(
+            text("SELECT verification_token FROM users WHERE username = 'mailuser0'")
+        ).scalar_one()
+    finally:
+        db.close()
+    recipients, raw = next(message for message in sink.messages if message[0] == ["mailuser0@example.com"])
+    message = email.message_from_string(raw, policy=policy.default)
+    assert message["Subject"].startswith("Confirm your email address")
+    assert f"verify-email?token={token}" in message.get_content()
+
+
+def test_failures_are_retried_with_backoff_then_dead_lettered(sink, monkeypatch):
+    """
+    Test that a temporary failure is retried after a growing delay until
+    out of attempts, that a permanent one is dead-lettered at once, and
+    that admins can requeue dead letters.
+    """
+    admin = register_and_login("mailadmin", admin=True)
+    clear_mail()
+    monkeypatch.setattr(settings, "MAIL_MAX_ATTEMPTS", 3)
+    sink.replies = {"busy@example.com": "451 Try again later", "nobody@example.com": "550 No such user"}
+    values = {"username": "x", "verify_url": "http://x"}
+    enqueue_mail("verify_email", "busy@example.com", values)
+    enqueue_mail("verify_email", "nobody@example.com", values)
+
+    connection = SmtpConnection()
+    try:
+        assert deliver_batch(connection, timeout=0.1) == 2
+        [dead] = [json.loads(raw) for raw in r.lrange(MAIL_DEAD_KEY, 0, -1)]
+        assert dead["to"] == "nobody@example.com" and dead["attempts"] == 1
+        assert "550" in dead["error"]
+
+        [(retry, due)] = r.zrange(MAIL_RETRY_KEY, 0, -1, withscores=True)
+        assert due >= time.time() + settings.MAIL_RETRY_BASE_SECONDS / 2 - 1
+        assert promote_due() == 0
+        for attempt in range(2, 4):
+            assert promote_due(now=time.time() + settings.MAIL_RETRY_MAX_SECONDS) == 1
+            assert deliver_batch(connection, timeout=0.1) == 1
+        assert r.zcard(MAIL_RETRY_KEY) == 0
+        status = client.get("/admin/mail", headers=admin).json()
+        assert (status["queued"], status["retrying"], status["dead"]) == (0, 0, 2)
+        assert status["dead_letters"][0]["to"] == "busy@example.com"
+        assert status["dead_letters"][0]["attempts"] == 3
+
+        sink.replies = {}
+        response = client.post("/admin/mail/dead/requeue", headers=admin)
+        assert response.json() == {"requeued": 2}
+        assert deliver_batch(connection, timeout=0.1) == 2
+    finally:
+        connection.close()
+    assert sorted(message[0][0] for message in sink.messages) == ["busy@example.com", "nobody@example.com"]
+    assert r.llen(MAIL_DEAD_KEY) == 0
+    assert client.get("/admin/mail", headers=register_and_login("mailnonadmin")).status_code == 403
+
+# endregion Delivery tests
+
+
+
+# region Reminder tests
+
+def test_event_reminders_are_queued_once_per_event():
+    """
+    Test that attendees and the organizer of an event starting soon get
+    one reminder, and another after the event is moved.
+    """
+    organizer = register_and_login("reminderorganizer")
+    guest = register_and_login("reminderguest")
+    starts_at = datetime.now(timezone.utc) + timedelta(hours=2)
+    response = client.post(
+        "/events",
+        headers=organizer,
+        json={
+            "title": "Reminded Game Night",
+            "starts_at": starts_at.isoformat(),
+            "ends_at": (starts_at + timedelta(hours=3)).isoformat(),
+        }
+    )
+    event_id = response.json()["id"]
+    client.post(f"/events/{event_id}/rsvp", headers=guest)
+    clear_mail()
+
+    send_event_reminders()
+    jobs = [job for job in queued_jobs() if job["values"].get("event_url", "").endswith(event_id)]
+    assert sorted(job["to"] for job in jobs) == ["reminderguest@example.com", "reminderorganizer@example.com"]
+    assert all(job["template"] == "event_reminder" for job in jobs)
+    assert jobs[0]["values"]["title"] == "Reminded Game Night"
+
+    clear_mail()
+    send_event_reminders()
+    assert queued_jobs() == []
+
+    later = starts_at + timedelta(hours=1)
+    client.put(
+        f"/events/{event_id}",
+        headers=organizer,
+        json={"starts_at": later.isoformat(), "ends_at": (later + timedelta(hours=3)).isoformat()}
+    )
+    send_event_reminders()
+    assert len(queued_jobs()) == 2
+
+# endregion Reminder tests
@@ -0,0 +1,207 @@
+import json
+import random
+import re
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.core.pubsub import change_listener
+from app.database.database import SessionLocal
+from app.services.moderation import Automaton, moderation_filter, normalize, rescan
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def create_event(headers: dict, title: str) -> str:
+    response = client.post(
+        "/events",
+        headers=headers,
+        json={
+            "title": title,
+            "starts_at": "2031-10-04T18:00:00Z",
+            "ends_at": "2031-10-04T22:00:00Z",
+        }
+    )
+    assert response.status_code == 201, f"Event creation failed: {response.json()}"
+    return response.json()["id"]
+
+
+def add_terms(headers: dict, action: str, terms: list[str]) -> list[dict]:
+    response = client.post("/admin/moderation/terms", headers=headers, json={"action": action, "terms": terms})
+    assert response.status_code == 201, f"Adding terms failed: {response.json()}"
+    return response.json()
+
+
+def flags_for(headers: dict, content_id: str) -> list[dict]:
+    response = client.get("/admin/moderation/flags", headers=headers, params={"limit": 200})
+    assert response.status_code == 200
+    return [flag for flag in response.json()["items"] if flag["content_id"] == content_id]
+
+# endregion Helper functions
+
+
+
+# region Matching tests
+
+def test_normalization_folds_disguised_text():
+    """
+    Test that width, case, accents, invisible characters, leetspeak and
+    punctuation are folded away before matching.
+    """
+    assert normalize("ＧＲＩＭＢＬＥ") == "grimble"
+    assert normalize("Grímblé") == "grimble"
+    assert normalize("gr​imble") == "grimble"
+    assert normalize("GR1MBL3") == "grimble"
+    assert normalize("  grimble -- frost!! ") == "grimble frost"
+
+
+def test_automaton_matches_whole_words_like_a_regex():
+    """
+    Test that the automaton finds exactly the terms a word-bounded regex
+    finds, for overlapping multi-word terms.
+    """
+    rng = random.Random(7)
+    words = ["ab", "abc", "bc", "c", "cab", "ba"]
+    terms = {" ".join(rng.choice(words) for _ in range(rng.randint(1, 3))) for _ in range(40)}
+    automaton = Automaton((term, "flag") for term in terms)
+    for _ in range(200):
+        sample = " ".join(rng.choice(words) for _ in range(rng.randint(1, 12)))
+        expected = {term for term in terms if re.search(rf"(?<!\w){re.escape(term)}(?!\w)", sample)}
+        assert {match.term for match in automaton.scan(sample)} == expected
+
+# endregion Matching tests
+
+
+
+# region Moderation tests
+
+def test_blocked_terms_reject_comments_and_flagged_terms_queue_them():
+    """
+    Test that a blocked term rejects a comment in any disguise, that a
+    flagged term lets it through into the review queue, and that editing
+    the comment clean clears its flag.
+    """
+    admin = register_and_login("modadmin", admin=True)
+    user = register_and_login("modcommenter")
+    add_terms(admin, "block", ["grimblefrost"])
+    add_terms(admin, "flag", ["Snorkelwhip Wand"])
+    event_id = create_event(user, "Moderated Event")
+
+    for body in ["Beware the GR1MBLEFROST!", "ｇｒｉｍｂｌｅｆｒｏｓｔ", "the grïmblefrost"]:
+        response = client.post(
+            "/comments", headers=user, json={"subject_type": "events", "subject_id": event_id, "body": body}
+        )
+        assert response.status_code == 422, body
+    response = client.post(
+        "/comments", headers=user,
+        json={"subject_type": "events", "subject_id": event_id, "body": "grimblefrosting is fine"}
+    )
+    assert response.status_code == 201
+
+    response = client.post(
+        "/comments", headers=user,
+        json={"subject_type": "events", "subject_id": event_id, "body": "Who has a snorkelwhip-wand?"}
+    )
+    assert response.status_code == 201
+    comment_id = response.json()["id"]
+    flags = flags_for(admin, comment_id)
+    assert [(f["field"], f["action"], f["terms"]) for f in flags] == [("body", "flag", ["snorkelwhip wand"])]
+
+    response = client.put(f"/comments/{comment_id}", headers=user, json={"body": "Who has a wand?"})
+    assert response.status_code == 200
+    assert flags_for(admin, comment_id) == []
+
+    assert client.get("/admin/moderation/flags", headers=user).status_code == 403
+    assert client.post("/admin/moderation/terms", headers=user, json={"action": "block", "terms": ["x"]}).status_code == 403
+
+
+def test_profile_fields_are_screened():
+    """
+    Test that blocked terms are rejected in the username and full name,
+    and that a clean full name is saved.
+    """
+    admin = register_and_login("modprofileadmin", admin=True)
+    user = register_and_login("modprofileuser")
+    add_terms(admin, "block", ["quobbleworth"])
+
+    response = client.put("/users/profile", headers=user, json={"full_name": "Sir Quobble-Worth"})
+    assert response.status_code == 200
+    response = client.put("/users/profile", headers=user, json={"full_name": "Sir Qu0bbleworth"})
+    assert response.status_code == 422
+    response = client.put("/users/profile", headers=user, json={"username": "quobbleworth"})
+    assert response.status_code == 422
+    assert client.get("/users/profile", headers=user).json()["full_name"] == "Sir Quobble-Worth"
+
+
+def test_terms_move_between_lists_and_are_removed():
+    """
+    Test that re-adding a term to the other list moves it, that terms
+    without letters are refused, and that removed terms stop matching.
+    """
+    admin = register_and_login("modlistadmin", admin=True)
+    [term] = add_terms(admin, "flag", ["Wobbleknot"])
+    [moved] = add_terms(admin, "block", ["wobbleknot"])
+    assert moved["id"] == term["id"] and moved["action"] == "block"
+    response = client.post("/admin/moderation/terms", headers=admin, json={"action": "flag", "terms": ["!!"]})
+    assert response.status_code == 422
+
+    response = client.post("/admin/moderation/check", headers=admin, json={"text": "a W0bbleknot."})
+    assert response.json() == {
+        "normalized": "a wobbleknot",
+        "matches": [{"term": "wobbleknot", "action": "block"}],
+    }
+    assert client.delete(f"/admin/moderation/terms/{term['id']}", headers=admin).status_code == 204
+    response = client.post("/admin/moderation/check", headers=admin, json={"text": "a W0bbleknot."})
+    assert response.json()["matches"] == []
+
+
+def test_change_notifications_reload_the_lists():
+    """
+    Test that a worker picks up lists edited by another worker when the
+    change notification arrives.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(text("INSERT INTO moderation_terms (id, term, action) VALUES (gen_random_uuid(), 'plinkerdoodle', 'flag')"))
+        db.commit()
+        moderation_filter.ensure_loaded()
+        assert moderation_filter.scan("plinkerdoodle") == []
+        change_listener.dispatch(json.dumps({"topic": "moderation", "action": "reload", "data": {}}))
+        assert [match.term for match in moderation_filter.scan("plinkerdoodle")] == ["plinkerdoodle"]
+    finally:
+        db.execute(text("DELETE FROM moderation_terms WHERE term = 'plinkerdoodle'"))
+        db.commit()
+        db.close()
+        moderation_filter.reload()
+
+
+def test_rescan_flags_existing_content():
+    """
+    Test that the rescan flags content written before a term was added,
+    including blocked terms, and clears the flags once the term is gone.
+    """
+    admin = register_and_login("modrescanadmin", admin=True)
+    user = register_and_login("modrescanuser")
+    event_id = create_event(user, "Rescanned Event")
+    response = client.post(
+        "/comments", headers=user,
+        json={"subject_type": "events", "subject_id": event_id, "body": "An old tale of the Fizzlegrue."}
+    )
+    comment_id = response.json()["id"]
+    client.put("/users/profile", headers=user, json={"full_name": "Fizzlegrue Fan"})
+    user_id = client.get("/users/profile", headers=user).json()["id"]
+    assert flags_for(admin, comment_id) == []
+
+    [term] = add_terms(admin, "block", ["fizzlegrue"])
+    assert client.post("/admin/moderation/rescan", headers=admin).status_code == 202
+    assert [(f["field"], f["action"]) for f in flags_for(admin, comment_id)] == [("body", "block")]
+    assert [(f["field"], f["terms"]) for f in flags_for(admin, user_id)] == [("full_name", ["fizzlegrue"])]
+
+    client.delete(f"/admin/moderation/terms/{term['id']}", headers=admin)
+    rescan(batch_size=2)
+    assert flags_for(admin, comment_id) == []
+    assert flags_for(admin, user_id) == []
+
+# endregion Moderation tests
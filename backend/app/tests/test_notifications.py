@@ -0,0 +1,186 @@
+import redis
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.core.redis import r
+from app.database.database import SessionLocal
+from app.services import notifications
+from app.services.notifications import UNREAD_KEY_PREFIX, reconcile_unread_counts
+from app.tests.conftest import register_user
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def create_event(headers: dict, title: str, capacity: int) -> str:
+    response = client.post(
+        "/events",
+        headers=headers,
+        json={
+            "title": title,
+            "starts_at": "2031-11-08T18:00:00Z",
+            "ends_at": "2031-11-08T22:00:00Z",
+            "capacity": capacity,
+        }
+    )
+    assert response.status_code == 201, f"Event creation failed: {response.json()}"
+    return response.json()["id"]
+
+
+def unread(headers: dict) -> int:
+    return client.get("/notifications/unread", headers=headers).json()["unread"]
+
+# endregion Helper functions
+
+
+
+# region Notification tests
+
+def test_replies_and_rsvps_notify_and_count_as_unread():
+    """
+    Test that a reply notifies the parent's author (but not a self-reply),
+    that confirmed and promoted RSVPs notify the attendee, and that the
+    unread count follows without recounting.
+    """
+    _, host = register_user("notifyhost")
+    first_id, first = register_user("notifyfirst")
+    _, second = register_user("notifysecond")
+    event_id = create_event(host, "Notified Game Night", capacity=1)
+    assert unread(host) == 0
+
+    parent = client.post(
+        "/comments",
+        headers=host,
+        json={"subject_type": "events", "subject_id": event_id, "body": "Bring dice"}
+    ).json()
+    for headers in (first, host):
+        client.post(
+            "/comments",
+            headers=headers,
+            json={"subject_type": "events", "subject_id": event_id, "body": "Will do", "parent_id": parent["id"]}
+        )
+    page = client.get("/notifications", headers=host).json()
+    assert [n["kind"] for n in page["items"]] == ["comment.reply"]
+    assert page["items"][0]["actor_id"] == first_id
+    assert page["items"][0]["data"]["parent_id"] == parent["id"]
+    assert page["unread"] == 1
+
+    client.post(f"/events/{event_id}/rsvp", headers=first)
+    client.post(f"/events/{event_id}/rsvp", headers=second)
+    assert unread(first) == 1
+    assert unread(second) == 0
+    client.delete(f"/events/{event_id}/rsvp", headers=first)
+    [promotion] = client.get("/notifications", headers=second).json()["items"]
+    assert (promotion["kind"], promotion["subject_id"]) == ("rsvp.promoted", event_id)
+
+    # Served from the counter: drop the rows behind its back
+    db = SessionLocal()
+    try:
+        db.execute(text("DELETE FROM notifications WHERE subject_id = :id AND kind = 'rsvp.promoted'"), {"id": event_id})
+        db.commit()
+    finally:
+        db.close()
+    assert unread(second) == 1
+
+
+def test_inbox_pages_and_marking_read():
+    """
+    Test that the inbox pages newest first without gaps, and that marking
+    one or all notifications read updates the unread count.
+    """
+    host_id, host = register_user("inboxhost")
+    _, guest = register_user("inboxguest")
+    event_id = create_event(guest, "Inbox Event", capacity=10)
+    parent = client.post(
+        "/comments",
+        headers=host,
+        json={"subject_type": "events", "subject_id": event_id, "body": "Who is in?"}
+    ).json()
+    replies = [
+        client.post(
+            "/comments",
+            headers=guest,
+            json={"subject_type": "events", "subject_id": event_id, "body": f"Me {n}", "parent_id": parent["id"]}
+        ).json()["id"]
+        for n in range(5)
+    ]
+    assert unread(host) == 5
+
+    seen, cursor = [], None
+    while True:
+        page = client.get("/notifications", headers=host, params={"limit": 2, "cursor": cursor}).json()
+        seen += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert [n["data"]["comment_id"] for n in seen] == replies[::-1]
+
+    response = client.post(f"/notifications/{seen[0]['id']}/read", headers=host)
+    assert response.status_code == 204
+    client.post(f"/notifications/{seen[0]['id']}/read", headers=host)
+    assert unread(host) == 4
+    assert client.post(f"/notifications/{seen[0]['id']}/read", headers=guest).status_code == 404
+
+    response = client.post("/notifications/read", headers=host, json={"until": seen[2]["created_at"]})
+    assert response.json() == {"marked": 3, "unread": 1}
+    unread_page = client.get("/notifications", headers=host, params={"unread": True}).json()
+    assert [n["id"] for n in unread_page["items"]] == [seen[1]["id"]]
+    response = client.post("/notifications/read", headers=host)
+    assert response.json() == {"marked": 1, "unread": 0}
+    assert r.get(f"{UNREAD_KEY_PREFIX}{host_id}") == "0"
+
+
+def test_reconciliation_repairs_drifted_counters():
+    """
+    Test that reconciliation resets a counter that no longer matches the
+    table and leaves correct ones alone.
+    """
+    host_id, host = register_user("reconcilehost")
+    _, guest = register_user("reconcileguest")
+    event_id = create_event(guest, "Reconciled Event", capacity=10)
+    parent = client.post(
+        "/comments",
+        headers=host,
+        json={"subject_type": "events", "subject_id": event_id, "body": "Anyone?"}
+    ).json()
+    client.post(
+        "/comments",
+        headers=guest,
+        json={"subject_type": "events", "subject_id": event_id, "body": "Yes", "parent_id": parent["id"]}
+    )
+    assert unread(host) == 1
+    assert unread(guest) == 0
+
+    r.set(f"{UNREAD_KEY_PREFIX}{host_id}", 7)
+    assert reconcile_unread_counts() >= 1
+    assert unread(host) == 1
+    assert unread(guest) == 0
+    assert reconcile_unread_counts() == 0
+
+
+def test_redis_failures_after_commit_do_not_fail_the_request(monkeypatch):
+    """
+    Test that marking a notification read succeeds when the counter cannot
+    be adjusted, and that reconciliation repairs the counter afterwards.
+    """
+    _, host = register_user("redisdownhost")
+    _, guest = register_user("redisdownguest")
+    event_id = create_event(host, "Unreachable Event", capacity=10)
+    client.post(f"/events/{event_id}/rsvp", headers=guest)
+    assert unread(guest) == 1
+    notification_id = client.get("/notifications", headers=guest).json()["items"][0]["id"]
+
+    class Unavailable:
+        def __getattr__(self, name):
+            raise redis.ConnectionError("Redis is down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(notifications, "r", Unavailable())
+        response = client.post(f"/notifications/{notification_id}/read", headers=guest)
+    assert response.status_code == 204
+    assert unread(guest) == 1
+    reconcile_unread_counts()
+    assert unread(guest) == 0
+
+# endregion Notification tests
@@ -67,6 +67,15 @@ def test_access_protected_endpoint_with_token(token_header):
     assert data["username"] == "validationuser", "Returned profile data is incorrect"
 
 
+def test_metrics_require_an_admin(token_header):
+    """
+    Test that worker metrics are refused without a token and to users who
+    are not administrators.
+    """
+    assert client.get("/api/metrics").status_code == 401
+    assert client.get("/api/metrics", headers=token_header).status_code == 403
+
+
 def test_update_protected_endpoint_without_token():
     """
     Test that attempting to update the user profile without a valid token
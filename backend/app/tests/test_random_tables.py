@@ -0,0 +1,159 @@
+from collections import Counter
+import numpy as np
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.services.random_tables import build_alias, compile_table, compiled_tables
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def create_table(headers: dict, name: str, entries: list[dict]) -> dict:
+    response = client.post("/tables", headers=headers, json={"name": name, "entries": entries})
+    assert response.status_code == 201, f"Table creation failed: {response.json()}"
+    return response.json()
+
+# endregion Helper functions
+
+
+
+# region Alias table tests
+
+def test_alias_table_matches_the_weights():
+    """
+    Test that the alias table's slot probabilities add up to exactly the
+    entry weights, and that sampling follows them.
+    """
+    weights = [1, 2, 3, 10, 0.5, 7]
+    prob, alias = build_alias(weights)
+    expected = np.array(weights) / sum(weights)
+    mass = prob / len(weights)
+    np.add.at(mass, alias, (1 - prob) / len(weights))
+    assert np.allclose(mass, expected)
+
+    table = compile_table(None, 1, [{"weight": w, "text": str(i)} for i, w in enumerate(weights)])
+    picks = table.sample(200_000, np.random.default_rng(7))
+    frequencies = np.bincount(picks, minlength=len(weights)) / len(picks)
+    assert np.allclose(frequencies, expected, atol=0.005)
+
+# endregion Alias table tests
+
+
+
+# region Random table endpoint tests
+
+def test_nested_tables_are_resolved_in_bulk_rolls():
+    """
+    Test that entries rolling on other tables fill in their template, and
+    that seeded rolls are reproducible.
+    """
+    headers = register_and_login("tablesowner")
+    metals = create_table(headers, "Metals", [{"weight": 1, "text": "gold"}, {"weight": 1, "text": "silver"}])
+    loot = create_table(
+        headers,
+        "Loot",
+        [
+            {"weight": 3, "text": "nothing"},
+            {"weight": 1, "text": "a {} coin", "table_id": metals["id"]},
+        ],
+    )
+
+    response = client.get(f"/tables/{loot['id']}/roll", params={"count": 4000, "seed": 3})
+    assert response.status_code == 200
+    results = Counter(response.json()["results"])
+    assert set(results) == {"nothing", "a gold coin", "a silver coin"}
+    assert 0.7 < results["nothing"] / 4000 < 0.8
+    again = client.get(f"/tables/{loot['id']}/roll", params={"count": 4000, "seed": 3})
+    assert again.json()["results"] == response.json()["results"]
+
+
+def test_cycles_and_unknown_tables_are_rejected():
+    """
+    Test that a table cannot end up rolling on itself through other
+    tables, nor on a table that does not exist.
+    """
+    headers = register_and_login("tablescycles")
+    first = create_table(headers, "First", [{"text": "end"}])
+    second = create_table(headers, "Second", [{"table_id": first["id"]}])
+    third = create_table(headers, "Third", [{"table_id": second["id"]}])
+
+    response = client.put(f"/tables/{first['id']}", headers=headers, json={"entries": [{"table_id": third["id"]}]})
+    assert response.status_code == 400
+    response = client.put(f"/tables/{first['id']}", headers=headers, json={"entries": [{"table_id": first["id"]}]})
+    assert response.status_code == 400
+    response = client.post(
+        "/tables",
+        headers=headers,
+        json={"name": "Dangling", "entries": [{"table_id": "00000000-0000-0000-0000-000000000000"}]},
+    )
+    assert response.status_code == 400
+    assert client.get(f"/tables/{third['id']}/roll").json()["results"] == ["end"]
+
+
+def test_deep_chains_and_large_results_are_refused():
+    """
+    Test that tables cannot nest deeper than RANDOM_TABLES_MAX_DEPTH, even
+    by extending a chain from its top, and that rolls whose results could
+    be too long are refused before drawing.
+    """
+    headers = register_and_login("tablesdepth")
+    bottom = create_table(headers, "Bottom", [{"text": "x" * 500}])
+    chain = [bottom]
+    for level in range(settings.RANDOM_TABLES_MAX_DEPTH):
+        chain.append(create_table(headers, f"Level {level}", [{"text": "<{}>", "table_id": chain[-1]["id"]}]))
+    response = client.post(
+        "/tables", headers=headers, json={"name": "Too deep", "entries": [{"table_id": chain[-1]["id"]}]}
+    )
+    assert response.status_code == 400
+    leaf = create_table(headers, "Leaf", [{"text": "y"}])
+    response = client.put(f"/tables/{bottom['id']}", headers=headers, json={"entries": [{"table_id": leaf["id"]}]})
+    assert response.status_code == 400
+
+    top = chain[-1]["id"]
+    result = client.get(f"/tables/{top}/roll").json()["results"][0]
+    assert result == "<" * settings.RANDOM_TABLES_MAX_DEPTH + "x" * 500 + ">" * settings.RANDOM_TABLES_MAX_DEPTH
+    count = settings.RANDOM_TABLES_MAX_RESULT_CHARS // len(result)
+    assert client.get(f"/tables/{top}/roll", params={"count": count + 1}).status_code == 422
+    assert client.get(f"/tables/{top}/roll", params={"count": count}).status_code == 200
+
+
+def test_updates_bump_the_version_and_the_cache():
+    """
+    Test that editing a table bumps its version and rolls see the new
+    entries even in a worker that cached the old ones.
+    """
+    headers = register_and_login("tablesversions")
+    table = create_table(headers, "Weather", [{"text": "rain"}])
+    assert client.get(f"/tables/{table['id']}/roll").json()["results"] == ["rain"]
+
+    response = client.put(f"/tables/{table['id']}", headers=headers, json={"entries": [{"text": "sun"}]})
+    assert response.status_code == 200
+    assert response.json()["version"] == table["version"] + 1
+    compiled_tables.clear()
+    rolled = client.get(f"/tables/{table['id']}/roll", params={"count": 5}).json()
+    assert rolled["version"] == table["version"] + 1
+    assert rolled["results"] == ["sun"] * 5
+
+    other = register_and_login("tablesintruder")
+    response = client.put(f"/tables/{table['id']}", headers=other, json={"name": "Mine"})
+    assert response.status_code == 403
+
+
+def test_tables_rolled_on_cannot_be_deleted():
+    """
+    Test that deleting a table other tables roll on is refused until the
+    referencing table is gone.
+    """
+    headers = register_and_login("tablesdelete")
+    inner = create_table(headers, "Inner", [{"text": "x"}])
+    outer = create_table(headers, "Outer", [{"table_id": inner["id"]}])
+
+    assert client.delete(f"/tables/{inner['id']}", headers=headers).status_code == 409
+    assert client.delete(f"/tables/{outer['id']}", headers=headers).status_code == 204
+    assert client.delete(f"/tables/{inner['id']}", headers=headers).status_code == 204
+    assert client.get(f"/tables/{inner['id']}").status_code == 404
+
+# endregion Random table endpoint tests
@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.database.crud_ratings import reconcile_batch, set_rating
+from app.database.database import SessionLocal
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def create_game(title: str) -> str:
+    headers = register_and_login("ratingsadmin", admin=True)
+    response = client.post(
+        "/games",
+        headers=headers,
+        json={"title": title, "genre": "ratingstest", "min_players": 1, "max_players": 4}
+    )
+    assert response.status_code == 201, f"Game creation failed: {response.json()}"
+    return response.json()["id"]
+
+# endregion Helper functions
+
+
+
+# region Rating tests
+
+def test_rating_changes_adjust_the_aggregate():
+    """
+    Test that creating, changing and removing ratings keeps the summary,
+    histogram and weighted score in step.
+    """
+    game_id = create_game("Aggregate Quest")
+    alice, bob = register_and_login("ratingalice"), register_and_login("ratingbob")
+
+    assert client.put(f"/games/{game_id}/rating", headers=alice, json={"score": 5}).status_code == 200
+    assert client.put(f"/games/{game_id}/rating", headers=bob, json={"score": 2}).status_code == 200
+    client.put(f"/games/{game_id}/rating", headers=bob, json={"score": 4})
+
+    summary = client.get(f"/games/{game_id}/ratings").json()
+    assert summary["rating_count"] == 2 and summary["average"] == 4.5
+    assert summary["histogram"] == [0, 0, 0, 1, 1]
+    # Ten phantom ratings of 3 weigh the two real ones down
+    assert abs(summary["weighted_score"] - (10 * 3 + 9) / 12) < 1e-9
+    assert client.get(f"/games/{game_id}").json()["rating_count"] == 2
+
+    assert client.delete(f"/games/{game_id}/rating", headers=alice).status_code == 204
+    assert client.delete(f"/games/{game_id}/rating", headers=alice).status_code == 404
+    summary = client.get(f"/games/{game_id}/ratings").json()
+    assert summary["rating_count"] == 1 and summary["histogram"] == [0, 0, 0, 1, 0]
+
+
+def test_invalid_scores_and_unknown_games_are_rejected():
+    """
+    Test that scores outside the scale and ratings of missing games fail.
+    """
+    headers = register_and_login("ratingstrict")
+    game_id = create_game("Strict Game")
+    assert client.put(f"/games/{game_id}/rating", headers=headers, json={"score": 6}).status_code == 422
+    response = client.put(
+        "/games/00000000-0000-0000-0000-000000000000/rating", headers=headers, json={"score": 3}
+    )
+    assert response.status_code == 404
+
+
+def test_concurrent_ratings_are_all_counted():
+    """
+    Test that simultaneous ratings of one game all reach its aggregate.
+    """
+    game_id = create_game("Popular Title")
+    db = SessionLocal()
+    try:
+        user_ids = db.execute(text(
+            "INSERT INTO users (id, username, email, hashed_password, is_active, is_verified) "
+            "SELECT gen_random_uuid(), 'rater' || n, 'rater' || n || '@example.com', 'x', true, false "
+            "FROM generate_series(1, 30) AS n RETURNING id"
+        )).scalars().all()
+        db.commit()
+    finally:
+        db.close()
+
+    def rate(item):
+        index, user_id = item
+        session = SessionLocal()
+        try:
+            set_rating(session, game_id, user_id, 1 + index % 5)
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        list(pool.map(rate, enumerate(user_ids)))
+    summary = client.get(f"/games/{game_id}/ratings").json()
+    assert summary["rating_count"] == 30 and summary["histogram"] == [6] * 5
+    assert summary["average"] == 3.0
+
+
+def test_reconciliation_repairs_drift():
+    """
+    Test that the reconciliation batch recomputes aggregates that no longer
+    match the ratings, and leaves correct ones alone.
+    """
+    game_id = create_game("Drifting Game")
+    client.put(f"/games/{game_id}/rating", headers=register_and_login("driftrater"), json={"score": 5})
+    db = SessionLocal()
+    try:
+        db.execute(
+            text("UPDATE game_rating_stats SET rating_count = 7, rating_sum = 1 WHERE game_id = :g"),
+            {"g": game_id},
+        )
+        db.execute(text("UPDATE games SET rating_count = 7 WHERE id = :g"), {"g": game_id})
+        db.commit()
+
+        repaired, after = 0, None
+        while True:
+            after, fixed = reconcile_batch(db, after, batch_size=50)
+            repaired += fixed
+            if after is None:
+                break
+        assert repaired == 1
+        assert reconcile_batch(db, None, batch_size=10_000)[1] == 0
+    finally:
+        db.close()
+    summary = client.get(f"/games/{game_id}/ratings").json()
+    assert summary["rating_count"] == 1 and summary["average"] == 5.0
+    assert client.get(f"/games/{game_id}").json()["rating_count"] == 1
+
+# endregion Rating tests
@@ -0,0 +1,142 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from scipy import sparse
+from app.core.config import settings
+from app.core.redis import r
+from app.services.recommendations import CHANGES_KEY, REFRESHED_AT_KEY, refresh_similar_games, top_k_cosine
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def similar_titles(game_id: str) -> list[str]:
+    response = client.get(f"/games/{game_id}/similar")
+    assert response.status_code == 200
+    return [item["game"]["title"] for item in response.json()["items"]]
+
+# endregion Helper functions
+
+
+
+# region Similarity tests
+
+def test_top_k_matches_brute_force_cosine_across_blocks():
+    """
+    Test that the blockwise top-k equals a dense cosine similarity
+    computation, excluding each item itself and items with nothing in
+    common.
+    """
+    rng = np.random.default_rng(7)
+    dense = (rng.random((60, 40)) < 0.15) * rng.random((60, 40))
+    dense[5] = 0
+    items = sparse.csr_matrix(dense.astype(np.float32))
+    norms = np.linalg.norm(dense, axis=1)
+    rows = np.arange(60)
+
+    # Blocks of one row each
+    indices, scores = top_k_cosine(items, norms, rows, k=5, chunk_bytes=1)
+    expected = dense @ dense.T / np.maximum(np.outer(norms, norms), 1e-12)
+    np.fill_diagonal(expected, 0)
+    for row in rows:
+        found = indices[row][indices[row] >= 0]
+        best = np.sort(expected[row][expected[row] > 0])[::-1][:5]
+        assert np.allclose(scores[row][:len(found)], best, atol=1e-5)
+        assert np.allclose(expected[row][found], best, atol=1e-5)
+    assert (indices[5] == -1).all()
+    assert (indices[:, 0] != rows).all()
+
+    subset_indices, subset_scores = top_k_cosine(items, norms, rows[10:20], k=5, chunk_bytes=1 << 20)
+    assert np.allclose(subset_scores, scores[10:20], atol=1e-6)
+
+
+def test_similar_games_are_built_and_refreshed_incrementally():
+    """
+    Test that games rated and played by the same users are listed as
+    similar, best first, and that an incremental refresh picks up new and
+    removed interactions of the changed games only.
+    """
+    admin = register_and_login("similaradmin", admin=True)
+    game_ids = {}
+    for title in ("Similar Alpha", "Similar Beta", "Similar Gamma", "Similar Delta"):
+        response = client.post(
+            "/games",
+            headers=admin,
+            json={"title": title, "genre": "similartest", "min_players": 1, "max_players": 4}
+        )
+        game_ids[title] = response.json()["id"]
+    players = [register_and_login(f"similarplayer{n}") for n in range(4)]
+    for headers in players[:3]:
+        client.put(f"/games/{game_ids['Similar Alpha']}/rating", headers=headers, json={"score": 5})
+        client.put(f"/games/{game_ids['Similar Beta']}/rating", headers=headers, json={"score": 4})
+    event = client.post(
+        "/events",
+        headers=players[0],
+        json={
+            "title": "Similar Delta Night",
+            "game_id": game_ids["Similar Delta"],
+            "starts_at": "2032-01-10T18:00:00Z",
+            "ends_at": "2032-01-10T22:00:00Z",
+        }
+    ).json()
+    client.post(f"/events/{event['id']}/rsvp", headers=players[0])
+    client.put(f"/games/{game_ids['Similar Gamma']}/rating", headers=players[3], json={"score": 5})
+
+    assert similar_titles(game_ids["Similar Alpha"]) == []
+    refresh_similar_games(full=True)
+    assert similar_titles(game_ids["Similar Alpha"]) == ["Similar Beta", "Similar Delta"]
+    assert similar_titles(game_ids["Similar Delta"])[0] in ("Similar Alpha", "Similar Beta")
+    assert similar_titles(game_ids["Similar Gamma"]) == []
+    assert r.get(REFRESHED_AT_KEY) is not None
+
+    assert refresh_similar_games() == 0
+    for headers in players[:3]:
+        client.put(f"/games/{game_ids['Similar Gamma']}/rating", headers=headers, json={"score": 5})
+    assert refresh_similar_games() >= 4
+    assert set(similar_titles(game_ids["Similar Gamma"])[:2]) == {"Similar Alpha", "Similar Beta"}
+    assert "Similar Gamma" in similar_titles(game_ids["Similar Alpha"])
+    assert client.get(f"/games/{game_ids['Similar Alpha']}/similar", params={"limit": 1}).json()["items"][0]["score"] > 0.9
+
+    # Removed interactions leave no rows behind, but are refreshed too
+    for headers in players[:3]:
+        client.delete(f"/games/{game_ids['Similar Gamma']}/rating", headers=headers)
+    client.delete(f"/events/{event['id']}/rsvp", headers=players[0])
+    assert refresh_similar_games() >= 4
+    assert similar_titles(game_ids["Similar Alpha"]) == ["Similar Beta"]
+    assert similar_titles(game_ids["Similar Gamma"]) == []
+    assert r.scard(CHANGES_KEY) == 0
+
+
+def test_refresh_follows_changed_norms_to_co_rated_games(monkeypatch):
+    """
+    Test that when a game loses interactions, a game sharing another user
+    with it, which neither lists it nor belongs to the users who changed,
+    is refreshed to list it.
+    """
+    monkeypatch.setattr(settings, "SIMILAR_GAMES_K", 1)
+    admin = register_and_login("normadmin", admin=True)
+    game_ids = {}
+    for title in ("Norm Shared", "Norm Crowded", "Norm Other"):
+        response = client.post(
+            "/games",
+            headers=admin,
+            json={"title": title, "genre": "normtest", "min_players": 1, "max_players": 4}
+        )
+        game_ids[title] = response.json()["id"]
+    shared, other, *crowd = [register_and_login(f"normplayer{n}") for n in range(4)]
+    for title in game_ids:
+        client.put(f"/games/{game_ids[title]}/rating", headers=shared, json={"score": 5})
+    client.put(f"/games/{game_ids['Norm Other']}/rating", headers=other, json={"score": 5})
+    for headers in crowd:
+        client.put(f"/games/{game_ids['Norm Crowded']}/rating", headers=headers, json={"score": 5})
+
+    refresh_similar_games(full=True)
+    assert similar_titles(game_ids["Norm Shared"]) == ["Norm Other"]
+    for headers in crowd:
+        client.delete(f"/games/{game_ids['Norm Crowded']}/rating", headers=headers)
+    refresh_similar_games()
+    assert similar_titles(game_ids["Norm Shared"]) == ["Norm Crowded"]
+
+# endregion Similarity tests
@@ -0,0 +1,163 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.database.crud_rsvps import create_rsvp
+from app.database.database import SessionLocal
+from app.tests.conftest import register_user
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def create_event(headers: dict, title: str, capacity: int) -> dict:
+    response = client.post(
+        "/events",
+        headers=headers,
+        json={
+            "title": title,
+            "starts_at": "2031-09-06T18:00:00Z",
+            "ends_at": "2031-09-06T22:00:00Z",
+            "capacity": capacity,
+        }
+    )
+    assert response.status_code == 201, f"Event creation failed: {response.json()}"
+    return response.json()
+
+# endregion Helper functions
+
+
+
+# region RSVP tests
+
+def test_rsvps_fill_seats_then_waitlist_and_reject_duplicates():
+    """
+    Test that RSVPs are confirmed up to capacity, waitlisted after, and
+    that a second RSVP by the same user is rejected.
+    """
+    _, host = register_user("rsvphost")
+    event = create_event(host, "Two Seat Dungeon", capacity=2)
+    guests = [register_user(f"rsvpguest{i}")[1] for i in range(3)]
+
+    statuses = [client.post(f"/events/{event['id']}/rsvp", headers=g).json()["status"] for g in guests]
+    assert statuses == ["confirmed", "confirmed", "waitlisted"]
+
+    response = client.post(f"/events/{event['id']}/rsvp", headers=guests[0])
+    assert response.status_code == 409, "A duplicate RSVP should be rejected."
+    assert client.get(f"/events/{event['id']}").json()["rsvp_count"] == 2
+
+
+def test_cancellation_promotes_the_waitlist_in_order():
+    """
+    Test that a cancelled seat goes to the longest-waiting RSVP.
+    """
+    _, host = register_user("promotehost")
+    event = create_event(host, "One Seat Duel", capacity=1)
+    first, second, third = (register_user(f"promoteguest{i}")[1] for i in range(3))
+    for guest in (first, second, third):
+        client.post(f"/events/{event['id']}/rsvp", headers=guest)
+
+    response = client.delete(f"/events/{event['id']}/rsvp", headers=first)
+    assert response.status_code == 204
+    promoted = client.get(f"/events/{event['id']}/rsvp", headers=second).json()
+    assert promoted["status"] == "confirmed" and promoted["promoted_at"] is not None
+    assert client.get(f"/events/{event['id']}/rsvp", headers=third).json()["status"] == "waitlisted"
+    assert client.get(f"/events/{event['id']}").json()["rsvp_count"] == 1
+
+    response = client.delete(f"/events/{event['id']}/rsvp", headers=first)
+    assert response.status_code == 404, "A cancelled RSVP cannot be cancelled again."
+    client.delete(f"/events/{event['id']}/rsvp", headers=second)
+    assert client.get(f"/events/{event['id']}/rsvp", headers=third).json()["status"] == "confirmed"
+    assert client.get(f"/events/{event['id']}").json()["rsvp_count"] == 1
+
+
+def test_raising_capacity_promotes_and_lowering_below_rsvps_fails():
+    """
+    Test that added seats are filled from the waitlist, and that capacity
+    cannot drop below the confirmed RSVPs.
+    """
+    _, host = register_user("capacityhost")
+    event = create_event(host, "Growing Table", capacity=1)
+    for i in range(3):
+        client.post(f"/events/{event['id']}/rsvp", headers=register_user(f"capacityguest{i}")[1])
+
+    response = client.put(f"/events/{event['id']}", headers=host, json={"capacity": 3})
+    assert response.status_code == 200, f"Event update failed: {response.json()}"
+    confirmed = client.get(f"/events/{event['id']}/rsvps").json()["items"]
+    waitlisted = client.get(f"/events/{event['id']}/rsvps", params={"waitlisted": True}).json()["items"]
+    assert len(confirmed) == 3 and waitlisted == []
+
+    response = client.put(f"/events/{event['id']}", headers=host, json={"capacity": 2})
+    assert response.status_code == 400
+
+
+def test_concurrent_rsvps_never_overbook():
+    """
+    Test that simultaneous RSVPs from many users confirm exactly as many
+    seats as the event has.
+    """
+    _, host = register_user("rushhost")
+    event = create_event(host, "Convention Rush", capacity=5)
+    db = SessionLocal()
+    try:
+        user_ids = db.execute(text(
+            "INSERT INTO users (id, username, email, hashed_password, is_active, is_verified) "
+            "SELECT gen_random_uuid(), 'rushguest' || n, 'rushguest' || n || '@example.com', 'x', true, false "
+            "FROM generate_series(1, 40) AS n RETURNING id"
+        )).scalars().all()
+        db.commit()
+    finally:
+        db.close()
+
+    def rsvp(user_id):
+        session = SessionLocal()
+        try:
+            return create_rsvp(session, event["id"], user_id).status
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        statuses = list(pool.map(rsvp, user_ids))
+    assert statuses.count("confirmed") == 5, "Exactly capacity RSVPs should be confirmed."
+    assert statuses.count("waitlisted") == 35
+    assert client.get(f"/events/{event['id']}").json()["rsvp_count"] == 5
+
+
+def test_rsvp_during_a_cancellation_takes_the_freed_seat():
+    """
+    Test that an RSVP racing a cancellation of the last seat waits for it
+    and is confirmed, rather than waitlisted on the count from before.
+    """
+    _, host = register_user("racehost")
+    event = create_event(host, "Last Seat Race", capacity=1)
+    leaving_id, leaving = register_user("raceleaving")
+    arriving_id, _ = register_user("racearriving")
+    client.post(f"/events/{event['id']}/rsvp", headers=leaving)
+
+    cancelling = SessionLocal()
+    try:
+        # A cancellation holding the event lock, its seat freed but not committed
+        params = {"event_id": event["id"], "user_id": leaving_id}
+        cancelling.execute(text("SELECT id FROM events WHERE id = :event_id FOR NO KEY UPDATE"), params)
+        cancelling.execute(text("DELETE FROM rsvps WHERE event_id = :event_id AND user_id = :user_id"), params)
+        cancelling.execute(text("UPDATE events SET rsvp_count = rsvp_count - 1 WHERE id = :event_id"), params)
+
+        def rsvp():
+            session = SessionLocal()
+            try:
+                return create_rsvp(session, event["id"], arriving_id).status
+            finally:
+                session.close()
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            arrival = pool.submit(rsvp)
+            time.sleep(0.3)
+            cancelling.commit()
+            assert arrival.result() == "confirmed"
+    finally:
+        cancelling.close()
+    assert client.get(f"/events/{event['id']}").json()["rsvp_count"] == 1
+
+# endregion RSVP tests
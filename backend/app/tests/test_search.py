@@ -0,0 +1,130 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.services.search import search
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Pytest Fixtures Setup
+
+@pytest.fixture(scope="module")
+def searchable_games():
+    """
+    Seeds games mentioning a rare word in the title, the description or
+    the genre, so their relative ranking is known.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(text(
+            "INSERT INTO games (id, title, description, genre, min_players, max_players) VALUES "
+            "(gen_random_uuid(), 'Quokka Quest', 'A card game about islands.', 'cards', 1, 4), "
+            "(gen_random_uuid(), 'Island Hopper', 'Race a quokka across the islands.', 'racing', 2, 4), "
+            "(gen_random_uuid(), 'Marsupial Mayhem', 'Chaos in the outback.', 'quokka', 2, 6)"
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+# endregion Pytest Fixtures Setup
+
+
+
+# region Search tests
+
+def test_results_are_ranked_by_field_weight(searchable_games):
+    """
+    Test that title matches outrank description matches, which outrank
+    genre matches, and that snippets highlight the matched terms.
+    """
+    response = client.get("/search", params={"q": "Quokkas"})
+    assert response.status_code == 200, f"Search failed: {response.json()}"
+    items = response.json()["items"]
+    assert [item["title"] for item in items] == ["Quokka Quest", "Island Hopper", "Marsupial Mayhem"]
+    assert all(item["type"] == "games" for item in items)
+    assert "<mark>quokka</mark>" in items[1]["snippet"]
+
+
+def test_snippets_escape_the_description():
+    """
+    Test that markup written in a description comes back escaped, with
+    only the highlight tags left as HTML.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(text(
+            "INSERT INTO games (id, title, description, genre, min_players, max_players) VALUES "
+            "(gen_random_uuid(), 'Burrow', '<img src=x onerror=alert(1)> Wombats & <b>friends</b>', 'cards', 1, 4)"
+        ))
+        db.commit()
+        snippet = search(db, "wombat", ["games"])[0]["snippet"]
+    finally:
+        db.close()
+    assert "<mark>Wombats</mark> &amp; &lt;b&gt;friends" in snippet
+    unmarked = snippet.replace("<mark>", "").replace("</mark>", "")
+    assert "<" not in unmarked and ">" not in unmarked
+
+
+def test_keyset_paging_returns_every_match_once(searchable_games):
+    """
+    Test that following next_cursor pages through all matches in rank order.
+    """
+    titles = []
+    cursor = None
+    while True:
+        params = {"q": "quokka", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/search", params=params).json()
+        titles += [item["title"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert titles == ["Quokka Quest", "Island Hopper", "Marsupial Mayhem"]
+
+
+def test_capped_candidates_page_consistently(searchable_games, monkeypatch):
+    """
+    Test that a query with more matches than SEARCH_MAX_CANDIDATES pages
+    through the same candidates, best first, without repeats.
+    """
+    monkeypatch.setattr(settings, "SEARCH_MAX_CANDIDATES", 2)
+    ranking = ["Quokka Quest", "Island Hopper", "Marsupial Mayhem"]
+    db = SessionLocal()
+    try:
+        first = search(db, "quokka", ["games"], limit=10)
+        titles, after = [], None
+        while True:
+            page = search(db, "quokka", ["games"], after=after, limit=1)
+            titles += [row["title"] for row in page[:1]]
+            if len(page) <= 1:
+                break
+            after = (page[0]["rank"], page[0]["id"])
+    finally:
+        db.close()
+    assert titles == [row["title"] for row in first]
+    assert len(titles) == 2 and titles == sorted(titles, key=ranking.index)
+
+
+def test_equivalent_queries_share_cached_results(searchable_games):
+    """
+    Test that queries differing only in case and spacing are answered from
+    the same cache entry.
+    """
+    first = client.get("/search", params={"q": "  QUOKKA   quest "})
+    second = client.get("/search", params={"q": "quokka quest"})
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+
+
+def test_unknown_search_type_is_rejected():
+    """
+    Test that searching an unknown content type fails.
+    """
+    response = client.get("/search", params={"q": "quokka", "types": ["spaceships"]})
+    assert response.status_code == 400
+
+# endregion Search tests
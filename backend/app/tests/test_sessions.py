@@ -0,0 +1,118 @@
+from fastapi.testclient import TestClient
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def register_and_login(username: str, email: str, password: str = "Testpassword123!"):
+    client.post(
+        "/auth/register",
+        json={
+            "username": username,
+            "email": email,
+            "password": password
+        }
+    )
+    return login(username, password)
+
+def login(username: str, password: str = "Testpassword123!"):
+    response = client.post(
+        "/auth/login",
+        data={
+            "username": username,
+            "password": password
+        }
+    )
+    assert response.status_code == 200, f"Login failed: {response.json()}"
+    return response.json()
+
+def auth_header(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+# endregion Helper functions
+
+
+
+# region Session listing test
+
+def test_login_registers_session():
+    """
+    Test that every login shows up as an active session, with the calling
+    session marked as current.
+    """
+    first = register_and_login("sessionuser", "session@example.com")
+    second = login("sessionuser")
+
+    response = client.get("/auth/sessions", headers=auth_header(second))
+    assert response.status_code == 200, f"Listing sessions failed: {response.json()}"
+    sessions = response.json()
+    assert len(sessions) >= 2, "Both logins should be listed as sessions."
+    current = [s for s in sessions if s["current"]]
+    assert len(current) == 1, "Exactly one session should be marked as current."
+
+    # The first login is still valid
+    response = client.get("/users/profile", headers=auth_header(first))
+    assert response.status_code == 200
+
+# endregion Session listing test
+
+
+
+# region Session revocation tests
+
+def test_revoke_single_session():
+    """
+    Test that revoking one session invalidates its access and refresh tokens
+    without affecting the user's other sessions.
+    """
+    lost_device = register_and_login("revokeoneuser", "revokeone@example.com")
+    this_device = login("revokeoneuser")
+
+    sessions = client.get("/auth/sessions", headers=auth_header(this_device)).json()
+    lost_session = next(s for s in sessions if not s["current"])
+
+    response = client.delete(
+        f"/auth/sessions/{lost_session['session_id']}",
+        headers=auth_header(this_device)
+    )
+    assert response.status_code == 200, f"Revoking session failed: {response.json()}"
+
+    # Tokens of the revoked session are rejected
+    response = client.get("/users/profile", headers=auth_header(lost_device))
+    assert response.status_code == 401, "Access token of a revoked session should be rejected."
+    response = client.post(
+        "/auth/refresh-token",
+        json={"refresh_token": lost_device["refresh_token"]}
+    )
+    assert response.status_code == 401, "Refresh token of a revoked session should be rejected."
+
+    # The other session keeps working
+    response = client.get("/users/profile", headers=auth_header(this_device))
+    assert response.status_code == 200
+
+    # Revoking it again reports it as missing
+    response = client.delete(
+        f"/auth/sessions/{lost_session['session_id']}",
+        headers=auth_header(this_device)
+    )
+    assert response.status_code == 404
+
+
+def test_logout_all_sessions():
+    """
+    Test that logging out of all devices revokes every session at once.
+    """
+    sessions = [register_and_login("logoutalluser", "logoutall@example.com")]
+    sessions += [login("logoutalluser") for _ in range(2)]
+
+    response = client.post("/auth/logout-all", headers=auth_header(sessions[0]))
+    assert response.status_code == 200, f"Logout all failed: {response.json()}"
+    assert response.json()["revoked_sessions"] == 3
+
+    for tokens in sessions:
+        response = client.get("/users/profile", headers=auth_header(tokens))
+        assert response.status_code == 401, "All sessions should be revoked."
+
+# endregion Session revocation tests
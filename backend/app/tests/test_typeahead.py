@@ -0,0 +1,196 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.database.database import SessionLocal
+# Imported the way main.py does, so the test shares the app's index and listener
+from app.core.pubsub import change_listener
+from app.services.typeahead import PrefixIndex, typeahead
+from app.tests.conftest import register_user
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Prefix index tests
+
+def test_prefix_lookup_orders_by_popularity_then_name():
+    """
+    Test that matches are case and accent insensitive, most popular first,
+    with ties in name order.
+    """
+    index = PrefixIndex()
+    index.build([
+        ("1", "Catan", 50),
+        ("2", "Carcassonne", 80),
+        ("3", "Café International", 5),
+        ("4", "Cartographers", 5),
+        ("5", "Azul", 90),
+    ])
+    assert [label for _, label in index.suggest("CA", 10)] ==\
+        ["Carcassonne", "Catan", "Café International", "Cartographers"]
+    assert index.suggest("cafe", 10) == [("3", "Café International")]
+    assert index.suggest("carc", 1) == [("2", "Carcassonne")]
+    assert index.suggest("zz", 10) == []
+
+
+def test_changes_update_cached_prefixes():
+    """
+    Test that upserts, renames and removals are visible to prefixes whose
+    results were already cached.
+    """
+    index = PrefixIndex()
+    index.build([("1", "Catan", 50), ("2", "Carcassonne", 80)])
+    assert index.suggest("c", 10) == [("2", "Carcassonne"), ("1", "Catan")]
+
+    index.upsert("3", "Cascadia", 100)
+    index.upsert("2", "Hive", 80)
+    index.remove("1")
+    assert index.suggest("c", 10) == [("3", "Cascadia")]
+    assert index.suggest("h", 10) == [("2", "Hive")]
+    assert len(index) == 2
+
+
+def test_changes_during_rebuild_are_not_lost():
+    """
+    Test that a change applied while the index is being rebuilt survives
+    the rebuild, even when the snapshot being loaded predates it.
+    """
+    index = PrefixIndex()
+
+    def stale_snapshot():
+        yield ("1", "Catan", 50)
+        # Arrives after the snapshot was read from the database
+        index.upsert("2", "Cascadia", 100)
+        index.remove("1")
+        yield ("3", "Carcassonne", 80)
+
+    index.build(stale_snapshot())
+    assert index.suggest("ca", 10) == [("2", "Cascadia"), ("3", "Carcassonne")]
+
+# endregion Prefix index tests
+
+
+
+# region Suggest endpoint tests
+
+@pytest.fixture(scope="module")
+def admin_header():
+    """
+    Logs in a user with administrator privileges.
+    """
+    client.post(
+        "/auth/register",
+        json={
+            "username": "typeaheadadmin",
+            "email": "typeaheadadmin@example.com",
+            "password": "Testpassword123!"
+        }
+    )
+    db = SessionLocal()
+    try:
+        db.execute(text("UPDATE users SET is_admin = true WHERE username = 'typeaheadadmin'"))
+        db.commit()
+    finally:
+        db.close()
+    response = client.post(
+        "/auth/login",
+        data={"username": "typeaheadadmin", "password": "Testpassword123!"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def listening():
+    """
+    Runs the change listener, as the app does during its lifespan.
+    """
+    typeahead.build()
+    change_listener.start()
+    # Give the listener time to subscribe before publishing
+    time.sleep(0.2)
+    yield
+    change_listener.stop()
+
+
+def suggest_labels(q: str, **params) -> list[str]:
+    response = client.get("/suggest", params={"q": q, **params})
+    assert response.status_code == 200, f"Suggest failed: {response.json()}"
+    return [item["label"] for item in response.json()]
+
+
+def wait_for(condition, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_suggestions_follow_published_changes(admin_header, listening):
+    """
+    Test that games created, renamed and deleted through the API show up in
+    suggestions through change notifications.
+    """
+    response = client.post(
+        "/games",
+        headers=admin_header,
+        json={"title": "Xylophone Xpedition", "genre": "music", "min_players": 1, "max_players": 4}
+    )
+    game_id = response.json()["id"]
+    assert wait_for(lambda: suggest_labels("xylo", types=["games"]) == ["Xylophone Xpedition"]),\
+        "A created game should be suggested."
+
+    client.put(f"/games/{game_id}", headers=admin_header, json={"title": "Xenon Xpedition"})
+    assert wait_for(lambda: suggest_labels("xeno", types=["games"]) == ["Xenon Xpedition"])
+    assert suggest_labels("xylo", types=["games"]) == [], "The old title should be gone."
+
+    client.delete(f"/games/{game_id}", headers=admin_header)
+    assert wait_for(lambda: suggest_labels("xeno", types=["games"]) == []),\
+        "A deleted game should no longer be suggested."
+
+
+def test_event_suggestions_follow_rsvps(admin_header, listening):
+    """
+    Test that events are re-ranked in suggestions as RSVPs are taken and
+    cancelled.
+    """
+    event_ids = {}
+    for title in ("Quokka Quest", "Quokka Quarrel"):
+        response = client.post(
+            "/events",
+            headers=admin_header,
+            json={"title": title, "starts_at": "2032-03-06T18:00:00Z", "ends_at": "2032-03-06T22:00:00Z"}
+        )
+        event_ids[title] = response.json()["id"]
+    assert wait_for(lambda: suggest_labels("quokka", types=["events"]) == ["Quokka Quarrel", "Quokka Quest"])
+
+    _, guest = register_user("typeaheadguest")
+    client.post(f"/events/{event_ids['Quokka Quest']}/rsvp", headers=guest)
+    assert wait_for(lambda: suggest_labels("quokka", types=["events"]) == ["Quokka Quest", "Quokka Quarrel"]),\
+        "An RSVP should raise the event."
+    client.delete(f"/events/{event_ids['Quokka Quest']}/rsvp", headers=guest)
+    assert wait_for(lambda: suggest_labels("quokka", types=["events"]) == ["Quokka Quarrel", "Quokka Quest"]),\
+        "A cancelled RSVP should lower it again."
+
+
+def test_suggestions_span_types(admin_header):
+    """
+    Test that, without a type filter, every suggestion type is looked up.
+    """
+    typeahead.build()
+    response = client.get("/suggest", params={"q": "typeaheadad"})
+    assert response.json() == [
+        {"type": "users", "id": response.json()[0]["id"], "label": "typeaheadadmin"}
+    ]
+
+
+def test_unknown_suggestion_type_is_rejected():
+    """
+    Test that asking for an unknown suggestion type fails.
+    """
+    response = client.get("/suggest", params={"q": "x", "types": ["spaceships"]})
+    assert response.status_code == 400
+
+# endregion Suggest endpoint tests
@@ -0,0 +1,97 @@
+import hashlib
+import os
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.storage import blob_path
+from app.tests.conftest import register_and_login
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def upload(headers: dict, filename: str, content: bytes, content_type: str = "application/pdf"):
+    return client.post(
+        "/uploads",
+        params={"filename": filename},
+        headers={**headers, "Content-Type": content_type},
+        content=content,
+    )
+
+# endregion Helper functions
+
+
+
+# region Upload tests
+
+def test_identical_uploads_share_one_blob_until_both_are_deleted():
+    """
+    Test that uploading the same content twice stores it once, and that the
+    file is only removed with its last upload.
+    """
+    content = os.urandom(300_000)
+    digest = hashlib.sha256(content).hexdigest()
+    first = upload(register_and_login("uploaderone"), "rules.pdf", content)
+    second_headers = register_and_login("uploadertwo")
+    second = upload(second_headers, "../../copy.pdf", content)
+    assert first.status_code == 201 and second.status_code == 201, second.json()
+    assert first.json()["sha256"] == second.json()["sha256"] == digest
+    assert second.json()["filename"] == "copy.pdf", "Path components should be stripped."
+    assert os.path.getsize(blob_path(digest)) == len(content)
+
+    assert client.delete(f"/uploads/{second.json()['id']}", headers=second_headers).status_code == 204
+    assert os.path.exists(blob_path(digest)), "The other upload still uses the blob."
+    response = client.get(f"/uploads/{first.json()['id']}/content")
+    assert response.status_code == 200 and response.content == content
+    assert client.get("/uploads/quota", headers=second_headers).json()["used_bytes"] == 0
+
+
+def test_downloads_support_ranges_and_revalidation():
+    """
+    Test byte ranges, suffix ranges, unsatisfiable ranges, If-Range and
+    If-None-Match on downloads.
+    """
+    content = bytes(range(256)) * 40
+    upload_id = upload(register_and_login("rangeuser"), "map.png", content, "image/png").json()["id"]
+    url = f"/uploads/{upload_id}/content"
+
+    full = client.get(url)
+    assert full.headers["content-type"] == "image/png" and full.headers["accept-ranges"] == "bytes"
+    etag = full.headers["etag"]
+
+    partial = client.get(url, headers={"Range": "bytes=100-199"})
+    assert partial.status_code == 206 and partial.content == content[100:200]
+    assert partial.headers["content-range"] == f"bytes 100-199/{len(content)}"
+    assert client.get(url, headers={"Range": "bytes=-10"}).content == content[-10:]
+    assert client.get(url, headers={"Range": f"bytes={len(content)}-"}).status_code == 416
+
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"outdated"'})
+    assert stale.status_code == 200 and stale.content == content
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_quota_is_enforced_while_streaming(monkeypatch):
+    """
+    Test that uploads beyond the user's remaining quota are rejected and
+    leave neither a record nor a file behind.
+    """
+    monkeypatch.setattr(settings, "UPLOAD_QUOTA_BYTES", 1000)
+    headers = register_and_login("quotauser")
+    assert upload(headers, "small.txt", b"x" * 600, "text/plain").status_code == 201
+
+    def chunks():
+        for _ in range(10):
+            yield b"y" * 100
+
+    # Streamed without a Content-Length, so the limit is hit mid-stream
+    response = client.post(
+        "/uploads", params={"filename": "big.txt"}, headers=headers, content=chunks()
+    )
+    assert response.status_code == 413
+    assert client.get("/uploads/quota", headers=headers).json()["used_bytes"] == 600
+    assert len(client.get("/uploads", headers=headers).json()["items"]) == 1
+    assert not os.path.exists(blob_path(hashlib.sha256(b"y" * 1000).hexdigest()))
+    assert os.listdir(os.path.join(settings.STORAGE_ROOT, "tmp")) == []
+
+# endregion Upload tests
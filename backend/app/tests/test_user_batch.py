@@ -0,0 +1,130 @@
+import asyncio
+import threading
+from uuid import uuid4
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.database.database import SessionLocal, engine
+from app.database.loaders import UserLoader
+from backend.main import app
+
+
+client = TestClient(app)
+
+# region Helper functions
+
+def register_user(username: str) -> str:
+    response = client.post(
+        "/auth/register",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "Testpassword123!"
+        }
+    )
+    assert response.status_code == 201, f"User registration failed: {response.json()}"
+    return response.json()["id"]
+
+class QueryCounter:
+    """
+    Collects the SQL statements executed while it is active.
+    """
+    def __init__(self):
+        self.statements = []
+        self.threads = set()
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+        self.threads.add(threading.get_ident())
+
+# endregion Helper functions
+
+
+
+# region Loader tests
+
+def test_loader_batches_lookups_in_one_query():
+    """
+    Test that lookups issued in the same tick are resolved with one query
+    off the event-loop thread, duplicates are coalesced and results are
+    cached.
+    """
+    ids = [register_user(f"loaderuser{i}") for i in range(3)]
+    # Duplicate and unknown keys on purpose
+    keys = ids + ids + [str(uuid4())]
+
+    async def load_twice(loader: UserLoader):
+        with QueryCounter() as first_round:
+            users = await asyncio.gather(*(loader.load(user_id) for user_id in keys))
+        with QueryCounter() as second_round:
+            await asyncio.gather(*(loader.load(user_id) for user_id in keys))
+        assert threading.get_ident() not in first_round.threads, "Queries should not block the event loop."
+        return users, first_round.statements, second_round.statements
+
+    db = SessionLocal()
+    try:
+        users, first_round, second_round = asyncio.run(load_twice(UserLoader(db)))
+    finally:
+        db.close()
+    assert len(first_round) == 1, "All lookups in one tick should share a single query."
+    assert [user.username for user in users[:3]] == [f"loaderuser{i}" for i in range(3)]
+    assert users[-1] is None, "Unknown ids should resolve to None."
+    assert second_round == [], "Cached users should not be queried again."
+
+# endregion Loader tests
+
+
+
+# region Batch endpoint tests
+
+@pytest.fixture(scope="module")
+def batch_user():
+    """
+    Registers and logs in a user, returning its id and auth header.
+    """
+    batch_id = register_user("batchuser")
+    login_response = client.post(
+        "/auth/login",
+        data={"username": "batchuser", "password": "Testpassword123!"}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    return batch_id, headers
+
+
+def test_batch_endpoint_resolves_ids_and_usernames(batch_user):
+    """
+    Test that /users/batch returns each known user once, whether requested
+    by id or by username.
+    """
+    batch_id, headers = batch_user
+    response = client.get(
+        "/users/batch",
+        params={"ids": [batch_id, str(uuid4())], "usernames": ["batchuser", "nosuchuser"]},
+        headers=headers
+    )
+    assert response.status_code == 200, f"Batch lookup failed: {response.json()}"
+    users = response.json()
+    assert [user["username"] for user in users] == ["batchuser"]
+    assert "email" not in users[0], "Batch lookups should only expose public fields."
+
+
+def test_batch_endpoint_rejects_oversized_batches(batch_user):
+    """
+    Test that batches above the configured maximum are rejected.
+    """
+    _, headers = batch_user
+    response = client.get(
+        "/users/batch",
+        params={"ids": [str(uuid4()) for _ in range(101)]},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+# endregion Batch endpoint tests
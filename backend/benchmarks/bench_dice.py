@@ -0,0 +1,91 @@
+# benchmarks/bench_dice.py
+
+"""
+Exact dice distributions: polynomial engine vs naive enumeration.
+
+For expressions small enough to enumerate, times listing every roll against
+computing the distribution by convolution and the keep/drop DP (cold, with
+the caches cleared, and cached), and checks both agree. Then times a batch
+of vectorized rolls like a large POST /dice/roll.
+
+Run from the backend directory:
+    python -m benchmarks.bench_dice [--rolls 100000]
+"""
+
+import argparse
+import itertools
+import time
+from collections import Counter
+
+import numpy as np
+
+from app.services import dice
+from app.services.dice import compile_expression
+
+
+# (expression, dice count, sides, dice kept, constant)
+CASES = [
+    ("4d6dl1+2", 4, 6, 3, 2),
+    ("6d6kh3", 6, 6, 3, 0),
+    ("3d20", 3, 20, 3, 0),
+    ("8d6", 8, 6, 8, 0),
+    ("5d10kh2", 5, 10, 2, 0),
+]
+
+
+def enumerate_distribution(count: int, sides: int, kept: int, constant: int) -> dict[int, float]:
+    totals = Counter(
+        sum(sorted(roll)[count - kept:]) + constant
+        for roll in itertools.product(range(1, sides + 1), repeat=count)
+    )
+    return {total: n / sides ** count for total, n in totals.items()}
+
+
+def clear_caches():
+    dice._compile.cache_clear()
+    dice.die.cache_clear()
+
+
+def timed(func, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rolls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'expression':<12} {'outcomes':>10} {'naive ms':>10} {'cold ms':>9} {'cached us':>10} {'max error':>10}")
+    for expression, count, sides, kept, constant in CASES:
+        expected = {}
+        naive = timed(lambda: expected.update(enumerate_distribution(count, sides, kept, constant)))
+
+        def cold():
+            clear_caches()
+            compile_expression(expression).distribution
+
+        cold_time = timed(cold, repeat=20)
+        cached = timed(lambda: compile_expression(expression).distribution, repeat=10_000)
+        distribution = compile_expression(expression).distribution
+        error = max(abs(distribution.probabilities[t - distribution.offset] - p) for t, p in expected.items())
+        print(
+            f"{expression:<12} {sides ** count:>10} {naive * 1e3:>10.1f} {cold_time * 1e3:>9.2f}"
+            f" {cached * 1e6:>10.2f} {error:>10.1e}"
+        )
+
+    for expression in ("100d100", "20d20kh10", "10d10!", "1000d1000"):
+        clear_caches()
+        print(f"{expression:<12} cold {timed(lambda: compile_expression(expression).distribution) * 1e3:.1f} ms")
+
+    expressions = [compile_expression(e) for e in ("1d20+5", "4d6dl1", "2d6+3", "1d8!", "3d6")]
+    rng = np.random.default_rng(1)
+    per_expression = args.rolls // len(expressions)
+    elapsed = timed(lambda: [e.roll(per_expression, rng) for e in expressions], repeat=5)
+    print(f"batch rolls: {args.rolls} in {elapsed * 1e3:.1f} ms ({args.rolls / elapsed / 1e6:.1f}M rolls/s)")
+
+
+if __name__ == "__main__":
+    main()
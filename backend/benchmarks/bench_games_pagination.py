@@ -0,0 +1,96 @@
+# benchmarks/bench_games_pagination.py
+
+"""
+Page latency of the games directory at increasing depth, keyset vs OFFSET.
+
+Seeds a catalog of synthetic games (tagged with their own genre so they can
+be removed afterwards) into the database from DATABASE_URL, then times
+fetching page N with a keyset cursor and with OFFSET.
+
+Run from the backend directory:
+    python -m benchmarks.bench_games_pagination [--games 100000] [--limit 20]
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.database.crud_games import list_games, sort_key
+from app.database.database import Base, SessionLocal, engine
+from app.models.game import Game
+from app.schemas.game import GameSort
+
+
+GENRE = "benchmark"
+
+
+def seed(db, count: int):
+    db.execute(text("DELETE FROM games WHERE genre = :genre"), {"genre": GENRE})
+    db.execute(text(
+        "INSERT INTO games (id, title, genre, min_players, max_players, rating, rating_count) "
+        "SELECT gen_random_uuid(), 'Benchmark Game ' || lpad(n::text, 7, '0'), :genre, "
+        "1 + n % 4, 4 + n % 4, round((random() * 5)::numeric, 2), n % 500 "
+        "FROM generate_series(1, :count) AS n"
+    ), {"genre": GENRE, "count": count})
+    db.commit()
+    db.execute(text("ANALYZE games"))
+
+
+def offset_page(db, sort: GameSort, page: int, limit: int):
+    columns = {
+        GameSort.title: [Game.title.asc(), Game.id.asc()],
+        GameSort.top_rated: [Game.rating.desc(), Game.id.desc()],
+    }[sort]
+    return (
+        db.query(Game).filter(Game.genre == GENRE)
+        .order_by(*columns).offset(page * limit).limit(limit + 1).all()
+    )
+
+
+def time_ms(func, repeat: int = 7) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print(f"Seeding {args.games} games...")
+        seed(db, args.games)
+        max_page = args.games // args.limit - 1
+        pages = sorted({p for p in (0, 10, 100, 1_000, max_page // 2, max_page) if p <= max_page})
+
+        for sort in (GameSort.title, GameSort.top_rated):
+            print(f"\nsort={sort.value} limit={args.limit}")
+            print(f"  {'page':>8} {'keyset ms':>10} {'offset ms':>10}")
+            for page in pages:
+                # Build the cursor of page N outside of the timed section
+                after = None
+                if page:
+                    previous = offset_page(db, sort, page - 1, args.limit)[args.limit - 1]
+                    after = sort_key(previous, sort)
+                keyset = time_ms(lambda: list_games(db, sort=sort, after=after, limit=args.limit, genre=GENRE))
+                offset = time_ms(lambda: offset_page(db, sort, page, args.limit))
+                print(f"  {page:>8} {keyset:>10.2f} {offset:>10.2f}")
+    finally:
+        if not args.keep:
+            db.execute(text("DELETE FROM games WHERE genre = :genre"), {"genre": GENRE})
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_random_tables.py
+
+"""
+Random tables: alias-table sampling vs a linear scan of cumulative weights.
+
+For tables of growing size, times compiling the alias table, a batch of
+vectorized alias rolls like GET /tables/{id}/roll, and the same number of
+rolls by walking the cumulative weights per roll (what a naive loop over
+the entries does), and checks the alias sample's frequencies.
+
+Run from the backend directory:
+    python -m benchmarks.bench_random_tables [--rolls 10000]
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+import numpy as np
+
+from app.services.random_tables import compile_table
+
+
+def timed(func, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def scan_rolls(weights: list[float], count: int, rng: random.Random) -> list[int]:
+    cumulative = list(itertools.accumulate(weights))
+    total = cumulative[-1]
+    picks = []
+    for _ in range(count):
+        target = rng.random() * total
+        for index, bound in enumerate(cumulative):
+            if target < bound:
+                picks.append(index)
+                break
+    return picks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rolls", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'compile ms':>11} {'alias ms':>9} {'scan ms':>9} {'max error':>10}")
+    for size in (10, 100, 1000):
+        weights = [random.Random(size + i).uniform(0.1, 10) for i in range(size)]
+        entries = [{"weight": w, "text": str(i)} for i, w in enumerate(weights)]
+        compile_time = timed(lambda: compile_table(None, 1, entries), repeat=20)
+        table = compile_table(None, 1, entries)
+        rng = np.random.default_rng(1)
+        alias_time = timed(lambda: table.sample(args.rolls, rng), repeat=20)
+        scan_time = timed(lambda: scan_rolls(weights, args.rolls, random.Random(1)), repeat=3)
+        frequencies = np.bincount(table.sample(1_000_000, rng), minlength=size) / 1_000_000
+        error = np.abs(frequencies - np.array(weights) / sum(weights)).max()
+        print(
+            f"{size:>8} {compile_time * 1e3:>11.2f} {alias_time * 1e3:>9.2f}"
+            f" {scan_time * 1e3:>9.1f} {error:>10.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
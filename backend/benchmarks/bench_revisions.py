@@ -0,0 +1,108 @@
+# benchmarks/bench_revisions.py
+
+"""
+Homebrew revision history: storage size and reconstruction latency.
+
+Saves a document through 500 revisions of small random edits into the
+database from DATABASE_URL (under a benchmark user, removed afterwards),
+then compares the bytes stored against keeping every revision in full,
+and times rebuilding revisions at every distance from their snapshot.
+
+Run from the backend directory:
+    python -m benchmarks.bench_revisions [--revisions 500] [--lines 400] [--interval 20]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database.crud_homebrew import create_document, get_revision_text, update_document
+from app.database.database import Base, SessionLocal, engine
+from app.models.user import User
+from app.services.revisions import compress
+
+
+USERNAME = "benchmark_revisions"
+
+
+def edit(lines: list[str], rng: random.Random) -> list[str]:
+    lines = list(lines)
+    position = rng.randrange(len(lines))
+    action = rng.random()
+    if action < 0.5:
+        lines[position] = f"{lines[position].rstrip()} (amended {rng.randrange(1000)})\n"
+    elif action < 0.8:
+        lines.insert(position, f"New rule {rng.randrange(10**6)}: a creature may take the Dash action.\n")
+    elif len(lines) > 10:
+        del lines[position]
+    return lines
+
+
+def time_ms(func, repeat: int = 20) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--revisions", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=400)
+    parser.add_argument("--interval", type=int, default=settings.HOMEBREW_SNAPSHOT_INTERVAL)
+    args = parser.parse_args()
+    settings.HOMEBREW_SNAPSHOT_INTERVAL = args.interval
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.execute(text("DELETE FROM users WHERE username = :u"), {"u": USERNAME})
+        owner = User(username=USERNAME, email=f"{USERNAME}@example.com", hashed_password="")
+        db.add(owner)
+        db.commit()
+        owner_id = owner.id
+
+        rng = random.Random(1)
+        lines = [f"Rule {n}: when a creature drops to 0 hit points it falls unconscious.\n" for n in range(args.lines)]
+        texts = ["".join(lines)]
+        started = time.perf_counter()
+        document = create_document(db, owner_id, "Benchmark rules", texts[0])
+        for _ in range(args.revisions - 1):
+            lines = edit(lines, rng)
+            texts.append("".join(lines))
+            update_document(db, document.id, owner_id, content=texts[-1])
+        saving = (time.perf_counter() - started) / args.revisions * 1000
+
+        stored, snapshots = db.execute(text(
+            "SELECT sum(octet_length(data)), count(*) FILTER (WHERE is_snapshot) "
+            "FROM homebrew_revisions WHERE document_id = :d"
+        ), {"d": document.id}).one()
+        full = sum(len(t.encode()) for t in texts)
+        full_compressed = sum(len(compress(t.encode())) for t in texts)
+        print(f"{args.revisions} revisions of a ~{len(texts[-1].encode()) // 1024} KB document, snapshot every {args.interval}")
+        print(f"  save: {saving:.2f} ms per revision")
+        print(f"  stored: {stored / 1024:.0f} KB ({snapshots} snapshots)")
+        print(f"  every revision in full: {full / 1024:.0f} KB, zlib each: {full_compressed / 1024:.0f} KB")
+        print(f"  ratio: {full / stored:.1f}x vs full, {full_compressed / stored:.1f}x vs compressed")
+
+        print(f"\n  {'deltas read':>11} {'rebuild ms':>11}")
+        base = (args.revisions // args.interval - 1) * args.interval + 1
+        for distance in sorted({0, 1, args.interval // 4, args.interval // 2, args.interval - 1}):
+            revision = base + distance
+            assert get_revision_text(db, document.id, revision) == texts[revision - 1]
+            print(f"  {distance:>11} {time_ms(lambda: get_revision_text(db, document.id, revision)):>11.2f}")
+    finally:
+        db.rollback()
+        db.execute(text("DELETE FROM users WHERE username = :u"), {"u": USERNAME})
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
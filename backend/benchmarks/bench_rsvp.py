@@ -0,0 +1,153 @@
+# benchmarks/bench_rsvp.py
+
+"""
+RSVP contention on a single event.
+
+Creates one event and a batch of users in the database from DATABASE_URL
+(whose tables must exist, e.g. from running the app once),
+fires all their RSVPs at once from a thread pool (each with its own
+session), then checks that exactly `capacity` were confirmed and that the
+counter matches the rows. A second round cancels confirmed RSVPs
+concurrently and checks every freed seat went to the waitlist, in order.
+
+Run from the backend directory:
+    python -m benchmarks.bench_rsvp [--rsvps 1000] [--capacity 300] [--workers 64]
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database.crud_rsvps import cancel_rsvp, create_rsvp, get_rsvp
+from app.models import event, game, user  # noqa: F401, tables the RSVP foreign keys resolve to
+from app.models.rsvp import RSVP_CONFIRMED, RSVP_WAITLISTED
+
+
+PREFIX = "benchrsvp"
+
+
+def setup(Session, rsvps: int, capacity: int):
+    db = Session()
+    try:
+        db.execute(text("DELETE FROM users WHERE username LIKE :p"), {"p": f"{PREFIX}%"})
+        user_ids = db.execute(text(
+            "INSERT INTO users (id, username, email, hashed_password, is_active, is_verified) "
+            "SELECT gen_random_uuid(), :p || n, :p || n || '@example.com', 'x', true, false "
+            "FROM generate_series(1, :n) AS n RETURNING id"
+        ), {"p": PREFIX, "n": rsvps + 1}).scalars().all()
+        starts_at = datetime.now(timezone.utc) + timedelta(days=30)
+        event_id = db.execute(text(
+            "INSERT INTO events (id, title, organizer_id, starts_at, ends_at, capacity) "
+            "VALUES (gen_random_uuid(), 'Benchmark Convention', :organizer, :starts_at, :ends_at, :capacity) "
+            "RETURNING id"
+        ), {
+            "organizer": user_ids[0],
+            "starts_at": starts_at,
+            "ends_at": starts_at + timedelta(hours=8),
+            "capacity": capacity,
+        }).scalar()
+        db.commit()
+        return event_id, user_ids[1:]
+    finally:
+        db.close()
+
+
+def check(Session, event_id, capacity: int) -> tuple[int, int]:
+    db = Session()
+    try:
+        counter = db.execute(text("SELECT rsvp_count FROM events WHERE id = :id"), {"id": event_id}).scalar()
+        rows = dict(db.execute(
+            text("SELECT status, count(*) FROM rsvps WHERE event_id = :id GROUP BY status"),
+            {"id": event_id},
+        ).all())
+    finally:
+        db.close()
+    confirmed = rows.get(RSVP_CONFIRMED, 0)
+    ok = confirmed == counter == capacity
+    print(f"  confirmed rows {confirmed}, counter {counter}, waitlisted {rows.get(RSVP_WAITLISTED, 0)}"
+          f" -> {'OK' if ok else 'OVERBOOKED OR INCONSISTENT'}")
+    return ok
+
+
+def run(pool: ThreadPoolExecutor, func, items) -> float:
+    start = time.perf_counter()
+    list(pool.map(func, items))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rsvps", type=int, default=1_000)
+    parser.add_argument("--capacity", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=64)
+    args = parser.parse_args()
+
+    # One connection per worker, as a fleet of app workers would have
+    engine = create_engine(settings.DATABASE_URL, pool_size=args.workers, max_overflow=0)
+    Session = sessionmaker(bind=engine)
+    event_id, user_ids = setup(Session, args.rsvps, args.capacity)
+
+    def rsvp(user_id):
+        db = Session()
+        try:
+            return create_rsvp(db, event_id, user_id)
+        finally:
+            db.close()
+
+    def cancel(user_id):
+        db = Session()
+        try:
+            cancel_rsvp(db, get_rsvp(db, event_id, user_id))
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        # Open every connection up front so the burst does not pay for it
+        list(pool.map(lambda _: Session().connection().close(), range(args.workers)))
+        elapsed = run(pool, rsvp, user_ids)
+        print(f"{args.rsvps} concurrent RSVPs, capacity {args.capacity}, {args.workers} workers: "
+              f"{elapsed:.2f}s, {args.rsvps / elapsed:.0f} RSVPs/s")
+        ok = check(Session, event_id, args.capacity)
+
+        db = Session()
+        try:
+            confirmed = db.execute(
+                text("SELECT user_id FROM rsvps WHERE event_id = :id AND status = :s"),
+                {"id": event_id, "s": RSVP_CONFIRMED},
+            ).scalars().all()
+            waitlist = db.execute(
+                text("SELECT user_id FROM rsvps WHERE event_id = :id AND status = :s ORDER BY created_at, id"),
+                {"id": event_id, "s": RSVP_WAITLISTED},
+            ).scalars().all()
+        finally:
+            db.close()
+        cancelled = confirmed[:args.capacity // 3]
+        elapsed = run(pool, cancel, cancelled)
+        print(f"{len(cancelled)} concurrent cancellations: {elapsed:.2f}s, {len(cancelled) / elapsed:.0f}/s")
+        ok = check(Session, event_id, args.capacity) and ok
+
+    db = Session()
+    try:
+        promoted = set(db.execute(
+            text("SELECT user_id FROM rsvps WHERE event_id = :id AND promoted_at IS NOT NULL"),
+            {"id": event_id},
+        ).scalars())
+        in_order = promoted == set(waitlist[:len(cancelled)])
+        print(f"  freed seats went to the head of the waitlist: {in_order}")
+        ok = in_order and ok
+        db.execute(text("DELETE FROM users WHERE username LIKE :p"), {"p": f"{PREFIX}%"})
+        db.commit()
+    finally:
+        db.close()
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
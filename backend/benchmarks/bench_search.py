@@ -0,0 +1,116 @@
+# benchmarks/bench_search.py
+
+"""
+Full-text search latency on a million-row corpus.
+
+Seeds synthetic games (random titles and descriptions drawn from a fixed
+vocabulary, tagged with their own genre so they can be removed afterwards)
+into the database from DATABASE_URL, then times `search` for a mix of rare,
+common and multi-word queries, bypassing the Redis cache.
+
+Run from the backend directory:
+    python -m benchmarks.bench_search [--rows 1000000] [--budget-ms 50]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.database.database import Base, SessionLocal, engine
+from app.services.search import normalize_query, search
+
+
+GENRE = "benchmarksearch"
+
+VOCABULARY = [
+    "dragon", "castle", "goblin", "wizard", "tavern", "quest", "dungeon", "forest",
+    "sword", "shield", "potion", "scroll", "knight", "rogue", "cleric", "bard",
+    "treasure", "map", "ship", "island", "pirate", "storm", "mountain", "river",
+    "empire", "rebellion", "station", "galaxy", "robot", "mutant", "zombie", "vampire",
+    "train", "railway", "harbor", "market", "farm", "garden", "city", "village",
+    "card", "dice", "token", "worker", "auction", "bluff", "deduction", "puzzle",
+    "horror", "mystery", "detective", "heist", "war", "siege", "trade", "exploration",
+]
+
+QUERIES = [
+    "dragon", "castle siege", "pirate treasure island", "zombie", "wizard tower",
+    "robot galaxy station", "heist", "cooperative deduction mystery", "nonexistentword",
+]
+
+
+def seed(db, rows: int):
+    db.execute(text("DELETE FROM games WHERE genre = :genre"), {"genre": GENRE})
+    vocabulary = "ARRAY[" + ", ".join(f"'{word}'" for word in VOCABULARY) + "]"
+    # Titles use two words, descriptions twelve, picked by hashing the row number
+    db.execute(text(
+        f"INSERT INTO games (id, title, description, genre, min_players, max_players) "
+        f"SELECT gen_random_uuid(), "
+        f"initcap(v[1 + (n * 7) % {len(VOCABULARY)}] || ' ' || v[1 + (n * 13 / 7) % {len(VOCABULARY)}]) || ' ' || n, "
+        f"(SELECT string_agg(v[1 + abs(hashint4(n * 12 + i)) % {len(VOCABULARY)}], ' ') "
+        f" FROM generate_series(1, 12) AS words(i)), "
+        f":genre, 1, 4 "
+        f"FROM generate_series(1, :rows) AS n, (SELECT {vocabulary} AS v) AS vocab"
+    ), {"genre": GENRE, "rows": rows})
+    db.commit()
+    db.execute(text("ANALYZE games"))
+
+
+def time_ms(func, repeat: int = 5) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse previously seeded rows")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if not args.skip_seed:
+            print(f"Seeding {args.rows} games...")
+            start = time.perf_counter()
+            seed(db, args.rows)
+            print(f"  seeded in {time.perf_counter() - start:.1f}s")
+
+        all_samples = []
+        print(f"\n  {'query':<34} {'matches':>8} {'p50 ms':>8} {'max ms':>8}")
+        for query in QUERIES:
+            normalized = normalize_query(query)
+            matches = db.execute(
+                text("SELECT count(*) FROM games WHERE search_vector @@ websearch_to_tsquery('english', :q)"),
+                {"q": normalized},
+            ).scalar()
+            first_page = search(db, normalized, ["games"], limit=20)
+            samples = time_ms(lambda: search(db, normalized, ["games"], limit=20))
+            # And a deeper keyset page
+            if len(first_page) > 20:
+                after = (first_page[19]["rank"], first_page[19]["id"])
+                samples += time_ms(lambda: search(db, normalized, ["games"], after=after, limit=20))
+            all_samples += samples
+            print(f"  {query:<34} {matches:>8} {statistics.median(samples):>8.2f} {max(samples):>8.2f}")
+
+        p95 = statistics.quantiles(all_samples, n=20)[-1]
+        print(f"\n  p95 over all queries: {p95:.2f} ms (budget {args.budget_ms:.0f} ms)")
+        if p95 > args.budget_ms:
+            sys.exit(1)
+    finally:
+        if not args.keep:
+            db.execute(text("DELETE FROM games WHERE genre = :genre"), {"genre": GENRE})
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_serialization.py
+
+"""
+Per-response CPU cost of the response serialization paths.
+
+Compares FastAPI's default `response_model` handling (validate, dump to
+Python primitives, `json.dumps` in JSONResponse) with the compiled
+`model_response` path, and the old validation error cleaning with the
+precompiled envelope encoder.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization
+"""
+
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from app.core.serialization import EnvelopeResponse, model_response, type_adapter
+from app.models.user import User
+from app.schemas.user import UserCreate, UserOut, UserPublic
+
+
+def make_user(i: int) -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=uuid.uuid4(),
+        username=f"benchuser{i}",
+        email=f"benchuser{i}@example.com",
+        hashed_password="x",
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+        is_verified=False,
+        verification_token=str(uuid.uuid4()),
+        full_name=f"Bench User {i}",
+        phone_number=None,
+        last_login_at=now,
+        last_seen_at=now,
+    )
+
+
+def default_path(tp, obj) -> bytes:
+    # What FastAPI 0.100 does for a route with `response_model`, with the
+    # response field built once as FastAPI does
+    adapter = type_adapter(tp)
+    value = adapter.validate_python(obj, from_attributes=True)
+    return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+def legacy_error_path(errors) -> bytes:
+    # The previous validation handler: copy and clean every error dict
+    cleaned_errors = []
+    for error in errors:
+        error_copy = error.copy()
+        error_copy["msg"] = str(error.get("msg"))
+        if "ctx" in error_copy:
+            error_copy["ctx"] = {
+                k: (str(v) if not isinstance(v, (str, int, float, bool, type(None))) else v)
+                for k, v in error_copy["ctx"].items()
+            }
+        cleaned_errors.append(error_copy)
+    return JSONResponse({
+        "success": False,
+        "error_code": "VALIDATION_ERROR",
+        "message": "Input validation failed.",
+        "detail": cleaned_errors,
+    }).body
+
+
+def envelope_error_path(errors) -> bytes:
+    return EnvelopeResponse({
+        "success": False,
+        "error_code": "VALIDATION_ERROR",
+        "message": "Input validation failed.",
+        "detail": errors,
+    }).body
+
+
+def bench(label: str, func, number: int) -> float:
+    # Best of several repeats, reported per call
+    per_call = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<32} {per_call * 1e6:10.1f} us")
+    return per_call
+
+
+def main():
+    user = make_user(0)
+    users = [make_user(i) for i in range(100)]
+    try:
+        UserCreate(username="a", email="not-an-email", password="short")
+    except ValidationError as exc:
+        errors = exc.errors()
+
+    cases = [
+        ("UserOut (single profile)", UserOut, user, 20_000),
+        ("list[UserPublic] (100 users)", list[UserPublic], users, 500),
+    ]
+    for name, tp, obj, number in cases:
+        # Both paths must produce the same document
+        assert json.loads(default_path(tp, obj)) == json.loads(model_response(tp, obj).body)
+        print(name)
+        before = bench("default response_model path", lambda: default_path(tp, obj), number)
+        after = bench("model_response", lambda: model_response(tp, obj).body, number)
+        print(f"  {'reduction':<32} {100 * (1 - after / before):10.1f} %")
+
+    print("Validation error envelope (3 errors)")
+    before = bench("copy-and-clean + JSONResponse", lambda: legacy_error_path(errors), 20_000)
+    after = bench("EnvelopeResponse", lambda: envelope_error_path(errors), 20_000)
+    print(f"  {'reduction':<32} {100 * (1 - after / before):10.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_typeahead.py
+
+"""
+Memory footprint and lookup latency of the typeahead prefix index.
+
+Builds a `PrefixIndex` over synthetic game-like titles (no database needed),
+reports the memory it holds per 100k entries and its build time, and times
+lookups for prefixes of increasing length, first and repeated.
+
+Run from the backend directory:
+    python -m benchmarks.bench_typeahead [--entries 100000]
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from app.services.typeahead import PrefixIndex
+
+
+WORDS = [
+    "dragon", "castle", "goblin", "wizard", "tavern", "quest", "dungeon", "forest",
+    "sword", "shield", "potion", "knight", "rogue", "treasure", "island", "pirate",
+    "storm", "mountain", "empire", "galaxy", "robot", "zombie", "railway", "harbor",
+    "market", "garden", "village", "auction", "mystery", "heist", "siege", "trade",
+]
+
+
+def make_entries(count: int, seed: int = 7) -> list[tuple[str, str, float]]:
+    rng = random.Random(seed)
+    return [
+        (
+            str(uuid.UUID(int=rng.getrandbits(128))),
+            f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}",
+            rng.randint(0, 5000),
+        )
+        for i in range(count)
+    ]
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    return sorted(samples)[int(fraction * (len(samples) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    index = PrefixIndex()
+    # The entries are only referenced by the index once built, as when
+    # streamed from the database
+    index.build(make_entries(args.entries))
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    held = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"{len(index)} entries: {held / 2**20:.1f} MiB "
+          f"({held / 2**20 * 100_000 / len(index):.1f} MiB per 100k, {held / len(index):.0f} B per entry)")
+
+    entries = make_entries(args.entries)
+    start = time.perf_counter()
+    PrefixIndex().build(entries)
+    print(f"build (with warm-up): {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(11)
+    titles = [label.casefold() for _, label, _ in entries]
+    print(f"\n  {'prefix len':>10} {'p50 us':>8} {'p99 us':>8}   (first lookup / repeated)")
+    for length in (1, 2, 3, 5, 8):
+        prefixes = list({rng.choice(titles)[:length] for _ in range(2_000)})
+        first, repeated = [], []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            index.suggest(prefix, 10)
+            first.append((time.perf_counter() - start) * 1e6)
+            start = time.perf_counter()
+            index.suggest(prefix, 10)
+            repeated.append((time.perf_counter() - start) * 1e6)
+        print(f"  {length:>10} {statistics.median(first):>8.1f} {percentile(first, 0.99):>8.1f}"
+              f"   {statistics.median(repeated):>8.1f} {percentile(repeated, 0.99):>8.1f}")
+
+    # New entries start unpopular, so they leave the cached top lists alone
+    start = time.perf_counter()
+    for i in range(10_000):
+        index.upsert(uuid.uuid4(), f"{rng.choice(WORDS).title()} Expansion {i}", 0)
+    print(f"\n  upsert: {(time.perf_counter() - start) / 10_000 * 1e6:.1f} us each, "
+          f"{len(index._top)} cached prefixes still valid")
+
+
+if __name__ == "__main__":
+    main()
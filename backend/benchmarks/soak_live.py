@@ -0,0 +1,137 @@
+# benchmarks/soak_live.py
+
+"""
+Live updates soak test: many idle Server-Sent Events connections on one
+worker.
+
+Opens `--connections` streams following the same topic against a running
+server, holds them open, then publishes one update through Redis and
+times how long it takes to reach every connection. Reports the worker's
+memory per connection when given its pid, and how many connections are
+still open after the hold period (heartbeats keep them alive through
+idle-timeout proxies).
+
+Start a single worker first, e.g.:
+    uvicorn main:app --port 8000 --workers 1
+Raise the open files limit for both processes (ulimit -n) above the
+number of connections. Then, from the backend directory:
+    python -m benchmarks.soak_live [--connections 10000] [--hold 60] [--pid <worker pid>]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Optional
+from urllib.parse import urlencode, urlsplit
+
+import httpx
+
+from app.services.live import publish_live
+
+
+def rss_kilobytes(pid: Optional[int]) -> Optional[int]:
+    if pid is None:
+        return None
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return None
+
+
+def login(base_url: str) -> str:
+    username = f"soak{uuid.uuid4().hex[:8]}"
+    password = "Soakpassword123!"
+    with httpx.Client(base_url=base_url) as http:
+        http.post("/auth/register", json={"username": username, "email": f"{username}@example.com", "password": password})
+        response = http.post("/auth/login", data={"username": username, "password": password})
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+
+class Connection:
+    def __init__(self):
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.received: Optional[float] = None
+        self.closed = False
+
+    async def open(self, host: str, port: int, path: str):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode())
+        await self.writer.drain()
+        headers = await self.reader.readuntil(b"\r\n\r\n")
+        if not headers.startswith(b"HTTP/1.1 200"):
+            raise ConnectionError(headers.split(b"\r\n", 1)[0].decode())
+
+    async def listen(self):
+        """
+        Read frames until the server closes the stream, noting when the
+        first update arrives.
+        """
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                if self.received is None and b"data: " in line:
+                    self.received = time.perf_counter()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        self.closed = True
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=500, help="connections opened concurrently")
+    parser.add_argument("--hold", type=float, default=60, help="seconds to hold the connections")
+    parser.add_argument("--pid", type=int, default=None, help="server worker pid, to report its memory")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    topic_id = uuid.uuid4()
+    path = "/live/stream?" + urlencode({"topics": f"events:{topic_id}", "token": login(args.url)})
+    baseline = rss_kilobytes(args.pid)
+
+    connections = [Connection() for _ in range(args.connections)]
+    failures = 0
+    started = time.perf_counter()
+    for offset in range(0, len(connections), args.batch):
+        batch = connections[offset:offset + args.batch]
+        results = await asyncio.gather(
+            *(connection.open(url.hostname, url.port, path) for connection in batch), return_exceptions=True
+        )
+        failures += sum(isinstance(result, Exception) for result in results)
+    opened = [connection for connection in connections if connection.writer is not None and connection.reader is not None]
+    listeners = [asyncio.create_task(connection.listen()) for connection in opened]
+    print(f"opened {len(opened) - failures} connections in {time.perf_counter() - started:.1f} s, {failures} failed")
+
+    loaded = rss_kilobytes(args.pid)
+    if baseline is not None:
+        per_connection = (loaded - baseline) / max(len(opened) - failures, 1)
+        print(f"worker RSS {baseline / 1024:.0f} MB -> {loaded / 1024:.0f} MB ({per_connection:.1f} KB per connection)")
+
+    await asyncio.sleep(1)
+    published = time.perf_counter()
+    publish_live("events", topic_id, "soak.ping", {"sent": published})
+    deadline = published + 30
+    while time.perf_counter() < deadline and any(c.received is None and not c.closed for c in opened):
+        await asyncio.sleep(0.05)
+    latencies = sorted(c.received - published for c in opened if c.received is not None)
+    if latencies:
+        print(f"update reached {len(latencies)} connections: "
+              f"median {latencies[len(latencies) // 2] * 1000:.0f} ms, last {latencies[-1] * 1000:.0f} ms")
+
+    await asyncio.sleep(args.hold)
+    print(f"after {args.hold:.0f} s: {sum(not c.closed for c in opened)} connections still open")
+    for connection in opened:
+        connection.writer.close()
+    for listener in listeners:
+        listener.cancel()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,18 +1,32 @@
 # backend/main.py
 
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.activity import flush_activity
+from app.core.audit import ensure_audit_partitions, flush_audit_events, maintain_audit_partitions
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.pubsub import change_listener
+from app.core.security import get_current_admin
+from app.core.tasks import PeriodicTask
 from app.exceptions.handlers import (
     EmailVerificationError, 
     email_verification_exception_handler, 
     http_exception_handler, 
     validation_exception_handler
     )
-from app.routes import auth, users
+from app.routes import admin, auth, character_sheets, comments, dice, events, feed, games, homebrew, live, notifications, random_tables, search, suggest, uploads, users
+from app.services.images import derivative_worker
+from app.services.mail import mail_worker, send_event_reminders
+from app.services.moderation import moderation_filter
+from app.services.notifications import reconcile_unread_counts
+from app.services.ratings import reconcile_ratings
+from app.services.recommendations import refresh_similar_games
+from app.services.typeahead import typeahead
 from app.database.database import Base, engine
 
 
@@ -38,14 +52,42 @@ def custom_openapi():
     app.openapi_schema = openapi_schema
     return app.openapi_schema
 
+
+background_tasks = [
+    PeriodicTask("activity-flush", settings.ACTIVITY_FLUSH_INTERVAL_SECONDS, flush_activity),
+    PeriodicTask("audit-flush", settings.AUDIT_FLUSH_INTERVAL_SECONDS, flush_audit_events),
+    PeriodicTask("audit-partitions", 6 * 60 * 60, maintain_audit_partitions),
+    PeriodicTask("ratings-reconcile", settings.RATINGS_RECONCILE_INTERVAL_SECONDS, reconcile_ratings),
+    PeriodicTask("event-reminders", settings.MAIL_REMINDER_INTERVAL_SECONDS, send_event_reminders),
+    PeriodicTask("notifications-reconcile", settings.NOTIFICATIONS_RECONCILE_INTERVAL_SECONDS, reconcile_unread_counts),
+    PeriodicTask("similar-games-refresh", settings.SIMILAR_GAMES_REFRESH_INTERVAL_SECONDS, refresh_similar_games),
+]
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
-    Create the database tables on startup and drop them on shutdown.
+    Create the database tables and start background tasks on startup,
+    stop the tasks and drop the tables on shutdown.
     """
     # Create the database tables
     Base.metadata.create_all(bind=engine)
+    ensure_audit_partitions()
+    # Listen before loading the typeahead index and moderation lists so no
+    # change is missed
+    change_listener.start()
+    await asyncio.to_thread(typeahead.build)
+    await asyncio.to_thread(moderation_filter.reload)
+    for task in background_tasks:
+        task.start()
+    derivative_worker.start()
+    mail_worker.start()
     yield
+    # Stop background tasks, flushing any buffered work
+    for task in background_tasks:
+        await task.stop()
+    await asyncio.to_thread(derivative_worker.stop)
+    await asyncio.to_thread(mail_worker.stop)
+    await asyncio.to_thread(change_listener.stop)
     # Drop the database tables
     Base.metadata.drop_all(bind=engine)
 
@@ -77,6 +119,20 @@ app.add_exception_handler(EmailVerificationError, email_verification_exception_h
 
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/users", tags=["Users"])
+app.include_router(dice.router, prefix="/dice", tags=["Dice"])
+app.include_router(random_tables.router, prefix="/tables", tags=["Random Tables"])
+app.include_router(character_sheets.router, prefix="/sheets", tags=["Character Sheets"])
+app.include_router(homebrew.router, prefix="/homebrew", tags=["Homebrew"])
+app.include_router(games.router, prefix="/games", tags=["Games"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
+app.include_router(comments.router, prefix="/comments", tags=["Comments"])
+app.include_router(live.router, prefix="/live", tags=["Live"])
+app.include_router(feed.router, prefix="/feed", tags=["Feed"])
+app.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
+app.include_router(uploads.router, prefix="/uploads", tags=["Uploads"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(suggest.router, prefix="/suggest", tags=["Search"])
+app.include_router(admin.router, prefix="/admin", tags=["Admin"])
 
 
 @app.get("/api/ping", summary="Ping the API")
@@ -84,4 +140,12 @@ async def ping():
     """
     Ping the API to check if it's running.
     """
-    return {"message": "Pong!"}
\ No newline at end of file
+    return {"message": "Pong!"}
+
+
+@app.get("/api/metrics", summary="Worker metrics", dependencies=[Depends(get_current_admin)])
+async def read_metrics():
+    """
+    Return the metrics collected by this worker process (admin only).
+    """
+    return metrics.snapshot()
\ No newline at end of file